@@ -18,6 +18,7 @@ Usage:
 
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 # Add the src directory to the Python path
@@ -41,4 +42,6 @@ def main():
         return 1
 
 if __name__ == "__main__":
+    # Needed for the render/processing worker pools in frozen builds
+    multiprocessing.freeze_support()
     sys.exit(main()) 
\ No newline at end of file
@@ -349,8 +349,16 @@ class AIHandler:
             Dict: Video analysis results
         """
         try:
-            from .video_handler import VideoHandler
+            from ...features.media_processing.video_handler import VideoHandler
+            from ...features.media_processing.video_analysis_cache import VideoAnalysisCache
             video_handler = VideoHandler()
+            analysis_cache = VideoAnalysisCache()
+            
+            # Frame analyses don't depend on the caption instructions, so reuse them
+            cached_analysis = analysis_cache.load_json(video_path, "content_analysis")
+            if cached_analysis:
+                self.logger.info(f"Using cached video analysis for {video_path}")
+                return cached_analysis
             
             analysis = {
                 "duration": 0,
@@ -371,7 +379,7 @@ class AIHandler:
                 analysis["audio_present"] = video_info.get("has_audio", False)
             
             # Extract key frames for analysis
-            frame_paths = self._extract_key_frames(video_path)
+            frame_paths = self._extract_key_frames(video_path, analysis_cache=analysis_cache)
             
             if frame_paths:
                 # Analyze each frame with Gemini
@@ -400,19 +408,24 @@ class AIHandler:
             # Analyze motion (basic implementation)
             analysis["motion_analysis"] = self._analyze_video_motion(video_path)
             
+            if analysis["frame_samples"]:
+                analysis_cache.save_json(video_path, "content_analysis", analysis)
+            
             return analysis
             
         except Exception as e:
             self.logger.error(f"Error analyzing video content: {e}")
             return {}
     
-    def _extract_key_frames(self, video_path: str, num_frames: int = 5) -> List[str]:
+    def _extract_key_frames(self, video_path: str, num_frames: int = 5,
+                            analysis_cache=None) -> List[str]:
         """
         Extract key frames from a video for analysis.
         
         Args:
             video_path: Path to the video file
             num_frames: Number of frames to extract
+            analysis_cache: Optional VideoAnalysisCache to reuse/store key-frame JPEG bytes
             
         Returns:
             List[str]: Paths to extracted frame images
@@ -433,15 +446,27 @@ class AIHandler:
                 for i in range(num_frames):
                     timestamp = (i + 1) * duration / (num_frames + 1)
                     frame_number = int(timestamp * fps)
+                    cache_name = f"keyframes/{analysis_cache.time_key(timestamp)}.jpg" if analysis_cache else None
                     
-                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-                    ret, frame = cap.read()
+                    jpeg_bytes = analysis_cache.load_bytes(video_path, cache_name) if analysis_cache else None
+                    if not jpeg_bytes:
+                        cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                        ret, frame = cap.read()
+                        if not ret:
+                            continue
+                        
+                        ret, encoded = cv2.imencode('.jpg', frame)
+                        if not ret:
+                            continue
+                        jpeg_bytes = encoded.tobytes()
+                        if analysis_cache:
+                            analysis_cache.save_bytes(video_path, cache_name, jpeg_bytes)
                     
-                    if ret:
-                        # Save frame as temporary image
-                        temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
-                        cv2.imwrite(temp_file.name, frame)
-                        frame_paths.append(temp_file.name)
+                    # Save frame as temporary image
+                    temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
+                    temp_file.write(jpeg_bytes)
+                    temp_file.close()
+                    frame_paths.append(temp_file.name)
             
             cap.release()
             return frame_paths
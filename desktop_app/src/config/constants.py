@@ -19,6 +19,8 @@ LIBRARY_DIR = os.path.join(DATA_DIR, 'images')  # Library images
 LIBRARY_IMAGES_DIR = os.path.join(DATA_DIR, 'images')
 LIBRARY_DATA_DIR = DATA_DIR  # Library data files are in root data dir
 MEDIA_GALLERY_DIR = os.path.join(DATA_DIR, 'media_gallery')
+VIDEO_ANALYSIS_CACHE_DIR = os.path.join(DATA_DIR, 'analysis_cache')  # Per-video analysis results
+THUMBNAIL_CACHE_DIR = os.path.join(DATA_DIR, 'thumbnails')  # Downscaled media thumbnails
 
 # Files
 PRESETS_FILE = os.path.join(ROOT_DIR, 'presets.json')
@@ -36,6 +38,7 @@ LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 UI_REFRESH_INTERVAL = 5000  # milliseconds
 THUMBNAIL_SIZE = (200, 200)
 PREVIEW_MAX_SIZE = (800, 800)
+PREVIEW_PROXY_MAX_SIZE = (1024, 1024)  # Live edit previews run on a proxy this size
 
 # Media Handling
 SUPPORTED_IMAGE_FORMATS = [".jpg", ".jpeg", ".png", ".webp", ".gif", ".bmp"]
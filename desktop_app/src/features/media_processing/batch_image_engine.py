@@ -0,0 +1,125 @@
+"""
+Batch image processing across a process pool.
+Each worker decodes, filters and encodes whole images, so enhancing a gallery
+scales with core count instead of running one photo at a time on the caller.
+"""
+
+import os
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from PIL import Image
+
+from ...utils.image_writer import write_image
+from .filter_pipeline import FilterPipeline
+
+
+# Moderate contrast, sharpness and colour boost used for automatic enhancement
+# (the same chain as media_handler.apply_default_enhancement)
+DEFAULT_ENHANCEMENT = FilterPipeline().contrast(1.08).sharpness(1.15).color(1.08)
+
+
+@dataclass
+class BatchImageJob:
+    """One image to load, filter and save."""
+
+    source_path: str
+    output_path: str
+    pipeline: FilterPipeline
+    # Filter RGBA images as RGB and save them fully opaque, as apply_default_enhancement does
+    flatten_alpha: bool = False
+
+
+def process_image(job: BatchImageJob) -> Tuple[bool, str, str]:
+    """
+    Load, filter and save one image. Runs inside a worker process.
+
+    Returns:
+        Tuple[bool, str, str]: (success, output_path, message)
+    """
+    try:
+        with Image.open(job.source_path) as img:
+            img.load()
+            flatten = job.flatten_alpha and img.mode == "RGBA"
+            result = job.pipeline.apply(img.convert("RGB") if flatten else img)
+            if flatten:
+                result = result.convert("RGBA")
+            if result is img:
+                # Nothing to do; detach from the file before it closes
+                result = img.copy()
+
+        directory = os.path.dirname(job.output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        write_image(result, job.output_path)
+        return True, job.output_path, "Processed"
+    except Exception as e:
+        return False, job.output_path, f"Processing failed: {e}"
+
+
+class BatchImageEngine:
+    """Spreads independent image jobs across a process pool."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the batch engine.
+
+        Args:
+            max_workers: Number of worker processes (default: one per CPU core)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+
+    def process(self, jobs: List[BatchImageJob],
+                progress_callback: Optional[Callable[[int, int], None]] = None) -> List[Tuple[bool, str, str]]:
+        """
+        Process all jobs, in parallel where possible.
+
+        Args:
+            jobs: Images to process
+            progress_callback: Called in the calling thread as (completed, total)
+                each time an image finishes, in completion order
+
+        Returns:
+            List of (success, output_path, message) in the same order as jobs
+        """
+        if not jobs:
+            return []
+
+        workers = min(self.max_workers, len(jobs))
+        if workers == 1:
+            return self._process_sequential(jobs, progress_callback)
+
+        self.logger.info(f"Processing {len(jobs)} images on {workers} worker processes")
+        results: List[Optional[Tuple[bool, str, str]]] = [None] * len(jobs)
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(process_image, job): index for index, job in enumerate(jobs)}
+                for completed, future in enumerate(as_completed(futures), start=1):
+                    results[futures[future]] = future.result()
+                    if progress_callback:
+                        progress_callback(completed, len(jobs))
+        except Exception as e:
+            # Broken pool (e.g. workers killed); finish the remaining jobs in-process
+            self.logger.warning(f"Process pool failed, processing remaining images sequentially: {e}")
+            remaining = [index for index, result in enumerate(results) if result is None]
+            done = len(jobs) - len(remaining)
+            for index in remaining:
+                results[index] = process_image(jobs[index])
+                done += 1
+                if progress_callback:
+                    progress_callback(done, len(jobs))
+
+        return results
+
+    def _process_sequential(self, jobs: List[BatchImageJob],
+                            progress_callback: Optional[Callable[[int, int], None]]) -> List[Tuple[bool, str, str]]:
+        """Process jobs one by one in the calling process."""
+        results = []
+        for job in jobs:
+            results.append(process_image(job))
+            if progress_callback:
+                progress_callback(len(results), len(jobs))
+        return results
@@ -0,0 +1,201 @@
+"""
+Declarative image filter chains with fused point operations.
+Consecutive per-band adjustments (brightness, contrast, channel gain, quantize)
+fold into one set of lookup tables and consecutive colour mixes (with any
+brightening that follows them) into one 3x3 matrix, so a preset costs a pass
+per group rather than a full-resolution copy per adjustment.
+"""
+
+from typing import Any, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+from . import image_kernels
+
+
+# Steps that act on each band independently and fold into a lookup table
+LUT_STEPS = ("brightness", "contrast", "channel_gain", "quantize")
+
+# Steps that mix bands; consecutive ones fold into a single 3x3 colour matrix
+MIX_STEPS = ("color", "color_matrix")
+
+
+class FilterPipeline:
+    """
+    Immutable chain of image filters.
+
+    Each builder method returns a new pipeline, so presets can be shared and
+    extended::
+
+        warm = FilterPipeline().channel_gain(1.15, 1.1, 0.9)
+        img = FilterPipeline().color(1.2).then(warm).contrast(1.1).apply(img)
+    """
+
+    def __init__(self, steps: Optional[Sequence[Tuple[str, Tuple[Any, ...]]]] = None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            steps: (name, params) pairs; normally built with the builder methods
+        """
+        self.steps: Tuple[Tuple[str, Tuple[Any, ...]], ...] = tuple(steps or ())
+
+    def __repr__(self) -> str:
+        return f"FilterPipeline({[name for name, _ in self.steps]})"
+
+    # ---- point operations (fused) ----
+
+    def brightness(self, factor: float) -> "FilterPipeline":
+        """Same as ImageEnhance.Brightness(img).enhance(factor)."""
+        return self._add("brightness", factor)
+
+    def contrast(self, factor: float) -> "FilterPipeline":
+        """Same as ImageEnhance.Contrast(img).enhance(factor)."""
+        return self._add("contrast", factor)
+
+    def channel_gain(self, red: float, green: float, blue: float) -> "FilterPipeline":
+        """Multiply each colour channel by its own gain (warm/cool tints)."""
+        return self._add("channel_gain", red, green, blue)
+
+    def quantize(self, step: int) -> "FilterPipeline":
+        """Snap each band, alpha included, down to multiples of ``step`` (flat, poster-like colour)."""
+        return self._add("quantize", step)
+
+    def color(self, factor: float) -> "FilterPipeline":
+        """Same as ImageEnhance.Color(img).enhance(factor)."""
+        return self._add("color", factor)
+
+    def color_matrix(self, matrix: np.ndarray) -> "FilterPipeline":
+        """Apply a 3x3 colour matrix (e.g. image_kernels.SEPIA_MATRIX)."""
+        return self._add("color_matrix", np.asarray(matrix, dtype=np.float64))
+
+    # ---- spatial operations (one pass each) ----
+
+    def gaussian_blur(self, radius: float) -> "FilterPipeline":
+        """Gaussian blur."""
+        return self.filter(ImageFilter.GaussianBlur(radius=radius))
+
+    def unsharp_mask(self, radius: float = 2, percent: int = 150, threshold: int = 3) -> "FilterPipeline":
+        """Unsharp-mask sharpening."""
+        return self.filter(ImageFilter.UnsharpMask(radius=radius, percent=percent, threshold=threshold))
+
+    def median(self, size: int = 3) -> "FilterPipeline":
+        """Median filter; sizes below 3 leave the image unchanged."""
+        if size < 3:
+            return self
+        return self.filter(ImageFilter.MedianFilter(size=size))
+
+    def sharpness(self, factor: float) -> "FilterPipeline":
+        """Same as ImageEnhance.Sharpness(img).enhance(factor)."""
+        return self._add("sharpness", factor)
+
+    def filter(self, image_filter: ImageFilter.Filter) -> "FilterPipeline":
+        """Any PIL ImageFilter."""
+        return self._add("filter", image_filter)
+
+    def then(self, other: "FilterPipeline") -> "FilterPipeline":
+        """Append the steps of another pipeline."""
+        return FilterPipeline(self.steps + other.steps)
+
+    # ---- execution ----
+
+    def apply(self, img: Image.Image) -> Image.Image:
+        """
+        Run the pipeline on an image.
+
+        Images other than RGB/RGBA are converted to RGB first; alpha is
+        carried through, changed only by quantize and spatial filters.
+        """
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGB")
+
+        tables: Optional[np.ndarray] = None  # 4x256 (RGB + alpha) lookup tables not yet applied
+        mixes: List[Tuple[str, Tuple[Any, ...]]] = []  # colour mixes not yet applied
+        for name, params in self.steps:
+            gains = self._gains(name, params)
+            if mixes and gains is not None and min(gains) >= 1:
+                # Scaling up after a mix commutes with its clipping, so it joins the matrix
+                mixes.append(("color_matrix", (np.diag(gains),)))
+            elif name in LUT_STEPS:
+                img, mixes = self._apply_mixes(img, mixes), []
+                tables = self._compose_tables(tables, self._tables(name, params, img, tables))
+            elif name in MIX_STEPS:
+                img, tables = self._apply_tables(img, tables), None
+                mixes.append((name, params))
+            else:
+                img = self._apply_mixes(self._apply_tables(img, tables), mixes)
+                tables, mixes = None, []
+                img = self._spatial(img, name, params)
+
+        return self._apply_mixes(self._apply_tables(img, tables), mixes)
+
+    def _add(self, name: str, *params: Any) -> "FilterPipeline":
+        """New pipeline with one more step."""
+        return FilterPipeline(self.steps + ((name, params),))
+
+    @staticmethod
+    def _gains(name: str, params: Tuple[Any, ...]) -> Optional[Tuple[float, float, float]]:
+        """Per-band gains of a step that only scales bands, else None."""
+        if name == "brightness":
+            return (params[0],) * 3
+        if name == "channel_gain":
+            return tuple(params)
+        return None
+
+    @staticmethod
+    def _tables(name: str, params: Tuple[Any, ...], img: Image.Image,
+                pending: Optional[np.ndarray]) -> np.ndarray:
+        """Per-band lookup tables (4x256, the last for alpha) for one point step."""
+        identity = image_kernels.IDENTITY_LUT
+        if name == "brightness":
+            return np.stack([image_kernels.blend_lut(0, params[0])] * 3 + [identity])
+        if name == "contrast":
+            # Mean grey of the image as it would be after the pending tables
+            luts = pending[:3] if pending is not None else None
+            mean = int(image_kernels.luma_mean(img.histogram(), luts) + 0.5)
+            return np.stack([image_kernels.blend_lut(mean, params[0])] * 3 + [identity])
+        if name == "channel_gain":
+            return np.stack([image_kernels.gain_lut(gain) for gain in params] + [identity])
+        return np.tile(image_kernels.quantize_lut(params[0]), (4, 1))
+
+    @staticmethod
+    def _compose_tables(first: Optional[np.ndarray], second: np.ndarray) -> np.ndarray:
+        """Tables equivalent to applying ``first`` and then ``second``."""
+        if first is None:
+            return second
+        return np.stack([second[band][first[band]] for band in range(4)])
+
+    @staticmethod
+    def _apply_tables(img: Image.Image, tables: Optional[np.ndarray]) -> Image.Image:
+        """Apply pending lookup tables in a single point() pass."""
+        if tables is None:
+            return img
+        if img.mode != "RGBA":
+            tables = tables[:3]
+        return img.point(tables.reshape(-1).tolist())
+
+    @staticmethod
+    def _apply_mixes(img: Image.Image, mixes: List[Tuple[str, Tuple[Any, ...]]]) -> Image.Image:
+        """Apply consecutive colour mixes as one 3x3 matrix conversion."""
+        if not mixes:
+            return img
+        if len(mixes) == 1 and mixes[0][0] == "color":
+            # PIL's own path rounds the intermediate luma exactly like the unfused filter
+            return ImageEnhance.Color(img).enhance(mixes[0][1][0])
+
+        matrix = np.eye(3)
+        for name, params in mixes:
+            step = image_kernels.saturation_matrix(params[0]) if name == "color" else params[0]
+            matrix = step @ matrix
+        mixed = image_kernels.apply_color_matrix(img, matrix)
+        if img.mode == "RGBA":
+            mixed.putalpha(img.getchannel("A"))
+        return mixed
+
+    @staticmethod
+    def _spatial(img: Image.Image, name: str, params: Tuple[Any, ...]) -> Image.Image:
+        """Run a spatial step."""
+        if name == "sharpness":
+            return ImageEnhance.Sharpness(img).enhance(params[0])
+        return img.filter(params[0])
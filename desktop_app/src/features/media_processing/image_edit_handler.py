@@ -6,6 +6,9 @@ import logging
 import base64
 import tempfile
 import io
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import Dict, Any, Optional, List, Tuple, Union
 from PIL import Image, ImageDraw, ImageFont, ImageStat, ImageEnhance, ImageFilter, ImageOps
 import numpy as np
@@ -22,11 +25,19 @@ except ImportError:
     logging.warning("Imagen 3 API not available. Install google-genai package for AI image generation.")
 
 from ...config import constants as const
+from . import image_kernels
+from .filter_pipeline import FilterPipeline
 
 # Constants
 GEMINI_VISION_MODEL = "gemini-1.5-flash"  # Using flash model which is better suited for image processing
 IMAGEN_MODEL = "imagen-3.0-generate-002"  # Latest Imagen 3 model
 TEMP_DIR = tempfile.gettempdir()
+MAX_PREVIEW_PROXIES = 4  # Open images whose preview proxies are kept in memory
+
+# Colour grades shared by several effects
+WARM_TONE = FilterPipeline().channel_gain(1.15, 1.1, 0.9)
+COOL_TONE = FilterPipeline().channel_gain(0.9, 1.0, 1.2)
+VINTAGE_TONE = FilterPipeline().color_matrix(image_kernels.SEPIA_MATRIX).contrast(0.8)
 
 class ImageEditHandler:
     """
@@ -39,6 +50,12 @@ class ImageEditHandler:
         self.original_image_path = None
         self.edited_image_path = None
         self.editing_history = []
+        # Screen-sized proxies for live previews: path -> ((mtime, size), image, proxy/original scale)
+        self._preview_proxies: "OrderedDict[str, Tuple[Tuple[float, int], Image.Image, float]]" = OrderedDict()
+        self._preview_lock = threading.Lock()
+        # Per-thread scale of the image being rendered relative to the original,
+        # so pixel radii look the same on a preview proxy as on the export
+        self._render_state = threading.local()
         
     def edit_image_with_gemini(self, image_path: str, edit_instructions: str) -> Tuple[bool, str, str]:
         """
@@ -386,7 +403,7 @@ class ImageEditHandler:
                 applied_effects.append("Saturation Enhancement (AI-guided)")
                 
             if any(keyword in analysis_lower for keyword in ["sharpen", "more detail", "crisp"]):
-                img = img.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
+                img = img.filter(ImageFilter.UnsharpMask(radius=self._px(2), percent=150, threshold=3))
                 applied_effects.append("Sharpening (AI-guided)")
             
             # Apply original instruction-based edits with enhanced processing
@@ -468,145 +485,13 @@ class ImageEditHandler:
         try:
             self.logger.info("Applying enhanced image editing with artistic transformations")
             
-            # Extract keywords from instructions
-            instructions_lower = edit_instructions.lower()
-            applied_effects = []
-            
             # Open the image
             img = Image.open(image_path).convert("RGB")
-            original_img = img.copy()
             
             # Store original image path
             self.original_image_path = image_path
             
-            # ARTISTIC STYLE TRANSFORMATIONS
-            if any(keyword in instructions_lower for keyword in ["studio ghibli", "ghibli", "anime", "animated"]):
-                img = self._apply_studio_ghibli_style(img)
-                applied_effects.append("Studio Ghibli Style")
-                
-            elif any(keyword in instructions_lower for keyword in ["oil painting", "painting", "artistic", "painterly"]):
-                img = self._apply_oil_painting_effect(img)
-                applied_effects.append("Oil Painting Style")
-                
-            elif any(keyword in instructions_lower for keyword in ["watercolor", "watercolour"]):
-                img = self._apply_watercolor_effect(img)
-                applied_effects.append("Watercolor Style")
-                
-            elif any(keyword in instructions_lower for keyword in ["pencil sketch", "sketch", "drawing"]):
-                img = self._apply_pencil_sketch_effect(img)
-                applied_effects.append("Pencil Sketch")
-                
-            elif any(keyword in instructions_lower for keyword in ["comic", "cartoon", "pop art"]):
-                img = self._apply_comic_book_effect(img)
-                applied_effects.append("Comic Book Style")
-                
-            elif any(keyword in instructions_lower for keyword in ["cyberpunk", "neon", "futuristic"]):
-                img = self._apply_cyberpunk_effect(img)
-                applied_effects.append("Cyberpunk Style")
-                
-            elif any(keyword in instructions_lower for keyword in ["fantasy", "magical", "ethereal"]):
-                img = self._apply_fantasy_effect(img)
-                applied_effects.append("Fantasy Style")
-            
-            # BACKGROUND TRANSFORMATIONS
-            if any(keyword in instructions_lower for keyword in ["remove background", "transparent background", "cut out"]):
-                img = self._remove_background(img)
-                applied_effects.append("Background Removal")
-                
-            elif any(keyword in instructions_lower for keyword in ["blue gradient", "gradient background"]):
-                img = self._apply_gradient_background(img, "blue")
-                applied_effects.append("Blue Gradient Background")
-                
-            elif any(keyword in instructions_lower for keyword in ["bokeh", "blurred background"]):
-                img = self._apply_bokeh_background(img)
-                applied_effects.append("Bokeh Background")
-            
-            # COLOR TRANSFORMATIONS
-            if any(keyword in instructions_lower for keyword in ["black and white", "grayscale", "monochrome"]):
-                img = self._apply_advanced_bw(img)
-                applied_effects.append("Professional B&W")
-                
-            elif any(keyword in instructions_lower for keyword in ["sepia", "vintage", "retro"]):
-                img = self._apply_vintage_effect(img)
-                applied_effects.append("Vintage Effect")
-                
-            elif any(keyword in instructions_lower for keyword in ["vibrant", "saturated", "vivid"]):
-                img = self._apply_vibrant_colors(img)
-                applied_effects.append("Vibrant Colors")
-                
-            elif any(keyword in instructions_lower for keyword in ["cinematic", "movie", "film"]):
-                img = self._apply_cinematic_look(img)
-                applied_effects.append("Cinematic Look")
-                
-            elif any(keyword in instructions_lower for keyword in ["warm", "golden hour", "sunset"]):
-                img = self._apply_warm_tone(img)
-                applied_effects.append("Warm Tone")
-                
-            elif any(keyword in instructions_lower for keyword in ["cool", "blue hour", "winter"]):
-                img = self._apply_cool_tone(img)
-                applied_effects.append("Cool Tone")
-            
-            # LIGHTING AND ATMOSPHERE
-            if any(keyword in instructions_lower for keyword in ["hdr", "high dynamic range"]):
-                img = self._apply_hdr_effect(img)
-                applied_effects.append("HDR Effect")
-                
-            elif any(keyword in instructions_lower for keyword in ["soft light", "dreamy", "romantic"]):
-                img = self._apply_soft_light(img)
-                applied_effects.append("Soft Light")
-                
-            elif any(keyword in instructions_lower for keyword in ["dramatic", "high contrast", "bold"]):
-                img = self._apply_dramatic_effect(img)
-                applied_effects.append("Dramatic Effect")
-                
-            elif any(keyword in instructions_lower for keyword in ["vignette", "dark edges"]):
-                img = self._apply_vignette_effect(img)
-                applied_effects.append("Vignette")
-            
-            # ENHANCEMENT EFFECTS
-            if any(keyword in instructions_lower for keyword in ["sharp", "clarity", "detail"]):
-                img = self._apply_sharpening(img)
-                applied_effects.append("Enhanced Sharpness")
-                
-            elif any(keyword in instructions_lower for keyword in ["smooth", "skin", "portrait"]):
-                img = self._apply_skin_smoothing(img)
-                applied_effects.append("Skin Smoothing")
-                
-            elif any(keyword in instructions_lower for keyword in ["bright", "exposure"]):
-                img = self._apply_brightness_adjustment(img, 1.3)
-                applied_effects.append("Brightness Enhancement")
-            
-            # SPECIAL EFFECTS
-            if any(keyword in instructions_lower for keyword in ["instagram", "social media", "filter"]):
-                img = self._apply_instagram_filter(img)
-                applied_effects.append("Social Media Filter")
-                
-            elif any(keyword in instructions_lower for keyword in ["polaroid", "instant", "vintage photo"]):
-                img = self._apply_polaroid_effect(img)
-                applied_effects.append("Polaroid Effect")
-                
-            elif any(keyword in instructions_lower for keyword in ["tilt shift", "miniature"]):
-                img = self._apply_tilt_shift(img)
-                applied_effects.append("Tilt-Shift Effect")
-            
-            # If no specific effects were applied, apply a smart enhancement based on instructions
-            if not applied_effects:
-                if any(keyword in instructions_lower for keyword in ["enhance", "improve", "better", "quality"]):
-                    img = self._apply_smart_enhancement(img)
-                    applied_effects.append("Smart Enhancement")
-                elif any(keyword in instructions_lower for keyword in ["dramatic", "bold", "striking", "vibrant"]):
-                    img = self._apply_dramatic_enhancement(img)
-                    applied_effects.append("Dramatic Enhancement")
-                elif any(keyword in instructions_lower for keyword in ["professional", "clean", "crisp"]):
-                    img = self._apply_professional_enhancement(img)
-                    applied_effects.append("Professional Enhancement")
-                elif any(keyword in instructions_lower for keyword in ["food", "bread", "baking", "culinary"]):
-                    img = self._apply_food_photography_enhancement(img)
-                    applied_effects.append("Food Photography Enhancement")
-                else:
-                    # Apply more substantial default transformation instead of subtle
-                    img = self._apply_enhanced_default(img)
-                    applied_effects.append("Enhanced Processing")
+            img, applied_effects = self._apply_instruction_effects(img, edit_instructions)
             
             # Create output file
             file_name = os.path.basename(image_path)
@@ -632,6 +517,153 @@ class ImageEditHandler:
             self.logger.error(f"Error in enhanced editing: {e}")
             return False, "", f"Error applying enhanced edits: {str(e)}"
             
+    def _apply_instruction_effects(self, img: Image.Image, edit_instructions: str) -> Tuple[Image.Image, List[str]]:
+        """
+        Apply the effect chain selected by keywords in the instructions.
+        Used for full-resolution edits and for live previews on a proxy.
+        
+        Args:
+            img: RGB image to edit
+            edit_instructions: Editing instructions
+            
+        Returns:
+            Tuple[Image.Image, List[str]]: Edited image and names of the applied effects
+        """
+        # Extract keywords from instructions
+        instructions_lower = edit_instructions.lower()
+        applied_effects = []
+        
+        # ARTISTIC STYLE TRANSFORMATIONS
+        if any(keyword in instructions_lower for keyword in ["studio ghibli", "ghibli", "anime", "animated"]):
+            img = self._apply_studio_ghibli_style(img)
+            applied_effects.append("Studio Ghibli Style")
+        
+        elif any(keyword in instructions_lower for keyword in ["oil painting", "painting", "artistic", "painterly"]):
+            img = self._apply_oil_painting_effect(img)
+            applied_effects.append("Oil Painting Style")
+        
+        elif any(keyword in instructions_lower for keyword in ["watercolor", "watercolour"]):
+            img = self._apply_watercolor_effect(img)
+            applied_effects.append("Watercolor Style")
+        
+        elif any(keyword in instructions_lower for keyword in ["pencil sketch", "sketch", "drawing"]):
+            img = self._apply_pencil_sketch_effect(img)
+            applied_effects.append("Pencil Sketch")
+        
+        elif any(keyword in instructions_lower for keyword in ["comic", "cartoon", "pop art"]):
+            img = self._apply_comic_book_effect(img)
+            applied_effects.append("Comic Book Style")
+        
+        elif any(keyword in instructions_lower for keyword in ["cyberpunk", "neon", "futuristic"]):
+            img = self._apply_cyberpunk_effect(img)
+            applied_effects.append("Cyberpunk Style")
+        
+        elif any(keyword in instructions_lower for keyword in ["fantasy", "magical", "ethereal"]):
+            img = self._apply_fantasy_effect(img)
+            applied_effects.append("Fantasy Style")
+        
+        # BACKGROUND TRANSFORMATIONS
+        if any(keyword in instructions_lower for keyword in ["remove background", "transparent background", "cut out"]):
+            img = self._remove_background(img)
+            applied_effects.append("Background Removal")
+        
+        elif any(keyword in instructions_lower for keyword in ["blue gradient", "gradient background"]):
+            img = self._apply_gradient_background(img, "blue")
+            applied_effects.append("Blue Gradient Background")
+        
+        elif any(keyword in instructions_lower for keyword in ["bokeh", "blurred background"]):
+            img = self._apply_bokeh_background(img)
+            applied_effects.append("Bokeh Background")
+        
+        # COLOR TRANSFORMATIONS
+        if any(keyword in instructions_lower for keyword in ["black and white", "grayscale", "monochrome"]):
+            img = self._apply_advanced_bw(img)
+            applied_effects.append("Professional B&W")
+        
+        elif any(keyword in instructions_lower for keyword in ["sepia", "vintage", "retro"]):
+            img = self._apply_vintage_effect(img)
+            applied_effects.append("Vintage Effect")
+        
+        elif any(keyword in instructions_lower for keyword in ["vibrant", "saturated", "vivid"]):
+            img = self._apply_vibrant_colors(img)
+            applied_effects.append("Vibrant Colors")
+        
+        elif any(keyword in instructions_lower for keyword in ["cinematic", "movie", "film"]):
+            img = self._apply_cinematic_look(img)
+            applied_effects.append("Cinematic Look")
+        
+        elif any(keyword in instructions_lower for keyword in ["warm", "golden hour", "sunset"]):
+            img = self._apply_warm_tone(img)
+            applied_effects.append("Warm Tone")
+        
+        elif any(keyword in instructions_lower for keyword in ["cool", "blue hour", "winter"]):
+            img = self._apply_cool_tone(img)
+            applied_effects.append("Cool Tone")
+        
+        # LIGHTING AND ATMOSPHERE
+        if any(keyword in instructions_lower for keyword in ["hdr", "high dynamic range"]):
+            img = self._apply_hdr_effect(img)
+            applied_effects.append("HDR Effect")
+        
+        elif any(keyword in instructions_lower for keyword in ["soft light", "dreamy", "romantic"]):
+            img = self._apply_soft_light(img)
+            applied_effects.append("Soft Light")
+        
+        elif any(keyword in instructions_lower for keyword in ["dramatic", "high contrast", "bold"]):
+            img = self._apply_dramatic_effect(img)
+            applied_effects.append("Dramatic Effect")
+        
+        elif any(keyword in instructions_lower for keyword in ["vignette", "dark edges"]):
+            img = self._apply_vignette_effect(img)
+            applied_effects.append("Vignette")
+        
+        # ENHANCEMENT EFFECTS
+        if any(keyword in instructions_lower for keyword in ["sharp", "clarity", "detail"]):
+            img = self._apply_sharpening(img)
+            applied_effects.append("Enhanced Sharpness")
+        
+        elif any(keyword in instructions_lower for keyword in ["smooth", "skin", "portrait"]):
+            img = self._apply_skin_smoothing(img)
+            applied_effects.append("Skin Smoothing")
+        
+        elif any(keyword in instructions_lower for keyword in ["bright", "exposure"]):
+            img = self._apply_brightness_adjustment(img, 1.3)
+            applied_effects.append("Brightness Enhancement")
+        
+        # SPECIAL EFFECTS
+        if any(keyword in instructions_lower for keyword in ["instagram", "social media", "filter"]):
+            img = self._apply_instagram_filter(img)
+            applied_effects.append("Social Media Filter")
+        
+        elif any(keyword in instructions_lower for keyword in ["polaroid", "instant", "vintage photo"]):
+            img = self._apply_polaroid_effect(img)
+            applied_effects.append("Polaroid Effect")
+        
+        elif any(keyword in instructions_lower for keyword in ["tilt shift", "miniature"]):
+            img = self._apply_tilt_shift(img)
+            applied_effects.append("Tilt-Shift Effect")
+        
+        # If no specific effects were applied, apply a smart enhancement based on instructions
+        if not applied_effects:
+            if any(keyword in instructions_lower for keyword in ["enhance", "improve", "better", "quality"]):
+                img = self._apply_smart_enhancement(img)
+                applied_effects.append("Smart Enhancement")
+            elif any(keyword in instructions_lower for keyword in ["dramatic", "bold", "striking", "vibrant"]):
+                img = self._apply_dramatic_enhancement(img)
+                applied_effects.append("Dramatic Enhancement")
+            elif any(keyword in instructions_lower for keyword in ["professional", "clean", "crisp"]):
+                img = self._apply_professional_enhancement(img)
+                applied_effects.append("Professional Enhancement")
+            elif any(keyword in instructions_lower for keyword in ["food", "bread", "baking", "culinary"]):
+                img = self._apply_food_photography_enhancement(img)
+                applied_effects.append("Food Photography Enhancement")
+            else:
+                # Apply more substantial default transformation instead of subtle
+                img = self._apply_enhanced_default(img)
+                applied_effects.append("Enhanced Processing")
+        
+        return img, applied_effects
+    
     def apply_traditional_edits(self, image_path: str, edit_instructions: str) -> Tuple[bool, str, str]:
         """
         Apply traditional image editing (brightness, contrast, filters, etc.) without AI generation.
@@ -645,6 +677,140 @@ class ImageEditHandler:
         """
         return self._apply_basic_edit(image_path, edit_instructions)
     
+    def get_preview_proxy(self, image_path: str) -> Optional[Image.Image]:
+        """
+        Get the screen-sized RGB proxy of an image used for live previews.
+        
+        JPEGs are decoded at reduced scale with draft(), so building the proxy of
+        a 24 MP photo costs a fraction of a full decode. Proxies are rebuilt when
+        the file changes; call release_preview_proxy() when the image is closed.
+        Safe to call from worker threads.
+        
+        Args:
+            image_path: Path to the image file
+            
+        Returns:
+            Optional[Image.Image]: Proxy image (do not modify), or None if unreadable
+        """
+        entry = self._get_preview_entry(image_path)
+        return entry[0] if entry else None
+    
+    def _get_preview_entry(self, image_path: str) -> Optional[Tuple[Image.Image, float]]:
+        """Proxy of an image and its scale relative to the original."""
+        try:
+            stat = os.stat(image_path)
+        except OSError:
+            return None
+        
+        key = (stat.st_mtime, stat.st_size)
+        with self._preview_lock:
+            cached = self._preview_proxies.get(image_path)
+            if cached and cached[0] == key:
+                self._preview_proxies.move_to_end(image_path)
+                return cached[1], cached[2]
+        
+        try:
+            with Image.open(image_path) as img:
+                original_width = img.width
+                img.draft("RGB", const.PREVIEW_PROXY_MAX_SIZE)
+                proxy = img.convert("RGB")
+            proxy.thumbnail(const.PREVIEW_PROXY_MAX_SIZE)
+        except Exception as e:
+            self.logger.error(f"Error building preview proxy for {image_path}: {e}")
+            return None
+        
+        scale = proxy.width / original_width
+        with self._preview_lock:
+            self._preview_proxies[image_path] = (key, proxy, scale)
+            self._preview_proxies.move_to_end(image_path)
+            while len(self._preview_proxies) > MAX_PREVIEW_PROXIES:
+                self._preview_proxies.popitem(last=False)
+        return proxy, scale
+    
+    def release_preview_proxy(self, image_path: str):
+        """
+        Drop the cached preview proxy of an image that is no longer open.
+        
+        Args:
+            image_path: Path to the image file
+        """
+        with self._preview_lock:
+            self._preview_proxies.pop(image_path, None)
+    
+    def preview_traditional_edits(self, image_path: str, edit_instructions: str):
+        """
+        Render apply_traditional_edits() on the preview proxy.
+        
+        Nothing is written to disk; run the full-resolution edit on export.
+        Pixel radii are scaled to the proxy, so effects look as they will on
+        the exported image. Safe to call from worker threads.
+        
+        Args:
+            image_path: Path to the image file
+            edit_instructions: Instructions for how to edit the image
+            
+        Returns:
+            Optional[QImage]: Preview image, or None on failure
+        """
+        entry = self._get_preview_entry(image_path)
+        if entry is None:
+            return None
+        try:
+            with self._render_scale(entry[1]):
+                img, _ = self._apply_instruction_effects(entry[0], edit_instructions)
+            return self._to_qimage(img)
+        except Exception as e:
+            self.logger.error(f"Error rendering edit preview: {e}")
+            return None
+    
+    def preview_filters(self, image_path: str, filters: List[str]):
+        """
+        Render edit_image_with_filters() on the preview proxy.
+        
+        Args:
+            image_path: Path to the image file
+            filters: List of filter names to apply
+            
+        Returns:
+            Optional[QImage]: Preview image, or None on failure
+        """
+        entry = self._get_preview_entry(image_path)
+        if entry is None:
+            return None
+        try:
+            with self._render_scale(entry[1]):
+                img = self._apply_filter_list(entry[0], filters)
+            return self._to_qimage(img)
+        except Exception as e:
+            self.logger.error(f"Error rendering filter preview: {e}")
+            return None
+    
+    @contextmanager
+    def _render_scale(self, scale: float):
+        """Render on this thread at `scale` times the original resolution."""
+        previous = getattr(self._render_state, "scale", 1.0)
+        self._render_state.scale = scale
+        try:
+            yield
+        finally:
+            self._render_state.scale = previous
+    
+    def _px(self, radius: float) -> float:
+        """A filter radius given in original-image pixels, at the current render scale."""
+        return radius * getattr(self._render_state, "scale", 1.0)
+    
+    def _px_size(self, size: int) -> int:
+        """An odd kernel size given in original-image pixels, at the current render scale."""
+        scaled = int(round(size * getattr(self._render_state, "scale", 1.0)))
+        return max(1, scaled | 1)
+    
+    @staticmethod
+    def _to_qimage(img: Image.Image):
+        """Convert a PIL image to a QImage that keeps its pixel buffer alive."""
+        from ...utils.image_conversion import pil_to_qimage
+        
+        return pil_to_qimage(img)
+    
     def revert_to_original(self) -> str:
         """
         Revert to the original image.
@@ -698,55 +864,7 @@ class ImageEditHandler:
             img = Image.open(image_path)
             
             # Apply filters
-            for filter_name in filters:
-                if filter_name.lower() == "grayscale":
-                    img = img.convert("L").convert("RGB")
-                elif filter_name.lower() == "sepia":
-                    # Simple sepia implementation
-                    img = img.convert("RGB")
-                    width, height = img.size
-                    pixels = img.load()
-                    for i in range(width):
-                        for j in range(height):
-                            r, g, b = pixels[i, j]
-                            new_r = int(r * 0.393 + g * 0.769 + b * 0.189)
-                            new_g = int(r * 0.349 + g * 0.686 + b * 0.168)
-                            new_b = int(r * 0.272 + g * 0.534 + b * 0.131)
-                            pixels[i, j] = (
-                                min(255, new_r),
-                                min(255, new_g),
-                                min(255, new_b)
-                            )
-                elif filter_name.lower() == "contrast":
-                    from PIL import ImageEnhance
-                    enhancer = ImageEnhance.Contrast(img)
-                    img = enhancer.enhance(1.5)
-                elif filter_name.lower() == "brightness":
-                    from PIL import ImageEnhance
-                    enhancer = ImageEnhance.Brightness(img)
-                    img = enhancer.enhance(1.2)
-                elif filter_name.lower() == "sharpness":
-                    from PIL import ImageEnhance
-                    enhancer = ImageEnhance.Sharpness(img)
-                    img = enhancer.enhance(1.5)
-                elif filter_name.lower() == "saturation":
-                    from PIL import ImageEnhance
-                    enhancer = ImageEnhance.Color(img)
-                    img = enhancer.enhance(1.5)
-                elif filter_name.lower() == "warm":
-                    # Apply warm tone by enhancing red channel
-                    img = img.convert("RGB")
-                    r, g, b = img.split()
-                    from PIL import ImageEnhance
-                    r = ImageEnhance.Brightness(r).enhance(1.2)
-                    img = Image.merge("RGB", (r, g, b))
-                elif filter_name.lower() == "cool":
-                    # Apply cool tone by enhancing blue channel
-                    img = img.convert("RGB")
-                    r, g, b = img.split()
-                    from PIL import ImageEnhance
-                    b = ImageEnhance.Brightness(b).enhance(1.2)
-                    img = Image.merge("RGB", (r, g, b))
+            img = self._apply_filter_list(img, filters)
             
             # Create a temporary file for the edited image
             file_name = os.path.basename(image_path)
@@ -771,6 +889,55 @@ class ImageEditHandler:
             self.logger.error(f"Error applying filters to image: {e}")
             return False, "", f"Error during filter application: {str(e)}"
 
+    def _apply_filter_list(self, img: Image.Image, filters: List[str]) -> Image.Image:
+        """
+        Apply named basic filters in order.
+        
+        Args:
+            img: Image to filter
+            filters: List of filter names to apply
+            
+        Returns:
+            Image.Image: Filtered image
+        """
+        for filter_name in filters:
+            if filter_name.lower() == "grayscale":
+                img = img.convert("L").convert("RGB")
+            elif filter_name.lower() == "sepia":
+                img = image_kernels.sepia(img)
+            elif filter_name.lower() == "contrast":
+                from PIL import ImageEnhance
+                enhancer = ImageEnhance.Contrast(img)
+                img = enhancer.enhance(1.5)
+            elif filter_name.lower() == "brightness":
+                from PIL import ImageEnhance
+                enhancer = ImageEnhance.Brightness(img)
+                img = enhancer.enhance(1.2)
+            elif filter_name.lower() == "sharpness":
+                from PIL import ImageEnhance
+                enhancer = ImageEnhance.Sharpness(img)
+                img = enhancer.enhance(1.5)
+            elif filter_name.lower() == "saturation":
+                from PIL import ImageEnhance
+                enhancer = ImageEnhance.Color(img)
+                img = enhancer.enhance(1.5)
+            elif filter_name.lower() == "warm":
+                # Apply warm tone by enhancing red channel
+                img = img.convert("RGB")
+                r, g, b = img.split()
+                from PIL import ImageEnhance
+                r = ImageEnhance.Brightness(r).enhance(1.2)
+                img = Image.merge("RGB", (r, g, b))
+            elif filter_name.lower() == "cool":
+                # Apply cool tone by enhancing blue channel
+                img = img.convert("RGB")
+                r, g, b = img.split()
+                from PIL import ImageEnhance
+                b = ImageEnhance.Brightness(b).enhance(1.2)
+                img = Image.merge("RGB", (r, g, b))
+        
+        return img
+    
     def optimize_for_story(self, image_path: str, target_aspect_ratio: float = 9/16, background_color=(0,0,0)) -> Tuple[bool, str, str]:
         """
         Optimizes an image for a story format (e.g., 9:16 aspect ratio).
@@ -1027,72 +1194,35 @@ class ImageEditHandler:
     
     def _apply_studio_ghibli_style(self, img: Image.Image) -> Image.Image:
         """Apply Studio Ghibli anime-style transformation."""
-        from PIL import ImageEnhance, ImageFilter
-        import numpy as np
-        
-        # Convert to numpy for color manipulation
-        img_array = np.array(img)
-        
-        # Apply anime-style color quantization (reduce color palette)
-        # Divide by factor, round, then multiply back to create flat color areas
-        quantize_factor = 32
-        img_array = (img_array // quantize_factor) * quantize_factor
-        img = Image.fromarray(img_array.astype(np.uint8))
-        
-        # Enhance colors and saturation dramatically for anime look
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.8)
-        
-        # Increase contrast for defined anime-style shading
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.4)
-        
-        # Apply slight blur for soft anime aesthetic
-        img = img.filter(ImageFilter.GaussianBlur(radius=0.8))
-        
-        # Increase brightness for that bright anime look
-        brightness_enhancer = ImageEnhance.Brightness(img)
-        img = brightness_enhancer.enhance(1.2)
-        
-        # Apply warm tone for Ghibli feel
-        img = self._apply_warm_tone(img)
-        
-        # Final sharpening to define edges
-        img = img.filter(ImageFilter.UnsharpMask(radius=1, percent=100, threshold=2))
-        
-        return img
+        pipeline = (FilterPipeline()
+                    # Anime-style colour quantization (flat colour areas)
+                    .quantize(32)
+                    # Saturated colours and defined shading
+                    .color(1.8)
+                    .contrast(1.4)
+                    # Slight blur for soft anime aesthetic
+                    .gaussian_blur(self._px(0.8))
+                    # Bright, warm Ghibli feel
+                    .brightness(1.2)
+                    .then(WARM_TONE)
+                    # Final sharpening to define edges
+                    .unsharp_mask(radius=self._px(1), percent=100, threshold=2))
+        return pipeline.apply(img)
     
     def _apply_oil_painting_effect(self, img: Image.Image) -> Image.Image:
         """Apply oil painting artistic effect."""
-        from PIL import ImageFilter, ImageEnhance
-        import numpy as np
-        
-        # Convert to numpy array for advanced processing
-        img_array = np.array(img)
-        
-        # Apply multiple median filters for stronger paint effect
-        img = img.filter(ImageFilter.MedianFilter(size=5))
-        img = img.filter(ImageFilter.MedianFilter(size=3))
-        
-        # Enhance colors dramatically for oil painting look
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.6)
-        
-        # Increase contrast for more defined brush strokes
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.3)
-        
-        # Apply blur for painterly texture
-        img = img.filter(ImageFilter.GaussianBlur(radius=1.2))
-        
-        # Add slight sharpening to define edges like brush strokes
-        img = img.filter(ImageFilter.UnsharpMask(radius=1, percent=120, threshold=3))
-        
-        # Enhance brightness slightly
-        brightness_enhancer = ImageEnhance.Brightness(img)
-        img = brightness_enhancer.enhance(1.1)
-        
-        return img
+        pipeline = (FilterPipeline()
+                    # Multiple median filters for stronger paint effect
+                    .median(self._px_size(5))
+                    .median(self._px_size(3))
+                    # Rich colours and defined brush strokes
+                    .color(1.6)
+                    .contrast(1.3)
+                    # Painterly texture, with edges sharpened like brush strokes
+                    .gaussian_blur(self._px(1.2))
+                    .unsharp_mask(radius=self._px(1), percent=120, threshold=3)
+                    .brightness(1.1))
+        return pipeline.apply(img)
     
     def _apply_watercolor_effect(self, img: Image.Image) -> Image.Image:
         """Apply watercolor painting effect."""
@@ -1103,7 +1233,7 @@ class ImageEditHandler:
         img = contrast_enhancer.enhance(0.8)
         
         # Apply blur for soft edges
-        img = img.filter(ImageFilter.GaussianBlur(radius=1.5))
+        img = img.filter(ImageFilter.GaussianBlur(radius=self._px(1.5)))
         
         # Enhance brightness
         brightness_enhancer = ImageEnhance.Brightness(img)
@@ -1125,7 +1255,7 @@ class ImageEditHandler:
         img = ImageOps.invert(img)
         
         # Apply Gaussian blur
-        img = img.filter(ImageFilter.GaussianBlur(radius=0.5))
+        img = img.filter(ImageFilter.GaussianBlur(radius=self._px(0.5)))
         
         return img
     
@@ -1148,36 +1278,13 @@ class ImageEditHandler:
     
     def _apply_cyberpunk_effect(self, img: Image.Image) -> Image.Image:
         """Apply cyberpunk/neon effect."""
-        import numpy as np
-        
-        # Convert to array for color manipulation
-        img_array = np.array(img)
-        
-        # Enhance blue and magenta channels
-        img_array[:, :, 0] = np.clip(img_array[:, :, 0] * 1.2, 0, 255)  # Red
-        img_array[:, :, 1] = np.clip(img_array[:, :, 1] * 0.8, 0, 255)  # Green
-        img_array[:, :, 2] = np.clip(img_array[:, :, 2] * 1.4, 0, 255)  # Blue
-        
-        img = Image.fromarray(img_array.astype(np.uint8))
-        
-        # High contrast
-        from PIL import ImageEnhance
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.5)
-        
-        return img
+        # Enhance blue and magenta channels, then high contrast
+        return FilterPipeline().channel_gain(1.2, 0.8, 1.4).contrast(1.5).apply(img)
     
     def _apply_fantasy_effect(self, img: Image.Image) -> Image.Image:
         """Apply magical/fantasy effect."""
-        from PIL import ImageEnhance
-        
-        # Enhance saturation for magical feel
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.3)
-        
-        # Add brightness
-        brightness_enhancer = ImageEnhance.Brightness(img)
-        img = brightness_enhancer.enhance(1.15)
+        # Saturation and brightness for magical feel
+        img = FilterPipeline().color(1.3).brightness(1.15).apply(img)
         
         # Apply soft glow effect
         img = self._apply_soft_light(img)
@@ -1226,7 +1333,7 @@ class ImageEditHandler:
         
         # For simplicity, apply Gaussian blur to entire image
         # In reality, you'd detect subjects and only blur background
-        blurred = img.filter(ImageFilter.GaussianBlur(radius=3))
+        blurred = img.filter(ImageFilter.GaussianBlur(radius=self._px(3)))
         
         # Blend original and blurred for partial effect
         img = Image.blend(img, blurred, 0.4)
@@ -1247,116 +1354,38 @@ class ImageEditHandler:
     
     def _apply_vintage_effect(self, img: Image.Image) -> Image.Image:
         """Apply vintage/retro effect."""
-        import numpy as np
-        
-        # Apply sepia tone
-        img_array = np.array(img)
-        
-        # Sepia transformation matrix
-        sepia_r = img_array[:, :, 0] * 0.393 + img_array[:, :, 1] * 0.769 + img_array[:, :, 2] * 0.189
-        sepia_g = img_array[:, :, 0] * 0.349 + img_array[:, :, 1] * 0.686 + img_array[:, :, 2] * 0.168
-        sepia_b = img_array[:, :, 0] * 0.272 + img_array[:, :, 1] * 0.534 + img_array[:, :, 2] * 0.131
-        
-        sepia_img = np.stack([
-            np.clip(sepia_r, 0, 255),
-            np.clip(sepia_g, 0, 255),
-            np.clip(sepia_b, 0, 255)
-        ], axis=2)
-        
-        img = Image.fromarray(sepia_img.astype(np.uint8))
-        
-        # Reduce contrast for vintage look
-        from PIL import ImageEnhance
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(0.8)
-        
-        return img
+        # Sepia tone with reduced contrast; like the sepia kernel, drops transparency
+        return VINTAGE_TONE.apply(img if img.mode == "RGB" else img.convert("RGB"))
     
     def _apply_vibrant_colors(self, img: Image.Image) -> Image.Image:
         """Apply vibrant color enhancement."""
-        from PIL import ImageEnhance
-        
-        # Enhance saturation
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.5)
-        
-        # Slight contrast boost
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.2)
-        
-        return img
+        # Enhanced saturation with a slight contrast boost
+        return FilterPipeline().color(1.5).contrast(1.2).apply(img)
     
     def _apply_cinematic_look(self, img: Image.Image) -> Image.Image:
         """Apply cinematic color grading."""
-        import numpy as np
-        
-        img_array = np.array(img).astype(float)
-        
-        # Apply teal-orange color grading (popular in movies)
-        # Enhance oranges in highlights, teals in shadows
-        img_array[:, :, 0] = np.clip(img_array[:, :, 0] * 1.1, 0, 255)  # Red
-        img_array[:, :, 1] = np.clip(img_array[:, :, 1] * 0.95, 0, 255)  # Green
-        img_array[:, :, 2] = np.clip(img_array[:, :, 2] * 1.05, 0, 255)  # Blue
-        
-        img = Image.fromarray(img_array.astype(np.uint8))
-        
-        # Slight desaturation for film look
-        from PIL import ImageEnhance
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(0.9)
-        
-        return img
+        # Teal-orange grading (popular in movies), slightly desaturated for film look
+        return FilterPipeline().channel_gain(1.1, 0.95, 1.05).color(0.9).apply(img)
     
     def _apply_warm_tone(self, img: Image.Image) -> Image.Image:
         """Apply warm color tone."""
-        import numpy as np
-        
-        img_array = np.array(img).astype(float)
-        
-        # Enhance red and yellow
-        img_array[:, :, 0] = np.clip(img_array[:, :, 0] * 1.15, 0, 255)  # Red
-        img_array[:, :, 1] = np.clip(img_array[:, :, 1] * 1.1, 0, 255)   # Green
-        img_array[:, :, 2] = np.clip(img_array[:, :, 2] * 0.9, 0, 255)   # Blue
-        
-        return Image.fromarray(img_array.astype(np.uint8))
+        return WARM_TONE.apply(img)
     
     def _apply_cool_tone(self, img: Image.Image) -> Image.Image:
         """Apply cool color tone."""
-        import numpy as np
-        
-        img_array = np.array(img).astype(float)
-        
-        # Enhance blue
-        img_array[:, :, 0] = np.clip(img_array[:, :, 0] * 0.9, 0, 255)   # Red
-        img_array[:, :, 1] = np.clip(img_array[:, :, 1] * 1.0, 0, 255)   # Green
-        img_array[:, :, 2] = np.clip(img_array[:, :, 2] * 1.2, 0, 255)   # Blue
-        
-        return Image.fromarray(img_array.astype(np.uint8))
+        return COOL_TONE.apply(img)
     
     def _apply_hdr_effect(self, img: Image.Image) -> Image.Image:
         """Apply HDR-like effect."""
-        from PIL import ImageEnhance
-        
-        # Enhance local contrast
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.4)
-        
-        # Enhance colors
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.2)
-        
-        # Brighten
-        brightness_enhancer = ImageEnhance.Brightness(img)
-        img = brightness_enhancer.enhance(1.1)
-        
-        return img
+        # Local contrast, colours and brightness
+        return FilterPipeline().contrast(1.4).color(1.2).brightness(1.1).apply(img)
     
     def _apply_soft_light(self, img: Image.Image) -> Image.Image:
         """Apply soft, dreamy lighting effect."""
         from PIL import ImageFilter, ImageEnhance
         
         # Create soft glow
-        blurred = img.filter(ImageFilter.GaussianBlur(radius=2))
+        blurred = img.filter(ImageFilter.GaussianBlur(radius=self._px(2)))
         
         # Blend with original using soft light blend mode simulation
         img = Image.blend(img, blurred, 0.3)
@@ -1369,17 +1398,7 @@ class ImageEditHandler:
     
     def _apply_dramatic_effect(self, img: Image.Image) -> Image.Image:
         """Apply dramatic, high-contrast effect."""
-        from PIL import ImageEnhance
-        
-        # High contrast
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.6)
-        
-        # Enhance sharpness
-        sharpness_enhancer = ImageEnhance.Sharpness(img)
-        img = sharpness_enhancer.enhance(1.3)
-        
-        return img
+        return FilterPipeline().contrast(1.6).sharpness(1.3).apply(img)
     
     def _apply_vignette_effect(self, img: Image.Image) -> Image.Image:
         """Apply vignette (dark edges) effect."""
@@ -1416,7 +1435,7 @@ class ImageEditHandler:
         from PIL import ImageFilter, ImageEnhance
         
         # Apply unsharp mask
-        img = img.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
+        img = img.filter(ImageFilter.UnsharpMask(radius=self._px(2), percent=150, threshold=3))
         
         # Enhance sharpness
         sharpness_enhancer = ImageEnhance.Sharpness(img)
@@ -1429,7 +1448,7 @@ class ImageEditHandler:
         from PIL import ImageFilter
         
         # Apply slight Gaussian blur for smoothing
-        smoothed = img.filter(ImageFilter.GaussianBlur(radius=1))
+        smoothed = img.filter(ImageFilter.GaussianBlur(radius=self._px(1)))
         
         # Blend with original to preserve detail
         img = Image.blend(img, smoothed, 0.4)
@@ -1445,31 +1464,13 @@ class ImageEditHandler:
     
     def _apply_instagram_filter(self, img: Image.Image) -> Image.Image:
         """Apply Instagram-style filter."""
-        from PIL import ImageEnhance
-        
-        # Enhance colors
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.2)
-        
-        # Slight warm tone
-        img = self._apply_warm_tone(img)
-        
-        # Enhance contrast
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.1)
-        
-        return img
+        # Enhanced colours, slight warm tone and contrast
+        return FilterPipeline().color(1.2).then(WARM_TONE).contrast(1.1).apply(img)
     
     def _apply_polaroid_effect(self, img: Image.Image) -> Image.Image:
         """Apply Polaroid instant photo effect."""
-        from PIL import ImageEnhance
-        
-        # Vintage effect
-        img = self._apply_vintage_effect(img)
-        
-        # Reduce saturation
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(0.8)
+        # Vintage effect with reduced saturation
+        img = VINTAGE_TONE.color(0.8).apply(img if img.mode == "RGB" else img.convert("RGB"))
         
         # Add slight vignette
         img = self._apply_vignette_effect(img)
@@ -1479,30 +1480,15 @@ class ImageEditHandler:
     def _apply_tilt_shift(self, img: Image.Image) -> Image.Image:
         """Apply tilt-shift miniature effect."""
         from PIL import ImageFilter
-        import numpy as np
-        
-        width, height = img.size
         
-        # Create focus band in the middle
-        img_array = np.array(img)
-        blurred_array = np.array(img.filter(ImageFilter.GaussianBlur(radius=3)))
+        height = img.size[1]
+        blurred = img.filter(ImageFilter.GaussianBlur(radius=self._px(3)))
         
-        # Create gradient mask for tilt-shift effect
+        # Focus band in the middle; blur ramps in with distance from it
         focus_center = height // 2
         focus_width = height // 4
-        
-        for y in range(height):
-            distance = abs(y - focus_center)
-            if distance > focus_width:
-                blend_factor = min(1.0, (distance - focus_width) / focus_width)
-                for x in range(width):
-                    for c in range(3):
-                        img_array[y, x, c] = int(
-                            img_array[y, x, c] * (1 - blend_factor) + 
-                            blurred_array[y, x, c] * blend_factor
-                        )
-        
-        img = Image.fromarray(img_array.astype(np.uint8))
+        weights = image_kernels.focus_band_ramp(height, focus_center, focus_width)
+        img = image_kernels.blend_rows(img, blurred, weights)
         
         # Enhance saturation for miniature look
         from PIL import ImageEnhance
@@ -1513,140 +1499,83 @@ class ImageEditHandler:
     
     def _apply_smart_enhancement(self, img: Image.Image) -> Image.Image:
         """Apply intelligent enhancement based on image analysis."""
-        from PIL import ImageEnhance, ImageStat
+        from PIL import ImageStat
         
         # Analyze image statistics
         stat = ImageStat.Stat(img)
         mean_brightness = sum(stat.mean) / 3
         
         # Adjust based on image characteristics
+        pipeline = FilterPipeline()
         if mean_brightness < 100:  # Dark image
-            brightness_enhancer = ImageEnhance.Brightness(img)
-            img = brightness_enhancer.enhance(1.3)
+            pipeline = pipeline.brightness(1.3)
         elif mean_brightness > 180:  # Bright image
-            contrast_enhancer = ImageEnhance.Contrast(img)
-            img = contrast_enhancer.enhance(1.2)
+            pipeline = pipeline.contrast(1.2)
         
         # Always enhance colors slightly
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.1)
-        
-        return img
+        return pipeline.color(1.1).apply(img)
     
     def _apply_subtle_enhancement(self, img: Image.Image) -> Image.Image:
         """Apply subtle enhancement as default."""
-        from PIL import ImageEnhance
-        
-        # Slight contrast boost
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.1)
-        
-        # Slight color enhancement
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.05)
-        
-        return img
+        return FilterPipeline().contrast(1.1).color(1.05).apply(img)
     
     def _apply_dramatic_enhancement(self, img: Image.Image) -> Image.Image:
         """Apply dramatic enhancement for bold, striking effects."""
-        from PIL import ImageEnhance, ImageFilter
-        
-        # High contrast for dramatic effect
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.6)
-        
-        # Boost saturation significantly
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.4)
-        
-        # Increase sharpness
-        sharpness_enhancer = ImageEnhance.Sharpness(img)
-        img = sharpness_enhancer.enhance(1.3)
-        
-        # Slight brightness adjustment
-        brightness_enhancer = ImageEnhance.Brightness(img)
-        img = brightness_enhancer.enhance(1.1)
-        
-        return img
+        pipeline = (FilterPipeline()
+                    # High contrast and strongly boosted saturation
+                    .contrast(1.6)
+                    .color(1.4)
+                    .sharpness(1.3)
+                    # Slight brightness adjustment
+                    .brightness(1.1))
+        return pipeline.apply(img)
     
     def _apply_professional_enhancement(self, img: Image.Image) -> Image.Image:
         """Apply professional enhancement for clean, crisp results."""
-        from PIL import ImageEnhance, ImageFilter
-        
-        # Moderate contrast for professional look
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.25)
-        
-        # Enhance sharpness for crisp details
-        sharpness_enhancer = ImageEnhance.Sharpness(img)
-        img = sharpness_enhancer.enhance(1.4)
-        
-        # Slight color enhancement
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.15)
-        
-        # Apply unsharp mask for professional sharpening
-        img = img.filter(ImageFilter.UnsharpMask(radius=1, percent=120, threshold=3))
-        
-        return img
+        pipeline = (FilterPipeline()
+                    # Moderate contrast and crisp details
+                    .contrast(1.25)
+                    .sharpness(1.4)
+                    .color(1.15)
+                    # Unsharp mask for professional sharpening
+                    .unsharp_mask(radius=self._px(1), percent=120, threshold=3))
+        return pipeline.apply(img)
     
     def _apply_food_photography_enhancement(self, img: Image.Image) -> Image.Image:
         """Apply food photography specific enhancements."""
-        from PIL import ImageEnhance, ImageFilter
-        
-        # Warm tone for appetizing look
-        img = self._apply_warm_tone(img)
-        
-        # Enhance colors for food appeal
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.3)
-        
-        # Increase contrast for definition
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.2)
-        
-        # Sharpen for texture details
-        sharpness_enhancer = ImageEnhance.Sharpness(img)
-        img = sharpness_enhancer.enhance(1.2)
-        
-        # Slight brightness boost
-        brightness_enhancer = ImageEnhance.Brightness(img)
-        img = brightness_enhancer.enhance(1.05)
-        
-        return img
+        pipeline = (FilterPipeline()
+                    # Warm, appetizing colours with definition
+                    .then(WARM_TONE)
+                    .color(1.3)
+                    .contrast(1.2)
+                    # Texture details and a slight brightness boost
+                    .sharpness(1.2)
+                    .brightness(1.05))
+        return pipeline.apply(img)
     
     def _apply_enhanced_default(self, img: Image.Image) -> Image.Image:
         """Apply enhanced default processing with more substantial changes."""
-        from PIL import ImageEnhance, ImageFilter, ImageStat
+        from PIL import ImageStat
         
         # Analyze image characteristics
         stat = ImageStat.Stat(img)
         mean_brightness = sum(stat.mean) / 3
         
-        # Significant contrast enhancement for more noticeable effect
-        contrast_enhancer = ImageEnhance.Contrast(img)
-        img = contrast_enhancer.enhance(1.5)
-        
-        # Strong color enhancement
-        color_enhancer = ImageEnhance.Color(img)
-        img = color_enhancer.enhance(1.4)
-        
-        # Sharpness enhancement for crisp details
-        sharpness_enhancer = ImageEnhance.Sharpness(img)
-        img = sharpness_enhancer.enhance(1.3)
-        
         # Brightness adjustment based on image analysis
         if mean_brightness < 120:  # Dark image
-            brightness_enhancer = ImageEnhance.Brightness(img)
-            img = brightness_enhancer.enhance(1.25)
+            brightness = 1.25
         elif mean_brightness > 160:  # Bright image
-            brightness_enhancer = ImageEnhance.Brightness(img)
-            img = brightness_enhancer.enhance(0.9)
+            brightness = 0.9
         else:  # Normal brightness
-            brightness_enhancer = ImageEnhance.Brightness(img)
-            img = brightness_enhancer.enhance(1.1)
-        
-        # Apply unsharp mask for professional sharpening
-        img = img.filter(ImageFilter.UnsharpMask(radius=1.5, percent=150, threshold=3))
-        
-        return img 
\ No newline at end of file
+            brightness = 1.1
+        
+        pipeline = (FilterPipeline()
+                    # Strong contrast and colour for a noticeable effect
+                    .contrast(1.5)
+                    .color(1.4)
+                    # Crisp details
+                    .sharpness(1.3)
+                    .brightness(brightness)
+                    # Unsharp mask for professional sharpening
+                    .unsharp_mask(radius=self._px(1.5), percent=150, threshold=3))
+        return pipeline.apply(img)
@@ -0,0 +1,218 @@
+"""
+Inter-frame motion scoring for video analysis.
+Computes a dense motion curve over a strided, downscaled frame sequence.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import cv2
+import numpy as np
+
+
+# Frames are downscaled to this width before motion is measured
+MOTION_FRAME_WIDTH = 160
+
+# Default sampling rate of the motion curve (samples per second of video)
+DEFAULT_MOTION_FPS = 2.0
+
+# Number of frames differenced together in one vectorized step
+MOTION_BATCH_SIZE = 64
+
+# Raw magnitudes treated as "full" motion for each method
+DIFF_NORMALIZER = 30.0   # mean absolute grey-level difference
+FLOW_NORMALIZER = 4.0    # mean optical-flow magnitude in pixels at MOTION_FRAME_WIDTH
+
+MOTION_METHODS = ("diff", "flow")
+
+
+@dataclass
+class MotionCurve:
+    """
+    Dense motion curve for a whole video.
+
+    ``values[i]`` is the normalised (0-1) motion between the samples at
+    ``times[i]`` and ``times[i + 1]``; it is attributed to ``times[i + 1]``.
+    """
+
+    times: np.ndarray
+    values: np.ndarray
+    sample_fps: float
+    method: str = "diff"
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Serialise to plain arrays (for np.savez)."""
+        return {
+            "times": self.times,
+            "values": self.values,
+            "sample_fps": np.array(self.sample_fps),
+            "method": np.array(self.method),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "MotionCurve":
+        """Rebuild a curve serialised with to_arrays."""
+        return cls(
+            times=arrays["times"],
+            values=arrays["values"],
+            sample_fps=float(arrays["sample_fps"]),
+            method=str(arrays["method"]),
+        )
+
+    @property
+    def duration(self) -> float:
+        """Time covered by the curve in seconds."""
+        return float(self.times[-1]) if self.times.size else 0.0
+
+    def window_means(self, starts: np.ndarray, ends: np.ndarray,
+                     default: float = 0.5) -> np.ndarray:
+        """
+        Mean motion inside each [start, end) window, computed with a prefix sum.
+
+        Windows without any motion sample get ``default``.
+        """
+        starts = np.asarray(starts, dtype=np.float64)
+        ends = np.asarray(ends, dtype=np.float64)
+        if self.values.size == 0:
+            return np.full(starts.shape, default, dtype=np.float64)
+
+        sample_times = self.times[1:]
+        prefix = np.concatenate(([0.0], np.cumsum(self.values, dtype=np.float64)))
+        lo = np.searchsorted(sample_times, starts, side="left")
+        hi = np.searchsorted(sample_times, ends, side="left")
+        counts = hi - lo
+        sums = prefix[hi] - prefix[lo]
+        return np.where(counts > 0, sums / np.maximum(counts, 1), default)
+
+    def value_at(self, times) -> np.ndarray:
+        """Interpolate the curve at arbitrary times."""
+        if self.values.size == 0:
+            return np.zeros(np.shape(times), dtype=np.float64)
+        return np.interp(times, self.times[1:], self.values)
+
+    def quietest_time(self, start: float, end: float) -> float:
+        """Time of the lowest motion inside [start, end], or the midpoint if unsampled."""
+        sample_times = self.times[1:]
+        lo = np.searchsorted(sample_times, start, side="left")
+        hi = np.searchsorted(sample_times, end, side="right")
+        if hi <= lo:
+            return (start + end) / 2
+        return float(sample_times[lo + int(np.argmin(self.values[lo:hi]))])
+
+
+class MotionEngine:
+    """Measures motion between downscaled frames sampled at a fixed stride."""
+
+    def __init__(self, sample_fps: float = DEFAULT_MOTION_FPS, method: str = "diff",
+                 frame_width: int = MOTION_FRAME_WIDTH):
+        """
+        Initialize the motion engine.
+
+        Args:
+            sample_fps: Samples per second of video in the resulting curve
+            method: "diff" for mean absolute frame difference, "flow" for
+                Farneback optical-flow magnitude
+            frame_width: Width frames are downscaled to before measurement
+        """
+        if method not in MOTION_METHODS:
+            raise ValueError(f"Unknown motion method: {method}")
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.sample_fps = sample_fps
+        self.method = method
+        self.frame_width = frame_width
+
+    def compute(self, video_path: str) -> MotionCurve:
+        """
+        Compute the motion curve for a video file with OpenCV.
+
+        Skipped frames are only grabbed (demuxed/decoded, never converted),
+        so a pass costs little more than a plain decode.
+        """
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise ValueError(f"Could not open video file: {video_path}")
+
+        try:
+            native_fps = cap.get(cv2.CAP_PROP_FPS) or 0
+            stride = max(1, int(round(native_fps / self.sample_fps))) if native_fps > 0 else 1
+            effective_fps = native_fps / stride if native_fps > 0 else self.sample_fps
+            return self.compute_from_gray(self._iter_capture(cap, stride, bgr=True), effective_fps)
+        finally:
+            cap.release()
+
+    def compute_from_frames(self, frames: Iterable[np.ndarray], fps: float) -> MotionCurve:
+        """Compute the motion curve for an iterable of RGB frames sampled at ``fps``."""
+        return self.compute_from_gray((self.to_small_gray(frame) for frame in frames), fps)
+
+    def compute_from_gray(self, gray_frames: Iterable[np.ndarray], fps: float) -> MotionCurve:
+        """
+        Compute the motion curve for already-downscaled grayscale frames.
+
+        Frames are stacked in batches so the per-pair differences are a single
+        NumPy operation per batch.
+        """
+        values: List[np.ndarray] = []
+        count = 0
+        previous: Optional[np.ndarray] = None
+        batch: List[np.ndarray] = []
+
+        for gray in gray_frames:
+            batch.append(gray)
+            count += 1
+            if len(batch) >= MOTION_BATCH_SIZE:
+                values.append(self._score_batch(previous, batch))
+                previous = batch[-1]
+                batch = []
+
+        if batch:
+            values.append(self._score_batch(previous, batch))
+
+        curve = np.concatenate(values) if values else np.zeros(0, dtype=np.float64)
+        times = np.arange(count, dtype=np.float64) / fps if fps > 0 else np.zeros(count)
+        return MotionCurve(times=times, values=curve, sample_fps=fps, method=self.method)
+
+    def to_small_gray(self, frame: np.ndarray, bgr: bool = False) -> np.ndarray:
+        """Downscale a colour frame and convert it to grayscale."""
+        height, width = frame.shape[:2]
+        if width > self.frame_width:
+            new_height = max(1, int(height * self.frame_width / width))
+            frame = cv2.resize(frame, (self.frame_width, new_height), interpolation=cv2.INTER_AREA)
+        if frame.ndim == 3:
+            code = cv2.COLOR_BGR2GRAY if bgr else cv2.COLOR_RGB2GRAY
+            return cv2.cvtColor(np.ascontiguousarray(frame[..., :3]), code)
+        return frame
+
+    def _iter_capture(self, cap, stride: int, bgr: bool) -> Iterator[np.ndarray]:
+        """Yield every ``stride``-th frame of a capture as a small grayscale image."""
+        index = 0
+        while True:
+            if index % stride == 0:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                yield self.to_small_gray(frame, bgr=bgr)
+            elif not cap.grab():
+                break
+            index += 1
+
+    def _score_batch(self, previous: Optional[np.ndarray], batch: List[np.ndarray]) -> np.ndarray:
+        """Motion values for consecutive pairs in ``[previous] + batch``."""
+        frames = batch if previous is None else [previous] + batch
+        if len(frames) < 2:
+            return np.zeros(0, dtype=np.float64)
+
+        if self.method == "flow":
+            raw = np.array([self._flow_magnitude(a, b) for a, b in zip(frames[:-1], frames[1:])])
+            return np.clip(raw / FLOW_NORMALIZER, 0.0, 1.0)
+
+        stack = np.stack(frames).astype(np.int16)
+        raw = np.abs(np.diff(stack, axis=0)).mean(axis=(1, 2))
+        return np.clip(raw / DIFF_NORMALIZER, 0.0, 1.0)
+
+    @staticmethod
+    def _flow_magnitude(first: np.ndarray, second: np.ndarray) -> float:
+        """Mean Farneback optical-flow magnitude between two grayscale frames."""
+        flow = cv2.calcOpticalFlowFarneback(first, second, None, 0.5, 2, 9, 2, 5, 1.1, 0)
+        magnitude = np.sqrt(flow[..., 0] ** 2 + flow[..., 1] ** 2)
+        return float(magnitude.mean())
@@ -0,0 +1,250 @@
+"""
+Parallel rendering of independent video segments.
+Each segment is encoded in its own worker process; highlight reels are then
+joined with an ffmpeg stream-copy concat so the final step does no re-encoding.
+"""
+
+import os
+import uuid
+import shutil
+import logging
+import tempfile
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...config import constants as const
+from .stream_cut import STREAM_COPIED, KeyframeIndex, StreamCutter, get_ffmpeg_binary
+
+
+# Standard story output size (9:16)
+STORY_SIZE = (1080, 1920)
+
+
+@dataclass
+class RenderJob:
+    """One independently encodable output segment."""
+
+    source_path: str
+    start: float
+    end: float
+    output_path: str
+    story_format: bool = False
+    fade_in: float = 0.0
+    fade_out: float = 0.0
+    preset: Optional[str] = None
+    bitrate: Optional[str] = None
+    threads: Optional[int] = None
+    # Cut-only jobs: try a keyframe stream copy before falling back to a full encode
+    stream_copy: bool = False
+    keyframes: Optional[KeyframeIndex] = None
+    source_info: Optional[Dict[str, Any]] = None
+
+
+def format_for_story(clip):
+    """
+    Format a video clip for Instagram/Facebook Stories (9:16 aspect ratio).
+    """
+    from moviepy.video.fx import resize, crop
+
+    # Get current dimensions
+    width, height = clip.size
+    current_ratio = width / height
+    target_ratio = 9 / 16  # Story aspect ratio
+
+    if abs(current_ratio - target_ratio) < 0.01:
+        # Already correct ratio
+        return clip
+
+    # Calculate new dimensions
+    if current_ratio > target_ratio:
+        # Video is too wide, crop sides
+        new_width = int(height * target_ratio)
+        new_height = height
+        x_offset = (width - new_width) // 2
+        y_offset = 0
+    else:
+        # Video is too tall, crop top/bottom
+        new_width = width
+        new_height = int(width / target_ratio)
+        x_offset = 0
+        y_offset = (height - new_height) // 2
+
+    # Crop the video
+    cropped_clip = crop(clip, x1=x_offset, y1=y_offset,
+                        x2=x_offset + new_width, y2=y_offset + new_height)
+
+    # Resize to standard story dimensions (1080x1920)
+    return resize(cropped_clip, STORY_SIZE)
+
+
+def render_segment(job: RenderJob) -> Tuple[bool, str, str]:
+    """
+    Encode a single segment. Runs inside a worker process, so it opens its own reader.
+
+    Returns:
+        Tuple[bool, str, str]: (success, output_path, message)
+    """
+    if job.stream_copy:
+        success, message = StreamCutter().cut(job.source_path, job.start, job.end, job.output_path,
+                                              keyframes=job.keyframes, info=job.source_info)
+        if success:
+            return True, job.output_path, message
+        logging.getLogger("RenderScheduler").info(f"Stream copy not possible, re-encoding: {message}")
+
+    from moviepy.editor import VideoFileClip
+
+    clip = None
+    try:
+        clip = VideoFileClip(job.source_path)
+        segment = clip.subclip(job.start, min(job.end, clip.duration))
+
+        if job.story_format:
+            segment = format_for_story(segment)
+        if job.fade_in > 0 and job.fade_in < segment.duration / 2:
+            segment = segment.fadein(job.fade_in)
+        if job.fade_out > 0 and job.fade_out < segment.duration / 2:
+            segment = segment.fadeout(job.fade_out)
+
+        temp_audio = os.path.join(tempfile.gettempdir(), f"temp-audio-{uuid.uuid4().hex}.m4a")
+        write_kwargs = {
+            'codec': 'libx264',
+            'audio_codec': 'aac',
+            'temp_audiofile': temp_audio,
+            'remove_temp': True,
+            'verbose': False,
+            'logger': None,
+        }
+        if job.preset:
+            write_kwargs['preset'] = job.preset
+        if job.bitrate:
+            write_kwargs['bitrate'] = job.bitrate
+        if job.threads:
+            write_kwargs['threads'] = job.threads
+
+        segment.write_videofile(job.output_path, **write_kwargs)
+        segment.close()
+        return True, job.output_path, "Rendered"
+    except Exception as e:
+        return False, job.output_path, f"Render failed: {e}"
+    finally:
+        if clip is not None:
+            try:
+                clip.close()
+            except Exception:
+                pass
+
+
+class RenderScheduler:
+    """Spreads independent render jobs across a process pool."""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initialize the render scheduler.
+
+        Args:
+            max_workers: Number of worker processes (default: one per CPU core)
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.max_workers = max(1, max_workers or os.cpu_count() or 1)
+
+    def render(self, jobs: List[RenderJob]) -> List[Tuple[bool, str, str]]:
+        """
+        Render all jobs, in parallel where possible.
+
+        Returns:
+            List of (success, output_path, message) in the same order as jobs
+        """
+        if not jobs:
+            return []
+
+        workers = min(self.max_workers, len(jobs))
+        # Split encoder threads between workers so cores aren't oversubscribed
+        threads_per_job = max(1, (os.cpu_count() or 1) // workers)
+        for job in jobs:
+            if job.threads is None:
+                job.threads = threads_per_job
+
+        if workers == 1:
+            return [render_segment(job) for job in jobs]
+
+        self.logger.info(f"Rendering {len(jobs)} segments on {workers} worker processes")
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(render_segment, jobs))
+        except Exception as e:
+            # Broken pool (e.g. workers killed); finish in-process
+            self.logger.warning(f"Process pool failed, rendering sequentially: {e}")
+            return [render_segment(job) for job in jobs]
+
+    def concat(self, part_paths: List[str], output_path: str) -> Tuple[bool, str]:
+        """
+        Join rendered parts with ffmpeg's concat demuxer using stream copy.
+
+        All parts must share codec parameters. render_and_concat() ensures this
+        by never mixing stream-copied parts with re-encoded ones.
+
+        Returns:
+            Tuple[bool, str]: (success, message)
+        """
+        if not part_paths:
+            return False, "No parts to concatenate"
+        if len(part_paths) == 1:
+            shutil.move(part_paths[0], output_path)
+            return True, "Single part moved into place"
+
+        list_fd, list_path = tempfile.mkstemp(suffix=".txt", prefix="concat_")
+        try:
+            with os.fdopen(list_fd, 'w', encoding='utf-8') as f:
+                for path in part_paths:
+                    escaped = os.path.abspath(path).replace("'", "'\\''")
+                    f.write(f"file '{escaped}'\n")
+
+            command = [
+                get_ffmpeg_binary(), "-y", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-c", "copy", "-movflags", "+faststart", output_path,
+            ]
+            result = subprocess.run(command, capture_output=True, text=True)
+            if result.returncode != 0:
+                return False, f"ffmpeg concat failed: {result.stderr.strip()}"
+            return True, f"Concatenated {len(part_paths)} parts"
+        finally:
+            os.remove(list_path)
+
+    def render_and_concat(self, jobs: List[RenderJob], output_path: str) -> Tuple[bool, str]:
+        """
+        Render jobs as separate parts in a scratch directory and stitch them into output_path.
+
+        The output_path of each job is replaced with a scratch location. When
+        only some stream-copy jobs fall back to a full encode, the copied parts
+        are re-encoded as well: they keep the source's stream parameters (e.g.
+        a 48 kHz audio rate), which a stream-copy concat cannot join to MoviePy's.
+
+        Returns:
+            Tuple[bool, str]: (success, message)
+        """
+        scratch_dir = tempfile.mkdtemp(prefix="render_", dir=const.OUTPUT_DIR if os.path.isdir(const.OUTPUT_DIR) else None)
+        try:
+            for index, job in enumerate(jobs):
+                job.output_path = os.path.join(scratch_dir, f"part_{index:04d}.mp4")
+
+            results = self.render(jobs)
+            failures = [message for success, _, message in results if not success]
+            if failures:
+                return False, failures[0]
+
+            copied = [index for index, (_, _, message) in enumerate(results) if message.startswith(STREAM_COPIED)]
+            if copied and len(copied) < len(jobs):
+                self.logger.info(f"Re-encoding {len(copied)} stream-copied parts to match the encoded ones")
+                reencoded = self.render([replace(jobs[index], stream_copy=False) for index in copied])
+                for index, result in zip(copied, reencoded):
+                    results[index] = result
+                failures = [message for success, _, message in results if not success]
+                if failures:
+                    return False, failures[0]
+
+            return self.concat([path for _, path, _ in results], output_path)
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
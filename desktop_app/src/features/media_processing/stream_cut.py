@@ -0,0 +1,279 @@
+"""
+Keyframe-aware stream-copy cutting for cut-only video operations.
+When no pixel transform is needed, the span between the first and last keyframe
+inside a cut is copied as-is and only the short GOP-boundary fragments are re-encoded.
+"""
+
+import os
+import re
+import shutil
+import logging
+import tempfile
+import subprocess
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+
+# Source pixel formats libx264 can reproduce for the re-encoded fragments
+SMART_CUT_PIXEL_FORMATS = ("yuv420p", "yuvj420p", "yuv422p", "yuv444p")
+
+# Fragments shorter than this are not worth a separate encode
+MIN_FRAGMENT_SECONDS = 0.05
+
+# Offset added to keyframe seek points so ffmpeg lands on that keyframe, not the one before
+KEYFRAME_SEEK_EPSILON = 0.001
+
+# Start of the message cut() returns on success
+STREAM_COPIED = "Stream-copied"
+
+_VIDEO_STREAM_RE = re.compile(r"Stream #\d+:\d+.*?: Video: (\w+).*?, (\w+)[(,]")
+_AUDIO_STREAM_RE = re.compile(r"Stream #\d+:\d+.*?: Audio: (\w+)")
+_SIZE_RE = re.compile(r", (\d{2,5})x(\d{2,5})[ ,]")
+
+
+def get_ffmpeg_binary() -> str:
+    """Path of the ffmpeg executable MoviePy is configured to use."""
+    try:
+        from moviepy.config import get_setting
+        return get_setting("FFMPEG_BINARY")
+    except Exception:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+
+
+@dataclass
+class KeyframeIndex:
+    """
+    Keyframe positions of a video stream.
+
+    ``packet_counts[i]`` is the number of packets (frames) from keyframe ``i``
+    up to the next keyframe, in decode order.
+    """
+
+    times: List[float]
+    packet_counts: List[int]
+    closed_gop: bool = True
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Serialise to plain arrays (for np.savez)."""
+        return {
+            "times": np.asarray(self.times, dtype=np.float64),
+            "packet_counts": np.asarray(self.packet_counts, dtype=np.int64),
+            "closed_gop": np.array(self.closed_gop),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "KeyframeIndex":
+        """Rebuild an index serialised with to_arrays."""
+        return cls(
+            times=arrays["times"].tolist(),
+            packet_counts=arrays["packet_counts"].tolist(),
+            closed_gop=bool(arrays["closed_gop"]),
+        )
+
+
+class StreamCutter:
+    """Cuts videos on keyframes with stream copy, re-encoding only GOP-boundary fragments."""
+
+    def __init__(self):
+        """Initialize the stream cutter."""
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.ffmpeg = get_ffmpeg_binary()
+
+    def probe(self, video_path: str) -> Dict[str, Any]:
+        """
+        Read codec, pixel format, size and audio codec of a video with ffmpeg.
+
+        Returns:
+            Dict with video_codec, pix_fmt, width, height, audio_codec (missing keys if unknown)
+        """
+        result = subprocess.run([self.ffmpeg, "-hide_banner", "-i", video_path],
+                                capture_output=True, text=True)
+        info: Dict[str, Any] = {}
+        for line in result.stderr.splitlines():
+            if "Video:" in line and "video_codec" not in info:
+                match = _VIDEO_STREAM_RE.search(line)
+                if match:
+                    info["video_codec"], info["pix_fmt"] = match.group(1), match.group(2)
+                size = _SIZE_RE.search(line)
+                if size:
+                    info["width"], info["height"] = int(size.group(1)), int(size.group(2))
+            elif "Audio:" in line and "audio_codec" not in info:
+                match = _AUDIO_STREAM_RE.search(line)
+                if match:
+                    info["audio_codec"] = match.group(1)
+        return info
+
+    def can_stream_copy(self, info: Dict[str, Any]) -> bool:
+        """Whether fragments re-encoded with libx264 can be joined to copied H.264 from this source."""
+        return info.get("video_codec") == "h264" and info.get("pix_fmt") in SMART_CUT_PIXEL_FORMATS
+
+    def scan_keyframes(self, video_path: str) -> KeyframeIndex:
+        """
+        Index the video keyframes by demuxing packets with stream copy (no decoding).
+        """
+        command = [
+            self.ffmpeg, "-hide_banner", "-loglevel", "error", "-i", video_path,
+            "-map", "0:v:0", "-c", "copy", "-f", "framecrc", "-",
+        ]
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Keyframe scan failed: {result.stderr.strip()[-500:]}")
+
+        time_base = None
+        packets = []  # (pts, is_keyframe) in decode order
+        for line in result.stdout.splitlines():
+            if line.startswith("#tb 0:"):
+                num, den = line.split(":", 1)[1].strip().split("/")
+                time_base = int(num) / int(den)
+            elif line and not line.startswith("#"):
+                fields = [field.strip() for field in line.split(",")]
+                if len(fields) >= 6 and fields[0] == "0":
+                    # Packets without an F= field carry only the keyframe flag
+                    flags = next((int(f[2:], 16) for f in fields[6:] if f.startswith("F=")), 0x1)
+                    packets.append((int(fields[2]), bool(flags & 0x1)))
+
+        if not time_base or not packets:
+            raise RuntimeError("No video packets found")
+
+        origin = min(pts for pts, _ in packets)
+        times: List[float] = []
+        packet_counts: List[int] = []
+        closed_gop = True
+        keyframe_pts = None
+        for pts, is_key in packets:
+            if is_key:
+                keyframe_pts = pts
+                times.append((pts - origin) * time_base)
+                packet_counts.append(0)
+            elif keyframe_pts is not None and pts < keyframe_pts:
+                # A frame shown before its GOP's keyframe references the previous GOP
+                closed_gop = False
+            if packet_counts:
+                packet_counts[-1] += 1
+
+        return KeyframeIndex(times=times, packet_counts=packet_counts, closed_gop=closed_gop)
+
+    def cut(self, video_path: str, start: float, end: float, output_path: str,
+            keyframes: Optional[KeyframeIndex] = None,
+            info: Optional[Dict[str, Any]] = None) -> Tuple[bool, str]:
+        """
+        Cut [start, end) of a video into output_path without re-encoding the bulk of it.
+
+        Args:
+            video_path: Source video
+            start: Cut start in seconds
+            end: Cut end in seconds
+            output_path: Destination file
+            keyframes: Keyframe index of the source (scanned if not given)
+            info: Result of probe() for the source (probed if not given)
+
+        Returns:
+            Tuple[bool, str]: (success, message)
+        """
+        info = info if info is not None else self.probe(video_path)
+        if not self.can_stream_copy(info):
+            return False, f"Source codec {info.get('video_codec')}/{info.get('pix_fmt')} not eligible for stream copy"
+        if keyframes is None:
+            keyframes = self.scan_keyframes(video_path)
+        if not keyframes.closed_gop:
+            return False, "Open-GOP source; copied GOPs would reference frames outside the cut"
+
+        # First keyframe at/after start and last keyframe at/before end
+        times = keyframes.times
+        first_index = bisect_left(times, start)
+        last_index = bisect_right(times, end) - 1
+        if first_index >= len(times) or last_index - first_index < 1:
+            # No whole GOP inside the cut; a plain encode is just as cheap
+            return False, "Cut does not span a keyframe interval"
+
+        copy_start, copy_end = times[first_index], times[last_index]
+        copy_frames = sum(keyframes.packet_counts[first_index:last_index])
+        work_dir = tempfile.mkdtemp(prefix="smartcut_")
+        try:
+            parts = []
+            if copy_start - start >= MIN_FRAGMENT_SECONDS:
+                parts.append(self._encode_fragment(video_path, start, copy_start, info, work_dir, len(parts)))
+            parts.append(self._copy_fragment(video_path, copy_start, copy_frames, work_dir, len(parts)))
+            if end - copy_end >= MIN_FRAGMENT_SECONDS:
+                parts.append(self._encode_fragment(video_path, copy_end, end, info, work_dir, len(parts)))
+
+            video_only = os.path.join(work_dir, "video.mp4")
+            self._concat(parts, video_only, work_dir)
+            self._mux_audio(video_only, video_path, start, end, info, output_path)
+            return True, f"{STREAM_COPIED} {copy_end - copy_start:.1f}s of {end - start:.1f}s"
+        except Exception as e:
+            self.logger.warning(f"Stream-copy cut failed for {video_path}: {e}")
+            return False, str(e)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    def _encode_fragment(self, video_path: str, start: float, end: float,
+                         info: Dict[str, Any], work_dir: str, index: int) -> str:
+        """Re-encode a short video-only fragment with parameters matching the source."""
+        path = os.path.join(work_dir, f"part_{index}.mp4")
+        self._run([
+            self.ffmpeg, "-y", "-loglevel", "error",
+            "-ss", f"{start:.6f}", "-i", video_path, "-t", f"{end - start:.6f}",
+            "-map", "0:v:0", "-an", "-c:v", "libx264", "-preset", "veryfast", "-crf", "18",
+            "-pix_fmt", info["pix_fmt"], path,
+        ])
+        return path
+
+    def _copy_fragment(self, video_path: str, start: float, frame_count: int,
+                       work_dir: str, index: int) -> str:
+        """
+        Stream-copy whole GOPs starting at the keyframe at ``start`` (video only).
+
+        The length is given in packets rather than seconds: with B-frames a
+        time limit is applied in decode order and would leak frames of the next GOP.
+        """
+        path = os.path.join(work_dir, f"part_{index}.mp4")
+        self._run([
+            self.ffmpeg, "-y", "-loglevel", "error",
+            "-ss", f"{start + KEYFRAME_SEEK_EPSILON:.6f}", "-i", video_path,
+            "-map", "0:v:0", "-an", "-c", "copy", "-frames:v", str(frame_count),
+            "-avoid_negative_ts", "make_zero", path,
+        ])
+        return path
+
+    def _concat(self, parts: List[str], output_path: str, work_dir: str):
+        """Join video fragments with the concat demuxer."""
+        if len(parts) == 1:
+            shutil.move(parts[0], output_path)
+            return
+        list_path = os.path.join(work_dir, "parts.txt")
+        with open(list_path, 'w', encoding='utf-8') as f:
+            for part in parts:
+                escaped = os.path.abspath(part).replace("'", "'\\''")
+                f.write(f"file '{escaped}'\n")
+        self._run([
+            self.ffmpeg, "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0", "-i", list_path, "-c", "copy", output_path,
+        ])
+
+    def _mux_audio(self, video_only: str, source_path: str, start: float, end: float,
+                   info: Dict[str, Any], output_path: str):
+        """Add the source audio for [start, end); audio is copied when it is already AAC."""
+        command = [self.ffmpeg, "-y", "-loglevel", "error", "-i", video_only]
+        if info.get("audio_codec"):
+            audio_codec = "copy" if info["audio_codec"] == "aac" else "aac"
+            command += [
+                "-ss", f"{start:.6f}", "-t", f"{end - start:.6f}", "-i", source_path,
+                "-map", "0:v:0", "-map", "1:a:0", "-c:v", "copy", "-c:a", audio_codec, "-shortest",
+            ]
+        else:
+            command += ["-map", "0:v:0", "-c", "copy"]
+        command += ["-movflags", "+faststart", output_path]
+        self._run(command)
+
+    @staticmethod
+    def _run(command: List[str]):
+        """Run an ffmpeg command, raising with its stderr on failure."""
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip()[-500:] or f"ffmpeg exited with {result.returncode}")
@@ -0,0 +1,190 @@
+"""
+Persistent on-disk cache for per-video analysis results.
+Entries are keyed by a content hash of the source file plus the analyser version,
+so retries with a different prompt or target duration skip decoding and AI calls.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import tempfile
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ...config import constants as const
+
+
+# Bump whenever feature extraction or motion scoring changes meaning
+ANALYZER_VERSION = 1
+
+# Content hash samples: head and tail blocks plus evenly spaced blocks in between
+HASH_EDGE_BYTES = 4 * 1024 * 1024
+HASH_SAMPLE_BYTES = 256 * 1024
+HASH_SAMPLE_COUNT = 16
+
+
+class VideoAnalysisCache:
+    """Stores motion curves, audio envelopes, key frames and AI frame analyses per video."""
+
+    def __init__(self, cache_dir: Optional[str] = None, version: int = ANALYZER_VERSION):
+        """
+        Initialize the analysis cache.
+
+        Args:
+            cache_dir: Root directory for cache entries (default: const.VIDEO_ANALYSIS_CACHE_DIR)
+            version: Analyser version; entries from other versions are ignored
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache_dir = cache_dir or const.VIDEO_ANALYSIS_CACHE_DIR
+        self.version = version
+        # Avoid re-hashing unchanged files within a session
+        self._hashes: Dict[Tuple[str, float, int], str] = {}
+
+    def file_hash(self, video_path: str) -> Optional[str]:
+        """
+        Content hash of a video file.
+
+        Hashes the file size, the first and last few megabytes and a fixed number
+        of evenly spaced blocks, which identifies a video without reading all of it.
+        """
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+
+        key = (os.path.abspath(video_path), stat.st_mtime, stat.st_size)
+        cached = self._hashes.get(key)
+        if cached:
+            return cached
+
+        size = stat.st_size
+        digest = hashlib.sha256(str(size).encode("ascii"))
+        try:
+            with open(video_path, "rb") as f:
+                if size <= 2 * HASH_EDGE_BYTES + HASH_SAMPLE_COUNT * HASH_SAMPLE_BYTES:
+                    for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                        digest.update(chunk)
+                else:
+                    digest.update(f.read(HASH_EDGE_BYTES))
+                    middle = size - 2 * HASH_EDGE_BYTES - HASH_SAMPLE_BYTES
+                    for i in range(HASH_SAMPLE_COUNT):
+                        f.seek(HASH_EDGE_BYTES + middle * i // max(1, HASH_SAMPLE_COUNT - 1))
+                        digest.update(f.read(HASH_SAMPLE_BYTES))
+                    f.seek(size - HASH_EDGE_BYTES)
+                    digest.update(f.read(HASH_EDGE_BYTES))
+        except OSError as e:
+            self.logger.warning(f"Could not hash {video_path}: {e}")
+            return None
+
+        file_hash = digest.hexdigest()
+        self._hashes[key] = file_hash
+        return file_hash
+
+    def entry_dir(self, video_path: str) -> Optional[str]:
+        """Directory holding the cache entry for a video, or None if it can't be hashed."""
+        file_hash = self.file_hash(video_path)
+        if not file_hash:
+            return None
+        return os.path.join(self.cache_dir, f"{file_hash}_v{self.version}")
+
+    def load_arrays(self, video_path: str, name: str) -> Optional[Dict[str, np.ndarray]]:
+        """Load a named set of NumPy arrays, or None if not cached."""
+        path = self._path(video_path, f"{name}.npz")
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                return {key: data[key] for key in data.files}
+        except Exception as e:
+            self.logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            return None
+
+    def save_arrays(self, video_path: str, name: str, **arrays: np.ndarray) -> bool:
+        """Store a named set of NumPy arrays."""
+        path = self._path(video_path, f"{name}.npz")
+        if not path:
+            return False
+
+        def write(handle):
+            np.savez_compressed(handle, **arrays)
+
+        return self._atomic_write(path, write)
+
+    def load_json(self, video_path: str, name: str) -> Optional[Any]:
+        """Load a named JSON document, or None if not cached."""
+        path = self._path(video_path, f"{name}.json")
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            return None
+
+    def save_json(self, video_path: str, name: str, data: Any) -> bool:
+        """Store a named JSON document."""
+        path = self._path(video_path, f"{name}.json")
+        if not path:
+            return False
+
+        def write(handle):
+            handle.write(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+        return self._atomic_write(path, write)
+
+    def load_bytes(self, video_path: str, name: str) -> Optional[bytes]:
+        """Load a named binary blob (e.g. key-frame JPEG bytes), or None if not cached."""
+        path = self._path(video_path, name)
+        if not path or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def save_bytes(self, video_path: str, name: str, data: bytes) -> bool:
+        """Store a named binary blob."""
+        path = self._path(video_path, name)
+        if not path:
+            return False
+        return self._atomic_write(path, lambda handle: handle.write(data))
+
+    def get_frame_analyses(self, video_path: str) -> Dict[str, Any]:
+        """AI frame analyses for a video, keyed by timestamp string."""
+        return self.load_json(video_path, "frame_analyses") or {}
+
+    def save_frame_analyses(self, video_path: str, analyses: Dict[str, Any]) -> bool:
+        """Store AI frame analyses for a video, keyed by timestamp string."""
+        return self.save_json(video_path, "frame_analyses", analyses)
+
+    @staticmethod
+    def time_key(timestamp: float) -> str:
+        """Stable string key for a timestamp in seconds."""
+        return f"{timestamp:.3f}"
+
+    def _path(self, video_path: str, filename: str) -> Optional[str]:
+        """Full path of a file inside a video's cache entry."""
+        entry = self.entry_dir(video_path)
+        return os.path.join(entry, filename) if entry else None
+
+    def _atomic_write(self, path: str, write) -> bool:
+        """Write via a temp file and rename, so readers never see partial entries."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as handle:
+                    write(handle)
+                os.replace(temp_path, path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            return True
+        except Exception as e:
+            self.logger.warning(f"Could not write cache entry {path}: {e}")
+            return False
@@ -0,0 +1,202 @@
+"""
+Single-pass video feature extraction for highlight analysis.
+Walks a clip's frames and audio once and produces per-window feature arrays.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .motion_engine import MotionCurve, MotionEngine, DEFAULT_MOTION_FPS
+
+# Audio is read in blocks of this many seconds (must fit MoviePy's audio buffer)
+AUDIO_BLOCK_SECONDS = 1.0
+
+# Normalisation constants (kept compatible with the previous per-segment heuristics)
+VARIANCE_NORMALIZER = 10000.0
+AUDIO_RMS_GAIN = 50.0
+
+# Defaults used when a window has no usable samples
+DEFAULT_MOTION_SCORE = 0.5
+DEFAULT_AUDIO_SCORE = 0.0
+
+
+@dataclass
+class VideoFeatures:
+    """
+    Per-window technical features for a video.
+
+    All arrays have one entry per analysis window and are normalised to 0-1.
+    """
+
+    window_duration: float
+    starts: np.ndarray
+    ends: np.ndarray
+    motion: np.ndarray
+    variance: np.ndarray
+    audio_rms: np.ndarray
+    motion_curve: Optional[MotionCurve] = None
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Serialise to plain arrays (for np.savez)."""
+        arrays = {
+            "window_duration": np.array(self.window_duration),
+            "starts": self.starts,
+            "ends": self.ends,
+            "motion": self.motion,
+            "variance": self.variance,
+            "audio_rms": self.audio_rms,
+        }
+        if self.motion_curve is not None:
+            arrays.update({f"curve_{key}": value for key, value in self.motion_curve.to_arrays().items()})
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "VideoFeatures":
+        """Rebuild features serialised with to_arrays."""
+        curve_arrays = {key[len("curve_"):]: value for key, value in arrays.items() if key.startswith("curve_")}
+        return cls(
+            window_duration=float(arrays["window_duration"]),
+            starts=arrays["starts"],
+            ends=arrays["ends"],
+            motion=arrays["motion"],
+            variance=arrays["variance"],
+            audio_rms=arrays["audio_rms"],
+            motion_curve=MotionCurve.from_arrays(curve_arrays) if curve_arrays else None,
+        )
+
+    @property
+    def num_windows(self) -> int:
+        """Number of analysis windows."""
+        return int(self.starts.size)
+
+    def technical_scores(self) -> np.ndarray:
+        """Combined technical score per window (motion weighted over audio)."""
+        return self.motion * 0.6 + self.audio_rms * 0.4
+
+    def select_windows(self, threshold: float = 0.3) -> List[Tuple[float, float]]:
+        """Return (start, end) pairs for windows whose technical score exceeds threshold."""
+        mask = self.technical_scores() > threshold
+        return list(zip(self.starts[mask].tolist(), self.ends[mask].tolist()))
+
+    def scored_windows(self, threshold: float = 0.3) -> List[Tuple[float, float, float]]:
+        """Return (start, end, score) triples for windows above threshold."""
+        scores = self.technical_scores()
+        mask = scores > threshold
+        return list(zip(self.starts[mask].tolist(), self.ends[mask].tolist(), scores[mask].tolist()))
+
+
+class VideoFeatureExtractor:
+    """Extracts motion, variance and audio RMS features in one decode pass."""
+
+    def __init__(self, motion_engine: Optional[MotionEngine] = None):
+        """
+        Initialize the extractor.
+
+        Args:
+            motion_engine: Engine used to score inter-frame motion; its sample
+                rate also sets how many frames per second are decoded
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.motion_engine = motion_engine or MotionEngine()
+        self.sample_fps = self.motion_engine.sample_fps or DEFAULT_MOTION_FPS
+
+    def extract(self, clip, window_duration: float) -> VideoFeatures:
+        """
+        Extract per-window features from a clip.
+
+        Frames are read strictly forward (no per-window subclips or seeks) and
+        audio is streamed in blocks, so the cost is one sequential decode.
+
+        Args:
+            clip: MoviePy video clip
+            window_duration: Length of each analysis window in seconds
+
+        Returns:
+            VideoFeatures: Feature arrays for every full window in the clip
+        """
+        duration = float(clip.duration or 0)
+        if duration <= 0 or window_duration <= 0:
+            raise ValueError("Clip duration and window duration must be positive")
+
+        num_windows = max(1, int(duration // window_duration))
+        starts = np.arange(num_windows, dtype=np.float64) * window_duration
+        ends = np.minimum(starts + window_duration, duration)
+
+        motion_curve, variance = self._extract_frame_features(clip, window_duration, num_windows)
+        motion = np.clip(motion_curve.window_means(starts, ends, default=DEFAULT_MOTION_SCORE), 0.0, 1.0)
+        audio_rms = self._extract_audio_features(clip, window_duration, num_windows)
+
+        return VideoFeatures(
+            window_duration=window_duration,
+            starts=starts,
+            ends=ends,
+            motion=motion,
+            variance=variance,
+            audio_rms=audio_rms,
+            motion_curve=motion_curve,
+        )
+
+    def _extract_frame_features(self, clip, window_duration: float,
+                                num_windows: int) -> Tuple[MotionCurve, np.ndarray]:
+        """Walk the frames once, building the motion curve and per-window variance."""
+        variance_sum = np.zeros(num_windows, dtype=np.float64)
+        variance_count = np.zeros(num_windows, dtype=np.float64)
+
+        def gray_frames() -> Iterator[np.ndarray]:
+            try:
+                for index, frame in enumerate(clip.iter_frames(fps=self.sample_fps, dtype="uint8")):
+                    window = int((index / self.sample_fps) // window_duration)
+                    if window >= num_windows:
+                        break
+
+                    gray = self.motion_engine.to_small_gray(frame)
+                    variance_sum[window] += float(gray.var())
+                    variance_count[window] += 1
+                    yield gray
+            except Exception as e:
+                self.logger.warning(f"Frame pass stopped early: {e}")
+
+        motion_curve = self.motion_engine.compute_from_gray(gray_frames(), self.sample_fps)
+
+        variance = np.where(variance_count > 0,
+                            variance_sum / np.maximum(variance_count, 1) / VARIANCE_NORMALIZER,
+                            0.0)
+        return motion_curve, np.clip(variance, 0.0, 1.0)
+
+    def _extract_audio_features(self, clip, window_duration: float, num_windows: int) -> np.ndarray:
+        """Stream the audio track in blocks, accumulating mean square per window."""
+        audio = getattr(clip, "audio", None)
+        if audio is None:
+            return np.full(num_windows, DEFAULT_AUDIO_SCORE, dtype=np.float64)
+
+        fps = getattr(audio, "fps", None) or 44100
+        total_samples = int(min(audio.duration or 0, num_windows * window_duration) * fps)
+        block = max(1, int(AUDIO_BLOCK_SECONDS * fps))
+
+        square_sum = np.zeros(num_windows, dtype=np.float64)
+        sample_count = np.zeros(num_windows, dtype=np.float64)
+
+        try:
+            for block_start in range(0, total_samples, block):
+                positions = np.arange(block_start, min(block_start + block, total_samples))
+                times = positions / fps
+                samples = audio.to_soundarray(times, fps=fps, buffersize=block)
+                if samples.size == 0:
+                    continue
+                if samples.ndim > 1:
+                    power = np.mean(samples.astype(np.float64) ** 2, axis=1)
+                else:
+                    power = samples.astype(np.float64) ** 2
+
+                windows = np.minimum((times // window_duration).astype(np.int64), num_windows - 1)
+                square_sum += np.bincount(windows, weights=power, minlength=num_windows)
+                sample_count += np.bincount(windows, minlength=num_windows)
+        except Exception as e:
+            self.logger.warning(f"Audio pass stopped early: {e}")
+
+        rms = np.sqrt(square_sum / np.maximum(sample_count, 1))
+        rms = np.where(sample_count > 0, rms * AUDIO_RMS_GAIN, DEFAULT_AUDIO_SCORE)
+        return np.clip(rms, 0.0, 1.0)
@@ -6,16 +6,19 @@ Implements highlight reel generation, story assistant, and thumbnail selection.
 import os
 import logging
 import tempfile
-import math
 from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 import cv2
 import numpy as np
-from moviepy.editor import VideoFileClip, concatenate_videoclips, CompositeVideoClip
-from moviepy.video.fx import resize, crop
+from moviepy.editor import VideoFileClip
 from PIL import Image
 
 from ...config import constants as const
+from .motion_engine import MotionCurve, MotionEngine
+from .video_analysis_cache import VideoAnalysisCache
+from .render_scheduler import RenderJob, RenderScheduler
+from .stream_cut import KeyframeIndex, StreamCutter
+from .video_features import VideoFeatureExtractor, VideoFeatures
 
 
 class VideoHandler:
@@ -26,6 +29,12 @@ class VideoHandler:
         self.logger = logging.getLogger(self.__class__.__name__)
         self.temp_dir = tempfile.gettempdir()
         
+        # Motion curves computed this session, keyed by (path, mtime, size)
+        self._motion_curves: Dict[Tuple[str, float, int], MotionCurve] = {}
+        
+        # Persistent analysis results (features, key frames, AI frame analyses)
+        self.analysis_cache = VideoAnalysisCache()
+        
         # Initialize analytics handler
         try:
             from ...handlers.analytics_handler import AnalyticsHandler
@@ -77,15 +86,11 @@ class VideoHandler:
             # Analyze prompt for specific instructions
             segments = self._analyze_video_for_highlights(clip, target_duration, prompt)
             
-            # Create highlight reel
-            highlight_clips = []
-            for start, end in segments:
-                highlight_clips.append(clip.subclip(start, end))
+            # Segments are rendered by worker processes, each with its own reader
+            clip.close()
             
-            # Concatenate clips
-            if highlight_clips:
-                final_clip = concatenate_videoclips(highlight_clips)
-                
+            # Create highlight reel
+            if segments:
                 # Generate output filename
                 base_name = os.path.splitext(os.path.basename(video_path))[0]
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -95,20 +100,13 @@ class VideoHandler:
                 # Ensure output directory exists
                 os.makedirs(const.OUTPUT_DIR, exist_ok=True)
                 
-                # Write video
-                final_clip.write_videofile(
-                    output_path,
-                    codec='libx264',
-                    audio_codec='aac',
-                    temp_audiofile='temp-audio.m4a',
-                    remove_temp=True
-                )
-                
-                # Clean up
-                clip.close()
-                final_clip.close()
-                for highlight_clip in highlight_clips:
-                    highlight_clip.close()
+                # Encode segments in parallel and stitch them with a stream copy.
+                # Plain trims need no pixel changes, so they try a keyframe stream copy first.
+                copy_source = self._get_stream_copy_source(video_path)
+                jobs = [self._make_cut_job(video_path, start, end, "", copy_source) for start, end in segments]
+                success, message = RenderScheduler().render_and_concat(jobs, output_path)
+                if not success:
+                    return False, "", f"Error generating highlight reel: {message}"
                 
                 # Track video processing in analytics
                 if self.analytics_handler:
@@ -122,7 +120,6 @@ class VideoHandler:
                 self.logger.info(f"Highlight reel saved to {output_path}")
                 return True, output_path, f"Highlight reel created ({len(segments)} segments)"
             else:
-                clip.close()
                 return False, "", "No suitable segments found for highlight reel"
                 
         except Exception as e:
@@ -144,8 +141,6 @@ class VideoHandler:
             Tuple[bool, str, str]: (success, output_path, message)
         """
         clip = None
-        final_clip = None
-        highlight_clips = []
         
         try:
             # Input validation
@@ -251,58 +246,22 @@ class VideoHandler:
             segments = valid_segments
             self.logger.info(f"Using {len(segments)} valid segments")
             
-            # Create highlight reel with enhanced error handling
-            highlight_clips = []
-            transition_duration = 0.5
-            
-            for i, (start, end) in enumerate(segments):
-                try:
-                    segment_clip = clip.subclip(start, end)
-                    
-                    # Validate segment clip
-                    if segment_clip.duration <= 0:
-                        self.logger.warning(f"Segment {i} has invalid duration, skipping")
-                        continue
-                    
-                    # Add fade transitions for smoother long-form content
-                    if i > 0 and transition_duration < segment_clip.duration / 2:
-                        segment_clip = segment_clip.fadein(transition_duration)
-                    if i < len(segments) - 1 and transition_duration < segment_clip.duration / 2:
-                        segment_clip = segment_clip.fadeout(transition_duration)
-                    
-                    highlight_clips.append(segment_clip)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Error processing segment {i} ({start}-{end}): {e}")
-                    continue
-            
-            if not highlight_clips:
-                clip.close()
-                return False, "", "No valid highlight clips could be created"
-            
-            # Concatenate clips with error handling
-            try:
-                final_clip = concatenate_videoclips(highlight_clips)
-                if final_clip is None or final_clip.duration <= 0:
-                    raise ValueError("Concatenated clip is invalid")
-            except Exception as e:
-                self.logger.error(f"Error concatenating clips: {e}")
-                # Clean up
-                clip.close()
-                for highlight_clip in highlight_clips:
-                    try:
-                        highlight_clip.close()
-                    except:
-                        pass
-                return False, "", f"Failed to combine video segments: {str(e)}"
+            # Segments are rendered by worker processes, each with its own reader
+            clip.close()
+            clip = None
             
-            # Add titles/chapters for longer content (with error handling)
-            if len(segments) > 3 and target_duration > 120:
-                try:
-                    final_clip = self._add_chapter_markers(final_clip, segments, prompt)
-                except Exception as e:
-                    self.logger.warning(f"Failed to add chapter markers: {e}")
-                    # Continue without chapter markers
+            # Fade transitions for smoother long-form content
+            transition_duration = 0.5
+            jobs = [
+                RenderJob(
+                    video_path, start, end, "",
+                    fade_in=transition_duration if i > 0 else 0.0,
+                    fade_out=transition_duration if i < len(segments) - 1 else 0.0,
+                    preset='medium',
+                    bitrate='2000k',
+                )
+                for i, (start, end) in enumerate(segments)
+            ]
             
             # Generate output filename with collision avoidance
             base_name = os.path.splitext(os.path.basename(video_path))[0]
@@ -329,20 +288,12 @@ class VideoHandler:
             except Exception as e:
                 return False, "", f"Cannot create output directory: {e}"
             
-            # Write video with comprehensive error handling
+            # Encode segments in parallel, stitch with a stream copy, then verify
             try:
                 self.logger.info(f"Writing video to {output_path}")
-                final_clip.write_videofile(
-                    output_path,
-                    codec='libx264',
-                    audio_codec='aac',
-                    temp_audiofile=f'temp-audio-longform-{timestamp}.m4a',
-                    remove_temp=True,
-                    preset='medium',
-                    bitrate='2000k',
-                    verbose=False,  # Reduce log noise
-                    logger=None    # Disable moviepy logging
-                )
+                success, message = RenderScheduler().render_and_concat(jobs, output_path)
+                if not success:
+                    raise RuntimeError(message)
                 
                 # Verify output file was created and is valid
                 if not os.path.exists(output_path):
@@ -362,26 +313,8 @@ class VideoHandler:
                         os.remove(output_path)
                 except:
                     pass
-                
-                # Clean up and return error
-                clip.close()
-                final_clip.close()
-                for highlight_clip in highlight_clips:
-                    try:
-                        highlight_clip.close()
-                    except:
-                        pass
                 return False, "", f"Failed to write video file: {str(e)}"
             
-            # Clean up memory
-            clip.close()
-            final_clip.close()
-            for highlight_clip in highlight_clips:
-                try:
-                    highlight_clip.close()
-                except:
-                    pass
-            
             # Track video processing in analytics
             if self.analytics_handler:
                 try:
@@ -405,13 +338,6 @@ class VideoHandler:
             try:
                 if clip:
                     clip.close()
-                if final_clip:
-                    final_clip.close()
-                for highlight_clip in highlight_clips:
-                    try:
-                        highlight_clip.close()
-                    except:
-                        pass
             except:
                 pass
             
@@ -438,8 +364,9 @@ class VideoHandler:
             clip = VideoFileClip(video_path)
             original_duration = clip.duration
             
-            # Calculate number of clips needed
-            num_clips = math.ceil(original_duration / max_clip_duration)
+            # Split at low-motion moments so stories don't cut mid-action
+            boundaries = self._story_boundaries(video_path, original_duration, max_clip_duration)
+            num_clips = len(boundaries) - 1
             
             output_paths = []
             base_name = os.path.splitext(os.path.basename(video_path))[0]
@@ -448,35 +375,31 @@ class VideoHandler:
             # Ensure output directory exists
             os.makedirs(const.OUTPUT_DIR, exist_ok=True)
             
+            # Sources that are already 9:16 need no crop/resize, only cuts
+            copy_source = self._get_stream_copy_source(video_path)
+            if copy_source and not self._is_story_aspect(copy_source[0]):
+                copy_source = None
+            
+            jobs = []
             for i in range(num_clips):
-                start_time = i * max_clip_duration
-                end_time = min((i + 1) * max_clip_duration, original_duration)
-                
-                # Extract clip
-                story_clip = clip.subclip(start_time, end_time)
-                
-                # Format for vertical story (9:16 aspect ratio)
-                story_clip = self._format_for_story(story_clip)
-                
                 # Generate output filename
                 output_filename = f"{base_name}_story_{i+1}_{timestamp}.mp4"
                 output_path = os.path.join(const.OUTPUT_DIR, output_filename)
                 
-                # Write video
-                story_clip.write_videofile(
-                    output_path,
-                    codec='libx264',
-                    audio_codec='aac',
-                    temp_audiofile=f'temp-audio-{i}.m4a',
-                    remove_temp=True
-                )
-                
-                output_paths.append(output_path)
-                story_clip.close()
+                # Format for vertical story (9:16 aspect ratio) inside the worker
+                job = self._make_cut_job(video_path, boundaries[i], boundaries[i + 1], output_path, copy_source)
+                job.story_format = True
+                jobs.append(job)
             
-            # Clean up
+            # Clean up before workers open their own readers
             clip.close()
             
+            # Each story is an independent encode, so render them in parallel
+            for success, output_path, message in RenderScheduler().render(jobs):
+                if not success:
+                    return False, output_paths, f"Error creating story clips: {message}"
+                output_paths.append(output_path)
+            
             # Track video processing in analytics
             if self.analytics_handler:
                 try:
@@ -522,23 +445,22 @@ class VideoHandler:
             # Ensure output directory exists
             os.makedirs(const.OUTPUT_DIR, exist_ok=True)
             
-            # Generate thumbnails at evenly spaced intervals
-            for i in range(num_thumbnails):
-                # Calculate time position (avoid very beginning and end)
-                time_position = (duration * (i + 1)) / (num_thumbnails + 1)
-                
-                # Extract frame
-                frame = clip.get_frame(time_position)
-                
-                # Convert to PIL Image
-                pil_image = Image.fromarray(frame)
+            # Generate thumbnails at evenly spaced intervals, nudged to the
+            # steadiest nearby moment to avoid motion blur
+            time_positions = self._thumbnail_times(video_path, duration, num_thumbnails)
+            for i, time_position in enumerate(time_positions):
+                # Extract frame (or reuse the cached key frame for this position)
+                jpeg_bytes = self._get_key_frame_jpeg(clip, video_path, time_position)
+                if not jpeg_bytes:
+                    continue
                 
                 # Generate thumbnail filename
                 thumbnail_filename = f"{base_name}_thumb_{i+1}_{timestamp}.jpg"
                 thumbnail_path = os.path.join(const.OUTPUT_DIR, thumbnail_filename)
                 
                 # Save thumbnail
-                pil_image.save(thumbnail_path, 'JPEG', quality=90)
+                with open(thumbnail_path, 'wb') as f:
+                    f.write(jpeg_bytes)
                 thumbnail_paths.append(thumbnail_path)
             
             # Clean up
@@ -720,6 +642,116 @@ class VideoHandler:
             self.logger.exception(f"Error getting video info: {e}")
             return {}
     
+    def get_motion_curve(self, video_path: str) -> Optional[MotionCurve]:
+        """
+        Get the dense motion curve for a video, computing it at most once per file version.
+        
+        Args:
+            video_path: Path to the video file
+            
+        Returns:
+            MotionCurve, or None if the video cannot be decoded
+        """
+        key = self._motion_key(video_path)
+        if key is None:
+            return None
+        
+        curve = self._motion_curves.get(key)
+        if curve is None:
+            cached = self.analysis_cache.load_arrays(video_path, "motion_curve")
+            if cached is not None:
+                curve = MotionCurve.from_arrays(cached)
+            else:
+                try:
+                    curve = MotionEngine().compute(video_path)
+                except Exception as e:
+                    self.logger.warning(f"Motion analysis failed for {video_path}: {e}")
+                    return None
+                self.analysis_cache.save_arrays(video_path, "motion_curve", **curve.to_arrays())
+            self._motion_curves[key] = curve
+        return curve
+    
+    def _motion_key(self, video_path: Optional[str]) -> Optional[Tuple[str, float, int]]:
+        """Cache key for a video's motion curve; changes whenever the file does."""
+        if not video_path:
+            return None
+        try:
+            stat = os.stat(video_path)
+        except OSError:
+            return None
+        return (os.path.abspath(video_path), stat.st_mtime, stat.st_size)
+    
+    def _story_boundaries(self, video_path: str, duration: float, max_clip_duration: int) -> List[float]:
+        """
+        Compute story cut points, each pulled back to the quietest moment of the
+        last few seconds before the nominal boundary. Clips never exceed max_clip_duration.
+        """
+        search_window = min(5.0, max_clip_duration / 4)
+        curve = self.get_motion_curve(video_path) if duration > max_clip_duration else None
+        
+        boundaries = [0.0]
+        while duration - boundaries[-1] > max_clip_duration:
+            nominal = boundaries[-1] + max_clip_duration
+            cut = curve.quietest_time(nominal - search_window, nominal) if curve else nominal
+            boundaries.append(min(max(cut, nominal - search_window), nominal))
+        boundaries.append(duration)
+        return boundaries
+    
+    def _thumbnail_times(self, video_path: str, duration: float, num_thumbnails: int) -> List[float]:
+        """Evenly spaced thumbnail times, each moved to the lowest-motion point nearby."""
+        spacing = duration / (num_thumbnails + 1)
+        nominal = [spacing * (i + 1) for i in range(num_thumbnails)]
+        
+        curve = self.get_motion_curve(video_path)
+        if curve is None:
+            return nominal
+        
+        radius = spacing / 4
+        return [min(max(curve.quietest_time(t - radius, t + radius), 0.0), duration - 0.1)
+                for t in nominal]
+    
+    def _get_stream_copy_source(self, video_path: str) -> Optional[Tuple[Dict[str, Any], KeyframeIndex]]:
+        """
+        Probe info and keyframe index for a source that supports keyframe stream copy.
+        
+        Returns None when the codec or GOP structure rules out the fast path.
+        """
+        try:
+            cutter = StreamCutter()
+            info = cutter.probe(video_path)
+            if not cutter.can_stream_copy(info):
+                return None
+            
+            cached = self.analysis_cache.load_arrays(video_path, "keyframe_index")
+            if cached is not None:
+                keyframes = KeyframeIndex.from_arrays(cached)
+            else:
+                keyframes = cutter.scan_keyframes(video_path)
+                self.analysis_cache.save_arrays(video_path, "keyframe_index", **keyframes.to_arrays())
+        except Exception as e:
+            self.logger.warning(f"Stream-copy probe failed for {video_path}: {e}")
+            return None
+        
+        return (info, keyframes) if keyframes.closed_gop else None
+    
+    @staticmethod
+    def _make_cut_job(video_path: str, start: float, end: float, output_path: str,
+                      copy_source: Optional[Tuple[Dict[str, Any], KeyframeIndex]]) -> RenderJob:
+        """Render job for a plain cut, using stream copy when the source allows it."""
+        if copy_source is None:
+            return RenderJob(video_path, start, end, output_path)
+        info, keyframes = copy_source
+        return RenderJob(video_path, start, end, output_path,
+                         stream_copy=True, keyframes=keyframes, source_info=info)
+    
+    @staticmethod
+    def _is_story_aspect(info: Dict[str, Any]) -> bool:
+        """Whether probed dimensions are already 9:16 (no story crop/resize needed)."""
+        width, height = info.get("width"), info.get("height")
+        if not width or not height:
+            return False
+        return abs(width / height - 9 / 16) < 0.01
+    
     def _analyze_video_for_highlights(self, clip, target_duration: int, prompt: str) -> List[Tuple[float, float]]:
         """
         Analyze video to find highlight segments based on prompt using cost-effective multi-stage approach.
@@ -779,8 +811,9 @@ class VideoHandler:
         duration = clip.duration
         self.logger.info(f"Analyzing long video ({duration/60:.1f} minutes) for highlights")
         
-        # Stage 1: Technical Analysis (No AI costs)
-        technical_segments = self._find_technical_highlights(clip, duration)
+        # Stage 1: Technical Analysis (No AI costs) - one decode pass over the whole video
+        features = self._extract_video_features(clip, duration)
+        technical_segments = self._find_technical_highlights(clip, duration, features)
         self.logger.info(f"Found {len(technical_segments)} technically interesting segments")
         
         # Stage 2: Intelligent Sampling (Minimal AI costs)
@@ -796,93 +829,49 @@ class VideoHandler:
         self.logger.info(f"Selected {len(final_segments)} segments for final highlight reel")
         return final_segments
     
-    def _find_technical_highlights(self, clip, duration: float) -> List[Tuple[float, float]]:
+    def _extract_video_features(self, clip, duration: float) -> Optional[VideoFeatures]:
         """
-        Find potentially interesting segments using technical analysis only.
-        No AI costs - uses motion detection, audio analysis, scene changes.
+        Extract per-window motion, variance and audio features in a single decode pass.
+        
+        Returns None if the clip cannot be decoded, so callers can fall back to even spacing.
         """
+        segment_duration = min(10, duration / 20)  # Adaptive segment duration
+        self.logger.info(f"Analyzing {duration/60:.1f} minute video in {segment_duration:.1f}s chunks")
+        
+        video_path = getattr(clip, 'filename', None)
+        cache_name = f"features_{segment_duration:.3f}"
+        
+        cached = self.analysis_cache.load_arrays(video_path, cache_name) if video_path else None
+        if cached is not None:
+            self.logger.info("Using cached technical analysis")
+            return VideoFeatures.from_arrays(cached)
+        
         try:
-            import numpy as np
-        except ImportError:
-            self.logger.error("NumPy not available for technical analysis")
-            # Fallback: return evenly spaced segments
-            num_segments = max(3, int(duration / 300))  # One segment per 5 minutes
-            segment_length = duration / num_segments
-            return [(i * segment_length, (i + 1) * segment_length) for i in range(num_segments)]
+            features = VideoFeatureExtractor().extract(clip, segment_duration)
+        except Exception as e:
+            self.logger.warning(f"Technical feature extraction failed: {e}")
+            return None
         
-        segments = []
-        segment_duration = min(10, duration / 20)  # Adaptive segment duration
-        current_time = 0
-        failed_segments = 0
-        max_failed_segments = 10
+        if video_path:
+            self.analysis_cache.save_arrays(video_path, cache_name, **features.to_arrays())
         
-        self.logger.info(f"Analyzing {duration/60:.1f} minute video in {segment_duration:.1f}s chunks")
+        # Share the motion curve with story splitting and thumbnail selection
+        key = self._motion_key(video_path)
+        if key and features.motion_curve is not None:
+            self._motion_curves[key] = features.motion_curve
+            self.analysis_cache.save_arrays(video_path, "motion_curve", **features.motion_curve.to_arrays())
+        return features
+    
+    def _find_technical_highlights(self, clip, duration: float,
+                                   features: Optional[VideoFeatures] = None) -> List[Tuple[float, float]]:
+        """
+        Find potentially interesting segments using technical analysis only.
+        No AI costs - uses motion detection, audio analysis, scene changes.
+        """
+        if features is None:
+            features = self._extract_video_features(clip, duration)
         
-        while current_time < duration - segment_duration:
-            end_time = min(current_time + segment_duration, duration)
-            segment_clip = None
-            
-            try:
-                # Get segment for analysis with timeout protection
-                segment_clip = clip.subclip(current_time, end_time)
-                
-                if segment_clip is None or segment_clip.duration <= 0:
-                    self.logger.warning(f"Invalid segment at {current_time}-{end_time}")
-                    current_time += segment_duration
-                    continue
-                
-                # Motion analysis with fallback
-                try:
-                    motion_score = self._calculate_motion_score(segment_clip)
-                except Exception as e:
-                    self.logger.warning(f"Motion analysis failed for {current_time}-{end_time}: {e}")
-                    motion_score = 0.5  # Default medium score
-                
-                # Audio analysis with fallback
-                try:
-                    audio_score = self._calculate_audio_score(segment_clip)
-                except Exception as e:
-                    self.logger.warning(f"Audio analysis failed for {current_time}-{end_time}: {e}")
-                    audio_score = 0.3  # Default low-medium score
-                
-                # Combined technical score with validation
-                if 0 <= motion_score <= 1 and 0 <= audio_score <= 1:
-                    technical_score = (motion_score * 0.6) + (audio_score * 0.4)
-                else:
-                    self.logger.warning(f"Invalid scores: motion={motion_score}, audio={audio_score}")
-                    technical_score = 0.4  # Default score
-                
-                # Keep segments above threshold
-                if technical_score > 0.3:  # Adjustable threshold
-                    segments.append((current_time, end_time))
-                    self.logger.debug(f"Added segment {current_time:.1f}-{end_time:.1f} (score: {technical_score:.2f})")
-                
-                # Clean up segment
-                if segment_clip:
-                    segment_clip.close()
-                
-                failed_segments = 0  # Reset failure counter on success
-                
-            except Exception as e:
-                self.logger.warning(f"Error analyzing segment {current_time}-{end_time}: {e}")
-                failed_segments += 1
-                
-                # Clean up failed segment
-                if segment_clip:
-                    try:
-                        segment_clip.close()
-                    except:
-                        pass
-                
-                # Include segment if analysis fails (better safe than sorry)
-                if failed_segments < max_failed_segments:
-                    segments.append((current_time, end_time))
-                    self.logger.debug(f"Added failed segment {current_time:.1f}-{end_time:.1f} as fallback")
-                else:
-                    self.logger.error("Too many failed segments, skipping technical analysis")
-                    break
-            
-            current_time += segment_duration
+        segments = features.select_windows(threshold=0.3) if features is not None else []
         
         # Ensure we have at least some segments
         if not segments:
@@ -895,49 +884,6 @@ class VideoHandler:
         self.logger.info(f"Technical analysis found {len(segments)} potentially interesting segments")
         return segments
     
-    def _calculate_motion_score(self, segment_clip) -> float:
-        """Calculate motion intensity for a video segment."""
-        try:
-            # Sample a few frames to calculate motion
-            sample_times = [0.2, 0.5, 0.8]  # Sample at 20%, 50%, 80% of segment
-            motion_scores = []
-            
-            for t in sample_times:
-                if t < segment_clip.duration:
-                    frame = segment_clip.get_frame(t * segment_clip.duration)
-                    # Simple motion estimation using frame variance
-                    gray_frame = np.dot(frame[...,:3], [0.2989, 0.5870, 0.1140])
-                    motion_scores.append(np.var(gray_frame) / 10000)  # Normalize
-            
-            return min(np.mean(motion_scores), 1.0) if motion_scores else 0.0
-            
-        except Exception as e:
-            self.logger.warning(f"Motion calculation error: {e}")
-            return 0.5  # Default medium score
-    
-    def _calculate_audio_score(self, segment_clip) -> float:
-        """Calculate audio activity score for a video segment."""
-        try:
-            if segment_clip.audio is None:
-                return 0.0
-            
-            # Get audio array
-            audio_array = segment_clip.audio.to_soundarray()
-            if audio_array.size == 0:
-                return 0.0
-            
-            # Calculate RMS (root mean square) for audio level
-            rms = np.sqrt(np.mean(audio_array**2))
-            
-            # Normalize to 0-1 range (adjust multiplier based on your content)
-            audio_score = min(rms * 50, 1.0)
-            
-            return audio_score
-            
-        except Exception as e:
-            self.logger.warning(f"Audio calculation error: {e}")
-            return 0.5  # Default medium score
-    
     def _score_segments_with_ai(self, clip, segments: List[Tuple[float, float]], prompt: str) -> List[Tuple[float, float, float]]:
         """
         Score segments using AI analysis. Limits API calls by intelligent sampling.
@@ -968,6 +914,11 @@ class VideoHandler:
         
         self.logger.info(f"Using AI to analyze {len(selected_segments)} of {len(segments)} segments")
         
+        # Frame analyses are independent of the prompt, so they are reused across retries
+        video_path = getattr(clip, 'filename', None)
+        frame_analyses = self.analysis_cache.get_frame_analyses(video_path) if video_path else {}
+        new_analyses = 0
+        
         for i, (start, end) in enumerate(selected_segments):
             if failed_ai_calls >= max_failed_calls:
                 self.logger.error("Too many AI analysis failures, stopping AI scoring")
@@ -990,86 +941,65 @@ class VideoHandler:
                     scored_segments.append((start, end, 0.4))
                     continue
                 
-                # Get frame with error handling
-                try:
-                    frame = clip.get_frame(mid_time)
-                    if frame is None:
-                        raise ValueError("Frame extraction returned None")
-                except Exception as e:
-                    self.logger.warning(f"Frame extraction failed at {mid_time}s: {e}")
-                    scored_segments.append((start, end, 0.4))
-                    continue
-                
-                # Validate frame
-                if frame.size == 0:
-                    self.logger.warning(f"Empty frame at {mid_time}s")
-                    scored_segments.append((start, end, 0.4))
-                    continue
-                
-                # Save frame temporarily with better error handling
-                import tempfile
-                import cv2
+                time_key = VideoAnalysisCache.time_key(mid_time)
+                analysis = frame_analyses.get(time_key)
                 
-                try:
-                    # Create secure temp file
-                    temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
-                    temp_file_path = temp_file.name
-                    temp_file.close()  # Close file handle so cv2 can write to it
-                    
-                    # Convert and save frame
-                    if len(frame.shape) == 3 and frame.shape[2] == 3:  # RGB image
-                        frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    else:
-                        frame_bgr = frame  # Already in correct format or grayscale
+                if analysis is None:
+                    # Get key frame JPEG (cached or freshly extracted)
+                    jpeg_bytes = self._get_key_frame_jpeg(clip, video_path, mid_time)
+                    if not jpeg_bytes:
+                        scored_segments.append((start, end, 0.4))
+                        continue
                     
-                    success = cv2.imwrite(temp_file_path, frame_bgr)
-                    if not success:
-                        raise ValueError("cv2.imwrite failed")
+                    try:
+                        # Create secure temp file for the AI handler
+                        temp_file = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
+                        temp_file_path = temp_file.name
+                        temp_file.write(jpeg_bytes)
+                        temp_file.close()
+                    except Exception as e:
+                        self.logger.warning(f"Failed to save frame for segment {start}-{end}: {e}")
+                        if temp_file_path and os.path.exists(temp_file_path):
+                            try:
+                                os.unlink(temp_file_path)
+                            except:
+                                pass
+                        scored_segments.append((start, end, 0.4))
+                        continue
                     
-                    # Verify file was created and has content
-                    if not os.path.exists(temp_file_path) or os.path.getsize(temp_file_path) == 0:
-                        raise ValueError("Temporary image file is empty or not created")
-                        
-                except Exception as e:
-                    self.logger.warning(f"Failed to save frame for segment {start}-{end}: {e}")
-                    if temp_file_path and os.path.exists(temp_file_path):
-                        try:
-                            os.unlink(temp_file_path)
-                        except:
-                            pass
-                    scored_segments.append((start, end, 0.4))
-                    continue
+                    # Analyze with AI
+                    try:
+                        ai_call_count += 1
+                        analysis = self.ai_handler._analyze_image_content_with_gemini(temp_file_path)
+                        if self._is_usable_frame_analysis(analysis):
+                            frame_analyses[time_key] = analysis
+                            new_analyses += 1
+                    except Exception as e:
+                        self.logger.warning(f"AI analysis failed for segment {start}-{end}: {e}")
+                        failed_ai_calls += 1
+                        scored_segments.append((start, end, 0.5))  # Default score
+                        continue
+                    finally:
+                        # Clean up temp file
+                        if temp_file_path and os.path.exists(temp_file_path):
+                            try:
+                                os.unlink(temp_file_path)
+                            except Exception as e:
+                                self.logger.warning(f"Failed to clean up temp file {temp_file_path}: {e}")
                 
-                # Analyze with AI
-                try:
-                    ai_call_count += 1
-                    analysis = self.ai_handler._analyze_image_content_with_gemini(temp_file_path)
-                    
-                    if analysis:
-                        # Score based on analysis and prompt
-                        ai_score = self._calculate_prompt_relevance_score(analysis, prompt)
-                        # Validate AI score
-                        if not (0 <= ai_score <= 1):
-                            self.logger.warning(f"Invalid AI score {ai_score}, using default")
-                            ai_score = 0.5
-                    else:
-                        self.logger.warning("AI analysis returned empty result")
+                if analysis:
+                    # Score based on analysis and prompt
+                    ai_score = self._calculate_prompt_relevance_score(analysis, prompt)
+                    # Validate AI score
+                    if not (0 <= ai_score <= 1):
+                        self.logger.warning(f"Invalid AI score {ai_score}, using default")
                         ai_score = 0.5
-                        
-                    scored_segments.append((start, end, ai_score))
-                    self.logger.debug(f"AI scored segment {start:.1f}-{end:.1f}: {ai_score:.3f}")
+                else:
+                    self.logger.warning("AI analysis returned empty result")
+                    ai_score = 0.5
                     
-                except Exception as e:
-                    self.logger.warning(f"AI analysis failed for segment {start}-{end}: {e}")
-                    failed_ai_calls += 1
-                    scored_segments.append((start, end, 0.5))  # Default score
-                
-                # Clean up temp file
-                if temp_file_path and os.path.exists(temp_file_path):
-                    try:
-                        os.unlink(temp_file_path)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to clean up temp file {temp_file_path}: {e}")
+                scored_segments.append((start, end, ai_score))
+                self.logger.debug(f"AI scored segment {start:.1f}-{end:.1f}: {ai_score:.3f}")
                 
             except Exception as e:
                 self.logger.warning(f"Unexpected error in AI scoring for segment {start}-{end}: {e}")
@@ -1084,6 +1014,9 @@ class VideoHandler:
                 
                 scored_segments.append((start, end, 0.5))  # Default score
         
+        if new_analyses and video_path:
+            self.analysis_cache.save_frame_analyses(video_path, frame_analyses)
+        
         # For segments not analyzed by AI, assign medium score
         analyzed_times = {(start, end) for start, end, _ in scored_segments}
         for start, end in segments:
@@ -1098,6 +1031,43 @@ class VideoHandler:
         
         return scored_segments
     
+    def _get_key_frame_jpeg(self, clip, video_path: Optional[str], timestamp: float) -> Optional[bytes]:
+        """
+        JPEG bytes of the frame at timestamp, served from the analysis cache when possible.
+        """
+        name = f"keyframes/{VideoAnalysisCache.time_key(timestamp)}.jpg"
+        if video_path:
+            cached = self.analysis_cache.load_bytes(video_path, name)
+            if cached:
+                return cached
+        
+        try:
+            frame = clip.get_frame(timestamp)
+            if frame is None or frame.size == 0:
+                raise ValueError("Frame extraction returned no data")
+            
+            # Convert and encode frame
+            if len(frame.shape) == 3 and frame.shape[2] == 3:  # RGB image
+                frame = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+            success, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 90])
+            if not success:
+                raise ValueError("cv2.imencode failed")
+        except Exception as e:
+            self.logger.warning(f"Frame extraction failed at {timestamp}s: {e}")
+            return None
+        
+        jpeg_bytes = encoded.tobytes()
+        if video_path:
+            self.analysis_cache.save_bytes(video_path, name, jpeg_bytes)
+        return jpeg_bytes
+    
+    @staticmethod
+    def _is_usable_frame_analysis(analysis: Optional[Dict[str, Any]]) -> bool:
+        """Whether an AI frame analysis has real content worth caching (not an error/placeholder)."""
+        if not analysis:
+            return False
+        return any(analysis.get(key) for key in ('main_subject', 'setting', 'activities', 'mood'))
+    
     def _calculate_prompt_relevance_score(self, analysis: dict, prompt: str) -> float:
         """Calculate how well the frame analysis matches the user prompt."""
         if not analysis or not prompt:
@@ -1117,21 +1087,29 @@ class VideoHandler:
         
         return min(score, 1.0)
     
-    def _select_best_segments(self, scored_segments: List[Tuple[float, float, float]], target_duration: int) -> List[Tuple[float, float]]:
+    def _select_best_segments(self, scored_segments, target_duration: int) -> List[Tuple[float, float]]:
         """
         Select the best segments to create a highlight reel of target duration.
+        
+        Accepts a list of (start, end, score) tuples or an (N, 3) array.
         """
-        if not scored_segments:
+        segments = np.asarray(scored_segments, dtype=np.float64).reshape(-1, 3)
+        if segments.shape[0] == 0:
             return []
         
-        # Sort by score (highest first)
-        sorted_segments = sorted(scored_segments, key=lambda x: x[2], reverse=True)
+        starts, ends, scores = segments[:, 0], segments[:, 1], segments[:, 2]
+        
+        # Highest score first; stable so ties keep their original order
+        order = np.argsort(-scores, kind='stable')
         
-        selected_segments = []
-        total_duration = 0
+        selected_starts = np.empty(order.size, dtype=np.float64)
+        selected_ends = np.empty(order.size, dtype=np.float64)
+        selected_count = 0
+        total_duration = 0.0
         min_gap = 2.0  # Minimum 2 seconds between selected segments
         
-        for start, end, score in sorted_segments:
+        for idx in order:
+            start, end = starts[idx], ends[idx]
             segment_duration = end - start
             
             # Check if adding this segment would exceed target
@@ -1139,67 +1117,21 @@ class VideoHandler:
                 # Try to trim the segment to fit
                 remaining_time = target_duration - total_duration
                 if remaining_time > 3:  # Only if we have at least 3 seconds left
-                    selected_segments.append((start, start + remaining_time))
+                    selected_starts[selected_count] = start
+                    selected_ends[selected_count] = start + remaining_time
+                    selected_count += 1
                 break
             
             # Check for overlap with existing segments
-            overlap = False
-            for existing_start, existing_end in selected_segments:
-                if not (end <= existing_start - min_gap or start >= existing_end + min_gap):
-                    overlap = True
-                    break
+            overlap = np.any(~((end <= selected_starts[:selected_count] - min_gap) |
+                               (start >= selected_ends[:selected_count] + min_gap)))
             
             if not overlap:
-                selected_segments.append((start, end))
+                selected_starts[selected_count] = start
+                selected_ends[selected_count] = end
+                selected_count += 1
                 total_duration += segment_duration
         
         # Sort selected segments by start time
-        selected_segments.sort(key=lambda x: x[0])
-        
-        return selected_segments
-    
-    def _add_chapter_markers(self, clip, segments: List[Tuple[float, float]], prompt: str):
-        """Add chapter markers/titles for longer highlight reels (optional enhancement)."""
-        try:
-            # For now, just return the clip as-is
-            # In the future, could add text overlays indicating different sections
-            return clip
-        except Exception as e:
-            self.logger.warning(f"Could not add chapter markers: {e}")
-            return clip
-    
-    def _format_for_story(self, clip):
-        """
-        Format a video clip for Instagram/Facebook Stories (9:16 aspect ratio).
-        """
-        # Get current dimensions
-        width, height = clip.size
-        current_ratio = width / height
-        target_ratio = 9 / 16  # Story aspect ratio
-        
-        if abs(current_ratio - target_ratio) < 0.01:
-            # Already correct ratio
-            return clip
-        
-        # Calculate new dimensions
-        if current_ratio > target_ratio:
-            # Video is too wide, crop sides
-            new_width = int(height * target_ratio)
-            new_height = height
-            x_offset = (width - new_width) // 2
-            y_offset = 0
-        else:
-            # Video is too tall, crop top/bottom
-            new_width = width
-            new_height = int(width / target_ratio)
-            x_offset = 0
-            y_offset = (height - new_height) // 2
-        
-        # Crop the video
-        cropped_clip = crop(clip, x1=x_offset, y1=y_offset, 
-                           x2=x_offset + new_width, y2=y_offset + new_height)
-        
-        # Resize to standard story dimensions (1080x1920)
-        final_clip = resize(cropped_clip, (1080, 1920))
-        
-        return final_clip 
\ No newline at end of file
+        by_start = np.argsort(selected_starts[:selected_count], kind='stable')
+        return [(float(selected_starts[i]), float(selected_ends[i])) for i in by_start]
@@ -5,22 +5,48 @@ Separate module for advanced content identification and tagging.
 import os
 from typing import List, Dict, Any
 
+from ..config import constants as const
+from .tag_store import PathKeywords, TagStore
+
 class AITaggingEngine:
     """Advanced AI tagging system for comprehensive content identification."""
     
-    def __init__(self):
-        """Initialize the AI tagging engine."""
+    def __init__(self, tag_db_path: str = None):
+        """
+        Initialize the AI tagging engine.
+        
+        Args:
+            tag_db_path: SQLite file persisting computed tags (defaults to the data directory)
+        """
         self.KNOWN_TAGS_DB = {
             "oip.jpeg": ["bread", "baked goods", "pastry", "food", "bakery", "assortment", "croissant", "roll"],
             "sourdough.jpeg": ["bread", "sourdough", "baked goods", "food", "bakery", "loaf", "sliced bread"],
             "igannouncement.png": ["game", "pixel art", "blimp", "vehicle", "sky", "announcement", "minecraft style", "landscape"],
             "untitled.png": ["art", "character", "fantasy", "warrior", "portrait", "woman", "red hair", "armor", "apex predators", "illustration", "person", "people"],
         }
+        # Tags are computed once per file version; the database is opened on first use
+        self.tag_store = TagStore(self.compute_tags,
+                                  db_path=tag_db_path or os.path.join(const.DATA_DIR, 'ai_tags.db'),
+                                  tagger="ai-tagging-v2")
     
     def get_tags(self, media_path: str) -> List[str]:
         """
         Get comprehensive AI tags for any media file.
         
+        Tags are computed on first request and reused until the file changes.
+        
+        Args:
+            media_path: Path to the media file
+            
+        Returns:
+            List of relevant tags for the media
+        """
+        return self.tag_store.get(media_path)
+    
+    def compute_tags(self, media_path: str) -> List[str]:
+        """
+        Compute AI tags for a media file from its name and path.
+        
         Args:
             media_path: Path to the media file
             
@@ -34,69 +60,47 @@ class AITaggingEngine:
         if exact_tags:
             return exact_tags
         
+        keywords = PathKeywords(media_path)
+        found = keywords.found
+        
         # Generate tags using comprehensive analysis
         tags = []
-        filename_lower = base_filename.lower()
-        
-        # PEOPLE & PORTRAITS
-        people_patterns = [
-            'person', 'people', 'man', 'woman', 'face', 'portrait', 'selfie', 'group',
-            'team', 'staff', 'customer', 'baker', 'chef', 'family', 'friend', 'smile',
-            'headshot', 'profile', 'human', 'worker', 'employee', 'owner', 'founder'
-        ]
-        if any(word in filename_lower for word in people_patterns):
+        
+        if found("people"):
             tags.extend(['person', 'people', 'portrait', 'human', 'photo'])
-            if any(word in filename_lower for word in ['team', 'staff', 'employee', 'worker']):
+            if found("team"):
                 tags.extend(['team', 'staff', 'workplace'])
         
-        # FOOD & CULINARY
-        bread_patterns = ['bread', 'sourdough', 'baguette', 'loaf', 'roll', 'croissant', 'focaccia']
-        pastry_patterns = ['pastry', 'danish', 'muffin', 'scone', 'bagel', 'pretzel']
-        dessert_patterns = ['cake', 'cupcake', 'cookie', 'brownie', 'pie', 'tart', 'donut', 'sweet']
-        food_patterns = ['pizza', 'dough', 'kitchen', 'cook', 'recipe', 'ingredient', 'flour', 'yeast']
-        
-        if any(word in filename_lower for word in bread_patterns):
+        if found("bread"):
             tags.extend(['bread', 'baked goods', 'food', 'bakery', 'artisan'])
-        elif any(word in filename_lower for word in pastry_patterns):
+        elif found("pastry"):
             tags.extend(['pastry', 'baked goods', 'food', 'bakery'])
-        elif any(word in filename_lower for word in dessert_patterns):
+        elif found("dessert"):
             tags.extend(['dessert', 'baked goods', 'food', 'sweet', 'bakery'])
-        elif any(word in filename_lower for word in food_patterns):
+        elif found("food"):
             tags.extend(['food', 'cooking', 'kitchen', 'culinary'])
         
-        # BUSINESS & LOCATIONS
-        business_patterns = [
-            'shop', 'store', 'bakery', 'cafe', 'restaurant', 'kitchen', 'counter',
-            'display', 'shelf', 'oven', 'interior', 'exterior', 'building', 'storefront'
-        ]
-        if any(word in filename_lower for word in business_patterns):
+        if found("business"):
             tags.extend(['location', 'business', 'commercial'])
-            if any(word in filename_lower for word in ['bakery', 'shop', 'store']):
+            if found("retail"):
                 tags.extend(['bakery', 'retail', 'storefront'])
         
-        # PRODUCTS & MERCHANDISE
-        product_patterns = ['product', 'merchandise', 'item', 'goods', 'package', 'box', 'label', 'brand']
-        if any(word in filename_lower for word in product_patterns):
+        if found("product"):
             tags.extend(['product', 'merchandise', 'commercial', 'branding'])
         
-        # EVENTS & ACTIVITIES
-        event_patterns = ['event', 'party', 'celebration', 'wedding', 'birthday', 'opening', 'festival']
-        if any(word in filename_lower for word in event_patterns):
+        if found("event"):
             tags.extend(['event', 'celebration', 'occasion', 'social'])
         
-        # ART & DESIGN
-        art_patterns = ['art', 'design', 'logo', 'graphic', 'drawing', 'sketch', 'illustration']
-        if any(word in filename_lower for word in art_patterns):
+        if found("art"):
             tags.extend(['art', 'design', 'graphic', 'illustration', 'creative'])
         
         # Path context analysis
-        path_parts = media_path.lower().split(os.sep)
-        for part in path_parts:
-            if any(keyword in part for keyword in ['portrait', 'people', 'staff']):
+        for words in keywords.parts:
+            if found("dir_people", words):
                 tags.extend(['person', 'people', 'portrait'])
-            elif any(keyword in part for keyword in ['product', 'merchandise']):
+            elif found("dir_product", words):
                 tags.extend(['product', 'commercial'])
-            elif any(keyword in part for keyword in ['food', 'bakery', 'kitchen']):
+            elif found("dir_food", words):
                 tags.extend(['food', 'bakery', 'culinary'])
         
         # Fallback for generic files
@@ -104,10 +108,9 @@ class AITaggingEngine:
             file_ext = os.path.splitext(base_filename)[1].lower()
             if file_ext in ['.jpg', '.jpeg', '.png', '.gif']:
                 # Smart fallback based on context
-                context_hints = media_path.lower()
-                if any(keyword in context_hints for keyword in ['bread', 'bakery', 'food']):
+                if found("fallback_food", keywords.path):
                     tags = ['food', 'bakery', 'photo', 'content']
-                elif any(keyword in context_hints for keyword in ['people', 'person', 'portrait']):
+                elif found("fallback_people", keywords.path):
                     tags = ['person', 'people', 'photo', 'portrait']
                 else:
                     tags = ['photo', 'image', 'visual', 'content']
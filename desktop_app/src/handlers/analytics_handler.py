@@ -4,8 +4,6 @@ Tracks internal post performance metrics and provides export functionality.
 """
 
 import os
-import json
-import csv
 import logging
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
@@ -13,6 +11,8 @@ from pathlib import Path
 import uuid
 
 from ..config import constants as const
+from .analytics_store import AnalyticsStore, apply_event, default_analytics_data
+from ..utils.streaming_export import StreamedObject, open_export, write_csv, write_json
 
 
 class AnalyticsHandler:
@@ -22,42 +22,45 @@ class AnalyticsHandler:
         """Initialize the analytics handler."""
         self.logger = logging.getLogger(self.__class__.__name__)
         self.analytics_file = os.path.join(const.ROOT_DIR, "analytics_data.json")
-        self.analytics_data = self._load_analytics_data()
+        self.analytics_db_file = os.path.join(const.ROOT_DIR, "analytics.db")
+        self.store = AnalyticsStore.for_path(self.analytics_db_file)
+        if self.store.import_json(self.analytics_file):
+            self.logger.info(f"Migrated {self.analytics_file} to {self.analytics_db_file}")
+        # Full records are only needed for exports and per-post lookups; the
+        # dashboard statistics are served from the store's rollups
+        self._analytics_data: Optional[Dict[str, Any]] = None
+    
+    @property
+    def analytics_data(self) -> Dict[str, Any]:
+        """All analytics records, loaded on first access."""
+        if self._analytics_data is None:
+            self._analytics_data = self._load_analytics_data()
+        return self._analytics_data
         
     def _load_analytics_data(self) -> Dict[str, Any]:
-        """Load analytics data from file."""
+        """Load analytics data from the event store."""
         try:
-            if os.path.exists(self.analytics_file):
-                with open(self.analytics_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+            return self.store.load()
         except Exception as e:
             self.logger.error(f"Error loading analytics data: {e}")
         
-        # Return default structure
-        return {
-            "version": "1.0",
-            "created": datetime.now().isoformat(),
-            "posts": {},
-            "galleries": {},
-            "videos": {},
-            "summary_stats": {
-                "total_posts": 0,
-                "total_galleries": 0,
-                "total_videos": 0,
-                "total_interactions": 0
-            }
-        }
+        return default_analytics_data()
     
-    def _save_analytics_data(self) -> bool:
-        """Save analytics data to file."""
-        try:
-            self.analytics_data["last_updated"] = datetime.now().isoformat()
-            with open(self.analytics_file, 'w', encoding='utf-8') as f:
-                json.dump(self.analytics_data, f, indent=2, ensure_ascii=False)
-            return True
-        except Exception as e:
-            self.logger.error(f"Error saving analytics data: {e}")
-            return False
+    def _record_event(self, event: Dict[str, Any]):
+        """Apply an event to the in-memory data and queue it for the write-behind log."""
+        event["at"] = datetime.now().isoformat()
+        if self._analytics_data is not None:
+            apply_event(self._analytics_data, event)
+        self.store.append(event)
+    
+    def flush(self) -> bool:
+        """
+        Write pending analytics events to disk now.
+        
+        Returns:
+            bool: True if successful
+        """
+        return self.store.flush()
     
     def track_post_creation(self, media_path: str, post_type: str = "single", 
                            platforms: List[str] = None) -> str:
@@ -97,9 +100,7 @@ class AnalyticsHandler:
                 "status": "created"
             }
             
-            self.analytics_data["posts"][post_id] = post_data
-            self.analytics_data["summary_stats"]["total_posts"] += 1
-            self._save_analytics_data()
+            self._record_event({"type": "post_created", "post": post_data})
             
             self.logger.info(f"Tracked post creation: {post_id}")
             return post_id
@@ -137,9 +138,7 @@ class AnalyticsHandler:
                 "usage_history": []
             }
             
-            self.analytics_data["galleries"][gallery_id] = gallery_data
-            self.analytics_data["summary_stats"]["total_galleries"] += 1
-            self._save_analytics_data()
+            self._record_event({"type": "gallery_created", "gallery": gallery_data})
             
             self.logger.info(f"Tracked gallery creation: {gallery_id}")
             return gallery_id
@@ -178,9 +177,7 @@ class AnalyticsHandler:
                 }
             }
             
-            self.analytics_data["videos"][process_id] = process_data
-            self.analytics_data["summary_stats"]["total_videos"] += 1
-            self._save_analytics_data()
+            self._record_event({"type": "video_processed", "video": process_data})
             
             self.logger.info(f"Tracked video processing: {process_id}")
             return process_id
@@ -201,29 +198,12 @@ class AnalyticsHandler:
             bool: True if successful
         """
         try:
-            if post_id not in self.analytics_data["posts"]:
+            if not self.store.has_post(post_id):
                 self.logger.warning(f"Post ID not found: {post_id}")
                 return False
             
-            post_data = self.analytics_data["posts"][post_id]
-            
-            # Update metrics
-            for metric, value in metrics.items():
-                if metric in post_data["metrics"]:
-                    post_data["metrics"][metric] += value
-            
-            # Add to engagement history
-            engagement_entry = {
-                "timestamp": datetime.now().isoformat(),
-                "metrics": metrics.copy()
-            }
-            post_data["engagement_history"].append(engagement_entry)
-            
-            # Update total interactions
-            total_new_interactions = sum(metrics.values())
-            self.analytics_data["summary_stats"]["total_interactions"] += total_new_interactions
-            
-            self._save_analytics_data()
+            # Adds to the post's metrics, engagement history and total interactions
+            self._record_event({"type": "post_metrics", "post_id": post_id, "metrics": dict(metrics)})
             return True
             
         except Exception as e:
@@ -300,32 +280,19 @@ class AnalyticsHandler:
             Dictionary of summary statistics
         """
         try:
-            # Calculate additional stats
-            posts = self.analytics_data["posts"]
-            
-            if posts:
-                total_engagement = sum(
-                    sum(post["metrics"].values()) 
-                    for post in posts.values()
-                )
-                avg_engagement = total_engagement / len(posts)
-                
-                # Find top performing post
-                top_post = max(
-                    posts.values(),
-                    key=lambda p: sum(p["metrics"].values()),
-                    default=None
-                )
-            else:
-                avg_engagement = 0
-                top_post = None
-            
-            summary = self.analytics_data["summary_stats"].copy()
-            summary.update({
+            stats = self.store.summary()
+            post_count = stats["post_count"]
+            avg_engagement = stats["total_engagement"] / post_count if post_count else 0
+            
+            summary = {
+                "total_posts": stats["total_posts"],
+                "total_galleries": stats["total_galleries"],
+                "total_videos": stats["total_videos"],
+                "total_interactions": stats["total_interactions"],
                 "avg_engagement_per_post": round(avg_engagement, 2),
-                "top_performing_post": top_post["filename"] if top_post else "None",
-                "last_updated": self.analytics_data.get("last_updated", "Never")
-            })
+                "top_performing_post": stats["top_post_filename"] or "None",
+                "last_updated": stats["last_updated"] or "Never"
+            }
             
             return summary
             
@@ -333,12 +300,32 @@ class AnalyticsHandler:
             self.logger.error(f"Error getting summary stats: {e}")
             return {}
     
-    def export_to_csv(self, export_path: str = None) -> str:
+    def get_recent_posts_performance(self, limit: int = 1000) -> List[Dict[str, Any]]:
+        """
+        Get performance data for the most recently created posts.
+        
+        Args:
+            limit: Maximum number of posts
+            
+        Returns:
+            List of post performance data (id, filename, post_type, platforms,
+            created_at and metrics), newest first
+        """
+        try:
+            return self.store.recent_posts(limit)
+        except Exception as e:
+            self.logger.error(f"Error getting recent posts performance: {e}")
+            return []
+    
+    def export_to_csv(self, export_path: str = None, compress: bool = False) -> str:
         """
         Export analytics data to CSV format.
         
+        Rows are streamed from the store, so memory use is flat in the number of posts.
+        
         Args:
             export_path: Optional custom export path
+            compress: Gzip the output (a default path then ends in .csv.gz)
             
         Returns:
             str: Path to the exported CSV file
@@ -346,57 +333,47 @@ class AnalyticsHandler:
         try:
             if not export_path:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                export_path = os.path.join(const.OUTPUT_DIR, f"analytics_export_{timestamp}.csv")
-            
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(export_path), exist_ok=True)
-            
-            with open(export_path, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = [
-                    'post_id', 'filename', 'post_type', 'platforms', 'created_at',
-                    'views', 'likes', 'shares', 'comments', 'saves', 'clicks',
-                    'reach', 'impressions', 'total_engagement'
-                ]
-                
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                
-                for post_id, post_data in self.analytics_data["posts"].items():
-                    metrics = post_data["metrics"]
-                    total_engagement = sum(metrics.values())
-                    
-                    row = {
-                        'post_id': post_id,
-                        'filename': post_data["filename"],
-                        'post_type': post_data["post_type"],
-                        'platforms': ', '.join(post_data["platforms"]),
-                        'created_at': post_data["created_at"],
-                        'views': metrics["views"],
-                        'likes': metrics["likes"],
-                        'shares': metrics["shares"],
-                        'comments': metrics["comments"],
-                        'saves': metrics["saves"],
-                        'clicks': metrics["clicks"],
-                        'reach': metrics["reach"],
-                        'impressions': metrics["impressions"],
-                        'total_engagement': total_engagement
-                    }
-                    
-                    writer.writerow(row)
-            
-            self.logger.info(f"Analytics data exported to CSV: {export_path}")
+                extension = ".csv.gz" if compress else ".csv"
+                export_path = os.path.join(const.OUTPUT_DIR, f"analytics_export_{timestamp}{extension}")
+            
+            fieldnames = [
+                'post_id', 'filename', 'post_type', 'platforms', 'created_at',
+                'views', 'likes', 'shares', 'comments', 'saves', 'clicks',
+                'reach', 'impressions', 'total_engagement'
+            ]
+            
+            def rows():
+                for post in self.store.iter_post_stats():
+                    row = {field: post.get(field) for field in fieldnames[5:-1]}
+                    row.update({
+                        'post_id': post["id"],
+                        'filename': post["filename"],
+                        'post_type': post["post_type"],
+                        'platforms': ', '.join(post["platforms"]),
+                        'created_at': post["created_at"],
+                        'total_engagement': post["engagement"]
+                    })
+                    yield row
+            
+            with open_export(export_path, compress=compress, newline='') as csvfile:
+                count = write_csv(csvfile, fieldnames, rows())
+            
+            self.logger.info(f"Analytics data exported to CSV ({count} posts): {export_path}")
             return export_path
             
         except Exception as e:
             self.logger.error(f"Error exporting to CSV: {e}")
             return ""
     
-    def export_to_json(self, export_path: str = None) -> str:
+    def export_to_json(self, export_path: str = None, compress: bool = False) -> str:
         """
         Export analytics data to JSON format.
         
+        Records are streamed from the store straight into the file.
+        
         Args:
             export_path: Optional custom export path
+            compress: Gzip the output (a default path then ends in .json.gz)
             
         Returns:
             str: Path to the exported JSON file
@@ -404,12 +381,10 @@ class AnalyticsHandler:
         try:
             if not export_path:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                export_path = os.path.join(const.OUTPUT_DIR, f"analytics_export_{timestamp}.json")
+                extension = ".json.gz" if compress else ".json"
+                export_path = os.path.join(const.OUTPUT_DIR, f"analytics_export_{timestamp}{extension}")
             
-            # Ensure output directory exists
-            os.makedirs(os.path.dirname(export_path), exist_ok=True)
-            
-            # Create export data with summary
+            # Create export data with summary; record collections are written as they are read
             export_data = {
                 "export_info": {
                     "exported_at": datetime.now().isoformat(),
@@ -417,13 +392,13 @@ class AnalyticsHandler:
                     "version": "1.0"
                 },
                 "summary": self.get_summary_stats(),
-                "posts": self.analytics_data["posts"],
-                "galleries": self.analytics_data["galleries"],
-                "videos": self.analytics_data["videos"]
+                "posts": StreamedObject(self.store.iter_records("posts")),
+                "galleries": StreamedObject(self.store.iter_records("galleries")),
+                "videos": StreamedObject(self.store.iter_records("videos"))
             }
             
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            with open_export(export_path, compress=compress) as f:
+                write_json(f, export_data)
             
             self.logger.info(f"Analytics data exported to JSON: {export_path}")
             return export_path
@@ -445,33 +420,17 @@ class AnalyticsHandler:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            recent_posts = []
-            for post_data in self.analytics_data["posts"].values():
-                created_at = datetime.fromisoformat(post_data["created_at"])
-                if created_at >= cutoff_date:
-                    recent_posts.append(post_data)
+            # Range query over the daily/weekly rollups
+            type_performance = self.store.engagement_by_type(cutoff_date)
             
-            if not recent_posts:
+            if not type_performance:
                 return {"message": f"No posts found in the last {days} days"}
             
             # Calculate trends
-            total_posts = len(recent_posts)
-            total_engagement = sum(
-                sum(post["metrics"].values()) 
-                for post in recent_posts
-            )
+            total_posts = sum(data["count"] for data in type_performance.values())
+            total_engagement = sum(data["total_engagement"] for data in type_performance.values())
             avg_engagement = total_engagement / total_posts if total_posts > 0 else 0
             
-            # Group by post type
-            type_performance = {}
-            for post in recent_posts:
-                post_type = post["post_type"]
-                if post_type not in type_performance:
-                    type_performance[post_type] = {"count": 0, "total_engagement": 0}
-                
-                type_performance[post_type]["count"] += 1
-                type_performance[post_type]["total_engagement"] += sum(post["metrics"].values())
-            
             # Calculate averages for each type
             for post_type, data in type_performance.items():
                 data["avg_engagement"] = data["total_engagement"] / data["count"]
@@ -0,0 +1,657 @@
+"""
+Write-behind persistence for internal analytics.
+Tracking calls append an event to an in-memory buffer; a background thread
+writes buffered events to an append-only SQLite log in batches, and the log
+is periodically compacted into per-record snapshot rows. The same writes
+maintain a per-post metrics table and daily/weekly rollups, so dashboard
+statistics are small range queries instead of scans over every post.
+"""
+import os
+import json
+import atexit
+import sqlite3
+import logging
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+# Buffered events are written after this many seconds, or sooner once FLUSH_EVERY accumulate
+FLUSH_INTERVAL_S = 2.0
+FLUSH_EVERY = 50
+
+# Fold the event log into the snapshot rows once it holds this many events
+COMPACT_EVERY = 1000
+
+COLLECTIONS = ("posts", "galleries", "videos")
+
+# Post metrics kept as columns of post_stats
+METRICS = ("views", "likes", "shares", "comments", "saves", "clicks", "reach", "impressions")
+
+# Rows fetched per round trip when streaming exports
+EXPORT_BATCH_SIZE = 500
+
+# Summary counters maintained alongside the rollups
+COUNTERS = ("total_posts", "total_galleries", "total_videos", "total_interactions")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS events (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    type TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    collection TEXT NOT NULL,
+    id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (collection, id)
+);
+CREATE TABLE IF NOT EXISTS post_stats (
+    id TEXT PRIMARY KEY,
+    filename TEXT NOT NULL DEFAULT '',
+    post_type TEXT NOT NULL DEFAULT '',
+    platforms TEXT NOT NULL DEFAULT '[]',
+    created_at TEXT NOT NULL DEFAULT '',
+    day TEXT NOT NULL DEFAULT '',
+    week TEXT NOT NULL DEFAULT '',
+    views INTEGER NOT NULL DEFAULT 0,
+    likes INTEGER NOT NULL DEFAULT 0,
+    shares INTEGER NOT NULL DEFAULT 0,
+    comments INTEGER NOT NULL DEFAULT 0,
+    saves INTEGER NOT NULL DEFAULT 0,
+    clicks INTEGER NOT NULL DEFAULT 0,
+    reach INTEGER NOT NULL DEFAULT 0,
+    impressions INTEGER NOT NULL DEFAULT 0,
+    engagement INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_post_stats_created_at ON post_stats(created_at);
+CREATE INDEX IF NOT EXISTS idx_post_stats_engagement ON post_stats(engagement DESC);
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    day TEXT NOT NULL,
+    post_type TEXT NOT NULL,
+    posts INTEGER NOT NULL DEFAULT 0,
+    engagement INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, post_type)
+);
+CREATE TABLE IF NOT EXISTS weekly_rollups (
+    week TEXT NOT NULL,
+    post_type TEXT NOT NULL,
+    posts INTEGER NOT NULL DEFAULT 0,
+    engagement INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (week, post_type)
+);
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def default_analytics_data() -> Dict[str, Any]:
+    """Empty analytics data in the analytics_data.json layout."""
+    return {
+        "version": "1.0",
+        "created": datetime.now().isoformat(),
+        "posts": {},
+        "galleries": {},
+        "videos": {},
+        "summary_stats": {
+            "total_posts": 0,
+            "total_galleries": 0,
+            "total_videos": 0,
+            "total_interactions": 0
+        }
+    }
+
+
+def apply_event(data: Dict[str, Any], event: Dict[str, Any]):
+    """
+    Apply one tracking event to analytics data in place.
+
+    Used both for live updates and when replaying the event log, so the two
+    can never disagree.
+
+    Args:
+        data: Analytics data (analytics_data.json layout)
+        event: Event dict with "type" and "at" plus type-specific fields
+    """
+    event_type = event["type"]
+    summary = data["summary_stats"]
+
+    if event_type == "post_created":
+        post = event["post"]
+        data["posts"][post["id"]] = post
+        summary["total_posts"] += 1
+    elif event_type == "gallery_created":
+        gallery = event["gallery"]
+        data["galleries"][gallery["id"]] = gallery
+        summary["total_galleries"] += 1
+    elif event_type == "video_processed":
+        video = event["video"]
+        data["videos"][video["id"]] = video
+        summary["total_videos"] += 1
+    elif event_type == "post_metrics":
+        post = data["posts"].get(event["post_id"])
+        if post is None:
+            return
+        metrics = event["metrics"]
+        for metric, value in metrics.items():
+            if metric in post["metrics"]:
+                post["metrics"][metric] += value
+        post["engagement_history"].append({"timestamp": event["at"], "metrics": dict(metrics)})
+        summary["total_interactions"] += sum(metrics.values())
+    else:
+        raise ValueError(f"Unknown analytics event type: {event_type}")
+
+    data["last_updated"] = event["at"]
+
+
+def day_and_week(created_at: str) -> Tuple[str, str]:
+    """Rollup keys of an ISO timestamp: its date and the Monday of its week."""
+    try:
+        day = datetime.fromisoformat(created_at).date()
+    except (TypeError, ValueError):
+        return "", ""
+    return day.isoformat(), (day - timedelta(days=day.weekday())).isoformat()
+
+
+class AnalyticsStore:
+    """Event-log store behind AnalyticsHandler, shared per database file."""
+
+    _instances: Dict[str, "AnalyticsStore"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_path(cls, db_path: str) -> "AnalyticsStore":
+        """Shared store for a database file, so every handler appends to one log."""
+        key = os.path.normcase(os.path.abspath(db_path))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(db_path)
+            return cls._instances[key]
+
+    def __init__(self, db_path: str, flush_interval: float = FLUSH_INTERVAL_S,
+                 flush_every: int = FLUSH_EVERY, compact_every: int = COMPACT_EVERY):
+        """
+        Open (and if needed create) the analytics database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            flush_interval: Seconds before buffered events are written
+            flush_every: Number of buffered events that triggers an early write
+            compact_every: Logged events that trigger a compaction
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.flush_every = flush_every
+        self.compact_every = compact_every
+
+        self._buffer: List[tuple] = []  # (type, serialized event)
+        self._buffer_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+        self._logged = self._conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+        self._post_ids = set()
+        with self._db_lock:
+            self._ensure_rollups()
+
+        # Buffered events must reach the disk even if nobody calls close()
+        atexit.register(self.close)
+
+    # --- Writing ---
+    def append(self, event: Dict[str, Any]):
+        """
+        Queue an event for writing; returns without touching the disk.
+
+        Args:
+            event: Event dict as accepted by apply_event
+        """
+        # Serialized now, so later in-memory changes to the same records don't leak in
+        entry = (event["type"], json.dumps(event, ensure_ascii=False))
+        with self._buffer_lock:
+            self._buffer.append(entry)
+            if event["type"] == "post_created":
+                self._post_ids.add(event["post"]["id"])
+            pending = len(self._buffer)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._run_flusher, name="analytics-flusher",
+                                                 daemon=True)
+                self._flusher.start()
+        if pending >= self.flush_every:
+            self._wake.set()
+
+    def flush(self) -> bool:
+        """
+        Write buffered events to the log now.
+
+        Returns:
+            bool: True if successful
+        """
+        with self._db_lock:
+            with self._buffer_lock:
+                entries, self._buffer = self._buffer, []
+            if not entries:
+                return True
+            try:
+                self._ensure_rollups()
+                with self._conn:
+                    self._conn.executemany("INSERT INTO events (type, payload) VALUES (?, ?)", entries)
+                    self._update_rollups(json.loads(payload) for _, payload in entries)
+                self._logged += len(entries)
+            except sqlite3.Error as e:
+                self.logger.error(f"Error writing analytics events: {e}")
+                with self._buffer_lock:
+                    self._buffer[:0] = entries
+                return False
+
+            if self._logged >= self.compact_every:
+                self._compact()
+        return True
+
+    def compact(self):
+        """Fold the event log into the snapshot rows."""
+        self.flush()
+        with self._db_lock:
+            self._compact()
+
+    def close(self):
+        """Stop the background writer and persist everything."""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wake.set()
+        if self._flusher is not None:
+            self._flusher.join()
+        self.compact()
+        with self._db_lock:
+            self._conn.close()
+
+    # --- Reading ---
+    def load(self) -> Dict[str, Any]:
+        """
+        Current analytics data: snapshot rows plus every logged and buffered event.
+
+        Returns:
+            Dict in the analytics_data.json layout
+        """
+        with self._db_lock:
+            return self._load_locked(include_buffer=True)
+
+    def has_post(self, post_id: str) -> bool:
+        """Whether a post has been tracked (including posts not yet written)."""
+        with self._buffer_lock:
+            return post_id in self._post_ids
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Summary counters and post engagement statistics.
+
+        Returns:
+            Dict with the COUNTERS, "post_count", "total_engagement",
+            "top_post_filename" (None without posts) and "last_updated" (None if never)
+        """
+        self.flush()
+        with self._db_lock:
+            self._ensure_rollups()
+            summary = {name: 0 for name in COUNTERS}
+            summary.update(self._conn.execute("SELECT name, value FROM counters").fetchall())
+            post_count, engagement = self._conn.execute(
+                "SELECT COALESCE(SUM(posts), 0), COALESCE(SUM(engagement), 0) FROM weekly_rollups"
+            ).fetchone()
+            top = self._conn.execute(
+                "SELECT filename FROM post_stats ORDER BY engagement DESC LIMIT 1"
+            ).fetchone()
+            last_updated = self._conn.execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+        summary.update({
+            "post_count": post_count,
+            "total_engagement": engagement,
+            "top_post_filename": top[0] if top else None,
+            "last_updated": last_updated[0] if last_updated else None,
+        })
+        return summary
+
+    def engagement_by_type(self, since: datetime) -> Dict[str, Dict[str, int]]:
+        """
+        Post count and engagement per post type for posts created at or after a time.
+
+        Whole weeks come from the weekly rollups, whole days from the daily
+        rollups, and only the posts of the partial first day are read individually.
+
+        Args:
+            since: Start of the range
+
+        Returns:
+            Dict of post type -> {"count", "total_engagement"}
+        """
+        first_full_day = since.date() + timedelta(days=1)
+        first_full_week = first_full_day + timedelta(days=(7 - first_full_day.weekday()) % 7)
+        queries = [
+            ("SELECT post_type, COUNT(*), SUM(engagement) FROM post_stats "
+             "WHERE created_at >= ? AND created_at < ? GROUP BY post_type",
+             (since.isoformat(), first_full_day.isoformat())),
+            ("SELECT post_type, SUM(posts), SUM(engagement) FROM daily_rollups "
+             "WHERE day >= ? AND day < ? GROUP BY post_type",
+             (first_full_day.isoformat(), first_full_week.isoformat())),
+            ("SELECT post_type, SUM(posts), SUM(engagement) FROM weekly_rollups "
+             "WHERE week >= ? GROUP BY post_type",
+             (first_full_week.isoformat(),)),
+        ]
+
+        self.flush()
+        by_type: Dict[str, Dict[str, int]] = {}
+        with self._db_lock:
+            self._ensure_rollups()
+            for query, params in queries:
+                for post_type, count, engagement in self._conn.execute(query, params):
+                    totals = by_type.setdefault(post_type, {"count": 0, "total_engagement": 0})
+                    totals["count"] += count
+                    totals["total_engagement"] += engagement
+        return {post_type: totals for post_type, totals in by_type.items() if totals["count"]}
+
+    def recent_posts(self, limit: int) -> List[Dict[str, Any]]:
+        """
+        Newest posts with their metrics.
+
+        Args:
+            limit: Maximum number of posts
+
+        Returns:
+            List of post dicts (id, filename, post_type, platforms, created_at, metrics)
+        """
+        self.flush()
+        with self._db_lock:
+            self._ensure_rollups()
+            rows = self._conn.execute(
+                f"SELECT id, filename, post_type, platforms, created_at, {', '.join(METRICS)} "
+                "FROM post_stats ORDER BY created_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [
+            {
+                "id": row[0],
+                "filename": row[1],
+                "post_type": row[2],
+                "platforms": json.loads(row[3]),
+                "created_at": row[4],
+                "metrics": dict(zip(METRICS, row[5:])),
+            }
+            for row in rows
+        ]
+
+    # --- Streaming reads (exports) ---
+    def iter_post_stats(self) -> Iterator[Dict[str, Any]]:
+        """
+        Stream every post's metrics row, oldest first.
+
+        Reads through its own connection, so the store stays writable while
+        an export is in progress.
+
+        Yields:
+            Dicts with id, filename, post_type, platforms, created_at,
+            the METRICS and engagement
+        """
+        self.flush()
+        with self._db_lock:
+            self._ensure_rollups()
+        columns = ("id", "filename", "post_type", "platforms", "created_at") + METRICS + ("engagement",)
+        for row in self._iter_query(f"SELECT {', '.join(columns)} FROM post_stats ORDER BY created_at"):
+            post = dict(zip(columns, row))
+            post["platforms"] = json.loads(post["platforms"])
+            yield post
+
+    def iter_records(self, collection: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Stream the full records of a collection after folding in pending events.
+
+        Args:
+            collection: "posts", "galleries" or "videos"
+
+        Yields:
+            (record_id, record) pairs
+        """
+        self.compact()
+        for record_id, data in self._iter_query(
+                "SELECT id, data FROM records WHERE collection = ? ORDER BY rowid", (collection,)):
+            yield record_id, json.loads(data)
+
+    def _iter_query(self, query: str, params: tuple = ()) -> Iterator[tuple]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cursor = conn.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+                if not rows:
+                    break
+                yield from rows
+        finally:
+            conn.close()
+
+    # --- One-time import ---
+    def import_json(self, json_path: str) -> bool:
+        """
+        Import an existing analytics_data.json once, as snapshot rows.
+
+        The JSON file is left in place as a backup.
+
+        Args:
+            json_path: Path to analytics_data.json
+
+        Returns:
+            bool: True if data was imported on this call
+        """
+        with self._db_lock:
+            imported = self._conn.execute("SELECT value FROM meta WHERE key = 'json_imported'").fetchone()
+        if imported or not os.path.exists(json_path):
+            return False
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Could not read {json_path} for import: {e}")
+            return False
+
+        state = default_analytics_data()
+        state.update({key: value for key, value in data.items() if key not in COLLECTIONS})
+        with self._db_lock, self._conn:
+            for collection in COLLECTIONS:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO records (collection, id, data) VALUES (?, ?, ?)",
+                    [(collection, record_id, json.dumps(record, ensure_ascii=False))
+                     for record_id, record in data.get(collection, {}).items()]
+                )
+            self._write_state(state)
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)",
+                               (os.path.abspath(json_path),))
+            # Rollups are rebuilt from the imported data
+            self._conn.execute("DELETE FROM meta WHERE key = 'rollups_built'")
+
+        self.logger.info(f"Imported analytics data from {json_path}")
+        return True
+
+    # --- Internals (callers hold _db_lock) ---
+    def _run_flusher(self):
+        while not self._stopped.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _load_locked(self, include_buffer: bool) -> Dict[str, Any]:
+        data = self._load_state()
+        for collection, record_id, record in self._conn.execute(
+                "SELECT collection, id, data FROM records ORDER BY rowid"):
+            data[collection][record_id] = json.loads(record)
+        events = [payload for (payload,) in self._conn.execute(
+            "SELECT payload FROM events ORDER BY seq")]
+        if include_buffer:
+            with self._buffer_lock:
+                events.extend(payload for _, payload in self._buffer)
+
+        for payload in events:
+            apply_event(data, json.loads(payload))
+        return data
+
+    def _ensure_rollups(self):
+        """Build post_stats, rollups and counters from the full data if they are missing."""
+        if self._conn.execute("SELECT 1 FROM meta WHERE key = 'rollups_built'").fetchone():
+            if not self._post_ids:
+                ids = {post_id for (post_id,) in self._conn.execute("SELECT id FROM post_stats")}
+                with self._buffer_lock:
+                    self._post_ids |= ids
+            return
+
+        # Logged events only; buffered ones are added incrementally when flushed
+        data = self._load_locked(include_buffer=False)
+        with self._conn:
+            for table in ("post_stats", "daily_rollups", "weekly_rollups", "counters"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO post_stats (id, filename, post_type, platforms, created_at, day, week, "
+                f"{', '.join(METRICS)}, engagement) VALUES ({', '.join('?' * (8 + len(METRICS)))})",
+                [self._post_stats_row(post) for post in data["posts"].values()]
+            )
+            for rollup, key in (("daily_rollups", "day"), ("weekly_rollups", "week")):
+                self._conn.execute(
+                    f"INSERT INTO {rollup} ({key}, post_type, posts, engagement) "
+                    f"SELECT {key}, post_type, COUNT(*), SUM(engagement) FROM post_stats GROUP BY {key}, post_type"
+                )
+            self._conn.executemany(
+                "INSERT INTO counters (name, value) VALUES (?, ?)",
+                [(name, data["summary_stats"].get(name, 0)) for name in COUNTERS]
+            )
+            if data.get("last_updated"):
+                self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)",
+                                   (data["last_updated"],))
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('rollups_built', '1')")
+        with self._buffer_lock:
+            self._post_ids |= set(data["posts"])
+        self.logger.info(f"Built analytics rollups for {len(data['posts'])} posts")
+
+    @staticmethod
+    def _post_stats_row(post: Dict[str, Any]) -> tuple:
+        metrics = post.get("metrics", {})
+        created_at = post.get("created_at") or ""
+        day, week = day_and_week(created_at)
+        return (post["id"], post.get("filename", ""), post.get("post_type", ""),
+                json.dumps(post.get("platforms", [])), created_at, day, week,
+                *(metrics.get(metric, 0) for metric in METRICS), sum(metrics.values()))
+
+    def _update_rollups(self, events: Iterable[Dict[str, Any]]):
+        """Apply events to post_stats, rollups and counters (inside the caller's transaction)."""
+        counters = dict.fromkeys(COUNTERS, 0)
+        rollups: Dict[Tuple[str, str, str], List[int]] = {}  # (day, week, type) -> [posts, engagement]
+        last_updated = None
+
+        for event in events:
+            event_type = event["type"]
+            if event_type == "post_created":
+                row = self._post_stats_row(event["post"])
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO post_stats (id, filename, post_type, platforms, created_at, day, week, "
+                    f"{', '.join(METRICS)}, engagement) VALUES ({', '.join('?' * len(row))})",
+                    row
+                )
+                totals = rollups.setdefault((row[5], row[6], row[2]), [0, 0])
+                totals[0] += 1
+                totals[1] += row[-1]
+                counters["total_posts"] += 1
+            elif event_type == "gallery_created":
+                counters["total_galleries"] += 1
+            elif event_type == "video_processed":
+                counters["total_videos"] += 1
+            elif event_type == "post_metrics":
+                post = self._conn.execute("SELECT day, week, post_type FROM post_stats WHERE id = ?",
+                                          (event["post_id"],)).fetchone()
+                if post is None:
+                    continue
+                metrics = event["metrics"]
+                deltas = [metrics.get(metric, 0) for metric in METRICS]
+                self._conn.execute(
+                    f"UPDATE post_stats SET {', '.join(f'{metric} = {metric} + ?' for metric in METRICS)}, "
+                    "engagement = engagement + ? WHERE id = ?",
+                    (*deltas, sum(deltas), event["post_id"])
+                )
+                rollups.setdefault(post, [0, 0])[1] += sum(deltas)
+                counters["total_interactions"] += sum(metrics.values())
+            last_updated = event["at"]
+
+        for (day, week, post_type), (posts, engagement) in rollups.items():
+            for rollup, key, value in (("daily_rollups", "day", day), ("weekly_rollups", "week", week)):
+                self._conn.execute(
+                    f"INSERT INTO {rollup} ({key}, post_type, posts, engagement) VALUES (?, ?, ?, ?) "
+                    f"ON CONFLICT({key}, post_type) DO UPDATE SET posts = posts + excluded.posts, "
+                    "engagement = engagement + excluded.engagement",
+                    (value, post_type, posts, engagement)
+                )
+        for name, delta in counters.items():
+            if delta:
+                self._conn.execute(
+                    "INSERT INTO counters (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    (name, delta)
+                )
+        if last_updated:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('last_updated', ?)",
+                               (last_updated,))
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Top-level fields and summary counters, with empty collections."""
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'state'").fetchone()
+        data = default_analytics_data()
+        if row:
+            data.update(json.loads(row[0]))
+        for collection in COLLECTIONS:
+            data[collection] = {}
+        return data
+
+    def _write_state(self, data: Dict[str, Any]):
+        state = {key: value for key, value in data.items() if key not in COLLECTIONS}
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('state', ?)",
+                           (json.dumps(state, ensure_ascii=False),))
+
+    def _compact(self):
+        """Apply logged events to the snapshot rows they touch, then clear the log."""
+        rows = self._conn.execute("SELECT seq, payload FROM events ORDER BY seq").fetchall()
+        if not rows:
+            return
+        events = [json.loads(payload) for _, payload in rows]
+
+        data = self._load_state()
+        # Only posts receiving metric updates need their stored row
+        post_ids = {event["post_id"] for event in events if event["type"] == "post_metrics"}
+        for post_id in post_ids:
+            row = self._conn.execute("SELECT data FROM records WHERE collection = 'posts' AND id = ?",
+                                     (post_id,)).fetchone()
+            if row:
+                data["posts"][post_id] = json.loads(row[0])
+        for event in events:
+            apply_event(data, event)
+
+        try:
+            with self._conn:
+                for collection in COLLECTIONS:
+                    self._conn.executemany(
+                        # Upsert in place: records keep their rowid, and with it their creation order
+                        "INSERT INTO records (collection, id, data) VALUES (?, ?, ?) "
+                        "ON CONFLICT(collection, id) DO UPDATE SET data = excluded.data",
+                        [(collection, record_id, json.dumps(record, ensure_ascii=False))
+                         for record_id, record in data[collection].items()]
+                    )
+                self._write_state(data)
+                self._conn.execute("DELETE FROM events WHERE seq <= ?", (rows[-1][0],))
+            self._logged = 0
+            self.logger.debug(f"Compacted {len(rows)} analytics events")
+        except sqlite3.Error as e:
+            self.logger.error(f"Error compacting analytics events: {e}")
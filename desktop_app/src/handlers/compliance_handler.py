@@ -10,11 +10,16 @@ import hashlib
 import hmac
 import base64
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 
+from ..utils.streaming_export import ZipExportBundle, open_export, write_json
+
 logger = logging.getLogger(__name__)
 
+# Directories whose files are listed in (and optionally bundled with) user data exports
+MEDIA_EXPORT_DIRS = ["media_library", "media_gallery", "output"]
+
 class ComplianceHandler:
     """Handler for Meta Developer Platform compliance requirements."""
     
@@ -333,22 +338,32 @@ class ComplianceHandler:
             self.logger.error(f"Error during factory reset: {e}")
             return False
     
-    def export_user_data(self, user_id: Optional[str] = None) -> str:
+    def export_user_data(self, user_id: Optional[str] = None, compress: bool = False,
+                         include_media: bool = False) -> str:
         """
         Export all user data for GDPR/CCPA compliance.
         
+        The export is streamed to disk as it is collected, so memory use does
+        not grow with the size of the media library.
+        
         Args:
             user_id: Optional user ID, if None exports all data
+            compress: Gzip the JSON export (.json.gz)
+            include_media: Write a ZIP bundle holding the JSON export (user_data.json)
+                and a copy of every media file under media/
             
         Returns:
             Path to the exported data file
         """
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            export_filename = f"user_data_export_{timestamp}.json"
+            if include_media:
+                export_filename = f"user_data_export_{timestamp}.zip"
+            else:
+                export_filename = f"user_data_export_{timestamp}.json{'.gz' if compress else ''}"
             export_path = os.path.join(self.user_data_export_dir, export_filename)
             
-            # Collect all user data
+            # Collect all user data; file listings are generated while the export is written
             export_data = {
                 "export_timestamp": datetime.now().isoformat(),
                 "user_id": user_id or "all_users",
@@ -368,8 +383,14 @@ class ComplianceHandler:
             }
             
             # Save export file
-            with open(export_path, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
+            if include_media:
+                with ZipExportBundle(export_path) as bundle:
+                    bundle.add_document("user_data.json", lambda f: write_json(f, export_data))
+                    for file_path, _ in self._iter_media_files():
+                        bundle.add_file(file_path, os.path.join("media", file_path))
+            else:
+                with open_export(export_path, compress=compress) as f:
+                    write_json(f, export_data)
             
             # Log the export
             log_data = self._load_compliance_log()
@@ -390,30 +411,46 @@ class ComplianceHandler:
             raise
     
     def _export_media_data(self) -> Dict[str, Any]:
-        """Export media library data."""
-        try:
-            media_data = {"files": [], "count": 0}
-            media_dirs = ["media_library", "media_gallery", "output"]
-            
-            for media_dir in media_dirs:
-                if os.path.exists(media_dir):
-                    for root, dirs, files in os.walk(media_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            stat = os.stat(file_path)
-                            media_data["files"].append({
-                                "filename": file,
-                                "path": file_path,
-                                "size": stat.st_size,
-                                "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-                                "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
-                            })
-                            media_data["count"] += 1
-            
-            return media_data
-        except Exception as e:
-            self.logger.error(f"Error exporting media data: {e}")
-            return {"error": str(e)}
+        """Export media library data (file entries are generated as the export is written)."""
+        listed = {"count": 0}
+        
+        def files() -> Iterator[Dict[str, Any]]:
+            for file_path, stat in self._iter_media_files():
+                listed["count"] += 1
+                yield {
+                    "filename": os.path.basename(file_path),
+                    "path": file_path,
+                    "size": stat.st_size,
+                    "created": datetime.fromtimestamp(stat.st_ctime).isoformat(),
+                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat()
+                }
+        
+        # The count is read after the file list has been written
+        return {"files": files(), "count": lambda: listed["count"]}
+    
+    def _iter_media_files(self) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (path, stat) for every file in the media directories."""
+        for media_dir in MEDIA_EXPORT_DIRS:
+            if os.path.isdir(media_dir):
+                yield from self._scan_files(media_dir)
+    
+    def _scan_files(self, directory: str) -> Iterator[Tuple[str, os.stat_result]]:
+        """Yield (path, stat) for every file below a directory, one entry at a time."""
+        pending = [directory]
+        while pending:
+            current = pending.pop()
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file():
+                                yield entry.path, entry.stat()
+                        except OSError as e:
+                            self.logger.warning(f"Skipping {entry.path} in export: {e}")
+            except OSError as e:
+                self.logger.warning(f"Could not list {current} for export: {e}")
     
     def _export_scheduled_posts(self) -> Dict[str, Any]:
         """Export scheduled posts data."""
@@ -431,32 +468,33 @@ class ComplianceHandler:
         return {}
     
     def _export_knowledge_base(self) -> Dict[str, Any]:
-        """Export knowledge base data."""
-        try:
-            kb_data = {"files": [], "count": 0}
-            if os.path.exists("knowledge_base"):
-                for root, dirs, files in os.walk("knowledge_base"):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                content = f.read()
-                            kb_data["files"].append({
-                                "filename": file,
-                                "path": file_path,
-                                "content": content[:1000] + "..." if len(content) > 1000 else content
-                            })
-                            kb_data["count"] += 1
-                        except Exception as e:
-                            kb_data["files"].append({
-                                "filename": file,
-                                "path": file_path,
-                                "error": f"Could not read file: {e}"
-                            })
-            return kb_data
-        except Exception as e:
-            self.logger.error(f"Error exporting knowledge base: {e}")
-            return {"error": str(e)}
+        """Export knowledge base data (file entries are generated as the export is written)."""
+        listed = {"count": 0}
+        
+        def files() -> Iterator[Dict[str, Any]]:
+            if not os.path.isdir("knowledge_base"):
+                return
+            for file_path, _ in self._scan_files("knowledge_base"):
+                file = os.path.basename(file_path)
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        # Only the preview is kept, so never read more than that
+                        content = f.read(1001)
+                    entry = {
+                        "filename": file,
+                        "path": file_path,
+                        "content": content[:1000] + "..." if len(content) > 1000 else content
+                    }
+                except Exception as e:
+                    entry = {
+                        "filename": file,
+                        "path": file_path,
+                        "error": f"Could not read file: {e}"
+                    }
+                listed["count"] += 1
+                yield entry
+        
+        return {"files": files(), "count": lambda: listed["count"]}
     
     def _export_analytics_data(self) -> Dict[str, Any]:
         """Export analytics and usage data."""
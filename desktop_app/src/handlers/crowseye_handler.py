@@ -16,8 +16,13 @@ from PIL import Image
 
 from ..models.app_state import AppState
 from ..config import constants as const
+from ..features.media_processing.batch_image_engine import BatchImageEngine, BatchImageJob, DEFAULT_ENHANCEMENT
 from .media_handler import MediaHandler, pil_to_qpixmap
 from .library_handler import LibraryManager
+from .media_directory_index import MediaDirectoryIndex
+from .media_search_index import MediaSearchIndex
+from .tag_store import PathKeywords, TagStore
+from .gallery_scoring import GalleryScorer, top_scored
 
 class CrowsEyeSignals(QObject):
     """Signal class for Crow's Eye operations."""
@@ -27,6 +32,8 @@ class CrowsEyeSignals(QObject):
     error = Signal(str, str)  # Title, message
     warning = Signal(str, str)  # Title, message
     info = Signal(str, str)  # Title, message
+    media_added = Signal(str, str)  # Category ('raw_photos'/'raw_videos'), path
+    media_removed = Signal(str, str)  # Category ('raw_photos'/'raw_videos'), path
 
 class CrowsEyeHandler:
     """Handler for Crow's Eye marketing features."""
@@ -87,6 +94,25 @@ class CrowsEyeHandler:
         self.media_gallery_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'media_gallery')
         self._ensure_directories()
         
+        # Raw uploads are listed once and then kept current from file system events
+        media_library_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'media')
+        self.media_index = MediaDirectoryIndex.for_directory(media_library_dir)
+        self.media_index.media_added.connect(self.signals.media_added)
+        self.media_index.media_removed.connect(self.signals.media_removed)
+        
+        # Simulated AI tags are computed once per file version and kept across runs
+        self.tag_store = TagStore(self._compute_simulated_ai_tags,
+                                  db_path=os.path.join(const.DATA_DIR, 'ai_tags.db'),
+                                  tagger="crowseye-simulated-v1")
+        
+        # Search index, built on first search and then kept current incrementally
+        self.search_index: Optional[MediaSearchIndex] = None
+        self.signals.media_added.connect(self._index_media)
+        self.signals.media_removed.connect(self._unindex_media)
+        LibraryManager.signals.item_added.connect(self._on_library_item_changed)
+        LibraryManager.signals.item_updated.connect(self._on_library_item_changed)
+        LibraryManager.signals.item_removed.connect(self._on_library_item_removed)
+        
         # Current state
         self.selected_media = []
         self.current_gallery = []
@@ -104,7 +130,9 @@ class CrowsEyeHandler:
     def get_all_media(self) -> Dict[str, List[str]]:
         """
         Get all media organized by type.
-        Raw media comes from media_library directory, finished posts from LibraryManager.
+        Raw media comes from the in-memory index of the data/media directory, finished
+        posts from LibraryManager. Changes are also reported incrementally through
+        signals.media_added and signals.media_removed.
         
         Returns:
             Dict with keys 'raw_photos', 'raw_videos', 'finished_posts' and media paths as values.
@@ -116,20 +144,8 @@ class CrowsEyeHandler:
         }
         
         try:
-            # Get raw uploads from data/media directory
-            media_library_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'data', 'media')
-            if os.path.exists(media_library_dir):
-                for filename in os.listdir(media_library_dir):
-                    file_path = os.path.join(media_library_dir, filename)
-                    if os.path.isfile(file_path):
-                        file_ext = os.path.splitext(filename)[1].lower()
-                        
-                        # Check if it's an image
-                        if file_ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp']:
-                            result["raw_photos"].append(file_path)
-                        # Check if it's a video
-                        elif file_ext in ['.mp4', '.mov', '.avi', '.mkv', '.wmv']:
-                            result["raw_videos"].append(file_path)
+            # Get raw uploads from the data/media directory index
+            result.update(self.media_index.snapshot())
             
             # Get finished posts from LibraryManager
             post_ready_items = self.library_manager.get_all_post_ready_items()
@@ -150,7 +166,11 @@ class CrowsEyeHandler:
     
     def search_media(self, query: str) -> Dict[str, List[str]]:
         """
-        Search media by filename, caption, and AI tags - improved with better matching.
+        Search media by filename, caption, and AI tags.
+        
+        Query words are matched as whole words, prefixes ("bre" finds "bread") or
+        longer forms ("breads" finds "bread"); results are ranked by how many words
+        matched and where (tags, then filename, then caption).
         
         Args:
             query: Search query
@@ -158,39 +178,86 @@ class CrowsEyeHandler:
         Returns:
             Dict with keys 'raw_photos', 'raw_videos', 'finished_posts' and filtered media paths as values
         """
-        all_media = self.get_all_media()
         if not query:
-            return all_media
+            return self.get_all_media()
             
-        query = query.lower()
         result = {
             "raw_photos": [],
             "raw_videos": [],
             "finished_posts": []
         }
         
-        # Enhanced search implementation with AI tags
-        for category, media_list in all_media.items():
-            for media_path in media_list:
-                filename = os.path.basename(media_path).lower()
-                caption = self.media_handler.get_caption(media_path) or ""
-                ai_tags = self._get_simulated_ai_tags(media_path)
-                
-                # Check for matches in filename, caption, or AI tags
-                matches = (
-                    query in filename or 
-                    query in caption.lower() or
-                    any(query in tag.lower() for tag in ai_tags) or
-                    any(tag.lower() in query for tag in ai_tags)
-                )
-                
-                if matches:
-                    result[category].append(media_path)
-                    self.logger.debug(f"Search match for '{query}': {filename} (tags: {ai_tags})")
+        search_index = self._ensure_search_index()
+        for media_path, _ in search_index.search(query):
+            result[search_index.category(media_path)].append(media_path)
         
         return result
     
+    def _ensure_search_index(self) -> MediaSearchIndex:
+        """Build the search index over all media on first use."""
+        if self.search_index is None:
+            self.search_index = MediaSearchIndex()
+            library_captions = self._library_captions()
+            for category, media_paths in self.get_all_media().items():
+                for media_path in media_paths:
+                    self._index_media(category, media_path, library_captions.get(media_path))
+            self.logger.info(f"Built search index over {len(self.search_index)} media files")
+        return self.search_index
+    
+    def _index_media(self, category: str, media_path: str, caption: Optional[str] = None) -> None:
+        """
+        Add or refresh one file in the search index (if it has been built).
+        
+        Args:
+            category: Search category of the file
+            media_path: Path to the media file
+            caption: Caption saved with the library item, if any; otherwise the
+                media handler's caption is indexed
+        """
+        if self.search_index is None:
+            return
+        self.search_index.add(
+            media_path,
+            category,
+            filename=os.path.basename(media_path),
+            caption=caption or self.media_handler.get_caption(media_path) or "",
+            tags=self._get_simulated_ai_tags(media_path)
+        )
+    
+    def _library_captions(self) -> Dict[str, str]:
+        """Captions of the finished posts in the library, by path."""
+        return {item["path"]: item.get("caption") or ""
+                for item in self.library_manager.get_all_post_ready_items() if "path" in item}
+    
+    def _unindex_media(self, category: str, media_path: str) -> None:
+        """Drop one file from the search index."""
+        if self.search_index is not None:
+            self.search_index.remove(media_path)
+    
+    def _on_library_item_changed(self, item_type: str, media_path: str, item: Dict[str, Any]) -> None:
+        """
+        Index a library item that was added or updated if it is a finished post.
+        
+        Captions are saved with library items, so this also refreshes edited captions.
+        """
+        if item_type.startswith("post_ready"):
+            self._index_media("finished_posts", media_path, item.get("caption"))
+        else:
+            self._on_library_item_removed(item_type, media_path)
+    
+    def _on_library_item_removed(self, item_type: str, media_path: str) -> None:
+        """Drop a library item from the finished posts in the search index."""
+        if self.search_index is not None and self.search_index.category(media_path) == "finished_posts":
+            self._unindex_media("finished_posts", media_path)
+    
     def _get_simulated_ai_tags(self, media_path: str) -> List[str]:
+        """
+        Simulated AI tags for a media file.
+        Tags are computed on first request and reused until the file changes.
+        """
+        return self.tag_store.get(media_path)
+    
+    def _compute_simulated_ai_tags(self, media_path: str) -> List[str]:
         """
         Advanced AI tagging system for comprehensive content identification.
         Simulates getting AI-generated tags for any type of media file.
@@ -198,164 +265,100 @@ class CrowsEyeHandler:
         """
         base_filename = os.path.basename(media_path).lower()
         
-        # DEBUG: Log what we're analyzing
-        self.logger.info(f"DEBUG TAGGING: Analyzing file '{base_filename}' from path '{media_path}'")
-        
         # First check for exact filename matches
         exact_tags = self.SIMULATED_TAGS_DB.get(base_filename, None)
         if exact_tags:
-            self.logger.info(f"DEBUG TAGGING: Found exact match in SIMULATED_TAGS_DB for '{base_filename}': {exact_tags}")
+            self.logger.debug(f"Found exact match in SIMULATED_TAGS_DB for '{base_filename}': {exact_tags}")
             return exact_tags
         
-        self.logger.info(f"DEBUG TAGGING: No exact match in SIMULATED_TAGS_DB for '{base_filename}', using heuristic analysis...")
+        filename_lower = base_filename.lower()
+        keywords = PathKeywords(media_path)
+        found = keywords.found
         
         # Comprehensive content analysis
         tags = []
-        filename_lower = base_filename.lower()
         
-        # PEOPLE & PORTRAITS - Enhanced detection
-        people_patterns = [
-            'person', 'people', 'man', 'woman', 'face', 'portrait', 'selfie', 'group',
-            'team', 'staff', 'customer', 'baker', 'chef', 'family', 'friend', 'smile',
-            'headshot', 'profile', 'human', 'worker', 'employee', 'owner', 'founder'
-        ]
-        if any(word in filename_lower for word in people_patterns):
+        if found("people"):
             tags.extend(['person', 'people', 'portrait', 'human', 'photo'])
-            if any(word in filename_lower for word in ['team', 'staff', 'employee', 'worker']):
+            if found("team"):
                 tags.extend(['team', 'staff', 'workplace'])
-            if any(word in filename_lower for word in ['customer', 'client']):
+            if found("customer"):
                 tags.extend(['customer', 'service'])
         
-        # FOOD & CULINARY - Comprehensive food detection
-        bread_patterns = ['bread', 'sourdough', 'baguette', 'loaf', 'roll', 'croissant', 'focaccia', 'ciabatta']
-        pastry_patterns = ['pastry', 'danish', 'muffin', 'scone', 'bagel', 'pretzel', 'croissant']
-        dessert_patterns = ['cake', 'cupcake', 'cookie', 'brownie', 'pie', 'tart', 'donut', 'sweet', 'chocolate']
-        food_patterns = ['pizza', 'dough', 'kitchen', 'cook', 'recipe', 'ingredient', 'flour', 'yeast', 'meal', 'dish']
-        
-        if any(word in filename_lower for word in bread_patterns):
+        if found("bread"):
             tags.extend(['bread', 'baked goods', 'food', 'bakery', 'artisan'])
-        elif any(word in filename_lower for word in pastry_patterns):
+        elif found("pastry"):
             tags.extend(['pastry', 'baked goods', 'food', 'bakery'])
-        elif any(word in filename_lower for word in dessert_patterns):
+        elif found("dessert"):
             tags.extend(['dessert', 'baked goods', 'food', 'sweet', 'bakery'])
-        elif any(word in filename_lower for word in food_patterns):
+        elif found("food"):
             tags.extend(['food', 'cooking', 'kitchen', 'culinary'])
         
-        # BUSINESS & LOCATIONS
-        business_patterns = [
-            'shop', 'store', 'bakery', 'cafe', 'restaurant', 'kitchen', 'counter',
-            'display', 'shelf', 'oven', 'interior', 'exterior', 'building', 'storefront',
-            'office', 'workspace', 'commercial', 'retail', 'franchise'
-        ]
-        if any(word in filename_lower for word in business_patterns):
+        if found("business"):
             tags.extend(['location', 'business', 'commercial'])
-            if any(word in filename_lower for word in ['bakery', 'shop', 'store']):
+            if found("retail"):
                 tags.extend(['bakery', 'retail', 'storefront'])
-            if any(word in filename_lower for word in ['interior', 'inside']):
+            if found("interior"):
                 tags.append('interior')
-            if any(word in filename_lower for word in ['exterior', 'outside']):
+            if found("exterior"):
                 tags.append('exterior')
         
-        # PRODUCTS & MERCHANDISE
-        product_patterns = [
-            'product', 'merchandise', 'item', 'goods', 'package', 'box', 'container',
-            'label', 'brand', 'logo', 'packaging', 'display', 'showcase'
-        ]
-        if any(word in filename_lower for word in product_patterns):
+        if found("product"):
             tags.extend(['product', 'merchandise', 'commercial', 'branding'])
         
-        # EQUIPMENT & TOOLS
-        equipment_patterns = [
-            'oven', 'mixer', 'tool', 'equipment', 'machine', 'scale', 'tray', 'pan',
-            'utensil', 'appliance', 'device', 'instrument'
-        ]
-        if any(word in filename_lower for word in equipment_patterns):
+        if found("equipment"):
             tags.extend(['equipment', 'tool', 'kitchen equipment', 'appliance'])
         
-        # EVENTS & ACTIVITIES
-        event_patterns = [
-            'event', 'party', 'celebration', 'wedding', 'birthday', 'opening', 'festival',
-            'workshop', 'class', 'demonstration', 'meeting', 'conference', 'gathering'
-        ]
-        if any(word in filename_lower for word in event_patterns):
+        if found("event"):
             tags.extend(['event', 'celebration', 'occasion', 'social', 'gathering'])
         
-        # MARKETING & PROMOTION
-        marketing_patterns = [
-            'marketing', 'promotion', 'advertisement', 'ad', 'campaign', 'social',
-            'post', 'content', 'media', 'banner', 'flyer', 'poster'
-        ]
-        if any(word in filename_lower for word in marketing_patterns):
+        if found("marketing"):
             tags.extend(['marketing', 'promotional', 'advertising', 'social media'])
         
-        # ART & DESIGN
-        art_patterns = [
-            'art', 'design', 'logo', 'graphic', 'drawing', 'sketch', 'illustration',
-            'poster', 'banner', 'creative', 'artwork', 'visual'
-        ]
-        if any(word in filename_lower for word in art_patterns):
+        if found("art"):
             tags.extend(['art', 'design', 'graphic', 'illustration', 'creative'])
         
-        # NATURE & OUTDOOR
-        nature_patterns = [
-            'outdoor', 'nature', 'garden', 'park', 'tree', 'flower', 'landscape',
-            'sky', 'weather', 'season', 'natural', 'environment'
-        ]
-        if any(word in filename_lower for word in nature_patterns):
+        if found("nature"):
             tags.extend(['nature', 'outdoor', 'landscape', 'environment'])
         
-        # TECHNOLOGY & DIGITAL
-        tech_patterns = [
-            'screen', 'computer', 'phone', 'digital', 'app', 'website', 'online',
-            'tech', 'software', 'system', 'interface'
-        ]
-        if any(word in filename_lower for word in tech_patterns):
+        if found("tech"):
             tags.extend(['technology', 'digital', 'electronic', 'modern'])
         
-        # PROCESS & WORKFLOW
-        process_patterns = [
-            'process', 'step', 'making', 'preparation', 'work', 'workflow',
-            'behind', 'scene', 'production', 'creation'
-        ]
-        if any(word in filename_lower for word in process_patterns):
+        if found("process"):
             tags.extend(['process', 'workflow', 'production', 'behind the scenes'])
         
         # Check path context for additional intelligent tagging
-        path_parts = media_path.lower().split(os.sep)
-        for part in path_parts:
-            # Directory-based context clues
-            if any(keyword in part for keyword in ['portrait', 'people', 'staff', 'team']):
+        for words in keywords.parts:
+            if found("dir_people", words):
                 tags.extend(['person', 'people', 'portrait'])
-            elif any(keyword in part for keyword in ['product', 'merchandise', 'items']):
+            elif found("dir_product", words):
                 tags.extend(['product', 'commercial', 'merchandise'])
-            elif any(keyword in part for keyword in ['event', 'celebration', 'party']):
+            elif found("dir_event", words):
                 tags.extend(['event', 'occasion', 'social'])
-            elif any(keyword in part for keyword in ['marketing', 'social', 'promo']):
+            elif found("dir_marketing", words):
                 tags.extend(['marketing', 'promotional', 'social media'])
-            elif any(keyword in part for keyword in ['food', 'bakery', 'kitchen']):
+            elif found("dir_food", words):
                 tags.extend(['food', 'bakery', 'culinary'])
-            elif any(keyword in part for keyword in ['location', 'interior', 'exterior']):
+            elif found("dir_location", words):
                 tags.extend(['location', 'space', 'environment'])
         
         # Advanced filename pattern analysis for generic files
         if not tags:
-            # Common camera naming patterns
-            if any(pattern in filename_lower for pattern in ['img_', 'dsc_', 'photo_', '20']):
+            if found("camera"):
                 tags.extend(['photo', 'image', 'photograph'])
                 
                 # Context-based guessing for camera photos
-                context_keywords = media_path.lower()
-                if any(keyword in context_keywords for keyword in ['bread', 'bakery', 'food']):
+                if found("camera_food", keywords.path):
                     tags.extend(['food', 'baked goods', 'bakery'])
-                elif any(keyword in context_keywords for keyword in ['people', 'portrait', 'staff']):
+                elif found("camera_people", keywords.path):
                     tags.extend(['person', 'people', 'portrait'])
-                elif any(keyword in context_keywords for keyword in ['product', 'item']):
+                elif found("camera_product", keywords.path):
                     tags.extend(['product', 'commercial'])
                 else:
                     tags.extend(['general', 'content'])
             
             # Date-based naming patterns
-            elif any(char.isdigit() for char in filename_lower) and len([c for c in filename_lower if c.isdigit()]) >= 6:
+            elif sum(char.isdigit() for char in filename_lower) >= 6:
                 tags.extend(['photo', 'dated', 'archived', 'timestamped'])
             
             # UUID/hash-style naming (generated files)
@@ -372,9 +375,9 @@ class CrowsEyeHandler:
             tags.extend(['photograph', 'image'])
         elif file_ext in ['.png']:
             tags.extend(['image', 'digital'])
-            if any(keyword in filename_lower for keyword in ['screenshot', 'screen', 'capture']):
+            if found("screenshot"):
                 tags.extend(['screenshot', 'screen capture'])
-            elif any(keyword in filename_lower for keyword in ['logo', 'icon', 'graphic']):
+            elif found("logo"):
                 tags.extend(['logo', 'graphic', 'branding'])
         elif file_ext in ['.gif']:
             tags.extend(['animation', 'gif', 'motion', 'animated'])
@@ -395,14 +398,13 @@ class CrowsEyeHandler:
         if not unique_tags:
             # Final intelligent fallback based on file type and context
             if any(ext in base_filename for ext in ['.jpg', '.jpeg', '.png', '.gif']):
-                context_hints = media_path.lower()
-                if any(keyword in context_hints for keyword in ['bread', 'bakery', 'food', 'kitchen']):
+                if found("fallback_food", keywords.path):
                     unique_tags = ['food', 'bakery', 'photo', 'content']
-                elif any(keyword in context_hints for keyword in ['people', 'person', 'portrait', 'staff']):
+                elif found("fallback_people", keywords.path):
                     unique_tags = ['person', 'people', 'photo', 'portrait']
-                elif any(keyword in context_hints for keyword in ['product', 'item', 'merchandise']):
+                elif found("fallback_product", keywords.path):
                     unique_tags = ['product', 'commercial', 'photo', 'item']
-                elif any(keyword in context_hints for keyword in ['event', 'party', 'celebration']):
+                elif found("fallback_event", keywords.path):
                     unique_tags = ['event', 'social', 'photo', 'occasion']
                 else:
                     unique_tags = ['photo', 'image', 'visual', 'content', 'media']
@@ -432,9 +434,9 @@ class CrowsEyeHandler:
         """
         self.signals.status_update.emit("Generating gallery based on content focus...")
         self.logger.info(f"Generating gallery with focus: '{prompt}' from {len(media_paths)} items.")
-        
-        # DEBUG: Log all input media paths
-        self.logger.info(f"DEBUG: Input media paths: {media_paths}")
+        trace = self.logger.isEnabledFor(logging.DEBUG)
+        if trace:
+            self.logger.debug(f"Input media paths: {media_paths}")
 
         prompt_keywords = self._extract_keywords(prompt)
         desired_count = self._extract_count(prompt)
@@ -446,98 +448,34 @@ class CrowsEyeHandler:
             self.signals.warning.emit("Gallery Generation", "Could not understand the focus. Please be more specific.")
             return []
 
-        scored_media = []
-        for path in media_paths:
-            score = 0
-            ai_tags = self._get_simulated_ai_tags(path)
-            caption = self.media_handler.get_caption(path) or ""
-            filename = os.path.basename(path).lower()
-            
-            # DEBUG: Log detailed analysis for each file
-            self.logger.info(f"DEBUG: Analyzing '{filename}' at path '{path}'")
-            self.logger.info(f"DEBUG: AI tags for '{filename}': {ai_tags}")
-            self.logger.info(f"DEBUG: Caption for '{filename}': '{caption}'")
-            
-            initial_score = score
-            
-            # Score for matching AI tags (exact and partial matches)
-            for keyword in prompt_keywords:
-                keyword_lower = keyword.lower()
-                keyword_score = 0
-                
-                # Exact AI tag match - highest score
-                if keyword_lower in [tag.lower() for tag in ai_tags]:
-                    keyword_score += 10
-                    self.logger.info(f"DEBUG: '{filename}' exact AI tag match for '{keyword}'. Score +10.")
-                
-                # Partial AI tag match - good score
-                elif any(keyword_lower in tag.lower() or tag.lower() in keyword_lower for tag in ai_tags):
-                    keyword_score += 8
-                    self.logger.info(f"DEBUG: '{filename}' partial AI tag match for '{keyword}'. Score +8.")
-                
-                # Caption match - medium score
-                if keyword_lower in caption.lower():
-                    keyword_score += 5
-                    self.logger.info(f"DEBUG: '{filename}' caption match for '{keyword}'. Score +5.")
-                
-                # Filename match - lower score but still relevant
-                if keyword_lower in filename:
-                    keyword_score += 3
-                    self.logger.info(f"DEBUG: '{filename}' filename match for '{keyword}'. Score +3.")
-                
-                score += keyword_score
-                if keyword_score > 0:
-                    self.logger.info(f"DEBUG: '{filename}' keyword '{keyword}' total contribution: +{keyword_score}")
-            
-            # Category bonuses for related searches
-            pre_bonus_score = score
-            score = score = self._apply_category_bonuses(score, prompt_keywords, ai_tags, filename)
-            bonus_added = score - pre_bonus_score
-            if bonus_added > 0:
-                self.logger.info(f"DEBUG: '{filename}' category bonuses added: +{bonus_added}")
-            
-            # Universal minimum score for any media that has relevant tags
-            if score == 0 and ai_tags:
-                # Give a small score to any media that might be somewhat relevant
-                # This ensures we don't get empty results for valid searches
-                generic_relevance = any(
-                    any(keyword.lower() in tag.lower() or tag.lower() in keyword.lower() 
-                        for tag in ai_tags) for keyword in prompt_keywords
-                )
-                if generic_relevance or any(keyword.lower() in ['photo', 'image', 'picture'] for keyword in prompt_keywords):
-                    score = 1
-                    self.logger.info(f"DEBUG: '{filename}' received minimal relevance score of 1.")
-            
-            # DEBUG: Log final score calculation
-            self.logger.info(f"DEBUG: '{filename}' FINAL SCORE: {score} (was {initial_score})")
-            
-            if score > 0:
-                scored_media.append((path, score))
-                self.logger.info(f"DEBUG: '{filename}' ADDED to results with score {score}")
-            else:
-                self.logger.info(f"DEBUG: '{filename}' REJECTED - no score for prompt '{prompt}'.")
+        # Score every candidate in one pass: AI tags (exact +10, partial +8), caption (+5),
+        # filename (+3) per keyword, plus category bonuses
+        item_tags = [self._get_simulated_ai_tags(path) for path in media_paths]
+        captions = [self.media_handler.get_caption(path) or "" for path in media_paths]
+        filenames = [os.path.basename(path) for path in media_paths]
+        scores = GalleryScorer(prompt_keywords).score(item_tags, captions, filenames)
 
-        # Sort by score in descending order
-        scored_media.sort(key=lambda x: x[1], reverse=True)
-        self.logger.info(f"Scored media: {[(os.path.basename(p), s) for p, s in scored_media]}")
-        
-        # DEBUG: More detailed results
-        self.logger.info(f"DEBUG: FINAL RESULTS - {len(scored_media)} items scored positively")
-        for path, score in scored_media:
-            self.logger.info(f"DEBUG: Result - {os.path.basename(path)}: {score} points")
+        if trace:
+            for path, tags, score in zip(media_paths, item_tags, scores.tolist()):
+                self.logger.debug(f"'{os.path.basename(path)}' tags {tags}: score {score}")
+
+        ranked = top_scored(scores)
+        self.logger.info(f"{len(ranked)} of {len(media_paths)} items scored positively")
+        if trace:
+            self.logger.debug(f"Scored media: {[(filenames[i], int(scores[i])) for i in ranked]}")
 
         selected_media = []
-        if not scored_media:
+        if not ranked:
             self.logger.info("No media items scored positively for the given focus.")
             self.signals.warning.emit("Gallery Generation", "No media matched your focus. Try a different focus or add more relevant media.")
             return []
 
         if desired_count is not None and desired_count > 0:
-            selected_media = [item[0] for item in scored_media[:desired_count]]
+            selected_media = [media_paths[i] for i in top_scored(scores, desired_count)]
             self.logger.info(f"Selected top {len(selected_media)} items based on desired count {desired_count}.")
         else:
             # If no specific count, select all positively scored items
-            selected_media = [item[0] for item in scored_media]
+            selected_media = [media_paths[i] for i in ranked]
             self.logger.info(f"No specific count given. Selecting all {len(selected_media)} positively scored items.")
             if desired_count is None:
                  self.signals.warning.emit("Gallery Generation", f"Could not determine a specific number from your focus, so selected all {len(selected_media)} matches. Try adding a number like 'pick 2 bread images'.")
@@ -548,37 +486,28 @@ class CrowsEyeHandler:
             enhanced_media_dir = Path(self.media_gallery_dir) / "enhanced"
             enhanced_media_dir.mkdir(parents=True, exist_ok=True)
 
+            # Decode, enhance and encode all photos in parallel; other media pass through
+            jobs = []
+            job_indices = []
             for original_path_str in selected_media:
                 original_path = Path(original_path_str)
-                file_ext = original_path.suffix.lower()
-                if file_ext in const.SUPPORTED_IMAGE_FORMATS:
-                    try:
-                        pil_image = self.media_handler.load_image(original_path_str)
-                        if pil_image:
-                            from .media_handler import apply_default_enhancement
-                            enhanced_image = apply_default_enhancement(pil_image)
-                            if enhanced_image:
-                                enhanced_filename = f"{original_path.stem}_enhanced{original_path.suffix}"
-                                enhanced_save_path = enhanced_media_dir / enhanced_filename
-                                
-                                success = self.media_handler.save_image(enhanced_image, str(enhanced_save_path))
-                                if success:
-                                    final_gallery_paths.append(str(enhanced_save_path))
-                                    self.logger.info(f"Saved enhanced image to {enhanced_save_path}")
-                                else:
-                                    self.logger.warning(f"Failed to save enhanced image for {original_path_str}. Using original.")
-                                    final_gallery_paths.append(original_path_str)
-                            else:
-                                self.logger.warning(f"Enhancement failed for {original_path_str}. Using original.")
-                                final_gallery_paths.append(original_path_str)
-                        else:
-                            self.logger.warning(f"Could not load image {original_path_str} for enhancement. Using original.")
-                            final_gallery_paths.append(original_path_str)
-                    except Exception as e:
-                        self.logger.exception(f"Error enhancing photo {original_path_str}: {e}. Using original.")
-                        final_gallery_paths.append(original_path_str)
+                if original_path.suffix.lower() in const.SUPPORTED_IMAGE_FORMATS:
+                    enhanced_filename = f"{original_path.stem}_enhanced{original_path.suffix}"
+                    jobs.append(BatchImageJob(original_path_str, str(enhanced_media_dir / enhanced_filename),
+                                              DEFAULT_ENHANCEMENT, flatten_alpha=True))
+                    job_indices.append(len(final_gallery_paths))
+                final_gallery_paths.append(original_path_str)
+
+            def report_progress(completed: int, total: int) -> None:
+                self.signals.status_update.emit(f"Enhancing photos for the gallery... ({completed}/{total})")
+
+            results = BatchImageEngine().process(jobs, progress_callback=report_progress)
+            for index, (success, enhanced_path, message) in zip(job_indices, results):
+                if success:
+                    final_gallery_paths[index] = enhanced_path
+                    self.logger.info(f"Saved enhanced image to {enhanced_path}")
                 else:
-                    final_gallery_paths.append(original_path_str)
+                    self.logger.warning(f"{message} for {final_gallery_paths[index]}. Using original.")
             self.signals.status_update.emit("Photo enhancement complete.")
         else:
             final_gallery_paths = selected_media
@@ -589,57 +518,6 @@ class CrowsEyeHandler:
         
         return final_gallery_paths
     
-    def _apply_category_bonuses(self, score: int, prompt_keywords: List[str], ai_tags: List[str], filename: str) -> int:
-        """Apply category-specific bonuses to improve search relevance."""
-        # Food & Culinary bonuses
-        food_keywords = ['bread', 'food', 'bakery', 'baked', 'goods', 'pastry', 'cake', 'dessert']
-        food_related_keywords = ['eat', 'delicious', 'fresh', 'artisan', 'homemade', 'organic']
-        
-        # People & Portrait bonuses  
-        people_keywords = ['people', 'person', 'man', 'woman', 'face', 'portrait', 'selfie', 'group', 'staff', 'team', 'customer']
-        
-        # Business & Location bonuses
-        business_keywords = ['shop', 'store', 'location', 'interior', 'exterior', 'building', 'commercial']
-        
-        # Product & Marketing bonuses
-        product_keywords = ['product', 'item', 'merchandise', 'brand', 'marketing', 'promotion']
-        
-        # Event & Social bonuses
-        event_keywords = ['event', 'party', 'celebration', 'social', 'gathering', 'occasion']
-        
-        for keyword in prompt_keywords:
-            keyword_lower = keyword.lower()
-            
-            # Food category bonuses
-            if keyword_lower in food_keywords and any(tag.lower() in food_keywords for tag in ai_tags):
-                score += 5
-                self.logger.debug(f"'{filename}' food category bonus for '{keyword}'. Score +5.")
-            elif keyword_lower in food_related_keywords and any(tag.lower() in ['food', 'bakery', 'baked goods'] for tag in ai_tags):
-                score += 3
-                self.logger.debug(f"'{filename}' food-related bonus for '{keyword}'. Score +3.")
-            
-            # People category bonuses
-            elif keyword_lower in people_keywords and any(tag.lower() in ['person', 'people', 'portrait', 'human'] for tag in ai_tags):
-                score += 7
-                self.logger.debug(f"'{filename}' people category bonus for '{keyword}'. Score +7.")
-            
-            # Business category bonuses
-            elif keyword_lower in business_keywords and any(tag.lower() in ['business', 'commercial', 'location'] for tag in ai_tags):
-                score += 4
-                self.logger.debug(f"'{filename}' business category bonus for '{keyword}'. Score +4.")
-            
-            # Product category bonuses
-            elif keyword_lower in product_keywords and any(tag.lower() in ['product', 'merchandise', 'commercial'] for tag in ai_tags):
-                score += 4
-                self.logger.debug(f"'{filename}' product category bonus for '{keyword}'. Score +4.")
-            
-            # Event category bonuses
-            elif keyword_lower in event_keywords and any(tag.lower() in ['event', 'social', 'celebration', 'occasion'] for tag in ai_tags):
-                score += 4
-                self.logger.debug(f"'{filename}' event category bonus for '{keyword}'. Score +4.")
-        
-        return score
-    
     def generate_caption(self, media_paths: List[str], tone_prompt: str = "") -> str:
         """
         Generate a caption for selected media, considering content and tone.
@@ -887,6 +765,7 @@ class CrowsEyeHandler:
                 success = False
             
             self._remove_from_galleries(media_path)
+            self._unindex_media("", media_path)
             
             if os.path.exists(media_path) and self.media_gallery_dir in media_path:
                 try:
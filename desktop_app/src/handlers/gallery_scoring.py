@@ -0,0 +1,151 @@
+"""
+Vectorized relevance scoring for gallery generation.
+Tags are normalized once into integer IDs; keyword/tag matches are decided
+over the (small) tag vocabulary and spread to items through a sparse
+item x tag incidence, so a whole library is scored in a few NumPy passes.
+"""
+import heapq
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+# Points per prompt keyword
+TAG_EXACT_SCORE = 10
+TAG_PARTIAL_SCORE = 8
+CAPTION_SCORE = 5
+FILENAME_SCORE = 3
+
+# Tagged media still qualify for generic prompts ("best 3 photos")
+MINIMAL_SCORE = 1
+GENERIC_KEYWORDS = ('photo', 'image', 'picture')
+
+_FOOD_KEYWORDS = frozenset(['bread', 'food', 'bakery', 'baked', 'goods', 'pastry', 'cake', 'dessert'])
+
+# (prompt keywords, item tags earning the bonus, bonus); for each keyword the
+# first category whose keywords and tags both match applies
+CATEGORY_BONUSES = (
+    # Food & Culinary
+    (_FOOD_KEYWORDS, _FOOD_KEYWORDS, 5),
+    (frozenset(['eat', 'delicious', 'fresh', 'artisan', 'homemade', 'organic']),
+     frozenset(['food', 'bakery', 'baked goods']), 3),
+    # People & Portrait
+    (frozenset(['people', 'person', 'man', 'woman', 'face', 'portrait', 'selfie', 'group', 'staff', 'team', 'customer']),
+     frozenset(['person', 'people', 'portrait', 'human']), 7),
+    # Business & Location
+    (frozenset(['shop', 'store', 'location', 'interior', 'exterior', 'building', 'commercial']),
+     frozenset(['business', 'commercial', 'location']), 4),
+    # Product & Marketing
+    (frozenset(['product', 'item', 'merchandise', 'brand', 'marketing', 'promotion']),
+     frozenset(['product', 'merchandise', 'commercial']), 4),
+    # Event & Social
+    (frozenset(['event', 'party', 'celebration', 'social', 'gathering', 'occasion']),
+     frozenset(['event', 'social', 'celebration', 'occasion']), 4),
+)
+
+
+class GalleryScorer:
+    """Scores media against the keywords of a gallery prompt."""
+
+    def __init__(self, prompt_keywords: Sequence[str]):
+        """
+        Initialize the scorer.
+
+        Args:
+            prompt_keywords: Keywords extracted from the gallery prompt
+        """
+        self.keywords = [keyword.lower() for keyword in prompt_keywords]
+
+    def score(self, item_tags: Sequence[Sequence[str]], captions: Sequence[str],
+              filenames: Sequence[str]) -> np.ndarray:
+        """
+        Relevance scores of a batch of media.
+
+        Args:
+            item_tags: AI tags of each item
+            captions: Caption of each item
+            filenames: Base filename of each item
+
+        Returns:
+            np.ndarray: Integer score per item (0 means not relevant)
+        """
+        count = len(item_tags)
+        scores = np.zeros(count, dtype=np.int64)
+        if count == 0 or not self.keywords:
+            return scores
+
+        # Sparse incidence: item_ids[i] carries tag tag_ids[i]
+        vocabulary = {}
+        item_ids, tag_ids = [], []
+        for item, tags in enumerate(item_tags):
+            for tag in tags:
+                item_ids.append(item)
+                tag_ids.append(vocabulary.setdefault(tag.lower(), len(vocabulary)))
+        item_ids = np.asarray(item_ids, dtype=np.intp)
+        tag_ids = np.asarray(tag_ids, dtype=np.intp)
+        terms = list(vocabulary)
+
+        # Per keyword and tag: 2 = exact match, 1 = partial match (either contains the other)
+        tag_match = np.array(
+            [[2 if keyword == term else 1 if keyword in term or term in keyword else 0
+              for keyword in self.keywords] for term in terms],
+            dtype=np.int8
+        ).reshape(len(terms), len(self.keywords))
+        item_match = np.zeros((count, len(self.keywords)), dtype=np.int8)
+        np.maximum.at(item_match, item_ids, tag_match[tag_ids])
+        scores += np.where(item_match == 2, TAG_EXACT_SCORE,
+                           np.where(item_match == 1, TAG_PARTIAL_SCORE, 0)).sum(axis=1)
+
+        captions = np.array([caption.lower() for caption in captions], dtype=np.str_)
+        filenames = np.array([filename.lower() for filename in filenames], dtype=np.str_)
+        for keyword in self.keywords:
+            scores += CAPTION_SCORE * (np.char.find(captions, keyword) >= 0)
+            scores += FILENAME_SCORE * (np.char.find(filenames, keyword) >= 0)
+
+        scores += self._category_bonuses(count, terms, item_ids, tag_ids)
+
+        if any(keyword in GENERIC_KEYWORDS for keyword in self.keywords):
+            has_tags = np.bincount(item_ids, minlength=count) > 0
+            scores[(scores == 0) & has_tags] = MINIMAL_SCORE
+
+        return scores
+
+    def _category_bonuses(self, count: int, terms: List[str], item_ids: np.ndarray,
+                          tag_ids: np.ndarray) -> np.ndarray:
+        """Summed category bonuses per item."""
+        bonuses = np.zeros(count, dtype=np.int64)
+        has_category = {}
+        for keyword in self.keywords:
+            applied = np.zeros(count, dtype=bool)
+            for index, (keywords, tags, bonus) in enumerate(CATEGORY_BONUSES):
+                if keyword not in keywords:
+                    continue
+                if index not in has_category:
+                    term_in_category = np.array([term in tags for term in terms], dtype=bool)
+                    has_category[index] = np.zeros(count, dtype=bool)
+                    if len(terms):
+                        has_category[index][item_ids[term_in_category[tag_ids]]] = True
+                apply = has_category[index] & ~applied
+                bonuses[apply] += bonus
+                applied |= apply
+        return bonuses
+
+
+def top_scored(scores: np.ndarray, count: Optional[int] = None) -> List[int]:
+    """
+    Indices of the positively scored items, best first.
+
+    Ties keep their input order.
+
+    Args:
+        scores: Scores from GalleryScorer.score
+        count: Number of items wanted (None or 0 for all)
+
+    Returns:
+        list: Item indices
+    """
+    score_list = scores.tolist()
+    candidates = np.flatnonzero(scores > 0).tolist()
+    if count:
+        # nlargest is stable, like the full sort below
+        return heapq.nlargest(count, candidates, key=score_list.__getitem__)
+    return sorted(candidates, key=score_list.__getitem__, reverse=True)
@@ -3,19 +3,23 @@ Library Manager for handling media library items.
 Consolidates functionality from library_manager.py and related files.
 """
 import os
-import json
 import uuid
 import shutil
 import logging
+import threading
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional
 from pathlib import Path
 
 from PIL import Image
+from PySide6.QtCore import QObject, Signal
 
 from src.config import constants # Added import
 from src.handlers.media_handler import MediaHandler  # Add MediaHandler import
 from src.models.app_state import AppState  # Import AppState
+from src.handlers.library_index import LibraryIndex
+from src.handlers.library_metadata import MetadataIndexer
+from src.handlers.library_store import LibraryStore
 
 # Define a minimal mock AppState for MediaHandler
 class MockAppState:
@@ -29,9 +33,19 @@ class MockAppState:
         self.current_caption = ""
         self.context_files = []
         
+class LibrarySignals(QObject):
+    """Library item changes, shared by every LibraryManager in the process."""
+    item_added = Signal(str, str, object)  # Item type, path, copy of the item
+    item_updated = Signal(str, str, object)  # Item type, path, copy of the item
+    item_removed = Signal(str, str)  # Item type, path
+
 class LibraryManager:
     """Manages the media library functionality."""
     
+    # Dialogs open their own managers on the same library, so changes are
+    # reported on one shared object
+    signals = LibrarySignals()
+    
     def __init__(self):
         """Initialize the library manager."""
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -41,33 +55,41 @@ class LibraryManager:
         self.images_dir = self.library_dir / "images"
         self.data_dir = self.library_dir / "data"
         self.library_file = self.data_dir / "library.json"
+        self.library_db_file = self.data_dir / "library.db"
         
         # Ensure directories exist
         self.images_dir.mkdir(parents=True, exist_ok=True)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
         # Load library data
+        self.store = LibraryStore(self.library_db_file)
         self.library_data = self._load_library_data()
         
+        # Sorted date_added and per-type indexes for paged listings
+        self.index = LibraryIndex()
+        self.index.rebuild(self.library_data["items"])
+        
+        # File details are read in the background and persisted, never on read paths
+        self._items_lock = threading.RLock()  # Guards item dicts shared with indexer threads
+        self.metadata_indexer = MetadataIndexer(self._apply_metadata)
+        self._backfill_metadata()
+        
         # Create a media handler instance with a mock AppState
         mock_app_state = MockAppState()
         self.media_handler = MediaHandler(mock_app_state)
         
     def _load_library_data(self) -> Dict[str, Any]:
-        """Load library data from the JSON file."""
+        """Load library data from the database, importing library.json on first run."""
         try:
-            if self.library_file.exists():
-                with open(self.library_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                # Initialize with empty structure
-                initial_data = {
-                    "version": "1.0",
-                    "items": {},
-                    "collections": {}
-                }
-                self._save_library_data(initial_data)
-                return initial_data
+            if self.store.import_json(self.library_file):
+                self.logger.info(f"Migrated {self.library_file} to {self.library_db_file}")
+            
+            items, collections = self.store.load()
+            return {
+                "version": "1.0",
+                "items": items,
+                "collections": collections
+            }
                 
         except Exception as e:
             self.logger.error(f"Error loading library data: {e}")
@@ -78,14 +100,13 @@ class LibraryManager:
                 "collections": {}
             }
             
-    def _save_library_data(self, data: Dict[str, Any]) -> bool:
-        """Save library data to the JSON file."""
+    def _save_item(self, item: Dict[str, Any]) -> bool:
+        """Persist a single item row."""
         try:
-            with open(self.library_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4)
+            self.store.put_item(item)
             return True
         except Exception as e:
-            self.logger.error(f"Error saving library data: {e}")
+            self.logger.error(f"Error saving library item {item.get('id')}: {e}")
             return False
     
     def get_current_timestamp(self) -> str:
@@ -183,9 +204,12 @@ class LibraryManager:
             
             # Add to library data
             self.library_data["items"][item_id] = item_data
+            self.index.add(item_id, item_data)
             
             # Save library data
-            self._save_library_data(self.library_data)
+            self._save_item(item_data)
+            self.metadata_indexer.submit(item_id, str(dest_path), item_type)
+            self.signals.item_added.emit(item_type, item_data["path"], dict(item_data))
             
             return item_data
                 
@@ -245,9 +269,12 @@ class LibraryManager:
             
             # Add to library data
             self.library_data["items"][item_id] = item_data
+            self.index.add(item_id, item_data)
             
             # Save library data
-            self._save_library_data(self.library_data)
+            self._save_item(item_data)
+            self.metadata_indexer.submit(item_id, str(dest_path), item_type)
+            self.signals.item_added.emit(item_type, item_data["path"], dict(item_data))
             
             return item_id
                 
@@ -284,29 +311,11 @@ class LibraryManager:
             dict: Item data, or None if not found
         """
         try:
-            item = self.library_data["items"].get(item_id)
-            if item:
-                # Ensure path is set
-                if "path" not in item and "filename" in item:
-                    file_path = self.images_dir / item["filename"]
-                    item["path"] = str(file_path.absolute())
-                
-                # Ensure dimensions and size are set
-                if "dimensions" not in item and "path" in item:
-                    try:
-                        with Image.open(item["path"]) as img:
-                            item["dimensions"] = [img.width, img.height]
-                    except:
-                        pass
-                        
-                if "size_str" not in item and "path" in item:
-                    try:
-                        size_bytes = os.path.getsize(item["path"])
-                        item["size_str"] = f"{size_bytes / 1024:.1f} KB"
-                    except:
-                        pass
-                        
-            return item
+            with self._items_lock:
+                item = self.library_data["items"].get(item_id)
+                if item:
+                    self._ensure_item_details(item)
+                return item
         except Exception as e:
             self.logger.error(f"Error getting item {item_id}: {e}")
             return None
@@ -316,40 +325,67 @@ class LibraryManager:
         Get all items from the library.
         
         Returns:
-            list: List of all item data
+            list: List of all item data, newest first
+        """
+        return self.query_items()
+    
+    def query_items(self, item_types: Optional[str | List[str]] = None, sort_by: str = "date_added",
+                    descending: bool = True, offset: int = 0, limit: Optional[int] = None,
+                    where: Optional[Callable[[Dict[str, Any]], bool]] = None) -> List[Dict[str, Any]]:
+        """
+        Get one page of library items.
+        
+        Sorting by date_added without a where filter is served straight from
+        the index, so the cost depends on the page size, not the library size.
+        Other sort keys or a where filter scan the matching items.
+        
+        Args:
+            item_types: Item type or list of types to include (None for all)
+            sort_by: Item field to sort by
+            descending: Sort in descending order (newest first for date_added)
+            offset: Number of matching items to skip
+            limit: Maximum number of items to return (None for all)
+            where: Optional predicate an item must satisfy
+            
+        Returns:
+            list: Copies of the matching item data
         """
         try:
-            items = list(self.library_data["items"].values())
+            if isinstance(item_types, str):
+                item_types = [item_types]
+            items = self.library_data["items"]
             
-            # Ensure all items have path, dimensions, and size info
-            for item in items:
-                # Add path if missing
-                if "path" not in item and "filename" in item:
-                    file_path = self.images_dir / item["filename"]
-                    item["path"] = str(file_path.absolute())
-                
-                # Add dimensions if missing
-                if "dimensions" not in item and "path" in item:
-                    try:
-                        with Image.open(item["path"]) as img:
-                            item["dimensions"] = [img.width, img.height]
-                    except:
-                        item["dimensions"] = [0, 0]
-                
-                # Add size if missing
-                if "size_str" not in item and "path" in item:
-                    try:
-                        size_bytes = os.path.getsize(item["path"])
-                        item["size_str"] = f"{size_bytes / 1024:.1f} KB"
-                    except:
-                        item["size_str"] = "Unknown"
-            
-            # Sort by date added (newest first)
-            items.sort(key=lambda x: x.get("date_added", ""), reverse=True)
-            return items
+            if sort_by == "date_added" and where is None:
+                item_ids = self.index.page(item_types, descending, offset, limit)
+            else:
+                item_ids = self.index.page(item_types, descending)
+                if where is not None:
+                    item_ids = [item_id for item_id in item_ids if where(items[item_id])]
+                if sort_by != "date_added":
+                    item_ids.sort(key=lambda item_id: str(items[item_id].get(sort_by) or ""),
+                                  reverse=descending)
+                stop = None if limit is None else offset + limit
+                item_ids = item_ids[offset:stop]
+            
+            with self._items_lock:
+                return [self._ensure_item_details(items[item_id].copy()) for item_id in item_ids]
         except Exception as e:
-            self.logger.error(f"Error getting all items: {e}")
+            self.logger.error(f"Error querying items: {e}")
             return []
+    
+    def count_items(self, item_types: Optional[str | List[str]] = None) -> int:
+        """
+        Count library items, optionally only of the given type(s).
+        
+        Args:
+            item_types: Item type or list of types to include (None for all)
+            
+        Returns:
+            int: Number of matching items
+        """
+        if isinstance(item_types, str):
+            item_types = [item_types]
+        return self.index.count(item_types)
             
     def update_item(self, item_id: str, updates: Dict[str, Any]) -> bool:
         """
@@ -364,12 +400,20 @@ class LibraryManager:
         """
         try:
             if item_id in self.library_data["items"]:
-                # Update specified fields
-                for key, value in updates.items():
-                    self.library_data["items"][item_id][key] = value
-                
-                # Save library data
-                return self._save_library_data(self.library_data)
+                with self._items_lock:
+                    item = self.library_data["items"][item_id]
+                    # Update specified fields
+                    for key, value in updates.items():
+                        item[key] = value
+                    self.index.add(item_id, item)
+                    item_type = item.get("type", "unknown")
+                    details = self._ensure_item_details(item.copy())
+                    
+                    # Save library data
+                    saved = self._save_item(item)
+                if saved:
+                    self.signals.item_updated.emit(item_type, details.get("path", ""), details)
+                return saved
             return False
         except Exception as e:
             self.logger.error(f"Error updating item {item_id}: {e}")
@@ -386,27 +430,35 @@ class LibraryManager:
             bool: True if successful, False otherwise
         """
         try:
-            # Check if item exists
-            if item_id not in self.library_data["items"]:
-                self.logger.warning(f"Item not found: {item_id}")
-                return False
-                
-            # Get the item
-            item = self.library_data["items"][item_id]
-            
-            # Delete the image file if it exists
-            if "filename" in item:
-                file_path = self.images_dir / item["filename"]
-                if file_path.exists():
-                    file_path.unlink()
-                    self.logger.info(f"Deleted image file: {file_path}")
+            # Hold the lock throughout so an indexer thread cannot write the row back
+            with self._items_lock:
+                # Check if item exists
+                if item_id not in self.library_data["items"]:
+                    self.logger.warning(f"Item not found: {item_id}")
+                    return False
                     
-            # Remove from library data
-            del self.library_data["items"][item_id]
-            
-            # Save library data
-            self._save_library_data(self.library_data)
+                # Get the item
+                item = self.library_data["items"][item_id]
+                
+                # Delete the image file if it exists
+                if "filename" in item:
+                    file_path = self.images_dir / item["filename"]
+                    if file_path.exists():
+                        file_path.unlink()
+                        self.logger.info(f"Deleted image file: {file_path}")
+                        
+                # Remove from library data (collection memberships are removed with the row)
+                del self.library_data["items"][item_id]
+                self.index.remove(item_id)
+                for collection in self.library_data["collections"].values():
+                    if item_id in collection["items"]:
+                        collection["items"].remove(item_id)
+                
+                # Save library data
+                self.store.delete_item(item_id)
             
+            path = self._ensure_item_details(item.copy()).get("path", "")
+            self.signals.item_removed.emit(item.get("type", "unknown"), path)
             self.logger.info(f"Removed item from library: {item_id}")
             return True
             
@@ -473,7 +525,7 @@ class LibraryManager:
             self.library_data["collections"][collection_id] = collection_data
             
             # Save library data
-            self._save_library_data(self.library_data)
+            self.store.put_collection(collection_data)
             
             return collection_id
             
@@ -498,11 +550,12 @@ class LibraryManager:
                 
                 # Check if item is already in collection
                 if item_id not in self.library_data["collections"][collection_id]["items"]:
+                    # Save library data
+                    self.store.add_collection_item(collection_id, item_id)
+                    
                     # Add item to collection
                     self.library_data["collections"][collection_id]["items"].append(item_id)
-                    
-                    # Save library data
-                    return self._save_library_data(self.library_data)
+                    return True
                     
                 return True  # Item already in collection
                 
@@ -513,59 +566,49 @@ class LibraryManager:
 
     # --- Item Retrieval by Type ---
     def _ensure_item_details(self, item: Dict[str, Any]) -> Dict[str, Any]:
-        """Helper to ensure path, dimensions, and size are set for an item."""
+        """
+        Helper to ensure path, dimensions, and size are set for an item.
+        
+        Only fills placeholders; the real values are read by the metadata
+        indexer, so this never touches the disk. Call it with _items_lock
+        held when ``item`` is the shared library dict.
+        """
         if "path" not in item and "filename" in item:
             file_path = self.images_dir / item["filename"]
             item["path"] = str(file_path.absolute())
         
-        item_type = item.get("type", "unknown")
+        item.setdefault("dimensions", [None, None])
+        item.setdefault("size_str", "Unknown")
+        return item
 
-        if "dimensions" not in item and "path" in item and item_type not in ["raw_video", "post_ready_video"]:
-            try:
-                with Image.open(item["path"]) as img:
-                    item["dimensions"] = [img.width, img.height]
-            except Exception:
-                item["dimensions"] = [None, None] # Use None for consistency
-        elif item_type in ["raw_video", "post_ready_video"] and "dimensions" not in item:
-             item["dimensions"] = [None, None] # Videos might not have dimensions initially
+    def _backfill_metadata(self):
+        """Queue items whose file details have never been indexed."""
+        for item_id, item in list(self.library_data["items"].items()):
+            if "mtime" in item:
+                continue
+            path = item.get("path")
+            if not path and "filename" in item:
+                path = str((self.images_dir / item["filename"]).absolute())
+            if path:
+                self.metadata_indexer.submit(item_id, path, item.get("type", "unknown"))
 
-        if "size_str" not in item and "path" in item and Path(item["path"]).exists():
-            try:
-                size_bytes = os.path.getsize(item["path"])
-                item["size_str"] = f"{size_bytes / 1024:.1f} KB"
-            except Exception:
-                item["size_str"] = "Unknown"
-        elif "size_str" not in item: # If path doesn't exist or other issue
-            item["size_str"] = "Unknown"
-            
-        return item
+    def _apply_metadata(self, item_id: str, metadata: Dict[str, Any]):
+        """Store indexed file details on an item (called from indexer threads)."""
+        with self._items_lock:
+            item = self.library_data["items"].get(item_id)
+            if item is None:
+                return  # Removed while it was being indexed
+            item.update(metadata)
+            self._save_item(item)
 
     def get_items_by_type(self, item_type_or_types: str | List[str]) -> List[Dict[str, Any]]:
         """Get items filtered by a specific type or list of types."""
-        try:
-            all_items = list(self.library_data["items"].values())
-            
-            types_to_match = []
-            if isinstance(item_type_or_types, str):
-                types_to_match.append(item_type_or_types)
-            elif isinstance(item_type_or_types, list):
-                types_to_match = item_type_or_types
-            else:
-                self.logger.warning("Invalid type for item_type_or_types in get_items_by_type")
-                return []
-
-            filtered_items = [
-                self._ensure_item_details(item.copy()) 
-                for item in all_items 
-                if item.get("type") in types_to_match
-            ]
-            
-            # Sort by date added (newest first)
-            filtered_items.sort(key=lambda x: x.get("date_added", ""), reverse=True)
-            return filtered_items
-        except Exception as e:
-            self.logger.error(f"Error in get_items_by_type: {e}")
+        if not isinstance(item_type_or_types, (str, list)):
+            self.logger.warning("Invalid type for item_type_or_types in get_items_by_type")
             return []
+        
+        # Sorted by date added (newest first)
+        return self.query_items(item_type_or_types)
 
     def get_raw_photos(self) -> List[Dict[str, Any]]:
         """Get all raw photo items."""
@@ -0,0 +1,115 @@
+"""
+In-memory secondary indexes over the media library.
+Keeps item IDs sorted by date_added, overall and per item type, so a page of
+a listing is a slice of a maintained list rather than a scan and sort of the
+whole library.
+"""
+import heapq
+from bisect import bisect_left, insort
+from itertools import islice
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+# (date_added, item_id); ties on date fall back to ID so the order is stable
+IndexKey = Tuple[str, str]
+
+
+class LibraryIndex:
+    """Sorted date_added index plus a type -> sorted IDs map."""
+
+    def __init__(self):
+        """Initialize empty indexes."""
+        self._by_date: List[IndexKey] = []
+        self._by_type: Dict[str, List[IndexKey]] = {}
+        self._keys: Dict[str, Tuple[str, IndexKey]] = {}  # item_id -> (type, key)
+
+    def __len__(self) -> int:
+        return len(self._by_date)
+
+    def rebuild(self, items: Dict[str, Dict[str, Any]]):
+        """
+        Rebuild all indexes from the library's items.
+
+        Args:
+            items: Item dicts keyed by ID
+        """
+        self._keys = {item_id: (item.get("type", "unknown"), self._key(item_id, item))
+                      for item_id, item in items.items()}
+        self._by_date = sorted(key for _, key in self._keys.values())
+        self._by_type = {}
+        for item_type, key in self._keys.values():
+            self._by_type.setdefault(item_type, []).append(key)
+        for keys in self._by_type.values():
+            keys.sort()
+
+    def add(self, item_id: str, item: Dict[str, Any]):
+        """Index a new item, or re-index one whose type or date changed."""
+        item_type = item.get("type", "unknown")
+        key = self._key(item_id, item)
+        if self._keys.get(item_id) == (item_type, key):
+            return
+        self.remove(item_id)
+        self._keys[item_id] = (item_type, key)
+        insort(self._by_date, key)
+        insort(self._by_type.setdefault(item_type, []), key)
+
+    def remove(self, item_id: str):
+        """Drop an item from the indexes (no-op if not indexed)."""
+        entry = self._keys.pop(item_id, None)
+        if entry is None:
+            return
+        item_type, key = entry
+        self._discard(self._by_date, key)
+        self._discard(self._by_type.get(item_type, []), key)
+
+    def count(self, item_types: Optional[Iterable[str]] = None) -> int:
+        """Number of items, optionally only of the given types."""
+        if item_types is None:
+            return len(self._by_date)
+        return sum(len(self._by_type.get(item_type, [])) for item_type in set(item_types))
+
+    def page(self, item_types: Optional[Iterable[str]] = None, descending: bool = True,
+             offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """
+        IDs of one page of items in date_added order.
+
+        Costs O(offset + limit) for a single type or no filter, plus a merge
+        step per extra type; the library size does not matter.
+
+        Args:
+            item_types: Types to include (None for all)
+            descending: Newest first when True
+            offset: Number of matching items to skip
+            limit: Maximum number of IDs to return (None for all)
+
+        Returns:
+            list: Item IDs
+        """
+        offset = max(0, offset)
+        stop = None if limit is None else offset + max(0, limit)
+        if item_types is None:
+            lists = [self._by_date]
+        else:
+            lists = [self._by_type[item_type] for item_type in set(item_types) if item_type in self._by_type]
+
+        if len(lists) == 1:
+            keys = lists[0]
+            if descending:
+                end = len(keys) - offset
+                begin = 0 if stop is None else max(0, len(keys) - stop)
+                return [item_id for _, item_id in reversed(keys[begin:max(0, end)])]
+            return [item_id for _, item_id in keys[offset:stop]]
+
+        merged: Iterator[IndexKey] = heapq.merge(
+            *(reversed(keys) if descending else iter(keys) for keys in lists), reverse=descending
+        )
+        return [item_id for _, item_id in islice(merged, offset, stop)]
+
+    @staticmethod
+    def _key(item_id: str, item: Dict[str, Any]) -> IndexKey:
+        return (item.get("date_added") or "", item_id)
+
+    @staticmethod
+    def _discard(keys: List[IndexKey], key: IndexKey):
+        position = bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
@@ -0,0 +1,128 @@
+"""
+Background metadata indexing for library items.
+File details (dimensions, size, mtime, EXIF orientation, video duration) are
+read once in a thread pool and persisted with the item, so listing the
+library never touches the disk.
+"""
+import os
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional
+
+from PIL import Image
+
+# Fields written by extract_metadata; items lacking "mtime" have not been indexed
+METADATA_FIELDS = ("dimensions", "size_bytes", "size_str", "mtime", "orientation", "duration")
+
+# EXIF tag holding the camera orientation
+EXIF_ORIENTATION = 274
+
+VIDEO_TYPES = ("raw_video", "post_ready_video")
+
+
+def format_size(size_bytes: int) -> str:
+    """Human-readable size in the library's "12.3 KB" format."""
+    return f"{size_bytes / 1024:.1f} KB"
+
+
+def extract_metadata(path: str, item_type: str) -> Dict[str, Any]:
+    """
+    Read the file details of one library item.
+
+    Args:
+        path: Path to the media file
+        item_type: Library item type (videos are probed with OpenCV)
+
+    Returns:
+        dict: Values for METADATA_FIELDS; unreadable values are None
+    """
+    stat = os.stat(path)
+    metadata = {
+        "dimensions": [None, None],
+        "size_bytes": stat.st_size,
+        "size_str": format_size(stat.st_size),
+        "mtime": stat.st_mtime,
+        "orientation": None,
+        "duration": None,
+    }
+
+    if item_type in VIDEO_TYPES:
+        from .media_handler import get_video_details
+
+        details = get_video_details(path)
+        if details:
+            metadata["dimensions"] = [details["width"], details["height"]]
+            metadata["duration"] = details["duration"]
+    else:
+        # Opening only parses the header; pixel data is never decoded
+        with Image.open(path) as img:
+            metadata["dimensions"] = [img.width, img.height]
+            metadata["orientation"] = img.getexif().get(EXIF_ORIENTATION)
+
+    return metadata
+
+
+class MetadataIndexer:
+    """Extracts item metadata on a small thread pool."""
+
+    def __init__(self, on_indexed: Callable[[str, Dict[str, Any]], None], max_workers: int = 4):
+        """
+        Initialize the indexer.
+
+        Args:
+            on_indexed: Called from a worker thread as (item_id, metadata)
+                once an item's metadata has been read
+            max_workers: Number of worker threads
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.on_indexed = on_indexed
+        self.max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, item_id: str, path: str, item_type: str):
+        """Queue an item for indexing (ignored if it is already queued)."""
+        with self._lock:
+            if item_id in self._pending:
+                return
+            if self._executor is None:
+                # Started on first use so libraries with nothing to index cost no threads
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="library-metadata")
+            future = self._executor.submit(self._index, item_id, path, item_type)
+            self._pending[item_id] = future
+        future.add_done_callback(lambda _: self._done(item_id))
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until everything queued so far has been indexed."""
+        with self._lock:
+            futures: List[Future] = list(self._pending.values())
+        for future in futures:
+            try:
+                future.result(timeout=timeout)
+            except Exception:
+                pass
+
+    def shutdown(self):
+        """Stop the worker threads once queued items are done."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _index(self, item_id: str, path: str, item_type: str):
+        """Worker: extract and hand back one item's metadata."""
+        try:
+            metadata = extract_metadata(path, item_type)
+        except Exception as e:
+            self.logger.warning(f"Could not read metadata for {path}: {e}")
+            # Record the failure so the item isn't retried on every start
+            metadata = {"dimensions": [None, None], "size_bytes": None, "size_str": "Unknown",
+                        "mtime": None, "orientation": None, "duration": None}
+        self.on_indexed(item_id, metadata)
+
+    def _done(self, item_id: str):
+        with self._lock:
+            self._pending.pop(item_id, None)
@@ -0,0 +1,209 @@
+"""
+SQLite storage backend for the media library.
+Each item and collection is its own row, so a single mutation is one small
+transactional write instead of rewriting library.json, and a crash can no
+longer leave a half-written library behind.
+"""
+import os
+import json
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Any, Tuple
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS items (
+    id TEXT PRIMARY KEY,
+    type TEXT NOT NULL,
+    date_added TEXT NOT NULL DEFAULT '',
+    is_post_ready INTEGER NOT NULL DEFAULT 0,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_type ON items(type);
+CREATE INDEX IF NOT EXISTS idx_items_date_added ON items(date_added);
+CREATE INDEX IF NOT EXISTS idx_items_post_ready ON items(is_post_ready, date_added);
+CREATE TABLE IF NOT EXISTS collections (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    date_created TEXT NOT NULL DEFAULT '',
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS collection_items (
+    collection_id TEXT NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+    item_id TEXT NOT NULL REFERENCES items(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    PRIMARY KEY (collection_id, item_id)
+);
+CREATE INDEX IF NOT EXISTS idx_collection_items_item ON collection_items(item_id);
+"""
+
+
+class LibraryStore:
+    """Row-per-item SQLite store (WAL mode) behind LibraryManager."""
+
+    def __init__(self, db_path: Path):
+        """
+        Open (and if needed create) the library database.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.db_path = Path(db_path)
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        with self._conn:
+            self._conn.executescript(SCHEMA)
+            self._conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),)
+            )
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    # --- Loading ---
+    def load(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+        """
+        Load the whole library.
+
+        Returns:
+            Tuple of (items, collections) keyed by ID, in the same shape as
+            library.json; each collection's "items" lists its members in order
+        """
+        with self._lock:
+            items = {
+                item_id: json.loads(data)
+                for item_id, data in self._conn.execute("SELECT id, data FROM items")
+            }
+            collections = {
+                collection_id: json.loads(data)
+                for collection_id, data in self._conn.execute("SELECT id, data FROM collections")
+            }
+            for collection in collections.values():
+                collection["items"] = []
+            rows = self._conn.execute(
+                "SELECT collection_id, item_id FROM collection_items ORDER BY collection_id, position"
+            )
+            for collection_id, item_id in rows:
+                collections[collection_id]["items"].append(item_id)
+        return items, collections
+
+    # --- Items ---
+    def put_item(self, item: Dict[str, Any]):
+        """Insert or replace a single item row."""
+        item_type = item.get("type", "unknown")
+        row = (
+            item["id"],
+            item_type,
+            item.get("date_added") or "",
+            1 if item_type.startswith("post_ready") else 0,
+            json.dumps(item),
+        )
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO items (id, type, date_added, is_post_ready, data) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET type = excluded.type, date_added = excluded.date_added, "
+                "is_post_ready = excluded.is_post_ready, data = excluded.data",
+                row
+            )
+
+    def delete_item(self, item_id: str):
+        """Delete an item row and its collection memberships."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM items WHERE id = ?", (item_id,))
+
+    # --- Collections ---
+    def put_collection(self, collection: Dict[str, Any]):
+        """Insert or replace a collection row (membership is stored separately)."""
+        data = {key: value for key, value in collection.items() if key != "items"}
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO collections (id, name, date_created, data) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET name = excluded.name, "
+                "date_created = excluded.date_created, data = excluded.data",
+                (collection["id"], collection.get("name", ""), collection.get("date_created") or "",
+                 json.dumps(data))
+            )
+
+    def add_collection_item(self, collection_id: str, item_id: str):
+        """Append an item to the end of a collection."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO collection_items (collection_id, item_id, position) "
+                "SELECT ?, ?, COALESCE(MAX(position) + 1, 0) FROM collection_items WHERE collection_id = ?",
+                (collection_id, item_id, collection_id)
+            )
+
+    # --- One-time import ---
+    def import_json(self, json_path: Path) -> bool:
+        """
+        Import an existing library.json once, in a single transaction.
+
+        The JSON file is left in place as a backup; the import is recorded in
+        the database so it never runs twice.
+
+        Args:
+            json_path: Path to library.json
+
+        Returns:
+            bool: True if data was imported on this call
+        """
+        json_path = Path(json_path)
+        with self._lock:
+            imported = self._conn.execute("SELECT value FROM meta WHERE key = 'json_imported'").fetchone()
+        if imported or not json_path.exists():
+            return False
+
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Could not read {json_path} for import: {e}")
+            return False
+
+        items = data.get("items", {})
+        collections = data.get("collections", {})
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO items (id, type, date_added, is_post_ready, data) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (item_id, item.get("type", "unknown"), item.get("date_added") or "",
+                     1 if str(item.get("type", "")).startswith("post_ready") else 0,
+                     json.dumps(dict(item, id=item.get("id", item_id))))
+                    for item_id, item in items.items()
+                ]
+            )
+            for collection_id, collection in collections.items():
+                collection = dict(collection, id=collection.get("id", collection_id))
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO collections (id, name, date_created, data) VALUES (?, ?, ?, ?)",
+                    (collection_id, collection.get("name", ""), collection.get("date_created") or "",
+                     json.dumps({key: value for key, value in collection.items() if key != "items"}))
+                )
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO collection_items (collection_id, item_id, position) "
+                    "SELECT ?, ?, ? WHERE EXISTS (SELECT 1 FROM items WHERE id = ?)",
+                    [(collection_id, item_id, position, item_id)
+                     for position, item_id in enumerate(collection.get("items", []))]
+                )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_imported', ?)",
+                (os.path.abspath(json_path),)
+            )
+
+        self.logger.info(f"Imported {len(items)} items and {len(collections)} collections from {json_path}")
+        return True
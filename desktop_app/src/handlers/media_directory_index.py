@@ -0,0 +1,122 @@
+"""
+Incremental index of the raw media upload directory.
+The directory is listed once; after that QFileSystemWatcher change
+notifications are turned into added/removed deltas, so callers read the
+listing from memory and the UI can patch its grids instead of rebuilding.
+"""
+import os
+import logging
+import threading
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QFileSystemWatcher, QTimer, Signal
+
+PHOTO_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp')
+VIDEO_EXTENSIONS = ('.mp4', '.mov', '.avi', '.mkv', '.wmv')
+
+# Collapse bursts of change notifications (e.g. a multi-file upload) into one diff
+RESCAN_DELAY_MS = 200
+
+
+def media_category(filename: str) -> Optional[str]:
+    """'raw_photos', 'raw_videos' or None for a file name."""
+    file_ext = os.path.splitext(filename)[1].lower()
+    if file_ext in PHOTO_EXTENSIONS:
+        return "raw_photos"
+    if file_ext in VIDEO_EXTENSIONS:
+        return "raw_videos"
+    return None
+
+
+class MediaDirectoryIndex(QObject):
+    """In-memory listing of a media directory, kept current from file system events."""
+
+    media_added = Signal(str, str)  # category, path
+    media_removed = Signal(str, str)  # category, path
+
+    _instances: Dict[str, "MediaDirectoryIndex"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, directory: str) -> "MediaDirectoryIndex":
+        """Shared index for a directory, so every handler reuses one scan and watcher."""
+        key = os.path.normcase(os.path.abspath(directory))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(directory)
+            return cls._instances[key]
+
+    def __init__(self, directory: str, parent: Optional[QObject] = None):
+        """
+        Initialize and scan the directory.
+
+        Args:
+            directory: Directory to index (need not exist yet)
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.directory = directory
+        self._lock = threading.Lock()
+        # Per category, path -> None; dicts keep listing order with O(1) removal
+        self._media: Dict[str, Dict[str, None]] = {"raw_photos": {}, "raw_videos": {}}
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._schedule_rescan)
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(RESCAN_DELAY_MS)
+        self._rescan_timer.timeout.connect(self.rescan)
+
+        self.rescan()
+
+    def snapshot(self) -> Dict[str, List[str]]:
+        """
+        Current listing.
+
+        Returns:
+            Dict with keys 'raw_photos' and 'raw_videos' and media paths as values
+        """
+        if not self._watcher.directories():
+            # Directory did not exist at the last scan; pick it up once it does
+            self.rescan()
+        with self._lock:
+            return {category: list(paths) for category, paths in self._media.items()}
+
+    def rescan(self):
+        """Diff the directory against the index and emit the changes."""
+        current: Dict[str, str] = {}
+        if os.path.isdir(self.directory):
+            if not self._watcher.directories():
+                self._watcher.addPath(self.directory)
+            try:
+                with os.scandir(self.directory) as entries:
+                    for entry in entries:
+                        category = media_category(entry.name)
+                        if category and entry.is_file():
+                            current[os.path.join(self.directory, entry.name)] = category
+            except OSError as e:
+                self.logger.warning(f"Could not list {self.directory}: {e}")
+                return
+
+        added, removed = [], []
+        with self._lock:
+            for category, paths in self._media.items():
+                for path in [path for path in paths if current.get(path) != category]:
+                    del paths[path]
+                    removed.append((category, path))
+            for path, category in current.items():
+                if path not in self._media[category]:
+                    self._media[category][path] = None
+                    added.append((category, path))
+
+        # A rename arrives as a removal of the old name and an addition of the new one
+        for category, path in removed:
+            self.media_removed.emit(category, path)
+        for category, path in added:
+            self.media_added.emit(category, path)
+        if added or removed:
+            self.logger.debug(f"Media directory changed: +{len(added)} -{len(removed)}")
+
+    def _schedule_rescan(self, _path: str):
+        self._rescan_timer.start()
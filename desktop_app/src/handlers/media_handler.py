@@ -8,7 +8,6 @@ import json
 import logging
 import time
 import math
-import io
 import shutil
 from typing import Optional, Tuple, List, Dict, Any
 import re
@@ -19,73 +18,17 @@ from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont, ImageEnhance, ImageFilter
 import cv2
 import fitz  # PyMuPDF
-from PySide6.QtGui import QPixmap, QImage
 
 # Application-Specific Imports
 from ..config import constants as const
 from ..models.app_state import AppState
 from ..features.authentication.auth_handler import auth_handler
+from ..features.media_processing import image_kernels
+from ..utils.image_writer import write_image
 
 # --- Image Conversion Utilities ---
-def pil_to_qpixmap(pil_image: Image.Image) -> QPixmap:
-    """Converts a PIL Image to a QPixmap with guaranteed color fidelity and aspect ratio preservation."""
-    if pil_image is None:
-        return QPixmap()
-    
-    try:
-        # Make a copy to avoid altering the original
-        img = pil_image.copy()
-        original_width, original_height = img.size
-        
-        # METHOD 1: Using raw bytes conversion - generally fastest and most reliable
-        try:
-            if img.mode == 'RGBA':
-                qimage = QImage(
-                    img.tobytes('raw', 'RGBA'), 
-                    original_width, 
-                    original_height, 
-                    QImage.Format.Format_RGBA8888
-                )
-            else:
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                qimage = QImage(
-                    img.tobytes('raw', 'RGB'), 
-                    original_width, 
-                    original_height, 
-                    3 * original_width,
-                    QImage.Format.Format_RGB888
-                )
-            
-            if not qimage.isNull():
-                pixmap = QPixmap.fromImage(qimage)
-                # Set the device pixel ratio to 1.0 to ensure no scaling is applied
-                pixmap.setDevicePixelRatio(1.0)
-                return pixmap
-        except Exception as e:
-            logging.warning(f"Direct conversion failed with error: {e}")
-        
-        # METHOD 2: Using buffer approach (fallback) - ensure lossless conversion
-        try:
-            # Always use PNG for lossless conversion
-            buffer = io.BytesIO()
-            img.save(buffer, format='PNG', compress_level=0)
-            buffer.seek(0)
-            temp_pixmap = QPixmap()
-            if temp_pixmap.loadFromData(buffer.getvalue()):
-                # Set the device pixel ratio to 1.0 to ensure no scaling is applied
-                temp_pixmap.setDevicePixelRatio(1.0)
-                return temp_pixmap
-        except Exception as e:
-            logging.warning(f"Buffer method failed with error: {e}")
-        
-        logging.error("All PIL to QPixmap conversion methods failed")
-        return QPixmap()
-    
-    except Exception as e:
-        logging.exception(f"Unexpected error in PIL to QPixmap conversion: {e}")
-        return QPixmap()
+# Implemented in utils.image_conversion; re-exported here for existing callers
+from ..utils.image_conversion import pil_to_qpixmap
 
 # --- Media Status Management ---
 def load_media_status(app_state: Any, signals: Any) -> bool:
@@ -385,29 +328,10 @@ def apply_warmth(img: Image.Image, factor: float = 1.2) -> Image.Image:
 
 def apply_sepia_tone(img: Image.Image) -> Image.Image:
     """Applies a sepia tone effect to the image."""
-    # Ensure we're working with a copy
-    img = img.copy()
-    img = img.convert('RGB')
-    width, height = img.size
-    pixels = img.load()
-    
-    for x in range(width):
-        for y in range(height):
-            r, g, b = pixels[x, y]
-            tr = int(0.393*r + 0.769*g + 0.189*b)
-            tg = int(0.349*r + 0.686*g + 0.168*b)
-            tb = int(0.272*r + 0.534*g + 0.131*b)
-            pixels[x, y] = (
-                min(tr, 255),
-                min(tg, 255),
-                min(tb, 255)
-            )
-    return img
+    return image_kernels.sepia(img)
 
 def apply_vintage_effect(img: Image.Image) -> Image.Image:
     """Applies a vintage film effect to the image."""
-    import random
-    
     # Ensure we're working with a copy
     img = img.copy()
     
@@ -425,14 +349,7 @@ def apply_vintage_effect(img: Image.Image) -> Image.Image:
     img = enhancer.enhance(0.9)
     
     # Add slight noise - with higher quality approach
-    width, height = img.size
-    noise_img = Image.new('RGB', img.size, (0, 0, 0))
-    noise_pixels = noise_img.load()
-    
-    for x in range(width):
-        for y in range(height):
-            r = int(255 * (0.5 + 0.05 * (random.random() - 0.5)))
-            noise_pixels[x, y] = (r, r, r)
+    noise_img = image_kernels.uniform_noise(img.size, mean=0.5, amplitude=0.05)
     
     # Use more subtle blending for better quality
     img = Image.blend(img, noise_img, 0.03)
@@ -442,21 +359,9 @@ def apply_vignette(img: Image.Image, factor: float = 0.75) -> Image.Image:
     """Applies a vignette effect to the image."""
     # Ensure we're working with a copy
     img = img.copy()
-    width, height = img.size
-    
-    # Create a high quality mask
-    mask = Image.new('L', (width, height), 0)
-    
-    # Calculate vignette parameters
-    center_x, center_y = width // 2, height // 2
-    max_distance = math.sqrt(center_x**2 + center_y**2)
     
-    # Create higher quality radial gradient
-    for x in range(width):
-        for y in range(height):
-            distance = math.sqrt((x - center_x)**2 + (y - center_y)**2)
-            intensity = 255 * (1 - (distance / max_distance) * factor)
-            mask.putpixel((x, y), int(intensity))
+    # Precomputed radial gradient, cached per image size
+    mask = image_kernels.radial_mask(img.size, factor)
     
     # Preserve original mode
     original_mode = img.mode
@@ -757,33 +662,8 @@ class MediaHandler:
                     self.logger.error(f"Cannot create directory {directory}: {e}")
                     return False
             
-            # Determine format from filename if not provided
-            if not format:
-                _, ext = os.path.splitext(filepath.lower())
-                if ext in ('.jpg', '.jpeg'):
-                    format = 'JPEG'
-                elif ext in ('.png'):
-                    format = 'PNG'
-                elif ext in ('.webp'):
-                    format = 'WEBP'
-                elif ext in ('.bmp'):
-                    format = 'BMP'
-                elif ext in ('.gif'):
-                    format = 'GIF'
-                else:
-                    format = 'PNG'  # Default to PNG for best quality
-            
             # Save with high quality settings based on format
-            if format == 'JPEG':
-                image.save(filepath, format=format, quality=100, subsampling=0)
-            elif format == 'PNG':
-                # PNG with minimum compression (lossless, best quality)
-                image.save(filepath, format=format, compress_level=0)
-            elif format == 'WEBP':
-                image.save(filepath, format=format, quality=100, lossless=True)
-            else:
-                # Default save for other formats
-                image.save(filepath, format=format)
+            write_image(image, filepath, format)
             
             return True
         except Exception as e:
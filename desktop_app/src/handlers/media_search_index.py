@@ -0,0 +1,240 @@
+"""
+Inverted index for media search.
+Filenames, captions and tags are split into lowercase word tokens and mapped
+to the media that contain them, so a query looks up a handful of postings
+instead of rescanning every file's caption and tags. Postings are merged and
+ranked as NumPy arrays, and short prefixes keep their merged postings.
+"""
+import re
+from bisect import bisect_left, insort
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+# Relative weight of a match in each field
+FIELD_WEIGHTS = {"tags": 3.0, "filename": 2.0, "caption": 1.0}
+
+# Weight multipliers by how a query token matched an indexed term
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.6   # query "bre" -> term "bread"
+STEM_MATCH = 0.5     # query "breads" -> term "bread"
+
+# Suffixes stripped from a query token to find its stem ("baking" -> "bak"/"bake");
+# the stem must keep at least MIN_STEM_LENGTH characters
+STEM_SUFFIXES = ("ing", "es", "ed", "er", "s")
+SILENT_E_SUFFIXES = ("ing", "ed", "er")
+MIN_STEM_LENGTH = 3
+
+# Query tokens up to this length are a prefix of a large share of the
+# vocabulary, so their merged postings are maintained as media are indexed
+SHORT_PREFIX_LENGTH = 1
+
+# Added per matched query token; larger than any single token's weight, so
+# media matching more of the query always outrank those matching less
+MATCH_BONUS = 10.0
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Document numbers and weights of a set of postings
+Postings = Tuple[np.ndarray, np.ndarray]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens of a text."""
+    return TOKEN_PATTERN.findall(text.lower()) if text else []
+
+
+def stems(token: str) -> List[str]:
+    """Candidate stems of a query token, by stripping common suffixes."""
+    candidates = []
+    for suffix in STEM_SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= MIN_STEM_LENGTH:
+            stem = token[:-len(suffix)]
+            candidates.append(stem)
+            if suffix in SILENT_E_SUFFIXES:
+                candidates.append(stem + "e")
+    return candidates
+
+
+class MediaSearchIndex:
+    """Token -> media postings with prefix lookup and ranked multi-term queries."""
+
+    def __init__(self):
+        """Initialize an empty index."""
+        # Documents are numbered in insertion order; postings hold those numbers
+        # so ranking ties fall back to a cheap integer order
+        self._postings: Dict[str, Dict[int, float]] = {}  # term -> doc -> weight
+        self._vocabulary: List[str] = []  # sorted terms, for prefix ranges
+        self._doc_ids: Dict[str, int] = {}
+        self._doc_terms: Dict[int, Set[str]] = {}
+        self._paths = np.empty(0, dtype=object)  # doc -> path, None once removed
+        self._categories: Dict[str, str] = {}
+        self._next_id = 0
+        # Short token -> doc -> best weight over the terms it matches
+        self._prefix_postings: Dict[str, Dict[int, float]] = defaultdict(dict)
+        # Array forms of term and short-prefix postings, dropped when those change
+        self._arrays: Dict[str, Postings] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._doc_ids
+
+    def add(self, path: str, category: str, filename: str = "", caption: str = "",
+            tags: Iterable[str] = ()):
+        """
+        Index (or re-index) one media file.
+
+        Args:
+            path: Media path
+            category: Result category ('raw_photos', 'raw_videos' or 'finished_posts')
+            filename: File name
+            caption: Caption text
+            tags: AI tags
+        """
+        doc = self._doc_ids.get(path)
+        if doc is None:
+            doc = self._doc_ids[path] = self._next_id
+            if doc == len(self._paths):
+                grown = np.empty(max(16, 2 * doc), dtype=object)
+                grown[:doc] = self._paths
+                self._paths = grown
+            self._paths[doc] = path
+            self._next_id += 1
+        else:
+            self._drop_postings(doc)
+
+        weights: Dict[str, float] = defaultdict(float)
+        fields = (("filename", filename), ("caption", caption), ("tags", " ".join(tags)))
+        for field, text in fields:
+            for term in set(tokenize(text)):
+                weights[term] = max(weights[term], FIELD_WEIGHTS[field])
+
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                insort(self._vocabulary, term)
+            postings[doc] = weight
+            self._arrays.pop(term, None)
+            for prefix, factor in self._short_prefixes(term):
+                prefix_postings = self._prefix_postings[prefix]
+                if weight * factor > prefix_postings.get(doc, 0.0):
+                    prefix_postings[doc] = weight * factor
+                self._arrays.pop(" " + prefix, None)
+        self._doc_terms[doc] = set(weights)
+        self._categories[path] = category
+
+    def remove(self, path: str):
+        """Drop a media file from the index (no-op if not indexed)."""
+        doc = self._doc_ids.pop(path, None)
+        if doc is None:
+            return
+        self._drop_postings(doc)
+        del self._doc_terms[doc]
+        self._paths[doc] = None
+        del self._categories[path]
+
+    def category(self, path: str) -> Optional[str]:
+        """Category a path was indexed under."""
+        return self._categories.get(path)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Rank media against a query.
+
+        Each query token matches indexed terms exactly, as a prefix, or as a
+        longer form of a term. Media matching more tokens rank first, then by
+        summed field weight, then in the order they were indexed.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results (None for all)
+
+        Returns:
+            list: (path, score) pairs, best first; the score is MATCH_BONUS per
+            matched token plus the weights of the matches
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        scores = np.zeros(self._next_id)
+        for token in tokens:
+            docs, weights = self._match_token(token)
+            scores[docs] += weights + MATCH_BONUS
+
+        # Stable sort on the score over docs in ID order keeps ties in insertion order
+        matched = np.flatnonzero(scores)
+        ranked = matched[np.argsort(-scores[matched], kind="stable")]
+        if limit is not None:
+            ranked = ranked[:limit]
+        return list(zip(self._paths[ranked].tolist(), scores[ranked].tolist()))
+
+    def _match_token(self, token: str) -> Postings:
+        """Best weight per document for one query token."""
+        if len(token) <= SHORT_PREFIX_LENGTH:
+            # Too short to have a stem. Terms never contain spaces, so " b" caches
+            # the arrays of prefix "b" apart from those of a term "b"
+            return self._as_arrays(" " + token, self._prefix_postings.get(token, {}))
+
+        terms = self._prefix_terms(token)
+        # Indexed terms the token is a longer form of ("breads" finds "bread")
+        terms.extend((stem, STEM_MATCH) for stem in stems(token) if stem in self._postings)
+        return self._merge(terms)
+
+    def _prefix_terms(self, token: str) -> List[Tuple[str, float]]:
+        """The exact term and every term the token is a prefix of, with their factors."""
+        vocabulary = self._vocabulary
+        terms = []
+        position = bisect_left(vocabulary, token)
+        while position < len(vocabulary) and vocabulary[position].startswith(token):
+            term = vocabulary[position]
+            terms.append((term, EXACT_MATCH if term == token else PREFIX_MATCH))
+            position += 1
+        return terms
+
+    def _merge(self, terms: List[Tuple[str, float]]) -> Postings:
+        """Best factor-weighted score per document over several terms."""
+        if len(terms) == 1:
+            term, factor = terms[0]
+            docs, weights = self._as_arrays(term, self._postings[term])
+            return docs, weights * factor
+
+        best = np.zeros(self._next_id)
+        for term, factor in terms:
+            docs, weights = self._as_arrays(term, self._postings[term])
+            best[docs] = np.maximum(best[docs], weights * factor)
+        docs = np.flatnonzero(best)
+        return docs, best[docs]
+
+    def _as_arrays(self, key: str, postings: Dict[int, float]) -> Postings:
+        """Postings as (docs, weights) arrays, cached under ``key``."""
+        arrays = self._arrays.get(key)
+        if arrays is None:
+            arrays = self._arrays[key] = (
+                np.fromiter(postings.keys(), dtype=np.intp, count=len(postings)),
+                np.fromiter(postings.values(), dtype=np.float64, count=len(postings)),
+            )
+        return arrays
+
+    @staticmethod
+    def _short_prefixes(term: str) -> List[Tuple[str, float]]:
+        """Short query tokens that match a term, with their factors."""
+        return [(term[:length], EXACT_MATCH if length == len(term) else PREFIX_MATCH)
+                for length in range(1, min(SHORT_PREFIX_LENGTH, len(term)) + 1)]
+
+    def _drop_postings(self, doc: int):
+        for term in self._doc_terms[doc]:
+            postings = self._postings[term]
+            postings.pop(doc, None)
+            self._arrays.pop(term, None)
+            for prefix, _ in self._short_prefixes(term):
+                self._prefix_postings[prefix].pop(doc, None)
+                self._arrays.pop(" " + prefix, None)
+            if not postings:
+                del self._postings[term]
+                position = bisect_left(self._vocabulary, term)
+                del self._vocabulary[position]
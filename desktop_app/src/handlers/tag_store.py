@@ -0,0 +1,281 @@
+"""
+Memoized media tagging.
+TagStore computes a file's tags once and keeps them (in memory and in SQLite)
+until the file's mtime changes; KeywordMatcher finds every tagging keyword in
+a name with a single pass of one compiled pattern. TAG_PATTERNS holds the
+keyword groups shared by the heuristic taggers.
+"""
+import os
+import re
+import json
+import sqlite3
+import logging
+import threading
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tags (
+    tagger TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime REAL NOT NULL,
+    tags TEXT NOT NULL,
+    PRIMARY KEY (tagger, path)
+);
+"""
+
+
+class KeywordMatcher:
+    """All keywords occurring as substrings of a text, found in one scan."""
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compile the keywords into a single pattern.
+
+        Args:
+            keywords: Lowercase keywords to look for
+        """
+        keywords = sorted(set(keywords))
+        # Keywords share prefixes in a trie-shaped pattern, so each text position
+        # costs one walk down the trie; the lookahead reports overlapping matches
+        self._pattern = re.compile(f"(?=({self._trie_pattern(keywords)}))")
+        # The pattern reports the longest keyword at each position; the shorter
+        # keywords that are its prefixes matched there as well
+        self._expansions: Dict[str, FrozenSet[str]] = {
+            keyword: frozenset(other for other in keywords if keyword.startswith(other))
+            for keyword in keywords
+        }
+
+    def find(self, text: str) -> Set[str]:
+        """
+        Keywords contained in a text.
+
+        Args:
+            text: Text to scan (already lowercased)
+
+        Returns:
+            set: Keywords found anywhere in the text
+        """
+        found: Set[str] = set()
+        for match in self._pattern.finditer(text):
+            found |= self._expansions[match.group(1)]
+        return found
+
+    @staticmethod
+    def _trie_pattern(keywords: List[str]) -> str:
+        trie: Dict[str, dict] = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = {}  # end of a keyword
+
+        def build(node: Dict[str, dict]) -> str:
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+            # Optional (greedy) where a keyword ends here, so the longest keyword wins
+            return f"(?:{body})?" if "" in node else body
+
+        return build(trie)
+
+
+# Keyword groups behind the heuristic taggers (substring matches)
+TAG_PATTERNS = {
+    # PEOPLE & PORTRAITS
+    "people": ('person', 'people', 'man', 'woman', 'face', 'portrait', 'selfie', 'group',
+               'team', 'staff', 'customer', 'baker', 'chef', 'family', 'friend', 'smile',
+               'headshot', 'profile', 'human', 'worker', 'employee', 'owner', 'founder'),
+    "team": ('team', 'staff', 'employee', 'worker'),
+    "customer": ('customer', 'client'),
+    # FOOD & CULINARY - Comprehensive food detection
+    "bread": ('bread', 'sourdough', 'baguette', 'loaf', 'roll', 'croissant', 'focaccia', 'ciabatta'),
+    "pastry": ('pastry', 'danish', 'muffin', 'scone', 'bagel', 'pretzel', 'croissant'),
+    "dessert": ('cake', 'cupcake', 'cookie', 'brownie', 'pie', 'tart', 'donut', 'sweet', 'chocolate'),
+    "food": ('pizza', 'dough', 'kitchen', 'cook', 'recipe', 'ingredient', 'flour', 'yeast', 'meal', 'dish'),
+    # BUSINESS & LOCATIONS
+    "business": ('shop', 'store', 'bakery', 'cafe', 'restaurant', 'kitchen', 'counter',
+                 'display', 'shelf', 'oven', 'interior', 'exterior', 'building', 'storefront',
+                 'office', 'workspace', 'commercial', 'retail', 'franchise'),
+    "retail": ('bakery', 'shop', 'store'),
+    "interior": ('interior', 'inside'),
+    "exterior": ('exterior', 'outside'),
+    # PRODUCTS & MERCHANDISE
+    "product": ('product', 'merchandise', 'item', 'goods', 'package', 'box', 'container',
+                'label', 'brand', 'logo', 'packaging', 'display', 'showcase'),
+    # EQUIPMENT & TOOLS
+    "equipment": ('oven', 'mixer', 'tool', 'equipment', 'machine', 'scale', 'tray', 'pan',
+                  'utensil', 'appliance', 'device', 'instrument'),
+    # EVENTS & ACTIVITIES
+    "event": ('event', 'party', 'celebration', 'wedding', 'birthday', 'opening', 'festival',
+              'workshop', 'class', 'demonstration', 'meeting', 'conference', 'gathering'),
+    # MARKETING & PROMOTION
+    "marketing": ('marketing', 'promotion', 'advertisement', 'ad', 'campaign', 'social',
+                  'post', 'content', 'media', 'banner', 'flyer', 'poster'),
+    # ART & DESIGN
+    "art": ('art', 'design', 'logo', 'graphic', 'drawing', 'sketch', 'illustration',
+            'poster', 'banner', 'creative', 'artwork', 'visual'),
+    # NATURE & OUTDOOR
+    "nature": ('outdoor', 'nature', 'garden', 'park', 'tree', 'flower', 'landscape',
+               'sky', 'weather', 'season', 'natural', 'environment'),
+    # TECHNOLOGY & DIGITAL
+    "tech": ('screen', 'computer', 'phone', 'digital', 'app', 'website', 'online',
+             'tech', 'software', 'system', 'interface'),
+    # PROCESS & WORKFLOW
+    "process": ('process', 'step', 'making', 'preparation', 'work', 'workflow',
+                'behind', 'scene', 'production', 'creation'),
+    # Directory-based context clues
+    "dir_people": ('portrait', 'people', 'staff', 'team'),
+    "dir_product": ('product', 'merchandise', 'items'),
+    "dir_event": ('event', 'celebration', 'party'),
+    "dir_marketing": ('marketing', 'social', 'promo'),
+    "dir_food": ('food', 'bakery', 'kitchen'),
+    "dir_location": ('location', 'interior', 'exterior'),
+    # Common camera naming patterns and their path context
+    "camera": ('img_', 'dsc_', 'photo_', '20'),
+    "camera_food": ('bread', 'bakery', 'food'),
+    "camera_people": ('people', 'portrait', 'staff'),
+    "camera_product": ('product', 'item'),
+    # PNG sub-types
+    "screenshot": ('screenshot', 'screen', 'capture'),
+    "logo": ('logo', 'icon', 'graphic'),
+    # Final fallback context
+    "fallback_food": ('bread', 'bakery', 'food', 'kitchen'),
+    "fallback_people": ('people', 'person', 'portrait', 'staff'),
+    "fallback_product": ('product', 'item', 'merchandise'),
+    "fallback_event": ('event', 'party', 'celebration'),
+}
+TAG_MATCHER = KeywordMatcher(keyword for patterns in TAG_PATTERNS.values() for keyword in patterns)
+
+
+class PathKeywords:
+    """TAG_PATTERNS keywords in a media file's name and in each segment of its path."""
+
+    def __init__(self, media_path: str):
+        """
+        Scan the path, one pass of TAG_MATCHER per segment.
+
+        Args:
+            media_path: Path to the media file
+        """
+        self.name = TAG_MATCHER.find(os.path.basename(media_path).lower())
+        self.parts = [TAG_MATCHER.find(part) for part in media_path.lower().split(os.sep)]
+        self.path = set().union(*self.parts)
+
+    def found(self, group: str, words: Optional[Set[str]] = None) -> bool:
+        """
+        Whether any keyword of a TAG_PATTERNS group was found.
+
+        Args:
+            group: Key of TAG_PATTERNS
+            words: Keywords to check (default: those in the file name)
+
+        Returns:
+            bool: True if the group matched
+        """
+        return not (self.name if words is None else words).isdisjoint(TAG_PATTERNS[group])
+
+
+class TagStore:
+    """Tags per media file, computed once and reused until the file changes."""
+
+    def __init__(self, compute: Callable[[str], List[str]], db_path: Optional[str] = None,
+                 tagger: str = "tags"):
+        """
+        Initialize the store.
+
+        Args:
+            compute: Function computing the tags of a media path
+            db_path: SQLite file for persisting tags across runs (None keeps
+                them in memory only); opened on first use
+            tagger: Name of the tagging rules; rows of other taggers sharing the
+                database are left alone. Change it when the rules change so
+                stale tags are recomputed
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.compute = compute
+        self.db_path = db_path
+        self.tagger = tagger
+        self._tags: Dict[str, Tuple[float, List[str]]] = {}  # path -> (mtime, tags)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    def get(self, media_path: str) -> List[str]:
+        """
+        Tags of a media file, recomputed only if the file changed.
+
+        Args:
+            media_path: Path to the media file
+
+        Returns:
+            List of tags (a copy the caller may modify)
+        """
+        try:
+            mtime = os.stat(media_path).st_mtime
+        except OSError:
+            # Nothing to key on; tag by name without caching
+            return list(self.compute(media_path))
+
+        with self._lock:
+            self._load()
+            cached = self._tags.get(media_path)
+            if cached is not None and cached[0] == mtime:
+                return list(cached[1])
+
+        tags = list(self.compute(media_path))
+        with self._lock:
+            self._tags[media_path] = (mtime, tags)
+            self._write(media_path, mtime, tags)
+        return list(tags)
+
+    def invalidate(self, media_path: str):
+        """Forget the tags of one file."""
+        with self._lock:
+            self._load()
+            if self._tags.pop(media_path, None) is not None and self._conn is not None:
+                with self._conn:
+                    self._conn.execute("DELETE FROM tags WHERE tagger = ? AND path = ?",
+                                       (self.tagger, media_path))
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _load(self):
+        """Open the database and read this tagger's rows (once)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.db_path:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.executescript(SCHEMA)
+            rows = self._conn.execute("SELECT path, mtime, tags FROM tags WHERE tagger = ?", (self.tagger,))
+            for path, mtime, tags in rows:
+                self._tags[path] = (mtime, json.loads(tags))
+            self.logger.debug(f"Loaded {len(self._tags)} stored tag sets for '{self.tagger}'")
+        except Exception as e:
+            self.logger.warning(f"Tag store {self.db_path} unavailable, keeping tags in memory: {e}")
+            self._conn = None
+
+    def _write(self, media_path: str, mtime: float, tags: List[str]):
+        """Persist the tags of one file version, if the database is open."""
+        if self._conn is None:
+            return
+        try:
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO tags (tagger, path, mtime, tags) VALUES (?, ?, ?, ?)",
+                    (self.tagger, media_path, mtime, json.dumps(tags))
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not store tags for {media_path}: {e}")
@@ -9,7 +9,7 @@ from typing import Optional
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTabWidget, 
-    QLabel, QPushButton, QScrollArea, QGridLayout, QFileDialog, QMessageBox, QInputDialog, QListWidget, QDialog
+    QLabel, QPushButton, QFileDialog, QMessageBox, QInputDialog, QListWidget, QDialog
 )
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtGui import QFont, QPixmap
@@ -18,8 +18,10 @@ from ...handlers.library_handler import LibraryManager
 from ...models.app_state import AppState
 from ...handlers.media_handler import MediaHandler
 from ...handlers.crowseye_handler import CrowsEyeHandler
+from ...utils.thumbnail_cache import ThumbnailCache
+from ...utils.thumbnail_loader import ThumbnailLoader
 from .media_thumbnail_widget import MediaThumbnailWidget
-from .selectable_media_widget import SelectableMediaWidget
+from .media_grid import MediaGridModel, MediaGridView, MediaTileDelegate, PostGridModel, PostTileDelegate
 
 class LibraryTabs(QWidget):
     """Simple library tabs widget following the new specification."""
@@ -31,6 +33,12 @@ class LibraryTabs(QWidget):
     media_uploaded = Signal()  # Signal when media is uploaded
     create_post_with_media_requested = Signal(str)  # Signal to create post with pre-loaded media
     
+    # Library item types listed in each finished-posts subtab (other types show empty for now)
+    POST_TYPE_ITEMS = {
+        "Photo Posts": ["post_ready_photo", "post_ready_video"],  # Both photos and videos
+        "Videos/Reels": ["post_ready_video"],
+    }
+    
     def __init__(self, library_manager: LibraryManager = None, parent=None):
         super().__init__(parent)
         self.logger = logging.getLogger(self.__class__.__name__)
@@ -42,12 +50,29 @@ class LibraryTabs(QWidget):
         self.app_state = AppState()
         self.media_handler = MediaHandler(self.app_state)
         self.crowseye_handler = CrowsEyeHandler(self.app_state, self.media_handler, self.library_manager)
+        self.thumbnail_cache = ThumbnailCache.for_directory()
+        # Thumbnails load in the background; grids show placeholders until they arrive
+        self.thumbnail_loader = ThumbnailLoader(self.thumbnail_cache, parent=self)
+        
+        # Grid models and views; media selection for gallery creation lives in the models
+        self.media_models = {}  # Media type ("Photos"/"Videos") -> MediaGridModel
+        self.media_views = {}
+        self.post_models = {}  # Post type -> PostGridModel
+        self.post_views = {}
         
-        # Track selected media for gallery creation
-        self.selected_media = set()
-        self.media_widgets = {}  # Map media_path to widget for selection tracking
+        # Patch the grids when files appear in or disappear from the media directory
+        self.crowseye_handler.signals.media_added.connect(self._on_media_added)
+        self.crowseye_handler.signals.media_removed.connect(self._on_media_removed)
         
         self._setup_ui()
+    
+    @property
+    def selected_media(self):
+        """Paths of the checked photos and videos."""
+        selected = set()
+        for model in self.media_models.values():
+            selected |= model.selected_keys()
+        return selected
         
     def _setup_ui(self):
         """Set up the UI components."""
@@ -308,21 +333,20 @@ class LibraryTabs(QWidget):
         
 
         
-        # Scroll area for media items
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setStyleSheet("QScrollArea { border: none; background: transparent; }")
+        # Virtualized grid: only visible tiles are painted and load thumbnails
+        view = MediaGridView(f"No {media_type.lower()} found\n\nUse the upload button above\nto add {media_type.lower()}")
+        model = MediaGridModel(self.thumbnail_loader, "image" if media_type == "Photos" else "video", parent=self)
+        model.selection_changed.connect(self._update_selection_ui)
+        delegate = MediaTileDelegate(view)
+        delegate.item_clicked.connect(lambda item: self._on_media_selected(item["path"]))  # Both clicks show options dialog
+        view.setModel(model)
+        view.setItemDelegate(delegate)
         
-        # Container for media grid
-        container = QWidget()
-        grid_layout = QGridLayout(container)
-        grid_layout.setSpacing(8)
+        self.media_models[media_type] = model
+        self.media_views[media_type] = view
+        self._load_media_to_grid(media_type)
         
-        # Load actual media instead of placeholder
-        self._load_media_to_grid(grid_layout, media_type)
-        
-        scroll_area.setWidget(container)
-        layout.addWidget(scroll_area)
+        layout.addWidget(view)
         
         return section
         
@@ -391,159 +415,38 @@ class LibraryTabs(QWidget):
         layout = QVBoxLayout(widget)
         layout.setContentsMargins(10, 10, 10, 10)
         
-        # Create scroll area for posts
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setStyleSheet("QScrollArea { border: none; background-color: white; }")
-        
-        scroll_content = QWidget()
-        scroll_layout = QGridLayout(scroll_content)
-        scroll_layout.setSpacing(10)
-        scroll_layout.setContentsMargins(10, 10, 10, 10)
+        # Virtualized grid, filled from the library a page at a time
+        view = MediaGridView(f"No {post_type.lower()} found\n\nCreate posts using the 'Create Post' feature")
+        view.setStyleSheet("QListView { border: none; background-color: white; }")
+        model = PostGridModel(self.thumbnail_loader, self.library_manager,
+                              self.POST_TYPE_ITEMS.get(post_type, []), parent=self)
+        delegate = PostTileDelegate(view)
+        delegate.item_clicked.connect(self._open_post_preview)
+        view.setModel(model)
+        view.setItemDelegate(delegate)
         
-        # Load posts for this type
-        self._load_finished_posts_to_grid(scroll_layout, post_type)
+        self.post_models[post_type] = model
+        self.post_views[post_type] = view
+        self._load_finished_posts_to_grid(post_type)
         
-        scroll.setWidget(scroll_content)
-        layout.addWidget(scroll)
+        layout.addWidget(view)
         
         return widget
     
-    def _load_finished_posts_to_grid(self, grid_layout, post_type):
-        """Load finished posts from library manager into the grid."""
+    def _load_finished_posts_to_grid(self, post_type):
+        """Load (or refresh) the finished posts of one subtab from the library manager."""
+        view = self.post_views[post_type]
         try:
-            # Get finished posts from library manager
-            if post_type == "Photo Posts":
-                # Load both photos and videos for photo posts
-                posts = self.library_manager.get_all_post_ready_items() if self.library_manager else []
-            elif post_type == "Videos/Reels":
-                # Load only videos
-                posts = self.library_manager.get_post_ready_videos() if self.library_manager else []
-            else:
-                # For now, other types show empty
-                posts = []
-            
-            if not posts:
-                # Show placeholder if no posts
-                placeholder_label = QLabel(f"No {post_type.lower()} found\n\nCreate posts using the 'Create Post' feature")
-                placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                placeholder_label.setStyleSheet("color: #666666; font-size: 14px; padding: 40px;")
-                placeholder_label.setWordWrap(True)
-                grid_layout.addWidget(placeholder_label, 0, 0)
-                return
-            
-            # Add posts to grid
-            row, col = 0, 0
-            max_cols = 4
-            
-            for post in posts:
-                post_widget = self._create_post_thumbnail(post)
-                grid_layout.addWidget(post_widget, row, col)
-                
-                col += 1
-                if col >= max_cols:
-                    col = 0
-                    row += 1
-                    
+            # Rows are diffed against what is shown; more pages load as the grid scrolls
+            self.post_models[post_type].refresh()
+            view.set_placeholder_text(f"No {post_type.lower()} found\n\nCreate posts using the 'Create Post' feature")
         except Exception as e:
             self.logger.error(f"Error loading finished posts: {e}")
-            # Show error message
-            error_label = QLabel(f"Error loading posts: {str(e)}")
-            error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            error_label.setStyleSheet("color: #ff0000; font-size: 14px; padding: 40px;")
-            grid_layout.addWidget(error_label, 0, 0)
-    
-    def _create_post_thumbnail(self, post_data):
-        """Create a thumbnail widget for a finished post."""
-        widget = QWidget()
-        widget.setFixedSize(200, 250)
-        widget.setStyleSheet("""
-            QWidget {
-                background-color: white;
-                border: 1px solid #e0e0e0;
-                border-radius: 8px;
-            }
-            QWidget:hover {
-                border-color: #007bff;
-                background-color: #f8f9fa;
-            }
-        """)
-        widget.setCursor(Qt.CursorShape.PointingHandCursor)
-
-        # Store post data
-        widget.post_data = post_data
-        
-        layout = QVBoxLayout(widget)
-        layout.setContentsMargins(8, 8, 8, 8)
-        layout.setSpacing(5)
-        
-        # Media preview
-        preview_label = QLabel()
-        preview_label.setFixedSize(180, 150)
-        preview_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        preview_label.setStyleSheet("border: 1px solid #ddd; border-radius: 4px; background-color: #f5f5f5;")
-        
-        # Try to load thumbnail
-        media_path = post_data.get("path", "")
-        if media_path and os.path.exists(media_path):
-            try:
-                pixmap = QPixmap(media_path)
-                if not pixmap.isNull():
-                    # Scale pixmap to fit
-                    scaled_pixmap = pixmap.scaled(180, 150, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-                    preview_label.setPixmap(scaled_pixmap)
-                else:
-                    preview_label.setText("📷\nPreview\nUnavailable")
-            except Exception as e:
-                self.logger.warning(f"Could not load thumbnail for {media_path}: {e}")
-                preview_label.setText("📷\nPreview\nError")
-        else:
-            preview_label.setText("📷\nNo Preview")
-        
-        layout.addWidget(preview_label)
-        
-        # Caption preview
-        caption = post_data.get("caption", "No caption")
-        caption_label = QLabel(caption[:50] + "..." if len(caption) > 50 else caption)
-        caption_label.setWordWrap(True)
-        caption_label.setStyleSheet("font-size: 11px; color: #333; padding: 2px;")
-        caption_label.setMaximumHeight(40)
-        layout.addWidget(caption_label)
+            view.set_placeholder_text(f"Error loading posts: {str(e)}")
         
-        # Date
-        date_added = post_data.get("date_added", "")
-        if date_added:
-            try:
-                from datetime import datetime
-                date_obj = datetime.fromisoformat(date_added.replace('Z', '+00:00'))
-                date_str = date_obj.strftime("%m/%d/%Y")
-            except:
-                date_str = "Unknown date"
-        else:
-            date_str = "Unknown date"
-            
-        date_label = QLabel(date_str)
-        date_label.setStyleSheet("font-size: 10px; color: #666; font-style: italic;")
-        layout.addWidget(date_label)
-        
-        # Type indicator
-        post_type = post_data.get("type", "unknown")
-        type_icon = "📷" if "photo" in post_type else "🎥" if "video" in post_type else "📄"
-        type_label = QLabel(f"{type_icon} Ready to Post")
-        type_label.setStyleSheet("font-size: 10px; color: #007bff; font-weight: bold;")
-        layout.addWidget(type_label)
-        
-        # Connect click event to open post preview
-        def on_widget_click(event):
-            if event.button() == Qt.MouseButton.LeftButton:
-                self._open_post_preview(post_data)
-        
-        widget.mousePressEvent = on_widget_click
-        
-        return widget
-        
-    def _load_media_to_grid(self, grid_layout, media_type):
-        """Load media files into the grid layout."""
+    def _load_media_to_grid(self, media_type):
+        """Load (or refresh) the media files of one section."""
+        view = self.media_views[media_type]
         try:
             # Get all media from CrowsEye handler
             all_media = self.crowseye_handler.get_all_media()
@@ -551,54 +454,40 @@ class LibraryTabs(QWidget):
             # Determine which media type to load
             if media_type == "Photos":
                 media_paths = all_media.get("raw_photos", [])
-                widget_type = "image"
             else:  # Videos
                 media_paths = all_media.get("raw_videos", [])
-                widget_type = "video"
-            
-            if not media_paths:
-                # Show placeholder if no media
-                placeholder_label = QLabel(f"No {media_type.lower()} found\n\nUse the upload button above\nto add {media_type.lower()}")
-                placeholder_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                placeholder_label.setStyleSheet("color: #666666; font-size: 12px; padding: 30px;")
-                placeholder_label.setWordWrap(True)
-                grid_layout.addWidget(placeholder_label, 0, 0)
-                return
             
-            # Add media to grid
-            row, col = 0, 0
-            max_cols = 4
-            
-            for media_path in media_paths:
-                if os.path.exists(media_path):
-                    # Use selectable widget for the media tab
-                    thumbnail = SelectableMediaWidget(media_path, widget_type)
-                    thumbnail.selection_changed.connect(self._on_media_selection_changed)
-                    thumbnail.media_clicked.connect(self._on_media_selected)  # Both clicks show options dialog
-                    
-                    # Store widget reference for selection management
-                    self.media_widgets[media_path] = thumbnail
-                    
-                    grid_layout.addWidget(thumbnail, row, col)
-                    
-                    col += 1
-                    if col >= max_cols:
-                        col = 0
-                        row += 1
+            # Rows are diffed against what is shown, keeping scroll position and selection
+            self.media_models[media_type].set_paths(media_paths)
+            view.set_placeholder_text(f"No {media_type.lower()} found\n\nUse the upload button above\nto add {media_type.lower()}")
             
             # Show selection controls if we have any media in either section
-            all_media = self.crowseye_handler.get_all_media()
             has_any_media = (all_media.get("raw_photos", []) or all_media.get("raw_videos", []))
             if has_any_media:
                 self.selection_controls.setVisible(True)
                         
         except Exception as e:
             self.logger.error(f"Error loading {media_type}: {e}")
-            # Show error message
-            error_label = QLabel(f"Error loading {media_type.lower()}: {str(e)}")
-            error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            error_label.setStyleSheet("color: #ff0000; font-size: 12px; padding: 30px;")
-            grid_layout.addWidget(error_label, 0, 0)
+            view.set_placeholder_text(f"Error loading {media_type.lower()}: {str(e)}")
+    
+    def _on_media_added(self, category, media_path):
+        """Append a tile for a file that appeared in the media directory."""
+        model = self.media_models.get("Photos" if category == "raw_photos" else "Videos")
+        if model is None:
+            return
+        
+        model.add_path(media_path)
+        self.selection_controls.setVisible(True)
+    
+    def _on_media_removed(self, category, media_path):
+        """Drop the tile of a file that left the media directory."""
+        model = self.media_models.get("Photos" if category == "raw_photos" else "Videos")
+        if model is None or not model.contains(media_path):
+            return
+        
+        # Also drops the file from the selection
+        model.remove_item(media_path)
+        self.thumbnail_cache.invalidate(media_path)
     
     def _on_media_selected(self, media_path):
         """Handle media click by showing options dialog for unedited media."""
@@ -1053,29 +942,17 @@ class LibraryTabs(QWidget):
         self.logger.info("Refreshing library content")
         
         try:
-            current_index = self.tab_widget.currentIndex()
-            
-            # Clear selection tracking
-            self.selected_media.clear()
-            self.media_widgets.clear()
-            
             # Initialize selection tracking if not exists
             if not hasattr(self, 'selected_finished_posts'):
                 self.selected_finished_posts = []
             
-            # Refresh raw media files tab (unedited media for bulk uploads)
-            self.tab_widget.removeTab(0)  # Remove "Media Files" tab
-            media_tab = self._create_media_files_tab()
-            self.tab_widget.insertTab(0, media_tab, "Unedited Media")
+            # The grids apply row-level differences in place, so tabs, scroll
+            # positions and the selection of remaining media survive a refresh
+            for media_type in self.media_models:
+                self._load_media_to_grid(media_type)
             
-            # Refresh finished posts tab (completed content)
-            self.tab_widget.removeTab(1)  # Remove "Finished Posts" tab
-            posts_tab = self._create_finished_posts_tab()
-            self.tab_widget.insertTab(1, posts_tab, "Finished Posts")
-            
-            # Maintain current tab selection if possible
-            if current_index < self.tab_widget.count():
-                self.tab_widget.setCurrentIndex(current_index)
+            for post_type in self.post_models:
+                self._load_finished_posts_to_grid(post_type)
                 
         except Exception as e:
             self.logger.error(f"Error refreshing content: {e}")
@@ -1131,6 +1008,9 @@ class LibraryTabs(QWidget):
                     uploaded += 1
                     self.logger.info(f"Uploaded file: {filename} -> {dest_path}")
             
+            # Show the new files right away rather than waiting for the watcher
+            self.crowseye_handler.media_index.rescan()
+            
             QMessageBox.information(
                 self, 
                 "Upload Complete", 
@@ -1235,15 +1115,6 @@ class LibraryTabs(QWidget):
             self.logger.error(f"Error editing post: {e}")
             QMessageBox.critical(self, "Error", f"Could not edit post: {str(e)}")
     
-    def _on_media_selection_changed(self, media_path: str, is_selected: bool):
-        """Handle media selection change."""
-        if is_selected:
-            self.selected_media.add(media_path)
-        else:
-            self.selected_media.discard(media_path)
-        
-        self._update_selection_ui()
-    
     def _update_selection_ui(self):
         """Update the selection UI based on current selection."""
         count = len(self.selected_media)
@@ -1256,44 +1127,20 @@ class LibraryTabs(QWidget):
     
     def _select_all_media_combined(self):
         """Select all media (both photos and videos)."""
-        try:
-            all_media = self.crowseye_handler.get_all_media()
-            
-            # Select all photos and videos
-            all_media_paths = all_media.get("raw_photos", []) + all_media.get("raw_videos", [])
-            
-            for media_path in all_media_paths:
-                if media_path in self.media_widgets:
-                    widget = self.media_widgets[media_path]
-                    widget.set_selected(True)
-                    
-        except Exception as e:
-            self.logger.error(f"Error selecting all media: {e}")
+        for model in self.media_models.values():
+            model.set_all_checked(True)
     
     def _select_all_media(self, media_type: str):
         """Select all media of the specified type."""
-        try:
-            all_media = self.crowseye_handler.get_all_media()
-            
-            if media_type == "Photos":
-                media_paths = all_media.get("raw_photos", [])
-            else:  # Videos
-                media_paths = all_media.get("raw_videos", [])
-            
-            for media_path in media_paths:
-                if media_path in self.media_widgets:
-                    widget = self.media_widgets[media_path]
-                    widget.set_selected(True)
-                    
-        except Exception as e:
-            self.logger.error(f"Error selecting all media: {e}")
+        model = self.media_models.get(media_type)
+        if model is not None:
+            model.set_all_checked(True)
     
     def _clear_selection(self):
         """Clear all media selection."""
-        for widget in self.media_widgets.values():
-            widget.set_selected(False)
+        for model in self.media_models.values():
+            model.set_all_checked(False)
         
-        self.selected_media.clear()
         self._update_selection_ui()
     
     def _create_gallery_from_selection(self):
@@ -1384,9 +1231,9 @@ class LibraryTabs(QWidget):
                     self.logger.error(f"Failed to delete {media_path}: {e}")
                     failed_files.append(os.path.basename(media_path))
             
-            # Clear selection and refresh
+            # Clear selection; the media index reports the removals to patch the grid
             self._clear_selection()
-            self.refresh_content()
+            self.crowseye_handler.media_index.rescan()
             
             # Show result message
             if failed_files:
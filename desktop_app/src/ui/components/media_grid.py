@@ -0,0 +1,598 @@
+"""
+Virtualized media grids for the library tabs.
+Items live in list models (selection included) that update with row-level
+diffs; delegates paint only the visible tiles and request their thumbnails
+from the ThumbnailLoader as they come into view.
+"""
+import os
+import logging
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from PySide6.QtCore import Qt, QAbstractListModel, QEvent, QModelIndex, QRect, QSize, QTimer, Signal
+from PySide6.QtGui import QColor, QFont, QImage, QPainter, QPen
+from PySide6.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate
+
+from ...utils.thumbnail_loader import ThumbnailLoader
+
+try:
+    from ...utils.video_thumbnail_generator import VideoThumbnailGenerator
+    VIDEO_THUMBNAILS_AVAILABLE = True
+except ImportError:
+    VIDEO_THUMBNAILS_AVAILABLE = False
+
+# Custom data roles
+ITEM_ROLE = Qt.ItemDataRole.UserRole + 1       # item dict
+PATH_ROLE = Qt.ItemDataRole.UserRole + 2       # media path
+THUMBNAIL_ROLE = Qt.ItemDataRole.UserRole + 3  # QImage; None while loading or unavailable
+THUMBNAIL_FAILED_ROLE = Qt.ItemDataRole.UserRole + 4
+
+# Library items fetched per page as the posts grid scrolls
+POST_PAGE_SIZE = 200
+
+
+class LibraryGridModel(QAbstractListModel):
+    """Rows of media items keyed by a unique key, with optional checkbox selection."""
+
+    selection_changed = Signal()
+
+    def __init__(self, thumbnail_loader: ThumbnailLoader, thumbnail_size, checkable: bool = False,
+                 key_field: str = "path", parent=None):
+        """
+        Initialize the model.
+
+        Args:
+            thumbnail_loader: Loader producing the tile thumbnails
+            thumbnail_size: (width, height) box of the thumbnails
+            checkable: Whether rows carry a selection checkbox
+            key_field: Item field identifying a row across refreshes
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.thumbnail_loader = thumbnail_loader
+        self.thumbnail_size = (int(thumbnail_size[0]), int(thumbnail_size[1]))
+        self.checkable = checkable
+        self.key_field = key_field
+        self.video_generator = None
+
+        self._items: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}  # key -> row
+        self._path_rows: Dict[str, List[int]] = {}  # media path -> rows showing it
+        self._selected: Set[str] = set()
+        self._requested: Set[str] = set()  # paths with a thumbnail on the way
+        self._failed: Set[str] = set()  # paths without a thumbnail
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._items)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+        item = self._items[index.row()]
+        path = item.get("path", "")
+
+        if role == THUMBNAIL_ROLE:
+            return self._thumbnail(item)
+        if role == THUMBNAIL_FAILED_ROLE:
+            return path in self._failed or not path
+        if role == Qt.ItemDataRole.DisplayRole:
+            return os.path.basename(path)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return path
+        if role == Qt.ItemDataRole.CheckStateRole and self.checkable:
+            return Qt.CheckState.Checked if self._key(item) in self._selected else Qt.CheckState.Unchecked
+        if role == ITEM_ROLE:
+            return item
+        if role == PATH_ROLE:
+            return path
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled
+        if self.checkable:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole) -> bool:
+        if role != Qt.ItemDataRole.CheckStateRole or not self.checkable or not index.isValid():
+            return False
+        key = self._key(self._items[index.row()])
+        if Qt.CheckState(value) == Qt.CheckState.Checked:
+            self._selected.add(key)
+        else:
+            self._selected.discard(key)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        self.selection_changed.emit()
+        return True
+
+    # --- Items ---
+
+    def items(self) -> List[Dict[str, Any]]:
+        """Items in row order."""
+        return list(self._items)
+
+    def contains(self, key: str) -> bool:
+        """Whether a row with this key exists."""
+        return key in self._rows
+
+    def set_items(self, items: List[Dict[str, Any]]):
+        """
+        Replace the rows with a new listing.
+
+        The change is applied as row removals, insertions and per-row updates,
+        so views keep their scroll position and only touched tiles repaint.
+        Selection of rows that remain is kept.
+
+        Args:
+            items: New items in display order (keys must be unique)
+        """
+        new_keys = [self._key(item) for item in items]
+        new_key_set = set(new_keys)
+
+        # Removals, bottom up in contiguous runs
+        row = len(self._items) - 1
+        while row >= 0:
+            if self._key(self._items[row]) in new_key_set:
+                row -= 1
+                continue
+            end = row
+            while row >= 0 and self._key(self._items[row]) not in new_key_set:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, end)
+            del self._items[row + 1:end + 1]
+            self.endRemoveRows()
+
+        # Remaining rows must keep their relative order to be patched in place
+        kept_keys = [self._key(item) for item in self._items]
+        kept_key_set = set(kept_keys)
+        if kept_keys != [key for key in new_keys if key in kept_key_set]:
+            self.beginResetModel()
+            self._items = list(items)
+            self._reindex()
+            self.endResetModel()
+            self._failed.clear()
+            self._prune_selection()
+            return
+
+        # Insert runs of new rows and update changed ones
+        position = index = 0
+        changed = []
+        while index < len(items):
+            if position < len(self._items) and self._key(self._items[position]) == new_keys[index]:
+                if self._items[position] != items[index]:
+                    self._items[position] = items[index]
+                    changed.append(position)
+                position += 1
+                index += 1
+                continue
+            start = index
+            while index < len(items) and new_keys[index] not in kept_key_set:
+                index += 1
+            self.beginInsertRows(QModelIndex(), position, position + index - start - 1)
+            self._items[position:position] = items[start:index]
+            self.endInsertRows()
+            position += index - start
+
+        self._reindex()
+        self._failed.clear()
+        for row in changed:
+            model_index = self.index(row)
+            self.dataChanged.emit(model_index, model_index)
+        self._prune_selection()
+
+    def add_item(self, item: Dict[str, Any]):
+        """Append one row (ignored if its key is already present)."""
+        if self._key(item) in self._rows:
+            return
+        row = len(self._items)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.append(item)
+        self._rows[self._key(item)] = row
+        self._path_rows.setdefault(item.get("path", ""), []).append(row)
+        self.endInsertRows()
+
+    def remove_item(self, key: str):
+        """Remove the row with this key (no-op if absent)."""
+        row = self._rows.get(key)
+        if row is None:
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._items[row]
+        self._reindex()
+        self.endRemoveRows()
+        self._prune_selection()
+
+    # --- Selection ---
+
+    def selected_keys(self) -> Set[str]:
+        """Keys of the checked rows."""
+        return set(self._selected)
+
+    def set_all_checked(self, checked: bool):
+        """Check or uncheck every row."""
+        if not self.checkable:
+            return
+        selected = set(self._rows) if checked else set()
+        if selected == self._selected:
+            return
+        self._selected = selected
+        if self._items:
+            self.dataChanged.emit(self.index(0), self.index(len(self._items) - 1),
+                                  [Qt.ItemDataRole.CheckStateRole])
+        self.selection_changed.emit()
+
+    # --- Thumbnails ---
+
+    def cancel_thumbnails(self, is_offscreen: Callable[[int], bool]):
+        """
+        Stop loading thumbnails no visible row is waiting for.
+
+        Args:
+            is_offscreen: Tells whether a row is outside the view
+        """
+        size = self.thumbnail_size
+        for path in list(self._requested):
+            if all(is_offscreen(row) for row in self._path_rows.get(path, [])):
+                self._requested.discard(path)
+                self.thumbnail_loader.cancel(path, size)
+
+    def _thumbnail(self, item: Dict[str, Any]) -> Optional[QImage]:
+        """Decoded thumbnail of an item, requesting it when not in memory yet."""
+        path = item.get("path", "")
+        if not path or path in self._failed:
+            return None
+        image = self.thumbnail_loader.cache.peek(path, self.thumbnail_size)
+        if image is None and path not in self._requested:
+            # Only painted (visible) rows ask, so they load ahead of the rest
+            self._requested.add(path)
+            self.thumbnail_loader.request(path, self.thumbnail_size, partial(self._on_thumbnail, path),
+                                          owner=self, render=self._renderer(item), visible=True)
+        return image
+
+    def _on_thumbnail(self, path: str, image: Optional[QImage]):
+        self._requested.discard(path)
+        if image is None:
+            self._failed.add(path)
+        for row in self._path_rows.get(path, []):
+            model_index = self.index(row)
+            self.dataChanged.emit(model_index, model_index, [THUMBNAIL_ROLE])
+
+    def _renderer(self, item: Dict[str, Any]):
+        """Thumbnail renderer for the cache (None for images)."""
+        if not is_video_item(item):
+            return None
+        if self.video_generator is None and VIDEO_THUMBNAILS_AVAILABLE:
+            self.video_generator = VideoThumbnailGenerator()
+        generator = self.video_generator
+        if generator is None:
+            return lambda media_path, size: None
+        return lambda media_path, size: generator.generate_thumbnail_image(media_path, timestamp=1.0, size=size)
+
+    # --- Internals ---
+
+    def _key(self, item: Dict[str, Any]) -> str:
+        return item.get(self.key_field) or item.get("path", "")
+
+    def _reindex(self):
+        self._rows = {}
+        self._path_rows = {}
+        for row, item in enumerate(self._items):
+            self._rows[self._key(item)] = row
+            self._path_rows.setdefault(item.get("path", ""), []).append(row)
+
+    def _prune_selection(self):
+        selected = self._selected & set(self._rows)
+        if selected != self._selected:
+            self._selected = selected
+            self.selection_changed.emit()
+
+
+class MediaGridModel(LibraryGridModel):
+    """Raw media files (photos or videos) with selection checkboxes."""
+
+    def __init__(self, thumbnail_loader: ThumbnailLoader, media_type: str, parent=None):
+        """
+        Args:
+            thumbnail_loader: Loader producing the tile thumbnails
+            media_type: "image" or "video"
+            parent: Parent QObject
+        """
+        super().__init__(thumbnail_loader, MediaTileDelegate.THUMBNAIL_SIZE, checkable=True, parent=parent)
+        self.media_type = media_type
+
+    def set_paths(self, media_paths: List[str]):
+        """Show these media files, diffed against the current rows."""
+        self.set_items([{"path": media_path, "type": self.media_type} for media_path in media_paths])
+
+    def add_path(self, media_path: str):
+        """Append one media file."""
+        self.add_item({"path": media_path, "type": self.media_type})
+
+
+class PostGridModel(LibraryGridModel):
+    """Finished posts, read from LibraryManager.query_items a page at a time."""
+
+    def __init__(self, thumbnail_loader: ThumbnailLoader, library_manager, item_types: List[str],
+                 parent=None):
+        """
+        Args:
+            thumbnail_loader: Loader producing the tile thumbnails
+            library_manager: LibraryManager to query
+            item_types: Library item types shown (empty shows nothing)
+            parent: Parent QObject
+        """
+        super().__init__(thumbnail_loader, PostTileDelegate.THUMBNAIL_SIZE, key_field="id", parent=parent)
+        self.library_manager = library_manager
+        self.item_types = item_types
+        self._total = 0
+
+    def refresh(self):
+        """Re-read the loaded pages and apply the differences."""
+        if not self.library_manager or not self.item_types:
+            self._total = 0
+            self.set_items([])
+            return
+        self._total = self.library_manager.count_items(self.item_types)
+        limit = min(max(len(self._items), POST_PAGE_SIZE), self._total)
+        self.set_items(self.library_manager.query_items(self.item_types, limit=limit))
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and len(self._items) < self._total
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        items = self.library_manager.query_items(self.item_types, offset=len(self._items),
+                                                 limit=POST_PAGE_SIZE)
+        items = [item for item in items if self._key(item) not in self._rows]
+        if not items:
+            # The library shrank since it was counted
+            self._total = len(self._items)
+            return
+        start = len(self._items)
+        self.beginInsertRows(QModelIndex(), start, start + len(items) - 1)
+        self._items.extend(items)
+        self._reindex()
+        self.endInsertRows()
+
+
+def is_video_item(item: Dict[str, Any]) -> bool:
+    """Whether a grid item is a video."""
+    return "video" in str(item.get("type", ""))
+
+
+def format_post_date(date_added: str) -> str:
+    """Short date of a library item's date_added."""
+    if not date_added:
+        return "Unknown date"
+    try:
+        return datetime.fromisoformat(date_added.replace('Z', '+00:00')).strftime("%m/%d/%Y")
+    except ValueError:
+        return "Unknown date"
+
+
+class _TileDelegate(QStyledItemDelegate):
+    """Shared tile painting and click handling."""
+
+    item_clicked = Signal(dict)  # item, on a click outside the checkbox
+
+    TILE_SIZE = QSize(140, 160)
+
+    def sizeHint(self, option, index) -> QSize:
+        return self.TILE_SIZE
+
+    def checkbox_rect(self, tile_rect: QRect) -> Optional[QRect]:
+        """Area of the selection checkbox within a tile (None if the tile has none)."""
+        return None
+
+    def editorEvent(self, event, model, option, index) -> bool:
+        if event.type() != QEvent.Type.MouseButtonRelease:
+            return super().editorEvent(event, model, option, index)
+
+        checkbox = self.checkbox_rect(option.rect)
+        if (event.button() == Qt.MouseButton.LeftButton and checkbox is not None
+                and checkbox.contains(event.position().toPoint())):
+            checked = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+            model.setData(index, Qt.CheckState.Unchecked if checked else Qt.CheckState.Checked,
+                          Qt.ItemDataRole.CheckStateRole)
+            return True
+        if event.button() in (Qt.MouseButton.LeftButton, Qt.MouseButton.RightButton):
+            self.item_clicked.emit(index.data(ITEM_ROLE))
+            return True
+        return False
+
+    def _draw_card(self, painter: QPainter, rect: QRect, background: str, border: str, width: int = 1):
+        painter.setPen(QPen(QColor(border), width))
+        painter.setBrush(QColor(background))
+        painter.drawRoundedRect(rect, 8, 8)
+
+    def _draw_thumbnail(self, painter: QPainter, box: QRect, index, unavailable_text: str,
+                        loading_text: str):
+        """Thumbnail centered in box, or a text placeholder."""
+        image = index.data(THUMBNAIL_ROLE)
+        if image is not None and not image.isNull():
+            target = QRect(0, 0, image.width(), image.height())
+            target.moveCenter(box.center())
+            painter.drawImage(target, image)
+            return
+        failed = index.data(THUMBNAIL_FAILED_ROLE)
+        painter.setPen(QColor("#666666"))
+        painter.setFont(self._font(12, QFont.Weight.Bold if failed else QFont.Weight.Normal))
+        painter.drawText(box, Qt.AlignmentFlag.AlignCenter, unavailable_text if failed else loading_text)
+
+    @staticmethod
+    def _font(pixel_size: int, weight=QFont.Weight.Normal, italic: bool = False) -> QFont:
+        font = QFont()
+        font.setPixelSize(pixel_size)
+        font.setWeight(weight)
+        font.setItalic(italic)
+        return font
+
+
+class MediaTileDelegate(_TileDelegate):
+    """Paints a media tile: selection checkbox, thumbnail and file name."""
+
+    TILE_SIZE = QSize(140, 160)
+    THUMBNAIL_SIZE = (116, 86)
+
+    def checkbox_rect(self, tile_rect: QRect) -> QRect:
+        return QRect(tile_rect.left() + 6, tile_rect.top() + 6, 18, 18)
+
+    def paint(self, painter: QPainter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = option.rect.adjusted(1, 1, -1, -1)
+        selected = index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+
+        if selected:
+            self._draw_card(painter, rect, "#e3f2fd", "#2196f3", 2)
+        elif hovered:
+            self._draw_card(painter, rect, "#f5f5f5", "#cccccc")
+        else:
+            self._draw_card(painter, rect, "#ffffff", "#e0e0e0")
+
+        # Checkbox
+        checkbox = self.checkbox_rect(option.rect)
+        painter.setPen(QPen(QColor("#28a745" if selected else "#cccccc"), 2))
+        painter.setBrush(QColor("#28a745" if selected else "#ffffff"))
+        painter.drawRoundedRect(checkbox, 3, 3)
+        if selected:
+            painter.setPen(QPen(QColor("#ffffff"), 2))
+            painter.drawLine(checkbox.left() + 4, checkbox.center().y(),
+                             checkbox.left() + 8, checkbox.bottom() - 4)
+            painter.drawLine(checkbox.left() + 8, checkbox.bottom() - 4,
+                             checkbox.right() - 3, checkbox.top() + 4)
+
+        # Thumbnail frame
+        box = QRect(rect.left() + 9, rect.top() + 28, 120, 90)
+        painter.setPen(QPen(QColor("#dddddd"), 2))
+        painter.setBrush(QColor("#f8f9fa"))
+        painter.drawRoundedRect(box, 6, 6)
+        video = is_video_item(index.data(ITEM_ROLE))
+        self._draw_thumbnail(painter, box, index,
+                             "🎥\nVIDEO" if video else "📷\nNo Preview",
+                             "🎥" if video else "📷")
+
+        # File name
+        name_rect = QRect(rect.left() + 5, box.bottom() + 5, rect.width() - 10, rect.bottom() - box.bottom() - 8)
+        painter.setFont(self._font(11, QFont.Weight.Medium))
+        painter.setPen(QColor("#333333"))
+        name = painter.fontMetrics().elidedText(index.data(Qt.ItemDataRole.DisplayRole) or "",
+                                                Qt.TextElideMode.ElideMiddle, name_rect.width())
+        painter.drawText(name_rect, Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop, name)
+        painter.restore()
+
+
+class PostTileDelegate(_TileDelegate):
+    """Paints a finished-post tile: preview, caption, date and type."""
+
+    TILE_SIZE = QSize(200, 250)
+    THUMBNAIL_SIZE = (180, 150)
+
+    def paint(self, painter: QPainter, option, index):
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        rect = option.rect.adjusted(1, 1, -1, -1)
+        post = index.data(ITEM_ROLE) or {}
+
+        if option.state & QStyle.StateFlag.State_MouseOver:
+            self._draw_card(painter, rect, "#f8f9fa", "#007bff")
+        else:
+            self._draw_card(painter, rect, "#ffffff", "#e0e0e0")
+
+        # Preview
+        box = QRect(rect.left() + 8, rect.top() + 8, 180, 150)
+        painter.setPen(QPen(QColor("#dddddd"), 1))
+        painter.setBrush(QColor("#f5f5f5"))
+        painter.drawRoundedRect(box, 4, 4)
+        self._draw_thumbnail(painter, box, index, "📷\nPreview\nUnavailable", "📷")
+
+        left, width = rect.left() + 10, rect.width() - 20
+
+        # Caption preview
+        caption = post.get("caption") or "No caption"
+        caption = caption[:50] + "..." if len(caption) > 50 else caption
+        painter.setFont(self._font(11))
+        painter.setPen(QColor("#333333"))
+        painter.drawText(QRect(left, box.bottom() + 5, width, 32),
+                         Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap,
+                         caption)
+
+        # Date
+        painter.setFont(self._font(10, italic=True))
+        painter.setPen(QColor("#666666"))
+        painter.drawText(QRect(left, box.bottom() + 40, width, 16), Qt.AlignmentFlag.AlignLeft,
+                         format_post_date(post.get("date_added", "")))
+
+        # Type indicator
+        post_type = post.get("type", "unknown")
+        type_icon = "📷" if "photo" in post_type else "🎥" if "video" in post_type else "📄"
+        painter.setFont(self._font(10, QFont.Weight.Bold))
+        painter.setPen(QColor("#007bff"))
+        painter.drawText(QRect(left, box.bottom() + 58, width, 16), Qt.AlignmentFlag.AlignLeft,
+                         f"{type_icon} Ready to Post")
+        painter.restore()
+
+
+class MediaGridView(QListView):
+    """Wrapping icon-mode view of uniform tiles, with a message while it is empty."""
+
+    # Scrolling settles for this long before off-screen thumbnail loads are dropped
+    SCROLL_SETTLE_MS = 150
+
+    def __init__(self, placeholder_text: str = "", parent=None):
+        """
+        Args:
+            placeholder_text: Message shown when the model has no rows
+            parent: Parent widget
+        """
+        super().__init__(parent)
+        self.placeholder_text = placeholder_text
+        self.setViewMode(QListView.ViewMode.IconMode)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setWrapping(True)
+        # Equal tiles let the view place rows arithmetically instead of measuring each item
+        self.setUniformItemSizes(True)
+        self.setSpacing(4)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.NoSelection)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setMouseTracking(True)
+        self.setStyleSheet("QListView { border: none; background: transparent; }")
+
+        self._settle_timer = QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(self.SCROLL_SETTLE_MS)
+        self._settle_timer.timeout.connect(self._cancel_offscreen_thumbnails)
+        self.verticalScrollBar().valueChanged.connect(self._settle_timer.start)
+
+    def set_placeholder_text(self, text: str):
+        """Change the empty-grid message."""
+        self.placeholder_text = text
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        model = self.model()
+        if self.placeholder_text and (model is None or model.rowCount() == 0):
+            painter = QPainter(self.viewport())
+            painter.setPen(QColor("#666666"))
+            font = QFont()
+            font.setPixelSize(12)
+            painter.setFont(font)
+            painter.drawText(self.viewport().rect().adjusted(20, 20, -20, -20),
+                             Qt.AlignmentFlag.AlignCenter | Qt.TextFlag.TextWordWrap, self.placeholder_text)
+
+    def _cancel_offscreen_thumbnails(self):
+        model = self.model()
+        if isinstance(model, LibraryGridModel):
+            viewport_rect = self.viewport().rect()
+            model.cancel_thumbnails(lambda row: not self.visualRect(model.index(row)).intersects(viewport_rect))
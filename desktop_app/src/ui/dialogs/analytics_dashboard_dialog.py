@@ -25,6 +25,9 @@ from ...utils.subscription_utils import (
 )
 from ...features.subscription.access_control import Feature
 
+# Newest posts shown in the performance table; totals cover every post
+POSTS_TABLE_LIMIT = 1000
+
 
 class AnalyticsWorker(QThread):
     """Worker thread for analytics operations."""
@@ -485,8 +488,10 @@ class AnalyticsDashboardDialog(BaseDialog):
     def _load_posts_table(self):
         """Load posts data into the table."""
         try:
-            posts = self.analytics_handler.get_all_posts_performance()
+            posts = self.analytics_handler.get_recent_posts_performance(POSTS_TABLE_LIMIT)
             
+            # Sorting while filling would re-sort the table after every item
+            self.posts_table.setSortingEnabled(False)
             self.posts_table.setRowCount(len(posts))
             
             for row, post in enumerate(posts):
@@ -514,6 +519,8 @@ class AnalyticsDashboardDialog(BaseDialog):
                 self.posts_table.setItem(row, 7, QTableWidgetItem(str(metrics.get("comments", 0))))
                 self.posts_table.setItem(row, 8, QTableWidgetItem(str(total_engagement)))
             
+            self.posts_table.setSortingEnabled(True)
+            
             # Resize columns to content
             self.posts_table.resizeColumnsToContents()
             
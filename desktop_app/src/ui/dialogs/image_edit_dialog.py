@@ -9,12 +9,70 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
     QTextEdit, QPushButton, QComboBox, QFrame, QSizePolicy
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QThread, QTimer
 from PySide6.QtGui import QPixmap, QFont
 
+from ...config.shared_api_keys import get_gemini_api_key
 from ..base_dialog import BaseDialog
 from ..widgets.loading_screen import CartoonLoadingScreen
 
+PREVIEW_DELAY_MS = 120  # Debounce between typing and re-rendering the preview
+PREVIEW_SIZE = 300
+
+
+class ImageEditWorker(QThread):
+    """Worker thread for full-resolution edits, so they never block the GUI."""
+    
+    finished = Signal(bool, str, str)  # success, edited_path, message
+    
+    def __init__(self, image_path: str, instructions: str, edit_handler=None, use_ai: bool = True):
+        """
+        Args:
+            image_path: Path to the image to edit
+            instructions: Editing instructions
+            edit_handler: ImageEditHandler to run on (default: a new one); it
+                must not be used elsewhere until the worker has finished
+            use_ai: Edit with Gemini/Imagen, or only apply traditional edits
+        """
+        super().__init__()
+        self.image_path = image_path
+        self.instructions = instructions
+        self.edit_handler = edit_handler
+        self.use_ai = use_ai
+    
+    def run(self):
+        """Run the image edit."""
+        try:
+            from ...features.media_processing.image_edit_handler import ImageEditHandler
+            
+            handler = self.edit_handler or ImageEditHandler()
+            if self.use_ai:
+                result = handler.edit_image_with_gemini(self.image_path, self.instructions)
+            else:
+                result = handler.apply_traditional_edits(self.image_path, self.instructions)
+            self.finished.emit(*result)
+        except Exception as e:
+            self.finished.emit(False, "", f"Error: {str(e)}")
+
+
+class ImagePreviewWorker(QThread):
+    """Worker thread rendering one live preview on the preview proxy."""
+    
+    rendered = Signal(int, object)  # preview generation, QImage or None
+    
+    def __init__(self, edit_handler, image_path: str, instructions: str, generation: int):
+        super().__init__()
+        self.edit_handler = edit_handler
+        self.image_path = image_path
+        self.instructions = instructions
+        self.generation = generation
+    
+    def run(self):
+        """Render the preview."""
+        qimage = self.edit_handler.preview_traditional_edits(self.image_path, self.instructions)
+        self.rendered.emit(self.generation, qimage)
+
+
 class ImageEditDialog(BaseDialog):
     """Dialog for editing images with Gemini."""
     
@@ -40,6 +98,20 @@ class ImageEditDialog(BaseDialog):
         # Initialize loading screen
         self.loading_screen = CartoonLoadingScreen(self)
         
+        # Live preview runs on a screen-sized proxy in a worker; the full edit runs in a worker on export
+        self.edit_handler = None
+        self.worker = None
+        self.preview_worker = None
+        self.preview_generation = 0  # Bumped on every change; older renders are dropped
+        self.original_pixmap = None
+        # With a Gemini key, Apply edits through Gemini, which the filter preview cannot show;
+        # without one, Apply runs the same filter chain as the preview at full resolution
+        self.use_ai = bool(get_gemini_api_key())
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DELAY_MS)
+        self.preview_timer.timeout.connect(self._update_preview)
+        
         # Set up dialog properties
         self.setWindowTitle(self.tr("Edit Image with Gemini"))
         self.setMinimumSize(800, 600)
@@ -80,12 +152,12 @@ class ImageEditDialog(BaseDialog):
         if os.path.exists(self.image_path):
             pixmap = QPixmap(self.image_path)
             if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(
-                    300, 300,
+                self.original_pixmap = pixmap.scaled(
+                    PREVIEW_SIZE, PREVIEW_SIZE,
                     Qt.AspectRatioMode.KeepAspectRatio,
                     Qt.TransformationMode.SmoothTransformation
                 )
-                self.image_preview.setPixmap(scaled_pixmap)
+                self.image_preview.setPixmap(self.original_pixmap)
             else:
                 self.image_preview.setText("Error loading image")
         else:
@@ -93,6 +165,14 @@ class ImageEditDialog(BaseDialog):
             
         preview_layout.addWidget(self.image_preview)
         
+        preview_note = QLabel(
+            self.tr("Gemini edits are shown once applied") if self.use_ai
+            else self.tr("Live preview of the edit")
+        )
+        preview_note.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        preview_note.setStyleSheet("color: #555;")
+        preview_layout.addWidget(preview_note)
+        
         # Image info
         if os.path.exists(self.image_path):
             info_text = f"File: {os.path.basename(self.image_path)}\n"
@@ -147,6 +227,7 @@ class ImageEditDialog(BaseDialog):
             "- Add a subtle vignette effect"
         ))
         self.instructions_edit.setMinimumHeight(200)
+        self.instructions_edit.textChanged.connect(self.preview_timer.start)
         instructions_layout.addWidget(self.instructions_edit)
         
         # Tips
@@ -175,7 +256,7 @@ class ImageEditDialog(BaseDialog):
         button_layout.addWidget(cancel_btn)
         
         # Skip editing button
-        skip_btn = QPushButton(self.tr("Skip Editing"))
+        self.skip_btn = skip_btn = QPushButton(self.tr("Skip Editing"))
         skip_btn.setStyleSheet("""
             background-color: #6b7280;
             color: white;
@@ -331,6 +412,59 @@ class ImageEditDialog(BaseDialog):
             
         self.instructions_edit.setText(instructions)
         
+    def _update_preview(self):
+        """Render the current instructions on the preview proxy in the background."""
+        self.preview_generation += 1
+        if self.use_ai:
+            return
+        instructions = self.instructions_edit.toPlainText().strip()
+        if not instructions:
+            if self.original_pixmap is not None:
+                self.image_preview.setPixmap(self.original_pixmap)
+            return
+        
+        if self.preview_worker is None:
+            self._start_preview_render(instructions)
+        # Otherwise one render is running; the latest text is rendered when it finishes
+    
+    def _start_preview_render(self, instructions: str):
+        """Start a preview worker for the current preview generation."""
+        try:
+            if self.edit_handler is None:
+                from ...features.media_processing.image_edit_handler import ImageEditHandler
+                self.edit_handler = ImageEditHandler()
+            
+            self.preview_worker = ImagePreviewWorker(
+                self.edit_handler, self.image_path, instructions, self.preview_generation
+            )
+            self.preview_worker.rendered.connect(self._on_preview_rendered)
+            self.preview_worker.finished.connect(self._on_preview_worker_finished)
+            self.preview_worker.start()
+        except Exception as e:
+            self.logger.error(f"Error updating edit preview: {e}")
+    
+    def _on_preview_rendered(self, generation: int, qimage):
+        """Show a finished preview unless the instructions changed meanwhile."""
+        if generation != self.preview_generation or qimage is None:
+            return
+        self.image_preview.setPixmap(QPixmap.fromImage(qimage).scaled(
+            PREVIEW_SIZE, PREVIEW_SIZE,
+            Qt.AspectRatioMode.KeepAspectRatio,
+            Qt.TransformationMode.SmoothTransformation
+        ))
+    
+    def _on_preview_worker_finished(self):
+        """Release the preview worker and render the latest text if it was superseded."""
+        worker = self.preview_worker
+        self.preview_worker = None
+        if worker is None:
+            return
+        worker.deleteLater()
+        instructions = self.instructions_edit.toPlainText().strip()
+        if worker.generation != self.preview_generation and instructions and not self.preview_timer.isActive():
+            # The last render was superseded, so render again with the latest text
+            self._start_preview_render(instructions)
+        
     def _on_apply(self):
         """Handle apply button click."""
         # Get instructions from text edit
@@ -344,29 +478,39 @@ class ImageEditDialog(BaseDialog):
         self._apply_edits_and_save(instructions)
     
     def _apply_edits_and_save(self, instructions: str):
-        """Apply edits and save to library."""
+        """Run the full-resolution edit in a worker thread, then save to library."""
+        if self.worker and self.worker.isRunning():
+            return
+        
+        self.preview_timer.stop()
+        self.apply_btn.setEnabled(False)
+        self.skip_btn.setEnabled(False)
+        
+        # Show cartoon loading screen
+        self.loading_screen.show_loading("🎨 Creating your masterpiece...")
+        
+        self.worker = ImageEditWorker(self.image_path, instructions, use_ai=self.use_ai)
+        self.worker.finished.connect(self._on_edit_finished)
+        self.worker.start()
+    
+    def _on_edit_finished(self, success: bool, edited_path: str, message: str):
+        """Save the edited image to the library once the worker is done."""
+        from PySide6.QtWidgets import QMessageBox
+        
+        self.loading_screen.hide_loading()
+        self.apply_btn.setEnabled(True)
+        self.skip_btn.setEnabled(True)
+        instructions = self.worker.instructions if self.worker else ""
+        if self.worker:
+            # finished is emitted from run(); let the thread exit before deleting it
+            self.worker.wait()
+            self.worker.deleteLater()
+            self.worker = None
+        
         try:
-            from ...features.media_processing.image_edit_handler import ImageEditHandler
-            from ...handlers.library_handler import LibraryManager
-            from PySide6.QtWidgets import QMessageBox, QProgressDialog
-            from PySide6.QtCore import Qt
-            
-            # Show cartoon loading screen
-            self.loading_screen.show_loading("🎨 Creating your masterpiece...")
-            
-            # Show progress dialog
-            progress = QProgressDialog("Processing image...", "Cancel", 0, 0, self)
-            progress.setWindowModality(Qt.WindowModality.WindowModal)
-            progress.show()
-            
-            # Apply the image edits
-            image_handler = ImageEditHandler()
-            success, edited_path, message = image_handler.edit_image_with_gemini(self.image_path, instructions)
-            
-            progress.close()
-            self.loading_screen.hide_loading()
-            
             if success and edited_path:
+                from ...handlers.library_handler import LibraryManager
+                
                 # Save the edited image to library
                 library_manager = LibraryManager()
                 
@@ -408,7 +552,6 @@ class ImageEditDialog(BaseDialog):
                 )
                 
         except Exception as e:
-            self.loading_screen.hide_loading()
             QMessageBox.critical(
                 self,
                 "Error",
@@ -462,6 +605,23 @@ class ImageEditDialog(BaseDialog):
                 f"An error occurred while saving the image:\n\n{str(e)}"
             )
     
+    def done(self, result):
+        """Release the preview proxy when the dialog closes."""
+        if self.worker and self.worker.isRunning():
+            # Keep the dialog open until the export has finished
+            return
+        self.preview_timer.stop()
+        if self.preview_worker is not None:
+            # A preview render is short; let it finish before the dialog goes away
+            self.preview_worker.rendered.disconnect(self._on_preview_rendered)
+            self.preview_worker.finished.disconnect(self._on_preview_worker_finished)
+            self.preview_worker.wait()
+            self.preview_worker.deleteLater()
+            self.preview_worker = None
+        if self.edit_handler is not None:
+            self.edit_handler.release_preview_proxy(self.image_path)
+        super().done(result)
+    
     def retranslateUi(self):
         """Update UI text for translations."""
         self.setWindowTitle(self.tr("Edit Image with Gemini"))
@@ -20,6 +20,7 @@ from ...features.media_processing.image_edit_handler import ImageEditHandler
 from ...api.ai.ai_handler import AIHandler
 from ...models.app_state import AppState
 from ..widgets.loading_screen import CartoonLoadingScreen
+from .image_edit_dialog import ImageEditWorker
 
 
 class PostCreationDialog(BaseDialog):
@@ -37,6 +38,8 @@ class PostCreationDialog(BaseDialog):
         self.media_path = media_path
         self.library_manager = LibraryManager()
         self.image_edit_handler = ImageEditHandler()
+        self.edit_worker = None  # Runs image edits off the GUI thread
+        self._caption_generated = False
         
         # Initialize AI handler for caption generation
         self.app_state = AppState()
@@ -1031,6 +1034,7 @@ Ready for processing"""
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)  # Indeterminate progress
         
+        edit_started = False
         try:
             # Update app state with current media
             self.app_state.selected_media = self.media_path
@@ -1080,75 +1084,19 @@ Ready for processing"""
                     if use_imagen_overwrite:
                         # Show loading screen for AI image generation
                         self.loading_screen.show_loading("🎨 Creating your stunning enhanced image...")
-                        
-                        # Use AI image generation (Imagen) for complete enhancement
-                        success, edited_path, message = self.image_edit_handler.edit_image_with_gemini(
-                            source_path, 
-                            editing_instructions
-                        )
-                        
-                        # Hide loading screen immediately after AI operation
-                        self.loading_screen.hide_loading()
-                    else:
-                        # Use traditional image editing (brightness, contrast, filters, etc.)
-                        # No loading screen needed for traditional editing as it's fast
-                        success, edited_path, message = self.image_edit_handler.apply_traditional_edits(
-                            source_path, 
-                            editing_instructions
-                        )
                     
-                    if success and edited_path and os.path.exists(edited_path):
-                        # Store the edited version
-                        self.edited_media_path = edited_path
-                        
-                        # Switch to showing the edited version
-                        self.media_path = edited_path
-                        self.showing_original = False
-                        self.app_state.selected_media = edited_path
-                        
-                        # Show the toggle button now that we have both versions
-                        self.toggle_button.setVisible(True)
-                        self.toggle_button.setText("Show Original Version")
-                        self.toggle_button.setStyleSheet("""
-                            QPushButton {
-                                background-color: #FF9800;
-                                color: white;
-                                border: none;
-                                border-radius: 6px;
-                                padding: 8px 16px;
-                                font-size: 12px;
-                                font-weight: bold;
-                                margin-bottom: 10px;
-                            }
-                            QPushButton:hover {
-                                background-color: #F57C00;
-                            }
-                        """)
-                        
-                        self._load_media_preview()
-                        self.logger.info("Image editing completed successfully")
-                        
-                        # Determine if this was AI generation or traditional editing
-                        is_ai_generated = "Imagen 3" in message or "AI image generated" in message
-                        generation_type = "AI-generated" if is_ai_generated else "edited"
-                        
-                        QMessageBox.information(
-                            self, 
-                            "Content Generation Complete", 
-                            f"Content has been generated successfully!\n\n"
-                            f"Image {generation_type}: {message}\n"
-                            f"Use the toggle button to switch between original and {generation_type} versions.\n"
-                            f"{'Caption generated and ' if not keep_caption and (instructions or not caption) else ''}ready for posting."
-                        )
-                    else:
-                        self.logger.warning(f"Image editing failed: {message}")
-                        QMessageBox.warning(
-                            self, 
-                            "Image Editing Failed", 
-                            f"Image editing failed: {message}\n\n"
-                            f"The original image will be used. "
-                            f"{'Caption was ' if not keep_caption and (instructions or not caption) else 'Content is '}still generated successfully."
-                        )
+                    # AI generation (Imagen) or traditional editing (brightness, contrast,
+                    # filters, etc.) runs in a worker; the dialog stays disabled until it is done
+                    self._caption_generated = bool(not keep_caption and (instructions or not caption))
+                    self.edit_worker = ImageEditWorker(
+                        source_path, 
+                        editing_instructions, 
+                        edit_handler=self.image_edit_handler, 
+                        use_ai=bool(use_imagen_overwrite)
+                    )
+                    self.edit_worker.finished.connect(self._on_image_edit_finished)
+                    self.edit_worker.start()
+                    edit_started = True
                 else:
                     self.logger.info("Video editing instructions noted (will be applied during processing)")
                     QMessageBox.information(
@@ -1175,13 +1123,93 @@ Ready for processing"""
                 f"An error occurred while generating content: {str(e)}"
             )
         finally:
-            # Re-enable UI elements
-            self.setEnabled(True)
-            
-            # Hide loading screen (in case it's still showing due to an error)
-            if self.loading_screen:
-                self.loading_screen.hide_loading()
-            self.progress_bar.setVisible(False)
+            if not edit_started:
+                self._finish_content_generation()
+    
+    def _on_image_edit_finished(self, success: bool, edited_path: str, message: str):
+        """Show the edited image once the edit worker is done."""
+        if self.edit_worker:
+            # finished is emitted from run(); let the thread exit before deleting it
+            self.edit_worker.wait()
+            self.edit_worker.deleteLater()
+            self.edit_worker = None
+        
+        # Hide loading screen immediately after the edit
+        if self.loading_screen:
+            self.loading_screen.hide_loading()
+        
+        try:
+            if success and edited_path and os.path.exists(edited_path):
+                # Store the edited version
+                self.edited_media_path = edited_path
+                
+                # Switch to showing the edited version
+                self.media_path = edited_path
+                self.showing_original = False
+                self.app_state.selected_media = edited_path
+                
+                # Show the toggle button now that we have both versions
+                self.toggle_button.setVisible(True)
+                self.toggle_button.setText("Show Original Version")
+                self.toggle_button.setStyleSheet("""
+                    QPushButton {
+                        background-color: #FF9800;
+                        color: white;
+                        border: none;
+                        border-radius: 6px;
+                        padding: 8px 16px;
+                        font-size: 12px;
+                        font-weight: bold;
+                        margin-bottom: 10px;
+                    }
+                    QPushButton:hover {
+                        background-color: #F57C00;
+                    }
+                """)
+                
+                self._load_media_preview()
+                self.logger.info("Image editing completed successfully")
+                
+                # Determine if this was AI generation or traditional editing
+                is_ai_generated = "Imagen 3" in message or "AI image generated" in message
+                generation_type = "AI-generated" if is_ai_generated else "edited"
+                
+                QMessageBox.information(
+                    self, 
+                    "Content Generation Complete", 
+                    f"Content has been generated successfully!\n\n"
+                    f"Image {generation_type}: {message}\n"
+                    f"Use the toggle button to switch between original and {generation_type} versions.\n"
+                    f"{'Caption generated and ' if self._caption_generated else ''}ready for posting."
+                )
+            else:
+                self.logger.warning(f"Image editing failed: {message}")
+                QMessageBox.warning(
+                    self, 
+                    "Image Editing Failed", 
+                    f"Image editing failed: {message}\n\n"
+                    f"The original image will be used. "
+                    f"{'Caption was ' if self._caption_generated else 'Content is '}still generated successfully."
+                )
+        except Exception as e:
+            self.logger.error(f"Error generating content: {e}")
+            QMessageBox.critical(
+                self, 
+                "Content Generation Error", 
+                f"An error occurred while generating content: {str(e)}"
+            )
+        finally:
+            self._finish_content_generation()
+    
+    def _finish_content_generation(self):
+        """Re-enable the dialog after content generation."""
+        # Re-enable UI elements
+        self.setEnabled(True)
+        
+        # Hide loading screen (in case it's still showing due to an error)
+        if self.loading_screen:
+            self.loading_screen.hide_loading()
+        self.progress_bar.setVisible(False)
             
     def _add_context_file(self):
         """Add a context file."""
@@ -1254,6 +1282,12 @@ Ready for processing"""
                 f"An error occurred while adding the post to library: {str(e)}"
             )
             
+    def done(self, result):
+        """Keep the dialog open while an image edit is still running."""
+        if self.edit_worker and self.edit_worker.isRunning():
+            return
+        super().done(result)
+            
     def get_post_data(self) -> Dict[str, Any]:
         """Get the current post data."""
         from datetime import datetime
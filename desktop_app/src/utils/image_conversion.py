@@ -0,0 +1,171 @@
+"""
+PIL to Qt image conversion.
+Images are exported with a single tobytes() and wrapped by a QImage that reads
+that buffer in place, converting modes only when Qt has no matching format.
+Callers that show one image repeatedly can opt in to caching its pixmap.
+"""
+import logging
+import weakref
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from PIL import Image
+from PySide6.QtGui import QImage, QPixmap
+
+# Pixmaps kept for the most recently converted images; a 12 MP pixmap is ~48 MB
+PIXMAP_CACHE_SIZE = 4
+
+# PIL mode -> (QImage format, bytes per pixel) for modes Qt reads as they are
+_DIRECT_FORMATS = {
+    "RGB": (QImage.Format.Format_RGB888, 3),
+    "RGBA": (QImage.Format.Format_RGBA8888, 4),
+    "RGBX": (QImage.Format.Format_RGBX8888, 4),
+    "RGBa": (QImage.Format.Format_RGBA8888_Premultiplied, 4),
+    "L": (QImage.Format.Format_Grayscale8, 1),
+}
+
+_logger = logging.getLogger("ImageConversion")
+
+
+class _BufferedQImage(QImage):
+    """QImage over a bytes buffer it keeps alive, as PIL.ImageQt does."""
+
+    def __init__(self, data: bytes, width: int, height: int, bytes_per_line: int,
+                 image_format: QImage.Format):
+        super().__init__(data, width, height, bytes_per_line, image_format)
+        # The QImage reads its pixels straight from this buffer
+        self._data = data
+
+
+def pil_to_qimage(image: Image.Image) -> QImage:
+    """
+    Wrap a PIL image in a QImage.
+
+    Costs one export of the pixels (two when the mode has no Qt equivalent).
+    The QImage shares that buffer instead of copying it, so keep the returned
+    object alive while Qt uses it, or take a copy().
+
+    Args:
+        image: PIL image in any mode
+
+    Returns:
+        QImage, null if the image cannot be converted
+    """
+    mode = image.mode
+    if mode == "P" and image.palette.mode == "RGB" and "transparency" not in image.info:
+        qimage = _BufferedQImage(image.tobytes(), image.width, image.height, image.width,
+                                 QImage.Format.Format_Indexed8)
+        palette = image.getpalette("RGB") or []
+        qimage.setColorTable([
+            0xFF000000 | (palette[i] << 16) | (palette[i + 1] << 8) | palette[i + 2]
+            for i in range(0, len(palette), 3)
+        ])
+        return qimage
+
+    if mode == "1":
+        # PIL packs bilevel rows MSB first, as Format_Mono expects
+        qimage = _BufferedQImage(image.tobytes(), image.width, image.height, (image.width + 7) // 8,
+                                 QImage.Format.Format_Mono)
+        qimage.setColorTable([0xFF000000, 0xFFFFFFFF])
+        return qimage
+
+    if mode not in _DIRECT_FORMATS:
+        has_alpha = ("A" in image.getbands() or "transparency" in image.info
+                     or (mode == "P" and image.palette.mode == "RGBA"))
+        image = image.convert("RGBA" if has_alpha else "RGB")
+        mode = image.mode
+
+    image_format, bytes_per_pixel = _DIRECT_FORMATS[mode]
+    return _BufferedQImage(image.tobytes(), image.width, image.height,
+                           image.width * bytes_per_pixel, image_format)
+
+
+class _PixmapCache:
+    """Pixmaps of the last few converted images, keyed by image identity."""
+
+    def __init__(self, size: int = PIXMAP_CACHE_SIZE):
+        self.size = size
+        self._entries: "OrderedDict[int, Tuple[weakref.ref, tuple, QPixmap]]" = OrderedDict()
+
+    @staticmethod
+    def _version(image: Image.Image) -> tuple:
+        # In-place operations like thumbnail() swap the core image or resize it
+        return id(image.im), image.mode, image.size
+
+    def get(self, image: Image.Image) -> Optional[QPixmap]:
+        entry = self._entries.get(id(image))
+        if entry is None:
+            return None
+        ref, version, pixmap = entry
+        if ref() is not image or version != self._version(image):
+            del self._entries[id(image)]
+            return None
+        self._entries.move_to_end(id(image))
+        return pixmap
+
+    def put(self, image: Image.Image, pixmap: QPixmap):
+        key = id(image)
+        # Drop the entry as soon as the image is garbage collected
+        ref = weakref.ref(image, lambda _, key=key: self._discard(key, ref))
+        self._entries[key] = (ref, self._version(image), pixmap)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+
+    def _discard(self, key: int, ref: weakref.ref):
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] is ref:
+            del self._entries[key]
+
+    def clear(self):
+        self._entries.clear()
+
+
+_pixmap_cache = _PixmapCache()
+
+
+def pil_to_qpixmap(image: Optional[Image.Image], use_cache: bool = False) -> QPixmap:
+    """
+    Convert a PIL image to a QPixmap at its exact pixel size.
+
+    Must be called on the GUI thread. With use_cache, converting the same
+    image again returns the cached pixmap. The cache cannot see pixels drawn
+    in place (e.g. with ImageDraw), so only use it for images that are not
+    modified after conversion.
+
+    Args:
+        image: PIL image in any mode
+        use_cache: Reuse and remember the pixmap of this image
+
+    Returns:
+        QPixmap, null if the image is None or cannot be converted
+    """
+    if image is None:
+        return QPixmap()
+
+    try:
+        # Lazily opened files have no pixel data (and no stable version) until loaded
+        image.load()
+        if use_cache:
+            pixmap = _pixmap_cache.get(image)
+            if pixmap is not None:
+                return pixmap
+
+        pixmap = QPixmap.fromImage(pil_to_qimage(image))
+        if pixmap.isNull():
+            _logger.error(f"Could not convert {image.mode} image of size {image.size} to a pixmap")
+            return QPixmap()
+        # Set the device pixel ratio to 1.0 to ensure no scaling is applied
+        pixmap.setDevicePixelRatio(1.0)
+
+        if use_cache:
+            _pixmap_cache.put(image, pixmap)
+        return pixmap
+    except Exception as e:
+        _logger.exception(f"Error converting PIL image to QPixmap: {e}")
+        return QPixmap()
+
+
+def clear_pixmap_cache():
+    """Release the cached pixmaps."""
+    _pixmap_cache.clear()
@@ -0,0 +1,42 @@
+"""
+Saving images with the app's quality settings.
+"""
+import os
+from typing import Optional
+
+from PIL import Image
+
+
+def write_image(image: Image.Image, filepath: str, image_format: Optional[str] = None):
+    """
+    Save an image with the app's high quality settings for its format.
+
+    Args:
+        image: PIL Image to save
+        filepath: Path to save to
+        image_format: Image format (if None, determined from filename)
+    """
+    if not image_format:
+        _, ext = os.path.splitext(filepath.lower())
+        if ext in ('.jpg', '.jpeg'):
+            image_format = 'JPEG'
+        elif ext in ('.png',):
+            image_format = 'PNG'
+        elif ext in ('.webp',):
+            image_format = 'WEBP'
+        elif ext in ('.bmp',):
+            image_format = 'BMP'
+        elif ext in ('.gif',):
+            image_format = 'GIF'
+        else:
+            image_format = 'PNG'  # Default to PNG for best quality
+
+    if image_format == 'JPEG':
+        image.save(filepath, format=image_format, quality=100, subsampling=0)
+    elif image_format == 'PNG':
+        # PNG with minimum compression (lossless, best quality)
+        image.save(filepath, format=image_format, compress_level=0)
+    elif image_format == 'WEBP':
+        image.save(filepath, format=image_format, quality=100, lossless=True)
+    else:
+        image.save(filepath, format=image_format)
@@ -0,0 +1,159 @@
+"""
+Streaming writers for data exports.
+CSV rows and JSON arrays/objects are written as their source generators
+produce them, optionally gzip-compressed or bundled into a ZIP with media
+files, so memory use does not grow with the size of the export.
+"""
+import os
+import io
+import csv
+import gzip
+import json
+import zipfile
+from typing import Any, Callable, Dict, IO, Iterable, Iterator, Optional, Sequence, Tuple
+
+# Already-compressed media gains nothing from deflate; store it as is
+STORED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp', '.mp4', '.mov', '.avi', '.mkv', '.wmv',
+                     '.mp3', '.m4a', '.zip', '.gz'}
+
+
+class StreamedObject:
+    """Marks an iterable of (key, value) pairs to be written as a JSON object."""
+
+    def __init__(self, pairs: Iterable[Tuple[str, Any]]):
+        self.pairs = pairs
+
+
+def open_export(path: str, compress: bool = False, newline: Optional[str] = None) -> IO[str]:
+    """
+    Open an export file for text writing.
+
+    Args:
+        path: Output path
+        compress: Write gzip-compressed data
+        newline: Passed to open() (use '' for CSV)
+
+    Returns:
+        Text file object
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if compress:
+        return gzip.open(path, 'wt', encoding='utf-8', newline=newline)
+    return open(path, 'w', encoding='utf-8', newline=newline)
+
+
+def write_csv(f: IO[str], fieldnames: Sequence[str], rows: Iterable[Dict[str, Any]]) -> int:
+    """
+    Write CSV rows as they are produced.
+
+    Args:
+        f: Text file object
+        fieldnames: Column names
+        rows: Row dicts
+
+    Returns:
+        int: Number of rows written
+    """
+    writer = csv.DictWriter(f, fieldnames=fieldnames)
+    writer.writeheader()
+    count = 0
+    for row in rows:
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def write_json(f: IO[str], value: Any, indent: int = 2):
+    """
+    Write a JSON document, streaming its lazy parts.
+
+    Within value, iterators and generators are written as arrays and
+    StreamedObject as objects, item by item; zero-argument callables are
+    called when reached, so a value after a stream can report on it (e.g. a
+    count). Everything else is serialized like json.dump(indent=indent).
+
+    Args:
+        f: Text file object
+        value: Document to write
+        indent: Indentation per nesting level
+    """
+    _write_value(f, value, indent, 0)
+    f.write("\n")
+
+
+def _write_value(f: IO[str], value: Any, indent: int, level: int):
+    if callable(value):
+        value = value()
+
+    if isinstance(value, dict):
+        _write_container(f, "{", "}", value.items(), indent, level, is_object=True)
+    elif isinstance(value, StreamedObject):
+        _write_container(f, "{", "}", value.pairs, indent, level, is_object=True)
+    elif isinstance(value, Iterator):
+        _write_container(f, "[", "]", value, indent, level, is_object=False)
+    else:
+        text = json.dumps(value, indent=indent, ensure_ascii=False)
+        f.write(text.replace("\n", "\n" + " " * (indent * level)) if level else text)
+
+
+def _write_container(f: IO[str], opening: str, closing: str, items: Iterable, indent: int,
+                     level: int, is_object: bool):
+    inner = "\n" + " " * (indent * (level + 1))
+    empty = True
+    for item in items:
+        f.write(opening + inner if empty else "," + inner)
+        empty = False
+        if is_object:
+            key, item = item
+            f.write(json.dumps(str(key), ensure_ascii=False) + ": ")
+        _write_value(f, item, indent, level + 1)
+    f.write(opening + closing if empty else "\n" + " " * (indent * level) + closing)
+
+
+class ZipExportBundle:
+    """ZIP archive of streamed documents plus media files, written entry by entry."""
+
+    def __init__(self, path: str):
+        """
+        Create the archive.
+
+        Args:
+            path: Output .zip path
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self._zip = zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED, allowZip64=True)
+
+    def __enter__(self) -> "ZipExportBundle":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add_document(self, arcname: str, write: Callable[[IO[str]], Any]):
+        """
+        Add a text document produced by a writer function.
+
+        Args:
+            arcname: Name inside the archive
+            write: Called with a text file object for the entry
+        """
+        with self._zip.open(arcname, 'w', force_zip64=True) as raw:
+            with io.TextIOWrapper(raw, encoding='utf-8', newline='') as f:
+                write(f)
+
+    def add_file(self, path: str, arcname: str):
+        """
+        Copy a file into the archive in chunks.
+
+        Args:
+            path: Source file
+            arcname: Name inside the archive
+        """
+        compression = (zipfile.ZIP_STORED if os.path.splitext(path)[1].lower() in STORED_EXTENSIONS
+                       else zipfile.ZIP_DEFLATED)
+        self._zip.write(path, arcname, compress_type=compression)
+
+    def close(self):
+        """Finish the archive."""
+        self._zip.close()
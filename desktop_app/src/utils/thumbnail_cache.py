@@ -0,0 +1,235 @@
+"""
+Persistent thumbnail cache.
+Thumbnails are generated once per (file, mtime, size), kept on disk as small
+JPEG files (WebP, or PNG without Qt's WebP plugin, when transparent) and held
+decoded in a bounded in-memory LRU, so showing the library does not decode
+full-resolution originals.
+"""
+import os
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+
+from PIL import Image
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+
+from ..config import constants as const
+
+# Decoded thumbnails kept in memory, measured in image bytes
+MEMORY_BUDGET_BYTES = 64 * 1024 * 1024
+JPEG_QUALITY = 85
+# (extension, Qt format) to try in order; WebP needs the qt-imageformats plugin
+OPAQUE_FORMATS = ((".jpg", "JPEG"),)
+TRANSPARENT_FORMATS = ((".webp", "WEBP"), (".png", "PNG"))
+# Decode JPEGs at no less than this multiple of the target size before the
+# final resample, as Image.thumbnail does, so draft() costs no visible quality
+DRAFT_REDUCING_GAP = 2.0
+
+Size = Tuple[int, int]
+CacheKey = Tuple[str, int, Size]
+
+
+def fit_size(width: int, height: int, box: Size) -> Size:
+    """Size of a width x height image scaled to fit box, keeping its aspect ratio."""
+    scale = min(box[0] / width, box[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def render_image_thumbnail(media_path: str, size: Size) -> Optional[QImage]:
+    """
+    Decode an image file straight to thumbnail size.
+
+    JPEGs are decoded with draft(), which lets the decoder scale down by up to
+    8x in the DCT domain instead of producing every full-resolution pixel.
+
+    Args:
+        media_path: Path to the image
+        size: (width, height) box the thumbnail must fit
+
+    Returns:
+        QImage, or None if the file cannot be decoded
+    """
+    try:
+        with Image.open(media_path) as image:
+            target = fit_size(image.width, image.height, size)
+            image.draft(None, (int(target[0] * DRAFT_REDUCING_GAP), int(target[1] * DRAFT_REDUCING_GAP)))
+
+            has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+            image = image.resize(target, Image.Resampling.LANCZOS)
+
+            image_format = QImage.Format.Format_RGBA8888 if has_alpha else QImage.Format.Format_RGB888
+            data = image.tobytes()
+            # copy() detaches the QImage from the Python buffer
+            return QImage(data, image.width, image.height, len(image.getbands()) * image.width,
+                          image_format).copy()
+    except Exception:
+        # Formats PIL cannot read may still load through Qt's image plugins
+        image = QImage(media_path)
+        if image.isNull():
+            return None
+        return image.scaled(size[0], size[1], Qt.AspectRatioMode.KeepAspectRatio,
+                            Qt.TransformationMode.SmoothTransformation)
+
+
+class ThumbnailCache:
+    """Thumbnails by (path, mtime, size): a memory LRU over a directory of small image files."""
+
+    _instances: Dict[str, "ThumbnailCache"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, cache_dir: Optional[str] = None) -> "ThumbnailCache":
+        """Shared cache for a directory (default: const.THUMBNAIL_CACHE_DIR)."""
+        key = os.path.normcase(os.path.abspath(cache_dir or const.THUMBNAIL_CACHE_DIR))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(key)
+            return cls._instances[key]
+
+    def __init__(self, cache_dir: str, memory_budget: int = MEMORY_BUDGET_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the thumbnail files (created on first write)
+            memory_budget: Bytes of decoded thumbnails kept in memory
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache_dir = cache_dir
+        self.memory_budget = memory_budget
+        self._memory: "OrderedDict[CacheKey, QImage]" = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "generated": 0}
+
+    def get(self, media_path: str, size: Size,
+            render: Optional[Callable[[str, Size], Optional[QImage]]] = None) -> Optional[QImage]:
+        """
+        Thumbnail of a media file, generated from the original only when not cached.
+
+        Safe to call from worker threads.
+
+        Args:
+            media_path: Path to the media file
+            size: (width, height) box the thumbnail fits
+            render: Produces a thumbnail from the original when needed
+                (default: render_image_thumbnail); pass one for videos
+
+        Returns:
+            QImage, or None if the file is missing or cannot be rendered
+        """
+        try:
+            mtime = os.stat(media_path).st_mtime_ns
+        except OSError:
+            return None
+
+        size = (int(size[0]), int(size[1]))
+        key = (os.path.abspath(media_path), mtime, size)
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return image
+
+        image = self._read_disk(key)
+        if image is not None:
+            self.stats["disk_hits"] += 1
+        else:
+            image = (render or render_image_thumbnail)(media_path, size)
+            if image is None or image.isNull():
+                return None
+            self.stats["generated"] += 1
+            self._write_disk(key, image)
+
+        self._remember(key, image)
+        return image
+
+    def peek(self, media_path: str, size: Size) -> Optional[QImage]:
+        """Thumbnail if it is already decoded in memory; never reads the disk or the original."""
+        try:
+            mtime = os.stat(media_path).st_mtime_ns
+        except OSError:
+            return None
+        key = (os.path.abspath(media_path), mtime, (int(size[0]), int(size[1])))
+        with self._lock:
+            image = self._memory.get(key)
+            if image is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+            return image
+
+    def invalidate(self, media_path: str):
+        """Drop every cached thumbnail of a file, in memory and on disk."""
+        path = os.path.abspath(media_path)
+        with self._lock:
+            for key in [key for key in self._memory if key[0] == path]:
+                self._memory_bytes -= self._memory.pop(key).sizeInBytes()
+
+        directory = self._entry_dir(path)
+        try:
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"Could not remove cached thumbnails of {media_path}: {e}")
+
+    def _remember(self, key: CacheKey, image: QImage):
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous.sizeInBytes()
+            self._memory[key] = image
+            self._memory_bytes += image.sizeInBytes()
+            while self._memory_bytes > self.memory_budget and len(self._memory) > 1:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= evicted.sizeInBytes()
+
+    def _entry_dir(self, path: str) -> str:
+        digest = hashlib.sha1(path.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, digest[:2], digest)
+
+    def _entry_stem(self, key: CacheKey) -> str:
+        path, mtime, (width, height) = key
+        return os.path.join(self._entry_dir(path), f"{mtime}_{width}x{height}")
+
+    def _read_disk(self, key: CacheKey) -> Optional[QImage]:
+        stem = self._entry_stem(key)
+        for extension in (".jpg", ".webp", ".png"):
+            if os.path.exists(stem + extension):
+                image = QImage(stem + extension)
+                if not image.isNull():
+                    return image
+        return None
+
+    def _write_disk(self, key: CacheKey, image: QImage):
+        """Store a thumbnail, replacing those of older versions of the file."""
+        stem = self._entry_stem(key)
+        directory = os.path.dirname(stem)
+        temp_path = f"{stem}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(directory, exist_ok=True)
+            formats = TRANSPARENT_FORMATS if image.hasAlphaChannel() else OPAQUE_FORMATS
+            for extension, image_format in formats:
+                if image.save(temp_path, image_format, JPEG_QUALITY):
+                    break
+            else:
+                raise OSError("image encoder failed")
+            os.replace(temp_path, stem + extension)
+
+            current = f"{key[1]}_"
+            for name in os.listdir(directory):
+                if not name.startswith(current) and not name.endswith(".tmp"):
+                    os.remove(os.path.join(directory, name))
+        except OSError as e:
+            self.logger.warning(f"Could not store thumbnail of {key[0]}: {e}")
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
@@ -0,0 +1,171 @@
+"""
+Background thumbnail loading.
+Thumbnails are produced through a ThumbnailCache on a bounded QThreadPool and
+handed back on the GUI thread through a queued signal. Visible items can be
+moved ahead of the queue, and requests whose owners are gone are cancelled.
+"""
+import logging
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QThread, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage
+
+from .thumbnail_cache import ThumbnailCache
+
+# Decoding is mostly I/O and memory bound; a few threads keep the disk busy
+# without starving the GUI thread
+MAX_THREADS = max(1, min(4, QThread.idealThreadCount() - 1))
+VISIBLE_PRIORITY = 10
+BACKGROUND_PRIORITY = 0
+
+JobKey = Tuple[str, Tuple[int, int]]
+Receiver = Callable[[Optional[QImage]], None]
+
+
+class _JobSignals(QObject):
+    """Carries finished jobs from the pool threads to the GUI thread."""
+    done = Signal(object, object)  # job key, QImage or None
+
+
+class _ThumbnailJob(QRunnable):
+    """Produces one thumbnail through the cache."""
+
+    def __init__(self, cache: ThumbnailCache, key: JobKey, render, signals: _JobSignals):
+        super().__init__()
+        # The loader owns the job until its result comes back
+        self.setAutoDelete(False)
+        self.cache = cache
+        self.key = key
+        self.render = render
+        self.signals = signals
+        self.priority = BACKGROUND_PRIORITY
+        self.cancelled = False
+
+    def run(self):
+        image = None
+        if not self.cancelled:
+            media_path, size = self.key
+            try:
+                image = self.cache.get(media_path, size, self.render)
+            except Exception as e:
+                logging.getLogger("ThumbnailLoader").warning(f"Could not load thumbnail of {media_path}: {e}")
+        # Always report back, so the loader can release the job
+        self.signals.done.emit(self.key, image)
+
+
+class ThumbnailLoader(QObject):
+    """Loads thumbnails off the GUI thread and delivers them to their receivers."""
+
+    def __init__(self, cache: Optional[ThumbnailCache] = None, max_threads: int = MAX_THREADS,
+                 parent: Optional[QObject] = None):
+        """
+        Initialize the loader.
+
+        Args:
+            cache: Thumbnail cache to load through (default: the shared cache)
+            max_threads: Size of the worker pool
+            parent: Parent QObject
+        """
+        super().__init__(parent)
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.cache = cache or ThumbnailCache.for_directory()
+        # Created before the signals object, so it is destroyed (and drained) first
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads)
+        self._signals = _JobSignals(self)
+        self._signals.done.connect(self._on_job_done, Qt.ConnectionType.QueuedConnection)
+
+        self._jobs: Dict[JobKey, _ThumbnailJob] = {}
+        self._receivers: Dict[JobKey, List[Tuple[int, Receiver]]] = {}
+        self._owner_keys: Dict[int, Set[JobKey]] = {}
+
+    def request(self, media_path: str, size: Tuple[int, int], receiver: Receiver, owner: QObject,
+                render=None, visible: bool = False):
+        """
+        Load a thumbnail and pass it to receiver on the GUI thread.
+
+        Thumbnails already decoded in memory are delivered immediately.
+
+        Args:
+            media_path: Path to the media file
+            size: (width, height) box the thumbnail fits
+            receiver: Called with the QImage, or None if it cannot be produced
+            owner: Object the thumbnail is for; when it is destroyed the
+                receiver is dropped and the job cancelled if nobody else waits
+            render: Renderer for the cache when the original must be decoded
+            visible: Load ahead of items that are not on screen
+        """
+        size = (int(size[0]), int(size[1]))
+        image = self.cache.peek(media_path, size)
+        if image is not None:
+            receiver(image)
+            return
+
+        key = (media_path, size)
+        owner_id = id(owner)
+        if owner_id not in self._owner_keys:
+            self._owner_keys[owner_id] = set()
+            owner.destroyed.connect(lambda *_, owner_id=owner_id: self._forget_owner(owner_id))
+        self._owner_keys[owner_id].add(key)
+        self._receivers.setdefault(key, []).append((owner_id, receiver))
+
+        job = self._jobs.get(key)
+        if job is None:
+            job = self._jobs[key] = _ThumbnailJob(self.cache, key, render, self._signals)
+            job.priority = VISIBLE_PRIORITY if visible else BACKGROUND_PRIORITY
+            self.pool.start(job, job.priority)
+        else:
+            # A cancelled job that is already running is simply wanted again
+            job.cancelled = False
+            if visible:
+                self._raise_priority(job)
+
+    def cancel(self, media_path: str, size: Tuple[int, int]):
+        """Drop every request for one thumbnail."""
+        key = (media_path, (int(size[0]), int(size[1])))
+        for owner_id, _ in self._receivers.pop(key, []):
+            keys = self._owner_keys.get(owner_id)
+            if keys is not None:
+                keys.discard(key)
+        self._cancel(key)
+
+    def _raise_priority(self, job: _ThumbnailJob):
+        if job.priority < VISIBLE_PRIORITY and self.pool.tryTake(job):
+            job.priority = VISIBLE_PRIORITY
+            self.pool.start(job, job.priority)
+
+    def _forget_owner(self, owner_id: int):
+        for key in self._owner_keys.pop(owner_id, ()):
+            receivers = [entry for entry in self._receivers.get(key, []) if entry[0] != owner_id]
+            if receivers:
+                self._receivers[key] = receivers
+            else:
+                self._receivers.pop(key, None)
+                self._cancel(key)
+
+    def _cancel(self, key: JobKey):
+        job = self._jobs.get(key)
+        if job is None:
+            return
+        job.cancelled = True
+        # Jobs still queued are taken back; running ones report back and are ignored
+        try:
+            taken = self.pool.tryTake(job)
+        except RuntimeError:
+            # Owners outliving the loader at shutdown; the pool has drained already
+            taken = True
+        if taken:
+            del self._jobs[key]
+
+    def _on_job_done(self, key: JobKey, image: Optional[QImage]):
+        job = self._jobs.pop(key, None)
+        if job is None or job.cancelled:
+            return
+        for owner_id, receiver in self._receivers.pop(key, []):
+            keys = self._owner_keys.get(owner_id)
+            if keys is not None:
+                keys.discard(key)
+            try:
+                receiver(image)
+            except Exception as e:
+                self.logger.warning(f"Could not show thumbnail of {key[0]}: {e}")
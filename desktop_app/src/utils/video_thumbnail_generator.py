@@ -3,13 +3,21 @@ Video Thumbnail Generator - Utility for creating thumbnails from video files.
 """
 import os
 import logging
-import tempfile
-from typing import Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 import cv2
-from PIL import Image
-from PySide6.QtGui import QPixmap
+import numpy as np
+from PySide6.QtGui import QImage, QPixmap
 from PySide6.QtCore import Qt
 
+# When the next requested frame is further ahead than this, a seek (which
+# decodes forward from an earlier keyframe) is cheaper than decoding every
+# frame in between
+MAX_GRAB_AHEAD_SECONDS = 0.5
+# Shrink frames by a whole factor to no less than this multiple of the
+# thumbnail size before the final resample; INTER_AREA is much faster on
+# integer ratios and the result is indistinguishable
+PRESCALE_REDUCING_GAP = 2
+
 
 class VideoThumbnailGenerator:
     """Utility class for generating video thumbnails."""
@@ -17,7 +25,6 @@ class VideoThumbnailGenerator:
     def __init__(self):
         """Initialize the thumbnail generator."""
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.temp_dir = tempfile.gettempdir()
     
     def generate_thumbnail(self, video_path: str, timestamp: float = 1.0, 
                           size: Tuple[int, int] = (400, 300)) -> Optional[QPixmap]:
@@ -32,80 +39,96 @@ class VideoThumbnailGenerator:
         Returns:
             QPixmap object if successful, None otherwise
         """
-        try:
-            if not os.path.exists(video_path):
-                self.logger.warning(f"Video file not found: {video_path}")
-                return None
+        image = self.generate_thumbnail_image(video_path, timestamp, size)
+        if image is None:
+            return None
+        
+        pixmap = QPixmap.fromImage(image)
+        if pixmap.isNull():
+            self.logger.error("Failed to create QPixmap from thumbnail")
+            return None
+        return pixmap
+    
+    def generate_thumbnail_image(self, video_path: str, timestamp: float = 1.0, 
+                                 size: Tuple[int, int] = (400, 300)) -> Optional[QImage]:
+        """
+        Generate a thumbnail from a video file as a QImage.
+        
+        Unlike generate_thumbnail this is safe to call from worker threads.
+        
+        Args:
+            video_path: Path to the video file
+            timestamp: Time in seconds to capture the frame (default: 1.0)
+            size: Tuple of (width, height) for the thumbnail size
             
-            # Open video with OpenCV
-            cap = cv2.VideoCapture(video_path)
+        Returns:
+            QImage object if successful, None otherwise
+        """
+        images = self.generate_thumbnail_images(video_path, [timestamp], size)
+        if not images or images[0] is None:
+            return None
+        
+        self.logger.info(f"Generated thumbnail for {os.path.basename(video_path)}")
+        return images[0]
+    
+    def generate_thumbnail_images(self, video_path: str, timestamps: Sequence[float], 
+                                  size: Tuple[int, int] = (200, 150)) -> List[Optional[QImage]]:
+        """
+        Generate thumbnails at several timestamps in a single forward pass.
+        
+        The video is opened once and the requested frames are visited in time
+        order: nearby frames are reached by decoding forward, distant ones by
+        a forward seek, so the decoder never goes back to an earlier keyframe.
+        Safe to call from worker threads.
+        
+        Args:
+            video_path: Path to the video file
+            timestamps: Times in seconds to capture; timestamps beyond the end
+                of the video use a frame 10% into it
+            size: Tuple of (width, height) for each thumbnail
+            
+        Returns:
+            List of QImage objects (None where a frame could not be read), in
+            the order of timestamps; empty if the video cannot be opened
+        """
+        if not os.path.exists(video_path):
+            self.logger.warning(f"Video file not found: {video_path}")
+            return []
+        
+        cap = cv2.VideoCapture(video_path)
+        try:
             if not cap.isOpened():
                 self.logger.error(f"Could not open video file: {video_path}")
-                return None
+                return []
             
             # Get video properties
             fps = cap.get(cv2.CAP_PROP_FPS)
             total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             duration = total_frames / fps if fps > 0 else 0
             
-            # Adjust timestamp if it's beyond video duration
-            if timestamp > duration:
-                timestamp = duration * 0.1  # Use 10% into the video
-            
-            # Seek to the desired timestamp
-            frame_number = int(timestamp * fps)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
-            
-            # Read the frame
-            ret, frame = cap.read()
-            cap.release()
-            
-            if not ret or frame is None:
-                self.logger.error(f"Could not read frame at timestamp {timestamp}")
-                return None
-            
-            # Convert BGR to RGB
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            
-            # Convert to PIL Image
-            pil_image = Image.fromarray(frame_rgb)
-            
-            # Resize to desired size while maintaining aspect ratio
-            pil_image.thumbnail(size, Image.Resampling.LANCZOS)
-            
-            # Create a new image with the exact size and center the thumbnail
-            final_image = Image.new('RGB', size, (0, 0, 0))
-            
-            # Calculate position to center the thumbnail
-            x = (size[0] - pil_image.width) // 2
-            y = (size[1] - pil_image.height) // 2
-            
-            final_image.paste(pil_image, (x, y))
-            
-            # Convert to QPixmap
-            # Save to temporary file first
-            temp_path = os.path.join(self.temp_dir, f"video_thumb_{os.getpid()}.png")
-            final_image.save(temp_path, "PNG")
-            
-            # Load as QPixmap
-            pixmap = QPixmap(temp_path)
-            
-            # Clean up temporary file
-            try:
-                os.remove(temp_path)
-            except:
-                pass  # Ignore cleanup errors
-            
-            if pixmap.isNull():
-                self.logger.error("Failed to create QPixmap from thumbnail")
-                return None
-            
-            self.logger.info(f"Generated thumbnail for {os.path.basename(video_path)}")
-            return pixmap
+            frame_numbers = []
+            for timestamp in timestamps:
+                # Adjust timestamp if it's beyond video duration
+                if timestamp > duration:
+                    timestamp = duration * 0.1  # Use 10% into the video
+                frame_numbers.append(int(timestamp * fps))
             
+            frames = self._read_frames(cap, sorted(set(frame_numbers)), fps)
         except Exception as e:
-            self.logger.exception(f"Error generating thumbnail for {video_path}: {e}")
-            return None
+            self.logger.exception(f"Error generating thumbnails for {video_path}: {e}")
+            return []
+        finally:
+            cap.release()
+        
+        images = []
+        for frame_number in frame_numbers:
+            frame = frames.get(frame_number)
+            if frame is None:
+                self.logger.error(f"Could not read frame {frame_number} of {video_path}")
+                images.append(None)
+            else:
+                images.append(self._frame_to_image(frame, size))
+        return images
     
     def generate_multiple_thumbnails(self, video_path: str, count: int = 3, 
                                    size: Tuple[int, int] = (200, 150)) -> list:
@@ -149,17 +172,103 @@ class VideoThumbnailGenerator:
                     progress = 0.1 + (0.8 * i / (count - 1))
                     timestamps.append(duration * progress)
             
-            # Generate thumbnail for each timestamp
-            for timestamp in timestamps:
-                thumbnail = self.generate_thumbnail(video_path, timestamp, size)
-                if thumbnail:
-                    thumbnails.append(thumbnail)
+            # Decode all of them in one pass over the video
+            for image in self.generate_thumbnail_images(video_path, timestamps, size):
+                if image is not None:
+                    pixmap = QPixmap.fromImage(image)
+                    if not pixmap.isNull():
+                        thumbnails.append(pixmap)
             
         except Exception as e:
             self.logger.exception(f"Error generating multiple thumbnails: {e}")
         
         return thumbnails
     
+    def _read_frames(self, cap, frame_numbers: List[int], fps: float) -> dict:
+        """
+        Read the given frames, in ascending order, from an open capture.
+        
+        Args:
+            cap: Opened cv2.VideoCapture
+            frame_numbers: Sorted, distinct frame numbers
+            fps: Frame rate of the video
+            
+        Returns:
+            Dict of frame number to BGR frame for the frames that could be read
+        """
+        frames = {}
+        max_grab_ahead = max(1, int(fps * MAX_GRAB_AHEAD_SECONDS))
+        position = 0  # Number of the next frame the capture will return (None if unknown)
+        for frame_number in frame_numbers:
+            if position is None or frame_number < position or frame_number - position > max_grab_ahead:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                position = frame_number
+            
+            # grab() demuxes and decodes without converting the skipped frames
+            while position < frame_number:
+                if cap.grab():
+                    position += 1
+                else:
+                    # Seek past a frame that cannot be decoded
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, frame_number)
+                    position = frame_number
+            
+            ret, frame = cap.read()
+            if not ret or frame is None:
+                # A damaged stretch need not end the video; seek afresh for the next frame
+                position = None
+                continue
+            frames[frame_number] = frame
+            position += 1
+        return frames
+    
+    def _frame_to_image(self, frame: np.ndarray, size: Tuple[int, int]) -> QImage:
+        """
+        Letterbox a BGR frame onto a black size[0] x size[1] QImage.
+        
+        The frame is scaled straight into the QImage's own pixel buffer
+        (Format_BGR888 matches OpenCV's layout), so no colour conversion,
+        intermediate image or encode/decode round-trip is needed.
+        
+        Args:
+            frame: BGR frame as read by OpenCV
+            size: Tuple of (width, height) for the thumbnail
+            
+        Returns:
+            QImage owning its pixels
+        """
+        width, height = size
+        frame_height, frame_width = frame.shape[:2]
+        
+        # Shrink to fit while maintaining aspect ratio (never enlarge)
+        scale = min(width / frame_width, height / frame_height, 1.0)
+        fit_width = max(1, round(frame_width * scale))
+        fit_height = max(1, round(frame_height * scale))
+        factor = min(frame_width // (fit_width * PRESCALE_REDUCING_GAP), 
+                     frame_height // (fit_height * PRESCALE_REDUCING_GAP))
+        if factor > 1:
+            frame_width -= frame_width % factor
+            frame_height -= frame_height % factor
+            frame = cv2.resize(frame[:frame_height, :frame_width], 
+                               (frame_width // factor, frame_height // factor), 
+                               interpolation=cv2.INTER_AREA)
+        if (fit_width, fit_height) != frame.shape[1::-1]:
+            frame = cv2.resize(frame, (fit_width, fit_height), interpolation=cv2.INTER_AREA)
+        
+        image = QImage(width, height, QImage.Format.Format_BGR888)
+        image.fill(Qt.GlobalColor.black)
+        
+        # View the image's rows (padded to bytesPerLine) as a height x width x 3 array
+        stride = image.bytesPerLine()
+        pixels = np.frombuffer(image.bits(), np.uint8, count=stride * height)
+        pixels = pixels.reshape(height, stride)[:, :width * 3].reshape(height, width, 3)
+        
+        # Center the frame
+        x = (width - fit_width) // 2
+        y = (height - fit_height) // 2
+        pixels[y:y + fit_height, x:x + fit_width] = frame
+        return image
+    
     def create_video_preview_pixmap(self, video_path: str, 
                                   size: Tuple[int, int] = (400, 300)) -> QPixmap:
         """
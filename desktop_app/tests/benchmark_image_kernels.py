@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the vectorized image effect kernels.
+Compares the per-pixel loop implementations the kernels replaced against
+src.features.media_processing.image_kernels on a 4K (3840x2160) photo.
+
+The loop versions take minutes at 4K, so they are timed on a 1/16 tile
+and scaled by pixel count.
+"""
+
+import math
+import os
+import random
+import sys
+import time
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.features.media_processing import image_kernels
+from src.features.media_processing.filter_pipeline import FilterPipeline
+
+FULL_SIZE = (3840, 2160)
+TILE_SIZE = (960, 540)
+
+
+def legacy_sepia(img):
+    """Per-pixel sepia as previously implemented in media_handler."""
+    img = img.copy().convert('RGB')
+    width, height = img.size
+    pixels = img.load()
+    for x in range(width):
+        for y in range(height):
+            r, g, b = pixels[x, y]
+            tr = int(0.393*r + 0.769*g + 0.189*b)
+            tg = int(0.349*r + 0.686*g + 0.168*b)
+            tb = int(0.272*r + 0.534*g + 0.131*b)
+            pixels[x, y] = (min(tr, 255), min(tg, 255), min(tb, 255))
+    return img
+
+
+def legacy_vignette_mask(size, factor=0.75):
+    """Per-pixel radial mask as previously implemented in media_handler."""
+    width, height = size
+    mask = Image.new('L', (width, height), 0)
+    center_x, center_y = width // 2, height // 2
+    max_distance = math.sqrt(center_x**2 + center_y**2)
+    for x in range(width):
+        for y in range(height):
+            distance = math.sqrt((x - center_x)**2 + (y - center_y)**2)
+            mask.putpixel((x, y), int(255 * (1 - (distance / max_distance) * factor)))
+    return mask
+
+
+def legacy_noise(size):
+    """Per-pixel noise as previously implemented in media_handler."""
+    width, height = size
+    noise_img = Image.new('RGB', size, (0, 0, 0))
+    noise_pixels = noise_img.load()
+    for x in range(width):
+        for y in range(height):
+            r = int(255 * (0.5 + 0.05 * (random.random() - 0.5)))
+            noise_pixels[x, y] = (r, r, r)
+    return noise_img
+
+
+def legacy_tilt_shift_blend(img, blurred):
+    """Per-pixel tilt-shift blend as previously implemented in ImageEditHandler."""
+    width, height = img.size
+    img_array = np.array(img)
+    blurred_array = np.array(blurred)
+    focus_center = height // 2
+    focus_width = height // 4
+    for y in range(height):
+        distance = abs(y - focus_center)
+        if distance > focus_width:
+            blend_factor = min(1.0, (distance - focus_width) / focus_width)
+            for x in range(width):
+                for c in range(3):
+                    img_array[y, x, c] = int(
+                        img_array[y, x, c] * (1 - blend_factor) +
+                        blurred_array[y, x, c] * blend_factor
+                    )
+    return Image.fromarray(img_array)
+
+
+def kernel_tilt_shift_blend(img, blurred):
+    """Tilt-shift blend through the kernel library."""
+    height = img.size[1]
+    weights = image_kernels.focus_band_ramp(height, height // 2, height // 4)
+    return image_kernels.blend_rows(img, blurred, weights)
+
+
+def legacy_warm_tone(img):
+    """Channel-gain warm tone as previously implemented in ImageEditHandler."""
+    img_array = np.array(img).astype(float)
+    img_array[:, :, 0] = np.clip(img_array[:, :, 0] * 1.15, 0, 255)
+    img_array[:, :, 1] = np.clip(img_array[:, :, 1] * 1.1, 0, 255)
+    img_array[:, :, 2] = np.clip(img_array[:, :, 2] * 0.9, 0, 255)
+    return Image.fromarray(img_array.astype(np.uint8))
+
+
+def legacy_hdr(img):
+    """Unfused HDR preset: one full-resolution pass per adjustment."""
+    img = ImageEnhance.Contrast(img).enhance(1.4)
+    img = ImageEnhance.Color(img).enhance(1.2)
+    return ImageEnhance.Brightness(img).enhance(1.1)
+
+
+def legacy_instagram(img):
+    """Unfused Instagram preset."""
+    img = ImageEnhance.Color(img).enhance(1.2)
+    img = legacy_warm_tone(img)
+    return ImageEnhance.Contrast(img).enhance(1.1)
+
+
+def legacy_ghibli(img):
+    """Unfused Studio Ghibli preset."""
+    img = Image.fromarray((np.array(img) // 32) * 32)
+    img = ImageEnhance.Color(img).enhance(1.8)
+    img = ImageEnhance.Contrast(img).enhance(1.4)
+    img = img.filter(ImageFilter.GaussianBlur(radius=0.8))
+    img = ImageEnhance.Brightness(img).enhance(1.2)
+    img = legacy_warm_tone(img)
+    return img.filter(ImageFilter.UnsharpMask(radius=1, percent=100, threshold=2))
+
+
+WARM_TONE = FilterPipeline().channel_gain(1.15, 1.1, 0.9)
+PRESETS = [
+    ("hdr", legacy_hdr, FilterPipeline().contrast(1.4).color(1.2).brightness(1.1)),
+    ("instagram", legacy_instagram, FilterPipeline().color(1.2).then(WARM_TONE).contrast(1.1)),
+    ("ghibli", legacy_ghibli,
+     FilterPipeline().quantize(32).color(1.8).contrast(1.4).gaussian_blur(0.8)
+     .brightness(1.2).then(WARM_TONE).unsharp_mask(radius=1, percent=100, threshold=2)),
+]
+
+
+def timed(func, *args, repeat=1):
+    """Best wall-clock time of func(*args) over repeat runs."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def create_test_image(size):
+    """Deterministic photo-like test image."""
+    rng = np.random.default_rng(0)
+    width, height = size
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[np.newaxis, :, np.newaxis]
+    pixels = gradient + rng.normal(0, 40, (height, width, 3)).astype(np.float32)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), 'RGB')
+
+
+def run_benchmark():
+    """Time legacy loops against the kernels and check their outputs agree."""
+    print("Image kernel benchmark (4K input)")
+    print("=" * 50)
+
+    full = create_test_image(FULL_SIZE)
+    tile = full.crop((0, 0) + TILE_SIZE)
+    scale = (FULL_SIZE[0] * FULL_SIZE[1]) / (TILE_SIZE[0] * TILE_SIZE[1])
+
+    # Correctness on the tile
+    max_diff = np.abs(np.asarray(legacy_sepia(tile), dtype=np.int16)
+                      - np.asarray(image_kernels.sepia(tile), dtype=np.int16)).max()
+    print(f"sepia max channel difference: {max_diff}")
+    max_diff = np.abs(np.asarray(legacy_vignette_mask(TILE_SIZE), dtype=np.int16)
+                      - np.asarray(image_kernels.radial_mask(TILE_SIZE), dtype=np.int16)).max()
+    print(f"vignette mask max difference: {max_diff}")
+
+    tile_blurred = tile.filter(ImageFilter.GaussianBlur(radius=3))
+    max_diff = np.abs(np.asarray(legacy_tilt_shift_blend(tile, tile_blurred), dtype=np.int16)
+                      - np.asarray(kernel_tilt_shift_blend(tile, tile_blurred), dtype=np.int16)).max()
+    print(f"tilt-shift max channel difference: {max_diff}")
+    full_blurred = full.filter(ImageFilter.GaussianBlur(radius=3))
+
+    cases = [
+        ("sepia", lambda: legacy_sepia(tile), lambda: image_kernels.sepia(full)),
+        ("vignette mask", lambda: legacy_vignette_mask(TILE_SIZE),
+         lambda: (image_kernels._radial_mask_array.cache_clear(), image_kernels.radial_mask(FULL_SIZE))),
+        ("vintage noise", lambda: legacy_noise(TILE_SIZE), lambda: image_kernels.uniform_noise(FULL_SIZE)),
+        ("tilt-shift", lambda: legacy_tilt_shift_blend(tile, tile_blurred),
+         lambda: kernel_tilt_shift_blend(full, full_blurred)),
+    ]
+    for name, legacy, vectorized in cases:
+        legacy_time, _ = timed(legacy)
+        legacy_time *= scale
+        kernel_time, _ = timed(vectorized, repeat=3)
+        print(f"{name:15s} loop {legacy_time:8.2f}s  kernel {kernel_time:6.3f}s  "
+              f"speedup {legacy_time / kernel_time:7.0f}x")
+
+    print("\nFused filter presets (4K input)")
+    print("=" * 50)
+    for name, legacy, pipeline in PRESETS:
+        legacy_time, expected = timed(legacy, full, repeat=3)
+        fused_time, result = timed(pipeline.apply, full, repeat=3)
+        max_diff = np.abs(np.asarray(expected, dtype=np.int16) - np.asarray(result, dtype=np.int16)).max()
+        print(f"{name:15s} chain {legacy_time:6.3f}s  fused {fused_time:6.3f}s  "
+              f"speedup {legacy_time / fused_time:4.1f}x  max difference {max_diff}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for PIL to QPixmap conversion.
+Compares the previous copy/convert/tobytes implementation of pil_to_qpixmap
+against src.utils.image_conversion on 12 MP (4000x3000) RGB, RGBA and P images.
+"""
+
+import os
+import sys
+import time
+
+# Render without a display
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PIL import Image
+from PySide6.QtGui import QImage, QPixmap
+from PySide6.QtWidgets import QApplication
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.image_conversion import pil_to_qpixmap, clear_pixmap_cache
+
+SIZE = (4000, 3000)
+REPEAT = 5
+
+
+def legacy_pil_to_qpixmap(pil_image):
+    """Direct conversion path of the previous media_handler.pil_to_qpixmap."""
+    img = pil_image.copy()
+    width, height = img.size
+    if img.mode == 'RGBA':
+        qimage = QImage(img.tobytes('raw', 'RGBA'), width, height, QImage.Format.Format_RGBA8888)
+    else:
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        qimage = QImage(img.tobytes('raw', 'RGB'), width, height, 3 * width, QImage.Format.Format_RGB888)
+    pixmap = QPixmap.fromImage(qimage)
+    pixmap.setDevicePixelRatio(1.0)
+    return pixmap
+
+
+def timed(func, *args, repeat=REPEAT):
+    """Best wall-clock time of func(*args) over repeat runs."""
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def create_test_images(size):
+    """Deterministic photo-like RGB, RGBA and P test images."""
+    rng = np.random.default_rng(0)
+    width, height = size
+    gradient = np.linspace(0, 255, width, dtype=np.float32)[np.newaxis, :, np.newaxis]
+    pixels = gradient + rng.normal(0, 40, (height, width, 3)).astype(np.float32)
+    rgb = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8), 'RGB')
+    rgba = rgb.copy()
+    rgba.putalpha(Image.linear_gradient('L').resize(size))
+    return [("RGB", rgb), ("RGBA", rgba), ("P", rgb.quantize(256))]
+
+
+def pixels_of(pixmap):
+    """Pixmap contents as an RGBA array."""
+    image = pixmap.toImage().convertToFormat(QImage.Format.Format_RGBA8888)
+    data = np.frombuffer(image.constBits(), np.uint8, count=image.sizeInBytes())
+    return data.reshape(image.height(), image.bytesPerLine())[:, :image.width() * 4]
+
+
+def run_benchmark():
+    """Time both conversions and check their pixmaps agree."""
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print(f"PIL to QPixmap benchmark ({SIZE[0]}x{SIZE[1]} input)")
+    print("=" * 64)
+    for mode, image in create_test_images(SIZE):
+        legacy_time, expected = timed(legacy_pil_to_qpixmap, image)
+
+        convert_time, result = timed(pil_to_qpixmap, image)
+        clear_pixmap_cache()
+        cached_time, _ = timed(lambda: pil_to_qpixmap(image, use_cache=True))
+        identical = np.array_equal(pixels_of(expected), pixels_of(result))
+        print(f"{mode:5s} legacy {legacy_time * 1000:7.1f}ms  new {convert_time * 1000:7.1f}ms  "
+              f"speedup {legacy_time / convert_time:4.1f}x  cached {cached_time * 1000:6.3f}ms  "
+              f"identical {identical}")
+    return app
+
+
+if __name__ == "__main__":
+    run_benchmark()
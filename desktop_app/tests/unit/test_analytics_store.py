@@ -0,0 +1,206 @@
+"""
+Unit tests for analytics rollups in the SQLite analytics store.
+"""
+
+import os
+import random
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.handlers.analytics_store import METRICS, AnalyticsStore, day_and_week
+
+START = datetime(2024, 3, 1, 12, 0)
+
+
+def post_event(post_id, post_type, created_at):
+    """post_created event in the layout AnalyticsHandler writes."""
+    return {
+        "type": "post_created",
+        "at": created_at.isoformat(),
+        "post": {
+            "id": post_id,
+            "filename": f"{post_id}.jpg",
+            "post_type": post_type,
+            "platforms": ["instagram"],
+            "created_at": created_at.isoformat(),
+            "metrics": {metric: 0 for metric in METRICS},
+            "engagement_history": [],
+        },
+    }
+
+
+def metrics_event(post_id, at, **metrics):
+    """post_metrics event."""
+    return {"type": "post_metrics", "at": at.isoformat(), "post_id": post_id, "metrics": metrics}
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store that only writes when flushed explicitly."""
+    store = AnalyticsStore(str(tmp_path / "analytics.db"), flush_interval=3600,
+                           flush_every=10 ** 6, compact_every=10 ** 6)
+    yield store
+    store.close()
+
+
+def fill(store, count=60, seed=0):
+    """Posts spread over six weeks, each with a few metric updates."""
+    rng = random.Random(seed)
+    for index in range(count):
+        created_at = START + timedelta(hours=rng.randint(0, 42 * 24))
+        store.append(post_event(f"post{index}", rng.choice(["image", "video", "story"]), created_at))
+        for _ in range(rng.randint(0, 3)):
+            store.append(metrics_event(f"post{index}", created_at, likes=rng.randint(0, 20),
+                                       views=rng.randint(0, 100)))
+
+
+def expected_by_type(data, since):
+    """engagement_by_type computed by scanning every post."""
+    by_type = {}
+    for post in data["posts"].values():
+        if datetime.fromisoformat(post["created_at"]) >= since:
+            totals = by_type.setdefault(post["post_type"], {"count": 0, "total_engagement": 0})
+            totals["count"] += 1
+            totals["total_engagement"] += sum(post["metrics"].values())
+    return by_type
+
+
+def test_day_and_week():
+    """Rollup keys are the date and the Monday of its week."""
+    assert day_and_week("2024-03-07T15:30:00") == ("2024-03-07", "2024-03-04")
+    assert day_and_week("") == ("", "")
+
+
+def test_engagement_by_type_matches_scan(store):
+    """Rollup queries agree with a full scan for ranges starting at any hour."""
+    fill(store)
+    data = store.load()
+    for hours in (0, 5, 30, 24 * 9 + 7, 24 * 20, 24 * 50):
+        since = START + timedelta(hours=hours)
+        assert store.engagement_by_type(since) == expected_by_type(data, since)
+
+
+def test_summary(store):
+    """Counters and totals follow the tracked events."""
+    fill(store, count=10)
+    store.append({"type": "gallery_created", "at": START.isoformat(), "gallery": {"id": "g1"}})
+    data = store.load()
+    summary = store.summary()
+    engagement = {post_id: sum(post["metrics"].values()) for post_id, post in data["posts"].items()}
+
+    assert summary["total_posts"] == 10
+    assert summary["total_galleries"] == 1
+    assert summary["post_count"] == 10
+    assert summary["total_engagement"] == sum(engagement.values())
+    assert summary["total_interactions"] == data["summary_stats"]["total_interactions"]
+    assert engagement[summary["top_post_filename"][:-len(".jpg")]] == max(engagement.values())
+
+
+def test_recent_posts(store):
+    """Newest posts first, with their current metrics."""
+    store.append(post_event("old", "image", START))
+    store.append(post_event("new", "video", START + timedelta(days=1)))
+    store.append(metrics_event("old", START, likes=3))
+    posts = store.recent_posts(5)
+    assert [post["id"] for post in posts] == ["new", "old"]
+    assert posts[1]["metrics"]["likes"] == 3
+    assert posts[0]["platforms"] == ["instagram"]
+
+
+def test_rollups_rebuilt_from_data(tmp_path):
+    """Dropped rollups are rebuilt with the same results when the store reopens."""
+    db_path = str(tmp_path / "analytics.db")
+    store = AnalyticsStore(db_path, flush_interval=3600)
+    fill(store, seed=1)
+    since = START + timedelta(days=10, hours=3)
+    expected = store.engagement_by_type(since), store.summary()
+    store.close()
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM meta WHERE key = 'rollups_built'")
+        conn.execute("DELETE FROM weekly_rollups")
+
+    store = AnalyticsStore(db_path, flush_interval=3600)
+    try:
+        assert (store.engagement_by_type(since), store.summary()) == expected
+    finally:
+        store.close()
+
+
+def logged_events(store):
+    """Number of events in the on-disk log."""
+    with sqlite3.connect(store.db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+
+def tracked(data):
+    """The parts of analytics data that tracking events change."""
+    return {key: data[key] for key in ("posts", "galleries", "videos", "summary_stats", "last_updated")}
+
+
+def test_buffered_events_are_loaded_before_flush(store):
+    """load() includes events that have not been written yet."""
+    store.append(post_event("post1", "image", START))
+    store.append(metrics_event("post1", START, likes=4))
+    assert logged_events(store) == 0
+    data = store.load()
+    assert data["posts"]["post1"]["metrics"]["likes"] == 4
+    assert data["summary_stats"]["total_interactions"] == 4
+    assert store.has_post("post1")
+
+    assert store.flush()
+    assert logged_events(store) == 2
+    assert tracked(store.load()) == tracked(data)
+
+
+def test_compaction_keeps_loaded_data(store):
+    """Folding the log into snapshot rows does not change what load() returns."""
+    fill(store, count=20)
+    store.flush()
+    before = store.load()
+    store.compact()
+    assert logged_events(store) == 0
+    assert tracked(store.load()) == tracked(before)
+
+    # Metric updates after a compaction apply on top of the snapshot rows
+    store.append(metrics_event("post0", START, likes=5))
+    store.flush()
+    store.compact()
+    assert store.load()["posts"]["post0"]["metrics"]["likes"] == before["posts"]["post0"]["metrics"]["likes"] + 5
+
+
+def test_flush_compacts_past_threshold(tmp_path):
+    """A flush that takes the log past compact_every compacts it."""
+    store = AnalyticsStore(str(tmp_path / "analytics.db"), flush_interval=3600,
+                           flush_every=10 ** 6, compact_every=5)
+    try:
+        fill(store, count=10)
+        expected = tracked(store.load())
+        store.flush()
+        assert logged_events(store) == 0
+        assert tracked(store.load()) == expected
+    finally:
+        store.close()
+
+
+def test_close_persists_pending_events(tmp_path):
+    """Buffered events are written on close() and loaded by a new store."""
+    db_path = str(tmp_path / "analytics.db")
+    store = AnalyticsStore(db_path, flush_interval=3600, flush_every=10 ** 6)
+    fill(store, count=10)
+    store.append({"type": "video_processed", "at": START.isoformat(), "video": {"id": "v1"}})
+    expected = tracked(store.load())
+    store.close()
+
+    reopened = AnalyticsStore(db_path, flush_interval=3600)
+    try:
+        assert tracked(reopened.load()) == expected
+        assert reopened.has_post("post3")
+    finally:
+        reopened.close()
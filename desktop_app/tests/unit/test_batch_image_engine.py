@@ -0,0 +1,65 @@
+"""
+Unit tests for batch image processing and image writing.
+"""
+
+import os
+import sys
+
+import numpy as np
+from PIL import Image
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.features.media_processing.batch_image_engine import (
+    DEFAULT_ENHANCEMENT, BatchImageEngine, BatchImageJob
+)
+from src.utils.image_writer import write_image
+
+
+def rgba_image():
+    """Noisy RGBA image with a horizontal alpha gradient."""
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, (48, 64, 4), dtype=np.uint8)
+    pixels[..., 3] = np.linspace(0, 255, 64, dtype=np.uint8)
+    return Image.fromarray(pixels, "RGBA")
+
+
+def test_write_image_format_from_extension(tmp_path):
+    """The format follows the extension, defaulting to PNG."""
+    image = Image.new("RGB", (8, 8), (200, 100, 50))
+    for name, image_format in (("a.jpg", "JPEG"), ("b.PNG", "PNG"), ("c.webp", "WEBP"),
+                               ("d.bmp", "BMP"), ("e.gif", "GIF"), ("f.tiff", "PNG"), ("g.bm", "PNG")):
+        path = str(tmp_path / name)
+        write_image(image, path)
+        with Image.open(path) as written:
+            assert written.format == image_format, name
+
+
+def test_flatten_alpha_matches_default_enhancement(tmp_path):
+    """Flattened RGBA jobs are enhanced as RGB and saved fully opaque."""
+    source = str(tmp_path / "source.png")
+    rgba_image().save(source)
+    jobs = [BatchImageJob(source, str(tmp_path / "flat.png"), DEFAULT_ENHANCEMENT, flatten_alpha=True),
+            BatchImageJob(source, str(tmp_path / "alpha.png"), DEFAULT_ENHANCEMENT)]
+    results = BatchImageEngine(max_workers=1).process(jobs)
+    assert [success for success, _, _ in results] == [True, True]
+
+    with Image.open(source) as img:
+        expected = DEFAULT_ENHANCEMENT.apply(img.convert("RGB")).convert("RGBA")
+    with Image.open(jobs[0].output_path) as flat:
+        assert flat.mode == "RGBA"
+        assert np.array_equal(np.asarray(flat), np.asarray(expected))
+    with Image.open(jobs[1].output_path) as kept:
+        assert np.array_equal(np.asarray(kept)[..., 3], np.asarray(rgba_image())[..., 3])
+
+
+def test_failed_jobs_are_reported(tmp_path):
+    """A missing source fails its own job only."""
+    source = str(tmp_path / "source.png")
+    Image.new("RGB", (8, 8)).save(source)
+    jobs = [BatchImageJob(str(tmp_path / "missing.png"), str(tmp_path / "out1.png"), DEFAULT_ENHANCEMENT),
+            BatchImageJob(source, str(tmp_path / "nested" / "out2.png"), DEFAULT_ENHANCEMENT)]
+    results = BatchImageEngine(max_workers=1).process(jobs)
+    assert [success for success, _, _ in results] == [False, True]
+    assert os.path.exists(jobs[1].output_path)
@@ -0,0 +1,90 @@
+"""
+Unit tests for vectorized gallery scoring.
+"""
+
+import os
+import random
+import sys
+
+import numpy as np
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.handlers.gallery_scoring import (
+    CATEGORY_BONUSES, GENERIC_KEYWORDS, GalleryScorer, top_scored
+)
+
+
+def reference_score(keywords, tags, caption, filename):
+    """One item scored with plain loops, as the handler used to."""
+    keywords = [keyword.lower() for keyword in keywords]
+    tags = [tag.lower() for tag in tags]
+    caption, filename = caption.lower(), filename.lower()
+    score = 0
+    for keyword in keywords:
+        if keyword in tags:
+            score += 10
+        elif any(keyword in tag or tag in keyword for tag in tags):
+            score += 8
+        if keyword in caption:
+            score += 5
+        if keyword in filename:
+            score += 3
+    for keyword in keywords:
+        for category_keywords, category_tags, bonus in CATEGORY_BONUSES:
+            if keyword in category_keywords and any(tag in category_tags for tag in tags):
+                score += bonus
+                break
+    if score == 0 and tags and any(keyword in GENERIC_KEYWORDS for keyword in keywords):
+        score = 1
+    return score
+
+
+def test_scores_match_reference():
+    """Vectorized scores equal the per-item loop on random media."""
+    rng = random.Random(0)
+    words = ["bread", "food", "bakery", "cake", "people", "person", "portrait", "shop",
+             "commercial", "product", "event", "party", "social", "art", "photo", "baked goods"]
+    for _ in range(20):
+        keywords = rng.sample(words, rng.randint(1, 4))
+        items = [
+            (rng.sample(words, rng.randint(0, 5)),
+             " ".join(rng.sample(words, rng.randint(0, 3))),
+             f"{rng.choice(words)}_{rng.randint(0, 99)}.jpg")
+            for _ in range(30)
+        ]
+        tags, captions, filenames = zip(*items)
+        scores = GalleryScorer(keywords).score(tags, captions, filenames)
+        expected = [reference_score(keywords, *item) for item in items]
+        assert scores.tolist() == expected
+
+
+def test_field_scores():
+    """Exact tag, partial tag, caption and filename matches add their points."""
+    scorer = GalleryScorer(["Bread"])
+    scores = scorer.score([["bread"], ["breadstick"], [], []],
+                          ["", "", "fresh bread", ""],
+                          ["a.jpg", "b.jpg", "c.jpg", "bread.jpg"])
+    # Exact "bread" tag earns the food bonus as well
+    assert scores.tolist() == [10 + 5, 8, 5, 3]
+
+
+def test_generic_prompt_minimal_score():
+    """Tagged media get a minimal score for generic prompts."""
+    scores = GalleryScorer(["photo"]).score([["art"], []], ["", ""], ["a.jpg", "b.jpg"])
+    assert scores.tolist() == [1, 0]
+
+
+def test_empty_batch_and_keywords():
+    """Nothing to score gives zero scores."""
+    assert len(GalleryScorer(["bread"]).score([], [], [])) == 0
+    assert GalleryScorer([]).score([["bread"]], [""], ["bread.jpg"]).tolist() == [0]
+
+
+def test_top_scored_is_stable():
+    """Best first, ties in input order, zero scores left out."""
+    scores = np.array([3, 0, 5, 3, 5, 1])
+    assert top_scored(scores) == [2, 4, 0, 3, 5]
+    assert top_scored(scores, 3) == [2, 4, 0]
+    assert top_scored(np.zeros(3, dtype=np.int64)) == []
@@ -0,0 +1,77 @@
+"""
+Unit tests for the in-memory library index behind paged queries.
+"""
+
+import os
+import random
+import sys
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.handlers.library_index import LibraryIndex
+
+TYPES = ["raw_photo", "raw_video", "post_ready_photo", "post_ready_video"]
+
+
+def random_items(count, seed=0):
+    """Items with random types and dates, including shared dates."""
+    rng = random.Random(seed)
+    return {
+        f"item{index:03d}": {"type": rng.choice(TYPES), "date_added": f"2024-01-{rng.randint(1, 9):02d}"}
+        for index in range(count)
+    }
+
+
+def expected_page(items, item_types=None, descending=True, offset=0, limit=None):
+    """Page computed by filtering and sorting every item."""
+    keys = sorted((item["date_added"], item_id) for item_id, item in items.items()
+                  if item_types is None or item["type"] in item_types)
+    if descending:
+        keys.reverse()
+    stop = None if limit is None else offset + limit
+    return [item_id for _, item_id in keys[offset:stop]]
+
+
+def test_pages_match_full_sort():
+    """Every page equals the slice of a full filter-and-sort."""
+    items = random_items(60)
+    index = LibraryIndex()
+    index.rebuild(items)
+    for item_types in (None, ["raw_photo"], ["raw_photo", "post_ready_video"], ["missing"]):
+        for descending in (True, False):
+            for offset, limit in ((0, None), (0, 10), (25, 10), (55, 10), (70, 5), (5, 0)):
+                assert index.page(item_types, descending, offset, limit) == \
+                    expected_page(items, item_types, descending, offset, limit)
+
+
+def test_count():
+    """Counts per type and overall."""
+    items = random_items(40, seed=1)
+    index = LibraryIndex()
+    index.rebuild(items)
+    assert index.count() == len(index) == 40
+    assert index.count(["raw_photo", "raw_photo"]) == sum(item["type"] == "raw_photo" for item in items.values())
+
+
+def test_incremental_updates_match_rebuild():
+    """Adds, re-indexes and removals leave the same index as a rebuild."""
+    rng = random.Random(2)
+    items = random_items(30, seed=2)
+    index = LibraryIndex()
+    for item_id, item in items.items():
+        index.add(item_id, item)
+
+    for item_id in rng.sample(sorted(items), 10):
+        items[item_id] = {"type": rng.choice(TYPES), "date_added": "2024-02-01"}
+        index.add(item_id, items[item_id])
+    for item_id in rng.sample(sorted(items), 5):
+        del items[item_id]
+        index.remove(item_id)
+    index.remove("never-added")
+
+    rebuilt = LibraryIndex()
+    rebuilt.rebuild(items)
+    for item_types in (None, ["raw_video"], TYPES[:3]):
+        assert index.page(item_types) == rebuilt.page(item_types) == expected_page(items, item_types)
+        assert index.count(item_types) == rebuilt.count(item_types)
@@ -0,0 +1,149 @@
+"""
+Unit tests for background metadata indexing of library items.
+"""
+
+import os
+import sys
+import threading
+
+import pytest
+from PIL import Image
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.handlers import library_metadata
+from src.handlers.library_handler import LibraryManager
+from src.handlers.library_metadata import EXIF_ORIENTATION, MetadataIndexer, extract_metadata
+from src.handlers.library_store import LibraryStore
+
+
+def make_item(item_id, **fields):
+    """Raw photo item stored under library/images."""
+    return dict({"id": item_id, "type": "raw_photo", "filename": f"{item_id}.jpg",
+                 "caption": "", "date_added": "2024-01-01T00:00:00", "tags": []}, **fields)
+
+
+@pytest.fixture
+def library(tmp_path, monkeypatch):
+    """Working directory holding a library database with three items, and the queued item ids."""
+    monkeypatch.chdir(tmp_path)
+    images_dir = tmp_path / "library" / "images"
+    images_dir.mkdir(parents=True)
+    (tmp_path / "library" / "data").mkdir()
+    Image.new("RGB", (30, 20)).save(images_dir / "new.jpg")
+    Image.new("RGB", (8, 8)).save(images_dir / "indexed.jpg")
+
+    store = LibraryStore(tmp_path / "library" / "data" / "library.db")
+    store.put_item(make_item("new"))
+    store.put_item(make_item("missing"))
+    store.put_item(make_item("indexed", mtime=1.0, dimensions=[8, 8]))
+    store.close()
+
+    submitted = []
+    submit = MetadataIndexer.submit
+
+    def record_submit(self, item_id, path, item_type):
+        submitted.append(item_id)
+        submit(self, item_id, path, item_type)
+
+    monkeypatch.setattr(MetadataIndexer, "submit", record_submit)
+    return submitted
+
+
+def stored_items(tmp_path):
+    """Items as persisted in the library database."""
+    store = LibraryStore(tmp_path / "library" / "data" / "library.db")
+    items, _ = store.load()
+    store.close()
+    return items
+
+
+def test_extract_metadata(tmp_path):
+    """Dimensions, size and EXIF orientation are read from the header."""
+    path = str(tmp_path / "photo.jpg")
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION] = 6
+    Image.new("RGB", (40, 30)).save(path, exif=exif)
+    metadata = extract_metadata(path, "raw_photo")
+    assert metadata["dimensions"] == [40, 30]
+    assert metadata["orientation"] == 6
+    assert metadata["size_bytes"] == os.path.getsize(path)
+    assert metadata["mtime"] == os.stat(path).st_mtime
+    assert set(metadata) == set(library_metadata.METADATA_FIELDS)
+
+
+def test_unreadable_item_is_recorded_as_failed(tmp_path):
+    """A file that cannot be read is reported with mtime None instead of an error."""
+    results = {}
+    indexer = MetadataIndexer(lambda item_id, metadata: results.update({item_id: metadata}))
+    indexer.submit("gone", str(tmp_path / "gone.jpg"), "raw_photo")
+    indexer.wait()
+    indexer.shutdown()
+    assert results["gone"]["mtime"] is None
+    assert results["gone"]["size_str"] == "Unknown"
+
+
+def test_queued_item_is_not_submitted_twice(tmp_path, monkeypatch):
+    """Submitting an item that is still queued does not index it again."""
+    release = threading.Event()
+    calls = []
+
+    def slow_extract(path, item_type):
+        calls.append(path)
+        release.wait(5)
+        return {}
+
+    monkeypatch.setattr(library_metadata, "extract_metadata", slow_extract)
+    indexer = MetadataIndexer(lambda item_id, metadata: None)
+    indexer.submit("a", "a.jpg", "raw_photo")
+    indexer.submit("a", "a.jpg", "raw_photo")
+    release.set()
+    indexer.wait()
+    indexer.shutdown()
+    assert calls == ["a.jpg"]
+
+
+def test_backfill_indexes_items_once(library, tmp_path):
+    """Un-indexed items are indexed and persisted; failures are not retried on the next start."""
+    manager = LibraryManager()
+    manager.metadata_indexer.wait()
+    manager.metadata_indexer.shutdown()
+    assert sorted(library) == ["missing", "new"]
+
+    items = stored_items(tmp_path)
+    assert items["new"]["dimensions"] == [30, 20]
+    assert items["new"]["mtime"] == os.stat(tmp_path / "library" / "images" / "new.jpg").st_mtime
+    assert "mtime" in items["missing"] and items["missing"]["mtime"] is None
+    assert items["indexed"]["mtime"] == 1.0
+    assert manager.get_item("new")["dimensions"] == [30, 20]
+
+    library.clear()
+    manager = LibraryManager()
+    manager.metadata_indexer.shutdown()
+    assert library == []
+
+
+def test_item_removed_while_indexing(library, tmp_path, monkeypatch):
+    """Metadata arriving for a removed item does not write its row back."""
+    started = threading.Event()
+    release = threading.Event()
+    extract = library_metadata.extract_metadata
+
+    def slow_extract(path, item_type):
+        started.set()
+        release.wait(5)
+        return extract(path, item_type)
+
+    monkeypatch.setattr(library_metadata, "extract_metadata", slow_extract)
+    manager = LibraryManager()
+    assert started.wait(5)
+    assert manager.remove_item("new")
+    assert manager.remove_item("missing")
+    release.set()
+    manager.metadata_indexer.wait()
+    manager.metadata_indexer.shutdown()
+
+    items = stored_items(tmp_path)
+    assert set(items) == {"indexed"}
+    assert manager.get_item("new") is None
@@ -0,0 +1,90 @@
+"""
+Unit tests for the SQLite media library store.
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.handlers.library_store import LibraryStore
+
+
+def make_item(item_id, item_type="raw_photo", date_added="2024-01-01T00:00:00"):
+    """Item dict in the library.json layout."""
+    return {"id": item_id, "type": item_type, "filename": f"{item_id}.jpg",
+            "caption": "", "date_added": date_added, "tags": []}
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Store on a fresh database."""
+    store = LibraryStore(tmp_path / "library.db")
+    yield store
+    store.close()
+
+
+def test_items_round_trip(tmp_path):
+    """Items written by one store are loaded by the next."""
+    db_path = tmp_path / "library.db"
+    store = LibraryStore(db_path)
+    store.put_item(make_item("a"))
+    store.put_item(make_item("b", "post_ready_photo"))
+    store.put_item(dict(make_item("a"), caption="updated"))
+    store.close()
+
+    store = LibraryStore(db_path)
+    items, collections = store.load()
+    store.close()
+    assert set(items) == {"a", "b"}
+    assert items["a"]["caption"] == "updated"
+    assert items["b"]["type"] == "post_ready_photo"
+    assert collections == {}
+
+
+def test_delete_item_removes_memberships(store):
+    """Deleting an item also drops it from its collections."""
+    store.put_item(make_item("a"))
+    store.put_item(make_item("b"))
+    store.put_collection({"id": "c1", "name": "Favourites", "date_created": "", "items": ["ignored"]})
+    store.add_collection_item("c1", "a")
+    store.add_collection_item("c1", "b")
+    store.add_collection_item("c1", "a")  # already a member
+
+    items, collections = store.load()
+    assert collections["c1"]["items"] == ["a", "b"]
+    assert collections["c1"]["name"] == "Favourites"
+
+    store.delete_item("a")
+    items, collections = store.load()
+    assert set(items) == {"b"}
+    assert collections["c1"]["items"] == ["b"]
+
+
+def test_import_json_once(store, tmp_path):
+    """library.json is imported with its collections, and only once."""
+    json_path = tmp_path / "library.json"
+    json_path.write_text(json.dumps({
+        "items": {"a": make_item("a"), "b": {"type": "raw_video", "filename": "b.mp4"}},
+        "collections": {"c1": {"name": "Mixed", "items": ["b", "missing", "a"]}},
+    }))
+
+    assert store.import_json(json_path)
+    items, collections = store.load()
+    assert items["b"]["id"] == "b"
+    assert collections["c1"]["id"] == "c1"
+    # Members that are not library items are skipped; the order is kept
+    assert collections["c1"]["items"] == ["b", "a"]
+
+    json_path.write_text(json.dumps({"items": {"c": make_item("c")}, "collections": {}}))
+    assert not store.import_json(json_path)
+    assert "c" not in store.load()[0]
+
+
+def test_import_without_json(store, tmp_path):
+    """Nothing to import when library.json does not exist."""
+    assert not store.import_json(tmp_path / "library.json")
@@ -0,0 +1,116 @@
+"""
+Unit tests for the row diffs of the library grid models.
+"""
+
+import os
+import sys
+
+import pytest
+from PySide6.QtCore import QtMsgType, qInstallMessageHandler
+from PySide6.QtTest import QAbstractItemModelTester
+from PySide6.QtWidgets import QApplication
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.ui.components.media_grid import ITEM_ROLE, LibraryGridModel
+from src.utils.thumbnail_cache import ThumbnailCache
+from src.utils.thumbnail_loader import ThumbnailLoader
+
+
+def items(*names):
+    """Items keyed by path, in the given order."""
+    return [{"path": f"/m/{name}.jpg", "type": "image"} for name in names]
+
+
+@pytest.fixture
+def app():
+    """The QApplication the models need."""
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def model(app, tmp_path):
+    """Checkable model under QAbstractItemModelTester, with its change signals recorded."""
+    loader = ThumbnailLoader(ThumbnailCache(str(tmp_path / "thumbnails")))
+    model = LibraryGridModel(loader, (64, 64), checkable=True)
+    model.events = []
+    model.rowsRemoved.connect(lambda parent, first, last: model.events.append(("removed", first, last)))
+    model.rowsInserted.connect(lambda parent, first, last: model.events.append(("inserted", first, last)))
+    model.modelReset.connect(lambda: model.events.append(("reset",)))
+    model.dataChanged.connect(lambda first, last, roles: model.events.append(("changed", first.row(), last.row())))
+    model.selection_changed.connect(lambda: model.events.append(("selection",)))
+
+    warnings = []
+
+    def handler(mode, context, message):
+        if mode != QtMsgType.QtDebugMsg:
+            warnings.append(message)
+
+    previous = qInstallMessageHandler(handler)
+    tester = QAbstractItemModelTester(model, QAbstractItemModelTester.FailureReportingMode.Warning)
+    yield model
+    qInstallMessageHandler(previous)
+    del tester
+    assert warnings == []
+
+
+def rows(model):
+    """Items as the model reports them, in row order."""
+    return [model.data(model.index(row), ITEM_ROLE) for row in range(model.rowCount())]
+
+
+def test_removals_in_contiguous_runs(model):
+    """Removed rows go in one signal per run, bottom up."""
+    model.set_items(items(*"abcdefgh"))
+    model.events.clear()
+    model.set_items(items(*"adegh"))
+    assert model.events == [("removed", 5, 5), ("removed", 1, 2)]
+    assert rows(model) == items(*"adegh")
+    assert model.contains("/m/h.jpg") and not model.contains("/m/b.jpg")
+
+
+def test_insertions_in_contiguous_runs(model):
+    """New rows go in one signal per run at their final positions."""
+    model.set_items(items(*"ac"))
+    model.events.clear()
+    model.set_items(items(*"xaycz"))
+    assert model.events == [("inserted", 0, 0), ("inserted", 2, 2), ("inserted", 4, 4)]
+    assert rows(model) == items(*"xaycz")
+
+
+def test_mixed_removals_insertions_and_updates(model):
+    """Rows that stay in order are patched in place; changed ones emit dataChanged."""
+    model.set_items(items(*"abcd"))
+    model.events.clear()
+    updated = items(*"axyd")
+    updated[3]["caption"] = "new"
+    model.set_items(updated)
+    assert model.events == [("removed", 1, 2), ("inserted", 1, 2), ("changed", 3, 3)]
+    assert rows(model) == updated
+
+
+def test_reorder_falls_back_to_reset(model):
+    """Kept rows that change their relative order reset the model."""
+    model.set_items(items(*"abcd"))
+    model.events.clear()
+    model.set_items(items(*"dbae"))
+    assert model.events == [("removed", 2, 2), ("reset",)]
+    assert rows(model) == items(*"dbae")
+    assert model.contains("/m/e.jpg")
+
+
+def test_selection_of_kept_rows(model):
+    """Checked rows stay checked while they remain; removed ones are dropped."""
+    model.set_items(items(*"abc"))
+    model.set_all_checked(True)
+    model.events.clear()
+    model.set_items(items(*"ab"))
+    assert model.selected_keys() == {"/m/a.jpg", "/m/b.jpg"}
+    assert model.events == [("removed", 2, 2), ("selection",)]
+
+    # Unchanged selection does not signal
+    model.events.clear()
+    model.set_items(items(*"bad"))
+    assert model.selected_keys() == {"/m/a.jpg", "/m/b.jpg"}
+    assert ("selection",) not in model.events
@@ -0,0 +1,106 @@
+"""
+Unit tests for the inverted media search index.
+"""
+
+import os
+import sys
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.handlers.media_search_index import (
+    MATCH_BONUS, MediaSearchIndex, stems, tokenize
+)
+
+
+def build_index():
+    """Small index over three photos and a post."""
+    index = MediaSearchIndex()
+    index.add("/m/bread.jpg", "raw_photos", "bread.jpg", "Fresh loaf", ["food", "bakery"])
+    index.add("/m/cat.jpg", "raw_photos", "cat.jpg", "A sleepy cat", ["animal"])
+    index.add("/m/category.jpg", "raw_photos", "category.jpg", "", ["chart"])
+    index.add("/p/party.mp4", "finished_posts", "party.mp4", "Bakery party tonight", ["event"])
+    return index
+
+
+def paths(results):
+    """Paths of search results, in rank order."""
+    return [path for path, _ in results]
+
+
+def test_tokenize():
+    """Tokens are lowercase runs of letters and digits."""
+    assert tokenize("IMG_0042 Fresh-Bread!") == ["img", "0042", "fresh", "bread"]
+    assert tokenize("") == []
+
+
+def test_stems_strip_only_real_suffixes():
+    """Stems come from common suffixes and keep at least three letters."""
+    assert "bread" in stems("breads")
+    assert "bake" in stems("baking")
+    assert "bake" in stems("baked")
+    assert "dress" in stems("dresses")
+    assert stems("category") == []
+    assert stems("cats") == ["cat"]
+    assert stems("bus") == []
+
+
+def test_exact_and_prefix_match():
+    """A token matches its own term and the terms it is a prefix of."""
+    index = build_index()
+    assert paths(index.search("party")) == ["/p/party.mp4"]
+    assert paths(index.search("bre")) == ["/m/bread.jpg"]
+    # The "chart" tag outweighs the "cat" file name
+    assert paths(index.search("c")) == ["/m/category.jpg", "/m/cat.jpg"]
+
+
+def test_stem_match():
+    """A longer form of a term finds it, but a longer word is not a longer form."""
+    index = build_index()
+    assert paths(index.search("breads")) == ["/m/bread.jpg"]
+    assert paths(index.search("category")) == ["/m/category.jpg"]
+
+
+def test_ranking():
+    """More matched tokens rank first, then field weight, then insertion order."""
+    index = build_index()
+    # Both match "bakery"; the post also matches "party"
+    assert paths(index.search("bakery party")) == ["/p/party.mp4", "/m/bread.jpg"]
+    # Tag match (bread photo) outranks caption match (post)
+    results = index.search("bakery")
+    assert paths(results) == ["/m/bread.jpg", "/p/party.mp4"]
+    assert results[0][1] == MATCH_BONUS + 3.0
+    assert results[1][1] == MATCH_BONUS + 1.0
+    # Equal scores keep the order the media were indexed in
+    assert paths(index.search("jpg")) == ["/m/bread.jpg", "/m/cat.jpg", "/m/category.jpg"]
+    assert len(index.search("jpg", limit=2)) == 2
+
+
+def test_remove_and_readd():
+    """Removed media stop matching; re-adding indexes the new text."""
+    index = build_index()
+    index.search("c")
+    index.remove("/m/cat.jpg")
+    assert "/m/cat.jpg" not in index
+    assert "/m/cat.jpg" not in paths(index.search("c"))
+    assert index.search("sleepy") == []
+
+    index.add("/m/cat.jpg", "raw_photos", "cat.jpg", "A playful kitten", ["animal"])
+    assert "/m/cat.jpg" in paths(index.search("c"))
+    assert paths(index.search("kitten")) == ["/m/cat.jpg"]
+    assert index.category("/m/cat.jpg") == "raw_photos"
+    assert len(index) == 4
+
+
+def test_reindex_replaces_old_terms():
+    """Re-indexing a path drops terms it no longer has."""
+    index = build_index()
+    index.add("/m/bread.jpg", "raw_photos", "bread.jpg", "Rye loaf", [])
+    assert index.search("food") == []
+    assert paths(index.search("f")) == []
+    assert paths(index.search("rye")) == ["/m/bread.jpg"]
+
+
+def test_empty_query():
+    """Queries without tokens match nothing."""
+    assert build_index().search("  !! ") == []
@@ -0,0 +1,81 @@
+"""
+Unit tests for rendering and joining highlight reel parts.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.features.media_processing import render_scheduler
+from src.features.media_processing.render_scheduler import RenderJob, RenderScheduler
+from src.features.media_processing.stream_cut import STREAM_COPIED, StreamCutter
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Record renders; stream copies succeed for cuts of at least a second."""
+    calls = []
+
+    def fake_render_segment(job):
+        calls.append((job.start, job.stream_copy))
+        if job.stream_copy and job.end - job.start >= 1:
+            return True, job.output_path, f"{STREAM_COPIED} {job.end - job.start:.1f}s"
+        return True, job.output_path, "Rendered"
+
+    monkeypatch.setattr(render_scheduler, "render_segment", fake_render_segment)
+    monkeypatch.setattr(RenderScheduler, "concat", lambda self, paths, output: (True, "Joined"))
+    return calls
+
+
+def test_mixed_parts_are_all_encoded(rendered, tmp_path):
+    """A fallback encode makes the stream-copied parts re-encode too."""
+    jobs = [RenderJob("in.mp4", 0, 2, "", stream_copy=True),
+            RenderJob("in.mp4", 5, 5.5, "", stream_copy=True),
+            RenderJob("in.mp4", 8, 10, "", stream_copy=True)]
+    success, _ = RenderScheduler(max_workers=1).render_and_concat(jobs, str(tmp_path / "out.mp4"))
+    assert success
+    assert rendered == [(0, True), (5, True), (8, True), (0, False), (8, False)]
+
+
+def test_copied_parts_are_kept(rendered, tmp_path):
+    """Parts that all stream-copy are joined as they are."""
+    jobs = [RenderJob("in.mp4", 0, 2, "", stream_copy=True),
+            RenderJob("in.mp4", 8, 10, "", stream_copy=True)]
+    success, _ = RenderScheduler(max_workers=1).render_and_concat(jobs, str(tmp_path / "out.mp4"))
+    assert success
+    assert rendered == [(0, True), (8, True)]
+
+
+def test_mixed_reel_timing(tmp_path):
+    """A reel of copied and fallback cuts from a 48 kHz source keeps its length and audio rate."""
+    pytest.importorskip("moviepy.editor")
+    cutter = StreamCutter()
+    source = str(tmp_path / "source.mp4")
+    subprocess.run([
+        cutter.ffmpeg, "-y", "-loglevel", "error",
+        "-f", "lavfi", "-i", "testsrc=size=160x120:rate=25:duration=10",
+        "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=48000:duration=10",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-g", "25", "-keyint_min", "25",
+        "-sc_threshold", "0", "-c:a", "aac", "-shortest", source,
+    ], check=True, capture_output=True)
+    copy_source = (cutter.probe(source), cutter.scan_keyframes(source))
+
+    # The middle cut spans no keyframe interval and falls back to a full encode
+    segments = [(0.5, 4.5), (5.1, 5.4), (6.0, 10.0)]
+    jobs = [RenderJob(source, start, end, "", stream_copy=True, keyframes=copy_source[1],
+                      source_info=copy_source[0]) for start, end in segments]
+    output = str(tmp_path / "reel.mp4")
+    success, message = RenderScheduler(max_workers=1).render_and_concat(jobs, output)
+    assert success, message
+
+    details = subprocess.run([cutter.ffmpeg, "-hide_banner", "-i", output], capture_output=True, text=True).stderr
+    hours, minutes, seconds = re.search(r"Duration: (\d+):(\d+):([\d.]+)", details).groups()
+    duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    assert abs(duration - sum(end - start for start, end in segments)) < 0.15
+    assert "44100 Hz" in details
@@ -0,0 +1,123 @@
+"""
+Unit tests for keyframe-aware stream-copy cutting.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+import pytest
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.features.media_processing.stream_cut import KeyframeIndex, StreamCutter
+
+FPS = 25
+GOP_FRAMES = 10
+DURATION = 4.0
+
+
+@pytest.fixture(scope="module")
+def cutter():
+    """Cutter using the bundled ffmpeg, skipping when there is none."""
+    try:
+        return StreamCutter()
+    except Exception as e:
+        pytest.skip(f"ffmpeg not available: {e}")
+
+
+@pytest.fixture(scope="module")
+def source_video(cutter, tmp_path_factory):
+    """H.264 test clip with AAC audio and a keyframe every GOP_FRAMES frames."""
+    path = str(tmp_path_factory.mktemp("stream_cut") / "source.mp4")
+    subprocess.run([
+        cutter.ffmpeg, "-y", "-loglevel", "error",
+        "-f", "lavfi", "-i", f"testsrc=size=160x120:rate={FPS}:duration={DURATION}",
+        "-f", "lavfi", "-i", f"sine=frequency=440:duration={DURATION}",
+        "-c:v", "libx264", "-pix_fmt", "yuv420p", "-g", str(GOP_FRAMES), "-keyint_min", str(GOP_FRAMES),
+        "-sc_threshold", "0", "-bf", "2", "-c:a", "aac", "-shortest", path,
+    ], check=True, capture_output=True)
+    return path
+
+
+def frame_count(path):
+    """Number of decodable frames in a video."""
+    cap = cv2.VideoCapture(path)
+    count = 0
+    while cap.grab():
+        count += 1
+    cap.release()
+    return count
+
+
+def test_keyframe_index_round_trip():
+    """Indexes survive serialisation to arrays."""
+    index = KeyframeIndex(times=[0.0, 0.4, 0.8], packet_counts=[10, 10, 5], closed_gop=False)
+    assert KeyframeIndex.from_arrays(index.to_arrays()) == index
+
+
+def test_probe(cutter, source_video):
+    """Codec, pixel format, size and audio codec are read from ffmpeg's output."""
+    info = cutter.probe(source_video)
+    assert info == {"video_codec": "h264", "pix_fmt": "yuv420p", "width": 160, "height": 120,
+                    "audio_codec": "aac"}
+    assert cutter.can_stream_copy(info)
+    assert not cutter.can_stream_copy(dict(info, video_codec="hevc"))
+    assert not cutter.can_stream_copy(dict(info, pix_fmt="yuv420p10le"))
+
+
+def test_scan_keyframes(cutter, source_video):
+    """Keyframes are found every GOP with the packets between them."""
+    index = cutter.scan_keyframes(source_video)
+    gop_seconds = GOP_FRAMES / FPS
+    assert np.allclose(index.times, np.arange(len(index.times)) * gop_seconds)
+    assert len(index.times) == int(DURATION * FPS) // GOP_FRAMES
+    assert index.packet_counts == [GOP_FRAMES] * len(index.times)
+    assert index.closed_gop
+
+
+def test_cut_copies_whole_gops(cutter, source_video, tmp_path):
+    """A cut spanning keyframes is copied in the middle and has the requested length."""
+    output = str(tmp_path / "cut.mp4")
+    success, message = cutter.cut(source_video, 0.5, 3.1, output)
+    assert success, message
+    assert "Stream-copied" in message
+    # 0.5 s to 3.1 s at 25 fps
+    assert abs(frame_count(output) - 65) <= 1
+    assert cutter.probe(output).get("audio_codec") == "aac"
+
+
+def test_cut_path_with_apostrophe(cutter, source_video, tmp_path, monkeypatch):
+    """Quotes in fragment paths are escaped in the concat list."""
+    directory = tmp_path / "crow's eye"
+    directory.mkdir()
+    # Fragments are written under the temporary directory
+    monkeypatch.setattr(tempfile, "tempdir", str(directory))
+    source = str(directory / "it's.mp4")
+    shutil.copy(source_video, source)
+    output = str(directory / "cut.mp4")
+    success, message = cutter.cut(source, 0.5, 3.1, output)
+    assert success, message
+    assert abs(frame_count(output) - 65) <= 1
+
+
+def test_cut_rejects_ineligible_sources(cutter, source_video, tmp_path):
+    """Cuts without a whole GOP, open-GOP sources and other codecs fall back."""
+    output = str(tmp_path / "cut.mp4")
+    info = cutter.probe(source_video)
+    keyframes = cutter.scan_keyframes(source_video)
+
+    success, _ = cutter.cut(source_video, 0.1, 0.5, output, keyframes=keyframes, info=info)
+    assert not success
+    open_gop = KeyframeIndex(keyframes.times, keyframes.packet_counts, closed_gop=False)
+    success, _ = cutter.cut(source_video, 0.5, 3.1, output, keyframes=open_gop, info=info)
+    assert not success
+    success, _ = cutter.cut(source_video, 0.5, 3.1, output, keyframes=keyframes,
+                            info=dict(info, video_codec="vp9"))
+    assert not success
+    assert not os.path.exists(output)
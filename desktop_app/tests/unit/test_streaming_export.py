@@ -0,0 +1,96 @@
+"""
+Unit tests for the streaming export writers.
+"""
+
+import csv
+import gzip
+import io
+import json
+import os
+import sys
+import zipfile
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils.streaming_export import (
+    StreamedObject, ZipExportBundle, open_export, write_csv, write_json
+)
+
+
+def streamed_json(value, indent=2):
+    """Text written by write_json."""
+    f = io.StringIO()
+    write_json(f, value, indent=indent)
+    return f.getvalue()
+
+
+def test_plain_values_match_json_dump():
+    """Documents without lazy parts are written exactly like json.dumps."""
+    document = {"name": "Crow's Eye", "tags": ["a", "ü"], "nested": {"empty": {}, "list": []},
+                "n": 3, "none": None}
+    for indent in (2, 4):
+        assert streamed_json(document, indent) == json.dumps(document, indent=indent, ensure_ascii=False) + "\n"
+
+
+def test_generators_and_streamed_objects():
+    """Generators become arrays and StreamedObject an object, formatted like json.dump."""
+    document = {
+        "posts": (post for post in [{"id": 1}, {"id": 2}]),
+        "by_id": StreamedObject((str(i), {"id": i}) for i in range(2)),
+        "empty": iter([]),
+    }
+    expected = {"posts": [{"id": 1}, {"id": 2}], "by_id": {"0": {"id": 0}, "1": {"id": 1}}, "empty": []}
+    assert streamed_json(document) == json.dumps(expected, indent=2) + "\n"
+
+
+def test_callables_see_streamed_items():
+    """A callable after a stream is evaluated once the stream has been written."""
+    seen = []
+
+    def rows():
+        for i in range(3):
+            seen.append(i)
+            yield i
+
+    text = streamed_json({"rows": rows(), "count": lambda: len(seen)})
+    assert json.loads(text) == {"rows": [0, 1, 2], "count": 3}
+
+
+def test_write_csv(tmp_path):
+    """Rows are written with a header and counted."""
+    path = str(tmp_path / "export.csv")
+    with open_export(path, newline='') as f:
+        count = write_csv(f, ["id", "caption"], ({"id": i, "caption": f"c,{i}"} for i in range(3)))
+    assert count == 3
+    with open(path, newline='', encoding='utf-8') as f:
+        assert list(csv.DictReader(f)) == [{"id": str(i), "caption": f"c,{i}"} for i in range(3)]
+
+
+def test_open_export_compressed(tmp_path):
+    """Compressed exports are gzip files, in new directories if needed."""
+    path = str(tmp_path / "nested" / "export.json.gz")
+    with open_export(path, compress=True) as f:
+        write_json(f, {"items": iter([1, 2])})
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        assert json.load(f) == {"items": [1, 2]}
+
+
+def test_zip_bundle(tmp_path):
+    """Documents and media are added to the archive; media is stored uncompressed."""
+    media = tmp_path / "photo.jpg"
+    media.write_bytes(b"\xff\xd8" + b"x" * 1000)
+    notes = tmp_path / "notes.txt"
+    notes.write_text("y" * 1000)
+    path = str(tmp_path / "bundle.zip")
+
+    with ZipExportBundle(path) as bundle:
+        bundle.add_document("data.json", lambda f: write_json(f, {"items": iter(range(3))}))
+        bundle.add_file(str(media), "media/photo.jpg")
+        bundle.add_file(str(notes), "notes.txt")
+
+    with zipfile.ZipFile(path) as archive:
+        assert json.loads(archive.read("data.json")) == {"items": [0, 1, 2]}
+        assert archive.read("media/photo.jpg") == media.read_bytes()
+        assert archive.getinfo("media/photo.jpg").compress_type == zipfile.ZIP_STORED
+        assert archive.getinfo("notes.txt").compress_type == zipfile.ZIP_DEFLATED
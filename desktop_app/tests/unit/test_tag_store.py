@@ -0,0 +1,104 @@
+"""
+Unit tests for keyword matching and the memoized tag store.
+"""
+
+import os
+import random
+import sys
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.handlers.tag_store import TAG_PATTERNS, KeywordMatcher, PathKeywords, TagStore
+
+
+def test_finds_overlapping_and_nested_keywords():
+    """Keywords that overlap or are prefixes of each other are all found."""
+    matcher = KeywordMatcher(["bread", "bre", "bakery", "cake", "cakes", "ake"])
+    assert matcher.find("fresh_breadcakes_bakery.jpg") == {
+        "bread", "bre", "bakery", "cake", "cakes", "ake"
+    }
+    assert matcher.find("cake") == {"cake", "ake"}
+    assert matcher.find("nothing here") == set()
+
+
+def test_escapes_special_characters():
+    """Keywords are matched literally."""
+    matcher = KeywordMatcher(["a.b", "c+"])
+    assert matcher.find("axb c") == set()
+    assert matcher.find("a.b c+") == {"a.b", "c+"}
+
+
+def test_matches_naive_substring_scan():
+    """Same result as checking every keyword with the in operator."""
+    rng = random.Random(0)
+    keywords = {"".join(rng.choice("abc") for _ in range(rng.randint(1, 4))) for _ in range(30)}
+    matcher = KeywordMatcher(keywords)
+    for _ in range(200):
+        text = "".join(rng.choice("abcd_") for _ in range(rng.randint(0, 20)))
+        assert matcher.find(text) == {keyword for keyword in keywords if keyword in text}
+
+
+def test_path_keywords():
+    """Groups match the file name by default, or the given segment keywords."""
+    keywords = PathKeywords(os.path.join("photos", "Team", "Sourdough_Loaf.JPG"))
+    assert keywords.found("bread")
+    assert not keywords.found("people")
+    assert keywords.found("dir_people", keywords.parts[1])
+    assert keywords.found("people", keywords.path)
+    assert keywords.path == {keyword for patterns in TAG_PATTERNS.values() for keyword in patterns
+                             if keyword in os.path.join("photos", "team", "sourdough_loaf.jpg")}
+
+
+def test_tags_are_computed_once_per_file_version(tmp_path):
+    """Tags are reused until the file's mtime changes."""
+    media = tmp_path / "photo.jpg"
+    media.write_bytes(b"jpg")
+    calls = []
+
+    def compute(path):
+        calls.append(path)
+        return ["food"]
+
+    store = TagStore(compute)
+    assert store.get(str(media)) == ["food"]
+    assert store.get(str(media)) == ["food"]
+    assert len(calls) == 1
+
+    os.utime(media, (1, 1))
+    store.get(str(media))
+    assert len(calls) == 2
+
+    store.invalidate(str(media))
+    store.get(str(media))
+    assert len(calls) == 3
+
+
+def test_returned_tags_are_copies():
+    """Modifying returned tags does not change the stored ones."""
+    store = TagStore(lambda path: ["food"])
+    tags = store.get(__file__)
+    tags.append("changed")
+    assert store.get(__file__) == ["food"]
+
+
+def test_tags_persist_per_tagger(tmp_path):
+    """Stored tags are reused by a new store with the same tagger only."""
+    media = tmp_path / "photo.jpg"
+    media.write_bytes(b"jpg")
+    db_path = str(tmp_path / "tags.db")
+
+    first = TagStore(lambda path: ["bakery"], db_path=db_path, tagger="v1")
+    first.get(str(media))
+    first.close()
+
+    def fail(path):
+        raise AssertionError("tags should come from the database")
+
+    second = TagStore(fail, db_path=db_path, tagger="v1")
+    assert second.get(str(media)) == ["bakery"]
+    second.close()
+
+    third = TagStore(lambda path: ["new"], db_path=db_path, tagger="v2")
+    assert third.get(str(media)) == ["new"]
+    third.close()
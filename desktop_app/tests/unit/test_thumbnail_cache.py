@@ -0,0 +1,148 @@
+"""
+Unit tests for the memory and disk thumbnail cache.
+"""
+
+import os
+import sys
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+# Add the desktop_app directory to the path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.utils import thumbnail_cache
+from src.utils.thumbnail_cache import ThumbnailCache
+
+SIZE = (32, 32)
+
+
+@pytest.fixture
+def app():
+    """The QApplication image plugins are loaded through."""
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def media(tmp_path):
+    """Three media files; their contents are never decoded."""
+    paths = []
+    for name in ("a.jpg", "b.jpg", "c.jpg"):
+        path = tmp_path / "media" / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(b"jpg")
+        paths.append(str(path))
+    return paths
+
+
+class Renderer:
+    """Thumbnail renderer that counts its calls."""
+
+    def __init__(self, transparent=False):
+        self.calls = []
+        self.transparent = transparent
+
+    def __call__(self, media_path, size):
+        self.calls.append(media_path)
+        if self.transparent:
+            image = QImage(size[0], size[1], QImage.Format.Format_ARGB32)
+            image.fill(Qt.GlobalColor.transparent)
+        else:
+            image = QImage(size[0], size[1], QImage.Format.Format_RGB32)
+            image.fill(Qt.GlobalColor.red)
+        return image
+
+
+def cached_files(cache_dir):
+    """Names of the thumbnail files under a cache directory."""
+    return sorted(name for _, _, names in os.walk(cache_dir) for name in names)
+
+
+def test_memory_hit(app, media, tmp_path):
+    """A second request is served from memory."""
+    cache = ThumbnailCache(str(tmp_path / "cache"))
+    render = Renderer()
+    first = cache.get(media[0], SIZE, render)
+    assert cache.get(media[0], SIZE, render) is first
+    assert cache.peek(media[0], SIZE) is first
+    assert len(render.calls) == 1
+    assert cache.stats["generated"] == 1
+    assert cache.stats["memory_hits"] == 2
+
+
+def test_disk_hit(app, media, tmp_path):
+    """A new cache on the same directory reads the stored thumbnail."""
+    ThumbnailCache(str(tmp_path / "cache")).get(media[0], SIZE, Renderer())
+    cache = ThumbnailCache(str(tmp_path / "cache"))
+    render = Renderer()
+    assert cache.peek(media[0], SIZE) is None
+    image = cache.get(media[0], SIZE, render)
+    assert (image.width(), image.height()) == SIZE
+    assert render.calls == []
+    assert cache.stats["disk_hits"] == 1
+
+
+def test_changed_file_is_regenerated(app, media, tmp_path):
+    """A new mtime renders again and replaces the older version's file."""
+    cache = ThumbnailCache(str(tmp_path / "cache"))
+    render = Renderer()
+    cache.get(media[0], SIZE, render)
+    cache.get(media[0], (16, 16), render)
+    assert len(cached_files(cache.cache_dir)) == 2
+
+    os.utime(media[0], (1, 1))
+    cache.get(media[0], SIZE, render)
+    assert len(render.calls) == 3
+    files = cached_files(cache.cache_dir)
+    assert len(files) == 1
+    assert files[0].startswith(f"{os.stat(media[0]).st_mtime_ns}_32x32")
+
+
+def test_invalidate(app, media, tmp_path):
+    """Invalidating a file drops its thumbnails from memory and disk only."""
+    cache = ThumbnailCache(str(tmp_path / "cache"))
+    render = Renderer()
+    cache.get(media[0], SIZE, render)
+    cache.get(media[1], SIZE, render)
+    cache.invalidate(media[0])
+    assert cache.peek(media[0], SIZE) is None
+    assert cache.peek(media[1], SIZE) is not None
+    assert len(cached_files(cache.cache_dir)) == 1
+
+    cache.get(media[0], SIZE, render)
+    assert len(render.calls) == 3
+
+
+def test_memory_budget_evicts_least_recently_used(app, media, tmp_path):
+    """Past the budget, the least recently used thumbnails leave memory."""
+    image_bytes = Renderer()(media[0], SIZE).sizeInBytes()
+    cache = ThumbnailCache(str(tmp_path / "cache"), memory_budget=2 * image_bytes)
+    render = Renderer()
+    cache.get(media[0], SIZE, render)
+    cache.get(media[1], SIZE, render)
+    cache.peek(media[0], SIZE)
+    cache.get(media[2], SIZE, render)
+    assert cache.peek(media[1], SIZE) is None
+    assert cache.peek(media[0], SIZE) is not None
+    assert cache.peek(media[2], SIZE) is not None
+
+    # Evicted thumbnails come back from disk
+    cache.get(media[1], SIZE, render)
+    assert len(render.calls) == 3
+    assert cache.stats["disk_hits"] == 1
+
+
+def test_transparent_thumbnails_without_webp(app, media, tmp_path, monkeypatch):
+    """Transparent thumbnails fall back to PNG when WebP cannot be written."""
+    monkeypatch.setattr(thumbnail_cache, "TRANSPARENT_FORMATS",
+                        ((".webp", "NO-SUCH-FORMAT"), (".png", "PNG")))
+    ThumbnailCache(str(tmp_path / "cache")).get(media[0], SIZE, Renderer(transparent=True))
+    files = cached_files(tmp_path / "cache")
+    assert len(files) == 1 and files[0].endswith(".png")
+
+    render = Renderer()
+    image = ThumbnailCache(str(tmp_path / "cache")).get(media[0], SIZE, render)
+    assert render.calls == []
+    assert image.hasAlphaChannel()